@@ -0,0 +1,19 @@
+"""
+Authentication backends for Disha LMS.
+"""
+
+from django.contrib.auth.backends import ModelBackend
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the session user together with the center head
+    and faculty profiles (and their centers), so role and center checks
+    during the request need no further queries.
+    """
+
+    def get_user(self, user_id):
+        from apps.core.principal import load_user_with_profiles
+
+        user = load_user_with_profiles(user_id)
+        return user if self.user_can_authenticate(user) else None
@@ -10,6 +10,9 @@ from django.views import View
 from django.views.generic import UpdateView, ListView, DetailView
 from django.contrib import messages
 
+from apps.core.mixins import MasterAccountRedirectMixin
+from apps.core.principal import Principal, get_principal
+
 from .forms import LoginForm, ProfileUpdateForm, CenterManagerCreationForm, FacultyCreationForm
 from .models import User
 
@@ -104,7 +107,8 @@ class UserManagementMixin(LoginRequiredMixin):
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
             return super().dispatch(request, *args, **kwargs)
-        if not (request.user.role == User.MASTER_ACCOUNT or request.user.role == User.CENTER_HEAD):
+        principal = get_principal(request)
+        if not (principal.is_master or principal.is_center_head):
             messages.error(request, 'You do not have permission to manage users.')
             return redirect('accounts:profile')
         return super().dispatch(request, *args, **kwargs)
@@ -121,9 +125,10 @@ class UserListView(UserManagementMixin, ListView):
         queryset = User.objects.all().select_related('faculty_profile', 'center_head_profile')
         
         # Center heads can only see users in their center
-        if self.request.user.role == User.CENTER_HEAD:
-            if hasattr(self.request.user, 'center_head_profile'):
-                center = self.request.user.center_head_profile.center
+        principal = get_principal(self.request)
+        if principal.is_center_head:
+            center = principal.center
+            if center:
                 # Get faculty and center heads in this center
                 from apps.faculty.models import Faculty
                 from apps.centers.models import CenterHead
@@ -181,10 +186,11 @@ class UserDetailView(UserManagementMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.object
+        profiles = Principal(user)
         
         # Get activity summary
-        if user.role == User.FACULTY:
-            if hasattr(user, 'faculty_profile'):
+        if profiles.is_faculty:
+            if profiles.faculty_profile:
                 from apps.attendance.models import AttendanceRecord
                 from apps.subjects.models import Assignment
                 from django.db.models import Count, Sum
@@ -194,16 +200,16 @@ class UserDetailView(UserManagementMixin, DetailView):
                 context['total_students'] = records.values('student').distinct().count()
                 context['total_hours'] = (records.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60
                 context['assignments'] = Assignment.objects.filter(
-                    faculty=user.faculty_profile,
+                    faculty=profiles.faculty_profile,
                     deleted_at__isnull=True
                 ).count()
         
-        elif user.role == User.CENTER_HEAD:
-            if hasattr(user, 'center_head_profile'):
+        elif profiles.is_center_head:
+            if profiles.center_head_profile:
                 from apps.students.models import Student
                 from apps.faculty.models import Faculty
                 
-                center = user.center_head_profile.center
+                center = profiles.center
                 context['center'] = center
                 context['total_students'] = Student.objects.filter(
                     center=center,
@@ -277,9 +283,10 @@ class UserDeleteView(UserManagementMixin, View):
         user.save()
         
         # Deactivate associated profile
-        if hasattr(user, 'faculty_profile'):
-            user.faculty_profile.is_active = False
-            user.faculty_profile.save()
+        faculty = Principal(user).faculty_profile
+        if faculty:
+            faculty.is_active = False
+            faculty.save()
         
         messages.success(request, f'User {user.get_full_name()} has been deactivated.')
         return redirect('accounts:user_list')
@@ -287,31 +294,19 @@ class UserDeleteView(UserManagementMixin, View):
 
 # Master Account - Center Manager Management
 
-class MasterAccountRequiredMixin(LoginRequiredMixin):
-    """Mixin to ensure only master accounts can access."""
-    
-    def dispatch(self, request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            return super().dispatch(request, *args, **kwargs)
-        if not request.user.is_master_account:
-            messages.error(request, 'You do not have permission to access this page.')
-            return redirect('accounts:profile')
-        return super().dispatch(request, *args, **kwargs)
-
-
 class CenterHeadRequiredMixin(LoginRequiredMixin):
     """Mixin to ensure only center heads can access."""
     
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
             return super().dispatch(request, *args, **kwargs)
-        if not request.user.is_center_head:
+        if not get_principal(request).is_center_head:
             messages.error(request, 'You do not have permission to access this page.')
             return redirect('accounts:profile')
         return super().dispatch(request, *args, **kwargs)
 
 
-class CreateCenterManagerView(MasterAccountRequiredMixin, View):
+class CreateCenterManagerView(MasterAccountRedirectMixin, View):
     """Master account creates center managers (center heads)."""
     
     template_name = 'accounts/create_center_manager.html'
@@ -363,7 +358,7 @@ class CreateCenterManagerView(MasterAccountRequiredMixin, View):
         return render(request, self.template_name, {'form': form})
 
 
-class CenterManagerListView(MasterAccountRequiredMixin, ListView):
+class CenterManagerListView(MasterAccountRedirectMixin, ListView):
     """List all center managers."""
     
     model = User
@@ -425,12 +420,11 @@ class CreateFacultyView(CenterHeadRequiredMixin, View):
             try:
                 with transaction.atomic():
                     # Get center head's center
-                    if not hasattr(request.user, 'center_head_profile'):
+                    center = get_principal(request).center
+                    if not center:
                         messages.error(request, 'You are not associated with any center.')
                         return redirect('accounts:profile')
                     
-                    center = request.user.center_head_profile.center
-                    
                     # Create user
                     user = User.objects.create_user(
                         email=form.cleaned_data['email'],
@@ -477,11 +471,10 @@ class FacultyListView(CenterHeadRequiredMixin, ListView):
     
     def get_queryset(self):
         # Get center head's center
-        if not hasattr(self.request.user, 'center_head_profile'):
+        center = get_principal(self.request).center
+        if not center:
             return User.objects.none()
         
-        center = self.request.user.center_head_profile.center
-        
         queryset = User.objects.filter(
             role=User.FACULTY,
             faculty_profile__center=center,
@@ -514,8 +507,9 @@ class FacultyListView(CenterHeadRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['search'] = self.request.GET.get('search', '')
         context['status_filter'] = self.request.GET.get('status', '')
-        if hasattr(self.request.user, 'center_head_profile'):
-            context['center'] = self.request.user.center_head_profile.center
+        center = get_principal(self.request).center
+        if center:
+            context['center'] = center
         return context
 
 
@@ -526,11 +520,10 @@ class EditFacultyCredentialsView(CenterHeadRequiredMixin, View):
     
     def get(self, request, pk):
         # Verify faculty belongs to center head's center
-        if not hasattr(request.user, 'center_head_profile'):
+        center = get_principal(request).center
+        if not center:
             messages.error(request, 'You are not associated with any center.')
             return redirect('accounts:profile')
-        
-        center = request.user.center_head_profile.center
         user = get_object_or_404(
             User,
             pk=pk,
@@ -543,11 +536,10 @@ class EditFacultyCredentialsView(CenterHeadRequiredMixin, View):
     
     def post(self, request, pk):
         # Verify faculty belongs to center head's center
-        if not hasattr(request.user, 'center_head_profile'):
+        center = get_principal(request).center
+        if not center:
             messages.error(request, 'You are not associated with any center.')
             return redirect('accounts:profile')
-        
-        center = request.user.center_head_profile.center
         user = get_object_or_404(
             User,
             pk=pk,
@@ -588,8 +580,8 @@ class EditFacultyCredentialsView(CenterHeadRequiredMixin, View):
             messages.success(request, f'Password updated for {user.get_full_name()}!')
         
         # Update faculty profile
-        if hasattr(user, 'faculty_profile'):
-            faculty = user.faculty_profile
+        faculty = Principal(user).faculty_profile
+        if faculty:
             faculty.employee_id = request.POST.get('employee_id', faculty.employee_id)
             faculty.specialization = request.POST.get('specialization', faculty.specialization)
             faculty.qualification = request.POST.get('qualification', faculty.qualification)
@@ -5,3 +5,7 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.api'
     verbose_name = 'API'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
@@ -0,0 +1,30 @@
+"""
+Management command to show the API token cache hit rate.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.api.v1.authentication import get_token_cache_stats, reset_token_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Show how many API token lookups were answered from the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after printing them',
+        )
+
+    def handle(self, *args, **options):
+        stats = get_token_cache_stats()
+        self.stdout.write(
+            f"{stats['lookups']} lookups: {stats['local_hits']} local hits, "
+            f"{stats['hits']} cache hits, {stats['misses']} misses"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Hit rate: {stats['hit_rate']}%"))
+
+        if options['reset']:
+            reset_token_cache_stats()
+            self.stdout.write('Counters reset')
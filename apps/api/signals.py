@@ -0,0 +1,51 @@
+"""
+Signal handlers that drop cached API tokens (see v1/authentication.py).
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.authtoken.models import Token
+
+from apps.centers.models import CenterHead
+from apps.faculty.models import Faculty
+
+from .v1.authentication import invalidate_token, invalidate_user_tokens
+
+
+def token_changed(sender, instance, **kwargs):
+    """Logout and rotation delete the token; drop it right away."""
+    invalidate_token(instance.key)
+    transaction.on_commit(lambda: invalidate_token(instance.key))
+
+
+def user_changed(sender, instance, **kwargs):
+    """Deactivation and role changes must take effect on the next request."""
+    if kwargs.get('raw'):
+        return
+    user_id = instance.pk
+    invalidate_user_tokens(user_id)
+    transaction.on_commit(lambda: invalidate_user_tokens(user_id))
+
+
+def profile_changed(sender, instance, **kwargs):
+    """The cached user carries its profiles (and their centers)."""
+    if kwargs.get('raw'):
+        return
+    user_id = instance.user_id
+    invalidate_user_tokens(user_id)
+    transaction.on_commit(lambda: invalidate_user_tokens(user_id))
+
+
+def connect_signals():
+    post_save.connect(token_changed, sender=Token, dispatch_uid='api_token_cache_token_save')
+    post_delete.connect(token_changed, sender=Token, dispatch_uid='api_token_cache_token_delete')
+
+    User = get_user_model()
+    post_save.connect(user_changed, sender=User, dispatch_uid='api_token_cache_user_save')
+    post_delete.connect(user_changed, sender=User, dispatch_uid='api_token_cache_user_delete')
+
+    for model in (Faculty, CenterHead):
+        dispatch_uid = f'api_token_cache_{model._meta.label_lower}'
+        post_save.connect(profile_changed, sender=model, dispatch_uid=f'{dispatch_uid}_save')
+        post_delete.connect(profile_changed, sender=model, dispatch_uid=f'{dispatch_uid}_delete')
@@ -0,0 +1,161 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.attendance.models import AttendanceRecord
+from apps.centers.models import Center
+from apps.core.outbox import DISPATCH_PENDING_KEY
+from apps.faculty.models import Faculty
+from apps.students.models import Student
+from apps.subjects.models import Assignment, Subject
+
+from .v1 import authentication
+from .v1.authentication import CachedTokenAuthentication
+
+
+class CachedTokenAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'f1@example.com', 'pass', first_name='Mira', last_name='Iyer', role=User.FACULTY
+        )
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        authentication._local_cache.clear()
+        self.auth = CachedTokenAuthentication()
+
+    def authenticate(self):
+        return self.auth.authenticate_credentials(self.token.key)
+
+    def test_known_token_needs_no_queries(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+        self.assertEqual(user, self.user)
+
+        # Past the per-process cache, the shared cache answers
+        authentication._local_cache.clear()
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def test_deactivated_user_is_rejected_at_once(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
+
+    def test_user_changes_are_reloaded(self):
+        self.authenticate()
+        self.user.role = User.CENTER_HEAD
+        self.user.save()
+
+        user, token = self.authenticate()
+        self.assertEqual(user.role, User.CENTER_HEAD)
+
+    def test_deleted_token_is_rejected(self):
+        self.authenticate()
+        self.token.delete()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
+
+    def test_unknown_token_is_rejected(self):
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials('0' * 40)
+
+
+class ConditionalReportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'master@example.com', 'pass', first_name='Master', last_name='User', role=User.MASTER_ACCOUNT
+        )
+        audit = {'created_by': cls.user, 'modified_by': cls.user}
+        cls.center = Center.objects.create(
+            name='North', code='N1', address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email='north@example.com', **audit
+        )
+        day = datetime.date(2024, 3, 4)
+        faculty_user = User.objects.create_user(
+            'f1@example.com', 'pass', first_name='Mira', last_name='Iyer', role=User.FACULTY
+        )
+        faculty = Faculty.objects.create(
+            user=faculty_user, center=cls.center, employee_id='EMP1', joining_date=day, **audit
+        )
+        cls.student = Student.objects.create(
+            center=cls.center, first_name='Asha', last_name='Rao', phone='111',
+            enrollment_number='E1', enrollment_date=day,
+            guardian_name='Guardian', guardian_phone='222', **audit
+        )
+        subject = Subject.objects.create(name='Maths', code='MATH', **audit)
+        cls.assignment = Assignment.objects.create(
+            student=cls.student, subject=subject, faculty=faculty, start_date=day, **audit
+        )
+        cls.record = AttendanceRecord.objects.create(
+            student=cls.student, assignment=cls.assignment, date=day,
+            in_time=datetime.time(10), out_time=datetime.time(11),
+            marked_by=faculty_user, **audit
+        )
+
+    def setUp(self):
+        cache.clear()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def revalidate(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        return first['ETag'], self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+    def test_unchanged_insights_are_not_modified(self):
+        url = reverse('api_v1:report-insights-center', args=[self.center.pk])
+        etag, response = self.revalidate(url)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_write_changes_the_center_report(self):
+        url = reverse('api_v1:report-center', args=[self.center.pk])
+        etag, response = self.revalidate(url)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.status = 'inactive'
+            self.student.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['students']['inactive'], 1)
+
+    def test_delete_changes_the_student_report(self):
+        url = reverse('api_v1:report-student', args=[self.student.pk])
+        etag, response = self.revalidate(url)
+        self.assertEqual(response.status_code, 304)
+
+        self.record.delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['recent_attendance'], [])
+
+    def test_other_query_parameters_are_not_modified_separately(self):
+        url = reverse('api_v1:report-student', args=[self.student.pk])
+        etag, response = self.revalidate(url)
+
+        response = self.client.get(url, {'days': 7}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,202 @@
+"""
+Cached token authentication for the API.
+
+TokenAuthentication reads the Token and its User on every request, which
+is most of the database traffic of the polling mobile and sync clients.
+CachedTokenAuthentication keeps the authenticated token (with its user and
+the user's profiles, so the request principal needs no query either) in
+the shared cache for API_TOKEN_CACHE_TTL seconds, behind a small
+per-process cache that holds entries for API_TOKEN_LOCAL_CACHE_TTL
+seconds.
+
+Entries are dropped when the token is deleted (logout, rotation) and when
+the user or one of their profiles is saved (deactivation, role or center
+change); see apps/api/signals.py. Other processes may keep serving a
+dropped entry from their local cache until it expires, so that TTL is
+kept to a few seconds.
+
+Lookups are counted per process and added to shared counters every
+API_TOKEN_CACHE_STATS_FLUSH lookups; get_token_cache_stats() reports the
+totals and the hit rate.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from apps.core.principal import PROFILE_RELATIONS
+
+TOKEN_KEY = 'api_token_auth:{key}'
+USER_TOKEN_KEY = 'api_token_auth_user:{user_id}'
+STATS_KEY = 'api_token_auth_stats:{name}'
+STATS_NAMES = ('local_hits', 'hits', 'misses')
+
+LOCAL_CACHE_MAX_ENTRIES = 1000
+
+_local_cache = OrderedDict()
+_local_stats = dict.fromkeys(STATS_NAMES, 0)
+_lock = threading.Lock()
+
+
+def _cache_ttl():
+    return getattr(settings, 'API_TOKEN_CACHE_TTL', 300)
+
+
+def _local_cache_ttl():
+    return getattr(settings, 'API_TOKEN_LOCAL_CACHE_TTL', 5)
+
+
+def _local_get(key):
+    with _lock:
+        entry = _local_cache.get(key)
+        if entry is None:
+            return None
+        expires, payload = entry
+        if expires < time.monotonic():
+            del _local_cache[key]
+            return None
+        _local_cache.move_to_end(key)
+    return payload
+
+
+def _local_set(key, payload):
+    with _lock:
+        _local_cache[key] = (time.monotonic() + _local_cache_ttl(), payload)
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > LOCAL_CACHE_MAX_ENTRIES:
+            _local_cache.popitem(last=False)
+
+
+def _local_delete(key):
+    with _lock:
+        _local_cache.pop(key, None)
+
+
+def _count(name):
+    with _lock:
+        _local_stats[name] += 1
+        if sum(_local_stats.values()) < getattr(settings, 'API_TOKEN_CACHE_STATS_FLUSH', 100):
+            return
+        counts = dict(_local_stats)
+        _local_stats.update(dict.fromkeys(STATS_NAMES, 0))
+    flush_token_cache_stats(counts)
+
+
+def flush_token_cache_stats(counts=None):
+    """
+    Add this process's lookup counts to the shared counters.
+
+    Args:
+        counts: dict of counter name -> count (defaults to the pending local counts)
+    """
+    if counts is None:
+        with _lock:
+            counts = dict(_local_stats)
+            _local_stats.update(dict.fromkeys(STATS_NAMES, 0))
+    for name, count in counts.items():
+        if not count:
+            continue
+        key = STATS_KEY.format(name=name)
+        if not cache.add(key, count, timeout=None):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                cache.set(key, count, timeout=None)
+
+
+def get_token_cache_stats():
+    """
+    Shared token cache counters.
+
+    Returns:
+        dict: local_hits, hits, misses, lookups and hit_rate (percentage of
+        lookups answered without the database)
+    """
+    stats = {name: cache.get(STATS_KEY.format(name=name), 0) for name in STATS_NAMES}
+    stats['lookups'] = sum(stats.values())
+    served = stats['local_hits'] + stats['hits']
+    stats['hit_rate'] = round(served / stats['lookups'] * 100, 1) if stats['lookups'] else 0
+    return stats
+
+
+def reset_token_cache_stats():
+    cache.delete_many([STATS_KEY.format(name=name) for name in STATS_NAMES])
+
+
+def invalidate_token(key):
+    """
+    Drop a token from the shared and the local cache.
+
+    Args:
+        key: Token key
+    """
+    cache_key = TOKEN_KEY.format(key=key)
+    cache.delete(cache_key)
+    _local_delete(cache_key)
+
+
+def invalidate_user_tokens(user_id):
+    """
+    Drop the cached token of a user.
+
+    Args:
+        user_id: User primary key
+    """
+    index_key = USER_TOKEN_KEY.format(user_id=user_id)
+    key = cache.get(index_key)
+    if key is not None:
+        invalidate_token(key)
+        cache.delete(index_key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that serves known tokens from the cache.
+
+    Use in place of rest_framework.authentication.TokenAuthentication; the
+    Authorization header format is unchanged.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = TOKEN_KEY.format(key=key)
+
+        payload = _local_get(cache_key)
+        if payload is not None:
+            _count('local_hits')
+        else:
+            payload = cache.get(cache_key)
+            if payload is not None:
+                _count('hits')
+            else:
+                _count('misses')
+                payload = self._load(key)
+                if payload is None:
+                    raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            _local_set(cache_key, payload)
+
+        # Every request gets its own copy of the token and user.
+        token = pickle.loads(payload)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
+
+    def _load(self, key):
+        model = self.get_model()
+        token = model.objects.select_related(
+            'user', *(f'user__{relation}' for relation in PROFILE_RELATIONS)
+        ).filter(key=key).first()
+        if token is None:
+            return None
+
+        payload = pickle.dumps(token, pickle.HIGHEST_PROTOCOL)
+        ttl = _cache_ttl()
+        cache.set(TOKEN_KEY.format(key=key), payload, ttl)
+        cache.set(USER_TOKEN_KEY.format(user_id=token.user_id), key, ttl)
+        return payload
@@ -0,0 +1,106 @@
+"""
+Conditional GET support for report API endpoints.
+
+Report payloads are expensive to build but change only when their
+underlying rows do. Each endpoint describes the rows its report reads as a
+set of querysets; the row count and latest modified_at of each one form a
+cheap watermark. The watermark (plus the request parameters, the caller's
+role and today's date, since reports are relative to today) becomes the
+ETag, and the latest modification becomes Last-Modified. When a polling
+client revalidates and nothing changed, a 304 is returned before the
+report is computed.
+"""
+
+import hashlib
+from datetime import datetime, time
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def data_watermark(querysets):
+    """
+    Compute a watermark for a set of querysets.
+
+    Args:
+        querysets: dict of name -> queryset of TimeStampedModel rows
+
+    Returns:
+        tuple: (list of (name, count, latest modified_at), latest modified_at or None)
+    """
+    marks = []
+    latest = None
+    for name in sorted(querysets):
+        stats = querysets[name].order_by().aggregate(
+            count=Count('pk'),
+            latest=Max('modified_at')
+        )
+        marks.append((name, stats['count'], stats['latest']))
+        if stats['latest'] and (latest is None or stats['latest'] > latest):
+            latest = stats['latest']
+    return marks, latest
+
+
+class ConditionalReportMixin:
+    """
+    Mixin for report APIViews that answers revalidations with 304.
+
+    After its permission checks, a view calls::
+
+        not_modified = self.check_not_modified(request, scope, querysets)
+        if not_modified:
+            return not_modified
+
+    and builds its report as usual; the ETag and Last-Modified headers are
+    added to the successful response in finalize_response().
+    """
+
+    def check_not_modified(self, request, scope, querysets):
+        """
+        Compute validators for this request and compare them with the client's.
+
+        Args:
+            request: The API request
+            scope: Identifies the report object (e.g. 'center:3')
+            querysets: dict of name -> queryset read by the report
+
+        Returns:
+            Response: A 304 response if the client's copy is current, else None
+        """
+        marks, latest = data_watermark(querysets)
+        user = request.user
+        key = repr((
+            type(self).__name__,
+            scope,
+            sorted(request.query_params.items()),
+            getattr(user, 'role', None),
+            timezone.localdate().isoformat(),
+            marks,
+        ))
+        self._report_etag = '"%s"' % hashlib.md5(key.encode()).hexdigest()
+        # Reports are relative to today, so they change at midnight even
+        # when no row does; never claim an earlier modification time.
+        day_start = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        self._report_last_modified = max(latest or day_start, day_start).timestamp()
+
+        if get_conditional_response(
+            request,
+            etag=self._report_etag,
+            last_modified=self._report_last_modified
+        ) is None:
+            return None
+        return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, '_report_etag', None)
+        if etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(self._report_last_modified)
+            patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+            patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
@@ -81,7 +81,7 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     subject_name = serializers.CharField(source='assignment.subject.name', read_only=True)
     marked_by_name = serializers.CharField(source='marked_by.get_full_name', read_only=True)
-    topics_covered = TopicSerializer(many=True, read_only=True)
+    topics_covered = TopicSerializer(source='covered_topics', many=True, read_only=True)
     topic_ids = serializers.PrimaryKeyRelatedField(
         many=True,
         write_only=True,
@@ -94,14 +94,14 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
         from apps.attendance.models import AttendanceRecord
         model = AttendanceRecord
         fields = [
-            'id', 'student', 'student_name', 'assignment', 'subject_name',
+            'id', 'student', 'student_name', 'assignment', 'subject_name', 'session',
             'date', 'in_time', 'out_time', 'duration_minutes',
             'topics_covered', 'topic_ids', 'notes',
             'is_backdated', 'backdated_reason',
             'marked_by', 'marked_by_name',
             'created_at', 'modified_at'
         ]
-        read_only_fields = ['id', 'duration_minutes', 'is_backdated', 'marked_by', 
+        read_only_fields = ['id', 'session', 'duration_minutes', 'is_backdated', 'marked_by', 
                             'created_at', 'modified_at']
 
 
@@ -265,7 +265,7 @@ class StudentReportSerializer(serializers.Serializer):
     attendance_velocity = AttendanceVelocitySerializer()
     learning_velocity = LearningVelocitySerializer()
     recent_attendance = AttendanceRecordSerializer(many=True)
-    subject_completion = serializers.ListField(child=serializers.DictField())
+    subject_completion = serializers.ListField(child=serializers.ListField())
 
 
 class FacultyReportSerializer(serializers.Serializer):
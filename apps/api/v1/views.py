@@ -21,6 +21,9 @@ from .serializers import (
     CenterReportSerializer, StudentReportSerializer,
     FacultyReportSerializer, InsightsSerializer
 )
+from apps.core.principal import get_principal
+
+from .conditional import ConditionalReportMixin
 
 
 class LoginAPIView(APIView):
@@ -116,12 +119,14 @@ class AttendanceViewSet(APIView):
             # Faculty sees their own marked attendance
             queryset = AttendanceRecord.objects.filter(
                 marked_by=request.user
-            ).select_related('student', 'assignment__subject').prefetch_related('topics_covered')
+            ).select_related('student', 'assignment__subject', 'session').prefetch_related(
+                'topics_covered', 'session__topics_covered'
+            )
         else:
             # Other roles see all attendance (admin)
             queryset = AttendanceRecord.objects.all().select_related(
-                'student', 'assignment__subject'
-            ).prefetch_related('topics_covered')
+                'student', 'assignment__subject', 'session'
+            ).prefetch_related('topics_covered', 'session__topics_covered')
         
         # Filter by date if provided
         date = request.query_params.get('date')
@@ -162,7 +167,7 @@ class TodayAttendanceAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        faculty = request.user.faculty_profile
+        faculty = get_principal(request).faculty_profile
         attendance_records = get_today_attendance_for_faculty(faculty)
         
         serializer = AttendanceRecordSerializer(attendance_records, many=True)
@@ -221,25 +226,26 @@ class StudentViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         from apps.students.models import Student
+        principal = get_principal(self.request)
         
         # Center heads see only their center's students
-        if hasattr(self.request.user, 'center_head_profile'):
+        if principal.center_head_profile:
             return Student.objects.filter(
-                center=self.request.user.center_head_profile.center,
+                center=principal.center_head_profile.center,
                 deleted_at__isnull=True
             ).select_related('center')
         
         # Master accounts see all students
-        if self.request.user.is_master_account:
+        if principal.is_master:
             return Student.objects.filter(
                 deleted_at__isnull=True
             ).select_related('center')
         
         # Faculty see students assigned to them
-        if hasattr(self.request.user, 'faculty_profile'):
+        if principal.faculty_profile:
             from apps.subjects.models import Assignment
             student_ids = Assignment.objects.filter(
-                faculty=self.request.user.faculty_profile,
+                faculty=principal.faculty_profile,
                 is_active=True
             ).values_list('student_id', flat=True)
             return Student.objects.filter(
@@ -268,16 +274,17 @@ class FacultyViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         from apps.faculty.models import Faculty
+        principal = get_principal(self.request)
         
         # Center heads see only their center's faculty
-        if hasattr(self.request.user, 'center_head_profile'):
+        if principal.center_head_profile:
             return Faculty.objects.filter(
-                center=self.request.user.center_head_profile.center,
+                center=principal.center_head_profile.center,
                 deleted_at__isnull=True
             ).select_related('user', 'center')
         
         # Master accounts see all faculty
-        if self.request.user.is_master_account:
+        if principal.is_master:
             return Faculty.objects.filter(
                 deleted_at__isnull=True
             ).select_related('user', 'center')
@@ -296,37 +303,22 @@ class SubjectViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         from apps.subjects.models import Subject
-        from django.db.models import Count
+        principal = get_principal(self.request)
         
-        # Center heads see only their center's subjects
-        if hasattr(self.request.user, 'center_head_profile'):
-            return Subject.objects.filter(
-                center=self.request.user.center_head_profile.center,
-                deleted_at__isnull=True
-            ).select_related('center').annotate(
-                topic_count=Count('topics')
-            )
-        
-        # Master accounts see all subjects
-        if self.request.user.is_master_account:
-            return Subject.objects.filter(
-                deleted_at__isnull=True
-            ).select_related('center').annotate(
-                topic_count=Count('topics')
-            )
+        # Subjects are common across all centers; topic_count is a column
+        if principal.is_master or principal.center_head_profile:
+            return Subject.objects.filter(deleted_at__isnull=True)
         
         # Faculty see subjects they teach
-        if hasattr(self.request.user, 'faculty_profile'):
+        if principal.faculty_profile:
             from apps.subjects.models import Assignment
             subject_ids = Assignment.objects.filter(
-                faculty=self.request.user.faculty_profile,
+                faculty=principal.faculty_profile,
                 is_active=True
             ).values_list('subject_id', flat=True)
             return Subject.objects.filter(
                 id__in=subject_ids,
                 deleted_at__isnull=True
-            ).select_related('center').annotate(
-                topic_count=Count('topics')
             )
         
         return Subject.objects.none()
@@ -355,23 +347,24 @@ class AssignmentViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         from apps.subjects.models import Assignment
+        principal = get_principal(self.request)
         
         # Center heads see assignments in their center
-        if hasattr(self.request.user, 'center_head_profile'):
+        if principal.center_head_profile:
             return Assignment.objects.filter(
-                student__center=self.request.user.center_head_profile.center
+                student__center=principal.center_head_profile.center
             ).select_related('student', 'subject', 'faculty__user')
         
         # Master accounts see all assignments
-        if self.request.user.is_master_account:
+        if principal.is_master:
             return Assignment.objects.all().select_related(
                 'student', 'subject', 'faculty__user'
             )
         
         # Faculty see their own assignments
-        if hasattr(self.request.user, 'faculty_profile'):
+        if principal.faculty_profile:
             return Assignment.objects.filter(
-                faculty=self.request.user.faculty_profile
+                faculty=principal.faculty_profile
             ).select_related('student', 'subject', 'faculty__user')
         
         return Assignment.objects.none()
@@ -417,65 +410,66 @@ class CenterViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         from apps.centers.models import Center
-        from django.db.models import Count, Q
+        from apps.centers.statistics import annotate_center_counts
         
         # Only master accounts can access centers API
         if not self.request.user.is_master_account:
             return Center.objects.none()
         
-        return Center.objects.filter(
-            deleted_at__isnull=True
-        ).annotate(
-            student_count=Count('students', filter=Q(students__deleted_at__isnull=True)),
-            faculty_count=Count('faculty_members', filter=Q(faculty_members__deleted_at__isnull=True)),
-            subject_count=Count('subjects', filter=Q(subjects__deleted_at__isnull=True))
+        return annotate_center_counts(
+            Center.objects.filter(deleted_at__isnull=True)
         ).order_by('-created_at')
     
     @action(detail=True, methods=['get'])
     def statistics(self, request, pk=None):
         """Get detailed statistics for a center."""
-        center = self.get_object()
+        from apps.centers.statistics import get_center_statistics
         
-        from apps.students.models import Student
-        from apps.faculty.models import Faculty
-        from apps.subjects.models import Subject
-        from apps.attendance.models import AttendanceRecord
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        today = timezone.now().date()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-        
-        stats = {
-            'center': CenterSerializer(center).data,
-            'students': {
-                'total': Student.objects.filter(center=center, deleted_at__isnull=True).count(),
-                'active': Student.objects.filter(center=center, status='active', deleted_at__isnull=True).count(),
-                'inactive': Student.objects.filter(center=center, status='inactive', deleted_at__isnull=True).count(),
-                'completed': Student.objects.filter(center=center, status='completed', deleted_at__isnull=True).count(),
-            },
-            'faculty': {
-                'total': Faculty.objects.filter(center=center, deleted_at__isnull=True).count(),
-                'active': Faculty.objects.filter(center=center, is_active=True, deleted_at__isnull=True).count(),
-            },
-            'subjects': {
-                'total': Subject.objects.filter(center=center, deleted_at__isnull=True).count(),
-                'active': Subject.objects.filter(center=center, is_active=True, deleted_at__isnull=True).count(),
-            },
-            'attendance': {
-                'this_week': AttendanceRecord.objects.filter(
-                    student__center=center,
-                    date__gte=week_ago
-                ).count(),
-                'this_month': AttendanceRecord.objects.filter(
-                    student__center=center,
-                    date__gte=month_ago
-                ).count(),
-            }
-        }
+        center = self.get_object()
+        stats = get_center_statistics([center.pk])[center.pk]
+        return Response(_center_statistics_payload(center, stats))
+    
+    @action(detail=False, methods=['get'], url_path='statistics')
+    def batch_statistics(self, request):
+        """
+        Get statistics for several centers at once.
+        
+        Query params: centers (comma-separated ids, defaults to all centers)
+        """
+        from apps.centers.statistics import get_center_statistics
+        
+        centers = self.get_queryset()
+        ids = request.query_params.get('centers')
+        if ids:
+            try:
+                ids = [int(value) for value in ids.split(',') if value.strip()]
+            except ValueError:
+                return Response(
+                    {'error': 'centers must be a comma-separated list of ids.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            centers = centers.filter(pk__in=ids)
         
-        return Response(stats)
+        centers = list(centers)
+        statistics = get_center_statistics(center.pk for center in centers)
+        return Response({
+            'count': len(centers),
+            'results': [
+                _center_statistics_payload(center, statistics[center.pk])
+                for center in centers
+            ],
+        })
+
+
+def _center_statistics_payload(center, stats):
+    """Response body of the center statistics endpoints."""
+    return {
+        'center': CenterSerializer(center).data,
+        'students': stats['students'],
+        'faculty': stats['faculty'],
+        'subjects': stats['subjects'],
+        'attendance': stats['attendance'],
+    }
 
 
 class CenterHeadViewSet(viewsets.ModelViewSet):
@@ -514,7 +508,33 @@ class CenterHeadViewSet(viewsets.ModelViewSet):
 
 # Report API Views (T150-T153)
 
-class CenterReportAPIView(APIView):
+def _center_report_querysets(center=None):
+    """Rows read by the center-level reports, scoped to a center (or all centers)."""
+    from apps.attendance.models import AttendanceRecord
+    from apps.centers.models import Center
+    from apps.faculty.models import Faculty
+    from apps.students.models import Student
+    from apps.subjects.models import Assignment
+
+    querysets = {
+        'students': Student.objects.all(),
+        'faculty': Faculty.objects.all(),
+        'assignments': Assignment.objects.all(),
+        'attendance': AttendanceRecord.objects.all(),
+    }
+    if center:
+        querysets = {
+            'students': querysets['students'].filter(center=center),
+            'faculty': querysets['faculty'].filter(center=center),
+            'assignments': querysets['assignments'].filter(student__center=center),
+            'attendance': querysets['attendance'].filter(student__center=center),
+        }
+    else:
+        querysets['centers'] = Center.objects.all()
+    return querysets
+
+
+class CenterReportAPIView(ConditionalReportMixin, APIView):
     """
     T150: API endpoint for center report data.
     Returns comprehensive metrics, charts, and insights for a center.
@@ -530,9 +550,9 @@ class CenterReportAPIView(APIView):
         center = get_object_or_404(Center, pk=center_id, deleted_at__isnull=True)
         
         # Check permissions
-        if request.user.is_center_head:
-            if not hasattr(request.user, 'center_head_profile') or \
-               request.user.center_head_profile.center != center:
+        principal = get_principal(request)
+        if principal.is_center_head:
+            if not principal.can_access_center(center.pk):
                 return Response(
                     {'error': 'You do not have permission to view this center.'},
                     status=status.HTTP_403_FORBIDDEN
@@ -543,18 +563,29 @@ class CenterReportAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        not_modified = self.check_not_modified(
+            request, f'center:{center.pk}', _center_report_querysets(center)
+        )
+        if not_modified:
+            return not_modified
+        
         # Get center metrics
         metrics = calculate_center_metrics(center)[0]
         
         # Get insights
         insights = get_insights_summary(center)
+        insights['nearing_completion_students'] = [
+            item['student'] for item in insights['nearing_completion_students']
+        ]
+        for key in ('at_risk_students', 'extended_students', 'nearing_completion_students'):
+            insights[key] = StudentSerializer(insights[key], many=True).data
         metrics['insights'] = insights
         
         serializer = CenterReportSerializer(metrics)
         return Response(serializer.data)
 
 
-class StudentReportAPIView(APIView):
+class StudentReportAPIView(ConditionalReportMixin, APIView):
     """
     T151: API endpoint for student report data.
     Returns attendance velocity, learning velocity, and subject progress.
@@ -570,14 +601,15 @@ class StudentReportAPIView(APIView):
             prepare_subject_completion_data
         )
         from apps.attendance.models import AttendanceRecord
+        from apps.subjects.models import Assignment, Topic
         from django.shortcuts import get_object_or_404
         
         student = get_object_or_404(Student, pk=student_id, deleted_at__isnull=True)
         
         # Check permissions
-        if request.user.is_center_head:
-            if not hasattr(request.user, 'center_head_profile') or \
-               request.user.center_head_profile.center != student.center:
+        principal = get_principal(request)
+        if principal.is_center_head:
+            if not principal.can_access_center(student.center_id):
                 return Response(
                     {'error': 'You do not have permission to view this student.'},
                     status=status.HTTP_403_FORBIDDEN
@@ -588,6 +620,15 @@ class StudentReportAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        not_modified = self.check_not_modified(request, f'student:{student.pk}', {
+            'student': Student.objects.filter(pk=student.pk),
+            'assignments': Assignment.objects.filter(student=student),
+            'attendance': AttendanceRecord.objects.filter(student=student),
+            'topics': Topic.objects.filter(subject__assignments__student=student).distinct(),
+        })
+        if not_modified:
+            return not_modified
+        
         # Get days parameter (default 30)
         days = int(request.query_params.get('days', 30))
         
@@ -605,18 +646,18 @@ class StudentReportAPIView(APIView):
         
         # Prepare response data
         data = {
-            'student': StudentSerializer(student).data,
+            'student': student,
             'attendance_velocity': attendance_velocity,
             'learning_velocity': learning_velocity,
             'subject_completion': subject_completion,
-            'recent_attendance': AttendanceRecordSerializer(recent_attendance, many=True).data
+            'recent_attendance': recent_attendance
         }
         
         serializer = StudentReportSerializer(data)
         return Response(serializer.data)
 
 
-class FacultyReportAPIView(APIView):
+class FacultyReportAPIView(ConditionalReportMixin, APIView):
     """
     T152: API endpoint for faculty report data.
     Returns teaching statistics, student performance, and session metrics.
@@ -635,9 +676,9 @@ class FacultyReportAPIView(APIView):
         faculty = get_object_or_404(Faculty, pk=faculty_id, deleted_at__isnull=True)
         
         # Check permissions
-        if request.user.is_center_head:
-            if not hasattr(request.user, 'center_head_profile') or \
-               request.user.center_head_profile.center != faculty.center:
+        principal = get_principal(request)
+        if principal.is_center_head:
+            if not principal.can_access_center(faculty.center_id):
                 return Response(
                     {'error': 'You do not have permission to view this faculty.'},
                     status=status.HTTP_403_FORBIDDEN
@@ -648,6 +689,16 @@ class FacultyReportAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        not_modified = self.check_not_modified(request, f'faculty:{faculty.pk}', {
+            'faculty': Faculty.objects.filter(pk=faculty.pk),
+            'assignments': Assignment.objects.filter(faculty=faculty),
+            'attendance': AttendanceRecord.objects.filter(marked_by=faculty.user),
+            # Student names and statuses appear in top students and sessions
+            'students': Student.objects.filter(attendance_records__marked_by=faculty.user).distinct(),
+        })
+        if not_modified:
+            return not_modified
+        
         # Get teaching statistics
         records = AttendanceRecord.objects.filter(marked_by=faculty.user)
         
@@ -666,7 +717,7 @@ class FacultyReportAPIView(APIView):
         top_students = Student.objects.filter(
             id__in=records.values_list('student_id', flat=True).distinct()
         ).annotate(
-            session_count=Count('attendancerecord', filter=Q(attendancerecord__marked_by=faculty.user))
+            session_count=Count('attendance_records', filter=Q(attendance_records__marked_by=faculty.user))
         ).order_by('-session_count')[:10]
         
         # Get recent sessions
@@ -674,17 +725,17 @@ class FacultyReportAPIView(APIView):
         
         # Prepare response data
         data = {
-            'faculty': FacultySerializer(faculty).data,
+            'faculty': faculty,
             'stats': stats,
-            'top_students': StudentSerializer(top_students, many=True).data,
-            'recent_sessions': AttendanceRecordSerializer(recent_sessions, many=True).data
+            'top_students': top_students,
+            'recent_sessions': recent_sessions
         }
         
         serializer = FacultyReportSerializer(data)
         return Response(serializer.data)
 
 
-class InsightsAPIView(APIView):
+class InsightsAPIView(ConditionalReportMixin, APIView):
     """
     T153: API endpoint for insights data.
     Returns at-risk students, extended students, and students nearing completion.
@@ -704,10 +755,10 @@ class InsightsAPIView(APIView):
         
         # Determine center
         center = None
-        if request.user.is_center_head:
-            if hasattr(request.user, 'center_head_profile'):
-                center = request.user.center_head_profile.center
-        elif request.user.is_master_account:
+        principal = get_principal(request)
+        if principal.is_center_head:
+            center = principal.center
+        elif principal.is_master:
             if center_id:
                 center = get_object_or_404(Center, pk=center_id, deleted_at__isnull=True)
         else:
@@ -716,6 +767,12 @@ class InsightsAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        not_modified = self.check_not_modified(
+            request, f'center:{center.pk if center else None}', _center_report_querysets(center)
+        )
+        if not_modified:
+            return not_modified
+        
         # Get query parameters
         days_threshold = int(request.query_params.get('days_threshold', 7))
         months_threshold = int(request.query_params.get('months_threshold', 6))
@@ -732,9 +789,9 @@ class InsightsAPIView(APIView):
             'at_risk_count': insights['at_risk_count'],
             'extended_count': insights['extended_count'],
             'nearing_completion_count': insights['nearing_completion_count'],
-            'at_risk_students': StudentSerializer(at_risk, many=True).data,
-            'extended_students': StudentSerializer(extended, many=True).data,
-            'nearing_completion': StudentSerializer(nearing_completion, many=True).data
+            'at_risk_students': at_risk,
+            'extended_students': extended,
+            'nearing_completion': [item['student'] for item in nearing_completion]
         }
         
         serializer = InsightsSerializer(data)
@@ -771,7 +828,7 @@ class SurveyViewSet(viewsets.ModelViewSet):
         if user.is_master_account:
             queryset = FeedbackSurvey.objects.filter(deleted_at__isnull=True)
         elif user.is_center_head:
-            center = user.center_head_profile.center
+            center = get_principal(self.request).center
             queryset = FeedbackSurvey.objects.filter(
                 Q(center__isnull=True) | Q(center=center),
                 deleted_at__isnull=True
@@ -814,7 +871,7 @@ class SurveyViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Create survey with center association."""
         if self.request.user.is_center_head:
-            serializer.save(center=self.request.user.center_head_profile.center)
+            serializer.save(center=get_principal(self.request).center)
         else:
             serializer.save()
     
@@ -852,7 +909,7 @@ class SurveyViewSet(viewsets.ModelViewSet):
         
         # Get center
         if request.user.is_center_head:
-            center = request.user.center_head_profile.center
+            center = get_principal(request).center
         else:
             center = survey.center
         
@@ -880,6 +937,48 @@ class SurveyViewSet(viewsets.ModelViewSet):
             'students': serializer.data,
             'existing_response_ids': list(existing_ids)
         })
+    
+    @action(detail=True, methods=['get'])
+    def questions(self, request, pk=None):
+        """
+        Question-level analytics for a survey.
+        
+        Without parameters returns a summary per question. With
+        ?question=<id> also returns that question's answer distribution
+        and, with &by=center|faculty|subject, a cross-tab.
+        """
+        from apps.feedback.question_analytics import (
+            CROSSTAB_DIMENSIONS,
+            get_question_crosstab,
+            get_question_distribution,
+            get_question_summary,
+        )
+        
+        survey = self.get_object()
+        center = get_principal(request).center if request.user.is_center_head else None
+        
+        question_key = request.query_params.get('question')
+        if not question_key:
+            return Response({
+                'survey_id': survey.id,
+                'questions': get_question_summary(survey, center=center)
+            })
+        
+        data = {
+            'survey_id': survey.id,
+            'question': question_key,
+            'distribution': get_question_distribution(survey, question_key, center=center)
+        }
+        by = request.query_params.get('by')
+        if by:
+            if by not in CROSSTAB_DIMENSIONS:
+                return Response(
+                    {'error': f"by must be one of: {', '.join(CROSSTAB_DIMENSIONS)}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            data['by'] = by
+            data['crosstab'] = get_question_crosstab(survey, question_key, by=by, center=center)
+        return Response(data)
 
 
 class SendSurveyAPIView(APIView):
@@ -964,48 +1063,64 @@ class SubmitSurveyAPIView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request, token):
-        """Get survey details by token."""
-        from apps.feedback.models import FeedbackResponse
-        from django.shortcuts import get_object_or_404
-        from .serializers import SurveySerializer
-        
-        # Get response by token
-        response = get_object_or_404(
-            FeedbackResponse,
-            token=token,
-            deleted_at__isnull=True
+        """
+        Get survey details by token.
+        
+        Signed tokens are verified without a query; the survey and link
+        state come from the feedback link cache.
+        """
+        from django.http import Http404
+        from apps.feedback.links import (
+            SURVEY_LINK, InvalidLink, get_link_state, get_survey_definition,
+            is_link_expired, is_survey_definition_valid, record_link_opened, resolve_link,
         )
         
+        try:
+            link = resolve_link(token, SURVEY_LINK)
+        except InvalidLink:
+            link = None
+        if link is None:
+            raise Http404
+        
+        if is_link_expired(link):
+            return Response({
+                'status': 'expired',
+                'message': 'This survey link has expired.',
+                'valid_until': link.expires
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        state = get_link_state(SURVEY_LINK, link.object_id, token)
+        if not state['exists'] or link.parent_id not in (None, state['survey_id']):
+            raise Http404
+        survey = get_survey_definition(state['survey_id'])
+        
         # Check if already completed
-        if response.is_completed:
+        if state['is_completed']:
             return Response({
                 'status': 'completed',
                 'message': 'This survey has already been completed.',
-                'submitted_at': response.submitted_at
+                'submitted_at': state['submitted_at']
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Check if survey is valid
-        if not response.survey.is_valid():
+        if not is_survey_definition_valid(survey):
             return Response({
                 'status': 'expired',
                 'message': 'This survey has expired.',
-                'valid_until': response.survey.valid_until
+                'valid_until': survey['valid_until']
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Track email opened
-        if not response.email_opened_at:
-            from django.utils import timezone
-            response.email_opened_at = timezone.now()
-            response.save(update_fields=['email_opened_at'])
+        record_link_opened(SURVEY_LINK, state)
         
         # Return survey and response data
         return Response({
-            'survey': SurveySerializer(response.survey).data,
-            'response_id': response.id,
-            'student_name': response.student.get_full_name(),
-            'student_email': response.student.email,
-            'is_completed': response.is_completed,
-            'email_sent_at': response.email_sent_at
+            'survey': dict(survey, is_valid=True),
+            'response_id': state['id'],
+            'student_name': state['student_name'],
+            'student_email': state['student_email'],
+            'is_completed': state['is_completed'],
+            'email_sent_at': state['email_sent_at']
         })
     
     def post(self, request, token):
@@ -1020,11 +1135,13 @@ class SubmitSurveyAPIView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         # Get response by token
-        response = get_object_or_404(
-            FeedbackResponse,
-            token=token,
-            deleted_at__isnull=True
-        )
+        from django.http import Http404
+        from apps.feedback.links import SURVEY_LINK, InvalidLink, lookup_kwargs
+        try:
+            lookup = lookup_kwargs(token, SURVEY_LINK)
+        except InvalidLink:
+            raise Http404
+        response = get_object_or_404(FeedbackResponse, **lookup)
         
         # Validate survey is still valid
         if not response.survey.is_valid():
@@ -1089,7 +1206,7 @@ class SurveyResponsesAPIView(APIView):
         
         # Get survey
         if request.user.is_center_head:
-            center = request.user.center_head_profile.center
+            center = get_principal(request).center
             survey = get_object_or_404(
                 FeedbackSurvey,
                 pk=pk,
@@ -1151,7 +1268,7 @@ class SurveyResponsesAPIView(APIView):
         })
 
 
-class SatisfactionTrendsAPIView(APIView):
+class SatisfactionTrendsAPIView(ConditionalReportMixin, APIView):
     """
     Get satisfaction trends over time.
     
@@ -1159,7 +1276,9 @@ class SatisfactionTrendsAPIView(APIView):
     
     Query parameters:
     - center_id: Filter by center (optional for master)
-    - months: Number of months (default: 6)
+    - months: Number of calendar months up to the current one (default: 6)
+    - start, end: Explicit month range as YYYY-MM (overrides months)
+    - by_center: Include a series per center (master accounts)
     
     Permissions: Center Head, Master Account
     """
@@ -1180,27 +1299,70 @@ class SatisfactionTrendsAPIView(APIView):
         # Get center
         center_id = request.query_params.get('center_id')
         if request.user.is_center_head:
-            center = request.user.center_head_profile.center
+            center = get_principal(request).center
         elif center_id:
             from apps.centers.models import Center
             center = Center.objects.get(id=center_id)
         else:
             center = None
         
-        # Get months parameter
+        from apps.feedback.models import FeedbackResponse
+        responses = FeedbackResponse.objects.all()
+        if center:
+            responses = responses.filter(student__center=center)
+        not_modified = self.check_not_modified(
+            request, f'center:{center.pk if center else None}', {'responses': responses}
+        )
+        if not_modified:
+            return not_modified
+        
+        # Get month range parameters
         months = int(request.query_params.get('months', 6))
+        try:
+            start_month = self.parse_month(request.query_params.get('start'))
+            end_month = self.parse_month(request.query_params.get('end'))
+        except ValueError:
+            return Response(
+                {'error': 'start and end must be months in YYYY-MM format.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start_month and end_month and start_month > end_month:
+            return Response(
+                {'error': 'start must not be after end.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        by_center = request.query_params.get('by_center') in ('1', 'true') and center is None
         
         # Calculate trends
-        trends_data = calculate_satisfaction_trends(center, months)
+        trends_data = calculate_satisfaction_trends(
+            center, months,
+            start_month=start_month,
+            end_month=end_month,
+            by_center=by_center
+        )
         
-        return Response({
+        data = {
             'center_id': center.id if center else None,
             'center_name': center.name if center else 'All Centers',
-            'months': months,
+            'months': len(trends_data['monthly_trends']),
             'overall_avg': round(trends_data['overall_avg'], 2) if trends_data['overall_avg'] else None,
             'total_responses': trends_data['total_responses'],
             'monthly_trends': trends_data['monthly_trends']
-        })
+        }
+        if by_center:
+            data['centers'] = [
+                {**center_data, 'overall_avg': round(center_data['overall_avg'], 2) if center_data['overall_avg'] else None}
+                for center_data in trends_data['centers']
+            ]
+        return Response(data)
+    
+    @staticmethod
+    def parse_month(value):
+        """Parse a YYYY-MM query parameter into the first day of the month."""
+        if not value:
+            return None
+        from datetime import datetime
+        return datetime.strptime(value, '%Y-%m').date()
 
 
 class FacultyBreakdownAPIView(APIView):
@@ -1230,7 +1392,7 @@ class FacultyBreakdownAPIView(APIView):
         
         # Get center
         if request.user.is_center_head:
-            center = request.user.center_head_profile.center
+            center = get_principal(request).center
         else:
             center_id = request.query_params.get('center_id')
             if not center_id:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AttendanceRecord
+from .models import AssignmentProgress, AttendanceRecord, ExpectedSession, ScheduleTemplate, Session
 
 
 @admin.register(AttendanceRecord)
@@ -9,11 +9,12 @@ class AttendanceRecordAdmin(admin.ModelAdmin):
     search_fields = ['student__first_name', 'student__last_name', 'assignment__subject__name']
     filter_horizontal = ['topics_covered']
     readonly_fields = ['created_at', 'created_by', 'modified_at', 'modified_by', 'duration_minutes']
+    raw_id_fields = ['session']
     date_hierarchy = 'date'
     
     fieldsets = (
         ('Attendance Details', {
-            'fields': ('student', 'assignment', 'date', 'marked_by')
+            'fields': ('student', 'assignment', 'session', 'date', 'marked_by')
         }),
         ('Time', {
             'fields': ('in_time', 'out_time', 'duration_minutes')
@@ -33,3 +34,59 @@ class AttendanceRecordAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         # Attendance records should not be deleted (event-sourced)
         return False
+
+
+@admin.register(Session)
+class SessionAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'faculty', 'date', 'in_time', 'out_time', 'duration_minutes', 'is_backdated']
+    list_filter = ['date', 'is_backdated', 'subject']
+    search_fields = ['subject__name', 'faculty__user__first_name', 'faculty__user__last_name']
+    filter_horizontal = ['topics_covered']
+    readonly_fields = ['created_at', 'created_by', 'modified_at', 'modified_by', 'duration_minutes']
+    date_hierarchy = 'date'
+    
+    def has_delete_permission(self, request, obj=None):
+        # Sessions carry attendance records, which are never deleted
+        return False
+
+
+@admin.register(ScheduleTemplate)
+class ScheduleTemplateAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'assignment', 'in_time', 'out_time', 'valid_from', 'valid_until', 'is_active']
+    list_filter = ['is_active']
+    search_fields = ['assignment__student__first_name', 'assignment__student__last_name', 'assignment__subject__name']
+    raw_id_fields = ['assignment']
+    readonly_fields = ['created_at', 'created_by', 'modified_at', 'modified_by']
+    
+    def save_model(self, request, obj, form, change):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .scheduling import materialize_expected_sessions
+        
+        if not obj.pk:
+            obj.created_by = request.user
+        obj.modified_by = request.user
+        super().save_model(request, obj, form, change)
+        
+        # Replace the upcoming slots so they follow the edited schedule
+        today = timezone.now().date()
+        materialize_expected_sessions(
+            ScheduleTemplate.objects.filter(pk=obj.pk), today, today + timedelta(days=28), replace=True
+        )
+
+
+@admin.register(ExpectedSession)
+class ExpectedSessionAdmin(admin.ModelAdmin):
+    list_display = ['student', 'assignment', 'date', 'in_time', 'out_time']
+    list_filter = ['date']
+    search_fields = ['student__first_name', 'student__last_name']
+    raw_id_fields = ['schedule', 'assignment', 'student']
+    date_hierarchy = 'date'
+
+
+@admin.register(AssignmentProgress)
+class AssignmentProgressAdmin(admin.ModelAdmin):
+    list_display = ['assignment', 'student', 'covered_topics', 'total_topics', 'percent_complete',
+                    'session_count', 'last_session_date', 'updated_at']
+    search_fields = ['student__first_name', 'student__last_name', 'student__enrollment_number']
+    readonly_fields = [field.name for field in AssignmentProgress._meta.fields]
@@ -5,3 +5,9 @@ class AttendanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.attendance'
     verbose_name = 'Attendance'
+
+    def ready(self):
+        from .projections import connect_projectors
+        from .signals import connect_signals
+        connect_signals()
+        connect_projectors()
@@ -0,0 +1,101 @@
+"""
+PostgreSQL exclusion constraints backing apps/attendance/overlaps.py.
+
+attendance_records gets one constraint on (student, time range). A faculty
+member's sessions may share a window (the same class) but may not overlap
+otherwise: one constraint on attendance_sessions rejects overlaps with a
+different start, the other overlaps with a different end.
+
+Records have no faculty column (the faculty is on their assignment), so
+faculty double-booking between individually marked records is not a
+database constraint; it is only enforced by the checks in overlaps.py.
+
+Adding a constraint fails while stored rows violate it, so migration
+0005_attendance_overlaps only adds them when find_violations() reports
+none. Otherwise fix the rows listed by `manage.py find_attendance_overlaps`
+and add the constraints with `manage.py find_attendance_overlaps
+--add-constraints`.
+
+Only raw SQL is used here, so migrations can import this module.
+"""
+
+SLOT = "tsrange(date + in_time, date + out_time, '[)')"
+
+CONSTRAINTS = [
+    ('attendance_records', 'attendance_student_no_overlap', f'student_id WITH =, {SLOT} WITH &&'),
+    ('attendance_sessions', 'attendance_faculty_no_overlap_start',
+     f'faculty_id WITH =, {SLOT} WITH &&, (date + in_time) WITH <>'),
+    ('attendance_sessions', 'attendance_faculty_no_overlap_end',
+     f'faculty_id WITH =, {SLOT} WITH &&, (date + out_time) WITH <>'),
+]
+
+_OVERLAP = 'b.date = a.date AND a.in_time < b.out_time AND b.in_time < a.out_time'
+
+# Rows blocking the constraints; overlapping pairs are counted once
+VIOLATION_QUERIES = {
+    'student overlaps': f"""
+        SELECT COUNT(*) FROM attendance_records a
+        JOIN attendance_records b ON b.student_id = a.student_id AND b.id > a.id AND {_OVERLAP}
+    """,
+    'faculty session overlaps': f"""
+        SELECT COUNT(*) FROM attendance_sessions a
+        JOIN attendance_sessions b ON b.faculty_id = a.faculty_id AND b.id > a.id AND {_OVERLAP}
+        WHERE a.in_time <> b.in_time OR a.out_time <> b.out_time
+    """,
+    # tsrange() rejects a lower bound above the upper bound
+    'records ending before they start': 'SELECT COUNT(*) FROM attendance_records WHERE out_time < in_time',
+    'sessions ending before they start': 'SELECT COUNT(*) FROM attendance_sessions WHERE out_time < in_time',
+}
+
+
+def find_violations(connection):
+    """
+    Count the stored rows that would make adding the constraints fail.
+
+    Args:
+        connection: PostgreSQL database connection
+
+    Returns:
+        dict: Violation kind -> count, only kinds with violations
+    """
+    violations = {}
+    with connection.cursor() as cursor:
+        for kind, sql in VIOLATION_QUERIES.items():
+            cursor.execute(sql)
+            count = cursor.fetchone()[0]
+            if count:
+                violations[kind] = count
+    return violations
+
+
+def add_constraints(connection):
+    """
+    Add the constraints that do not exist yet.
+
+    Args:
+        connection: PostgreSQL database connection
+
+    Returns:
+        list: Names of the constraints added
+    """
+    added = []
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        cursor.execute(
+            'SELECT conname FROM pg_constraint WHERE conname = ANY(%s)',
+            [[name for table, name, expressions in CONSTRAINTS]]
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        for table, name, expressions in CONSTRAINTS:
+            if name in existing:
+                continue
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} EXCLUDE USING gist ({expressions})')
+            added.append(name)
+    return added
+
+
+def remove_constraints(connection):
+    """Drop the constraints if they exist."""
+    with connection.cursor() as cursor:
+        for table, name, expressions in CONSTRAINTS:
+            cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}')
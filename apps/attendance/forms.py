@@ -90,7 +90,7 @@ class AttendanceForm(forms.ModelForm):
                 faculty=faculty,
                 is_active=True,
                 deleted_at__isnull=True
-            ).select_related('student', 'subject')
+            ).select_related('student', 'subject', 'faculty__user')
         else:
             # Fallback to empty
             self.fields['assignment'].queryset = Assignment.objects.none()
@@ -111,27 +111,26 @@ class AttendanceForm(forms.ModelForm):
             self.fields['backdated_reason'].help_text = 'Required: Reason for backdating this attendance'
             
         elif faculty:
-            # REGULAR MODE: Filter students assigned to faculty and exclude today's attendance
+            # REGULAR MODE: Students assigned to faculty without today's attendance,
+            # from the cached roster
             from apps.students.models import Student
-            today = timezone.now().date()
-            
-            # Get students who already have attendance today
-            students_with_attendance_today = AttendanceRecord.objects.filter(
-                marked_by=faculty.user,
-                date=today
-            ).values_list('student_id', flat=True).distinct()
-            
-            student_ids = faculty.assignments.filter(
-                is_active=True
-            ).values_list('student_id', flat=True).distinct()
+            from .roster import get_today_roster, get_unmarked_students
             
+            roster = get_today_roster(faculty.pk)
             self.fields['student'].queryset = Student.objects.filter(
-                id__in=student_ids,
-                deleted_at__isnull=True
-            ).exclude(
-                id__in=students_with_attendance_today
+                id__in=[student['id'] for student in get_unmarked_students(roster)]
             ).order_by('first_name', 'last_name')
             
+            # Only topics of the faculty's subjects (the AJAX narrows them further)
+            self.fields['topics_covered'].queryset = Topic.objects.filter(
+                subject_id__in={
+                    assignment['subject_id']
+                    for student_assignments in roster['assignments'].values()
+                    for assignment in student_assignments
+                },
+                deleted_at__isnull=True
+            ).select_related('subject')
+            
             # Update help text to inform about filtering
             self.fields['student'].help_text = 'Students who already have attendance today are hidden'
         
@@ -210,6 +209,17 @@ class AttendanceForm(forms.ModelForm):
             if not backdated_reason:
                 raise forms.ValidationError('Backdated reason is required for past dates.')
         
+        # Reject double-booking of the student or the faculty member
+        student = cleaned_data.get('student')
+        assignment = cleaned_data.get('assignment')
+        if date and student and assignment and in_time_str and out_time_str:
+            from .overlaps import check_attendance_overlaps
+            check_attendance_overlaps(
+                student, assignment, date,
+                cleaned_data['in_time'], cleaned_data['out_time'],
+                exclude_pk=self.instance.pk
+            )
+        
         return cleaned_data
     
     def save(self, commit=True):
@@ -249,3 +259,104 @@ class AttendanceForm(forms.ModelForm):
             # else: Let the view handle saving after setting created_by
         
         return instance
+
+
+class SessionForm(forms.Form):
+    """
+    Roster form for marking a whole class at once.
+    
+    The subject picks the roster: the faculty's active assignments in that
+    subject. Topics are stored once on the session.
+    """
+    
+    subject = forms.ModelChoiceField(
+        queryset=None,
+        widget=forms.Select(attrs={'class': 'select select-bordered w-full', 'id': 'id_subject'})
+    )
+    date = forms.DateField(
+        widget=forms.DateInput(attrs={'class': 'input input-bordered w-full', 'type': 'date'})
+    )
+    in_time = forms.ChoiceField(
+        choices=generate_time_choices(),
+        widget=forms.Select(attrs={'class': 'select select-bordered w-full'}),
+        help_text='Select session start time'
+    )
+    out_time = forms.ChoiceField(
+        choices=generate_time_choices(),
+        widget=forms.Select(attrs={'class': 'select select-bordered w-full'}),
+        help_text='Select session end time'
+    )
+    topics_covered = forms.ModelMultipleChoiceField(
+        queryset=Topic.objects.none(),
+        required=False,
+        widget=forms.SelectMultiple(attrs={'class': 'select select-bordered w-full', 'size': '5'})
+    )
+    assignments = forms.ModelMultipleChoiceField(
+        queryset=Assignment.objects.none(),
+        widget=forms.CheckboxSelectMultiple,
+        error_messages={'required': 'Select at least one student.'}
+    )
+    notes = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={'class': 'textarea textarea-bordered w-full', 'rows': 3, 'maxlength': '500'})
+    )
+    backdated_reason = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={'class': 'textarea textarea-bordered w-full', 'rows': 2})
+    )
+    
+    def __init__(self, *args, **kwargs):
+        self.faculty = kwargs.pop('faculty')
+        super().__init__(*args, **kwargs)
+        
+        faculty_assignments = Assignment.objects.filter(
+            faculty=self.faculty,
+            is_active=True,
+            deleted_at__isnull=True,
+            student__deleted_at__isnull=True
+        )
+        from apps.subjects.models import Subject
+        self.fields['subject'].queryset = Subject.objects.filter(
+            id__in=faculty_assignments.values('subject_id'),
+            deleted_at__isnull=True
+        ).order_by('name')
+        
+        subject_id = self.data.get('subject') or self.initial.get('subject')
+        if subject_id:
+            try:
+                subject_id = int(getattr(subject_id, 'pk', subject_id))
+            except (TypeError, ValueError):
+                subject_id = None
+        if subject_id:
+            self.fields['topics_covered'].queryset = Topic.objects.filter(
+                subject_id=subject_id,
+                deleted_at__isnull=True
+            ).order_by('sequence_number', 'name')
+            self.fields['assignments'].queryset = faculty_assignments.filter(
+                subject_id=subject_id
+            ).select_related('student').order_by('student__first_name', 'student__last_name')
+        
+        if not self.is_bound:
+            self.fields['date'].initial = timezone.now().date()
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        date = cleaned_data.get('date')
+        in_time_str = cleaned_data.get('in_time')
+        out_time_str = cleaned_data.get('out_time')
+        
+        if in_time_str and out_time_str:
+            from datetime import datetime
+            in_time = datetime.strptime(in_time_str, '%H:%M').time()
+            out_time = datetime.strptime(out_time_str, '%H:%M').time()
+            
+            if out_time <= in_time:
+                raise forms.ValidationError('Out time must be after in time.')
+            
+            cleaned_data['in_time'] = in_time
+            cleaned_data['out_time'] = out_time
+        
+        if date and date < timezone.now().date() and not cleaned_data.get('backdated_reason'):
+            raise forms.ValidationError('Backdated reason is required for past dates.')
+        
+        return cleaned_data
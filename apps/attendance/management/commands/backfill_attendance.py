@@ -0,0 +1,55 @@
+"""
+Management command to backfill attendance from expected sessions.
+"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.attendance.models import ExpectedSession
+from apps.attendance.scheduling import backfill_attendance
+
+
+class Command(BaseCommand):
+    help = 'Mark the expected sessions of a date range as attended (bulk insert)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', required=True, help='First date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='end', help='Last date (YYYY-MM-DD, default yesterday)')
+        parser.add_argument('--center', type=int, help='Only students of this center (ID)')
+        parser.add_argument('--student', type=int, help='Only this student (ID)')
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='Email of the user recorded as creator of the attendance',
+        )
+        parser.add_argument(
+            '--reason',
+            default='Backfilled from schedule',
+            help='Backdated reason stored on the sessions',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start'])
+            end = date.fromisoformat(options['end']) if options['end'] else timezone.now().date() - timedelta(days=1)
+        except ValueError as exc:
+            raise CommandError(f'Invalid date: {exc}')
+
+        user = User.objects.filter(email=options['user']).first()
+        if user is None:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        slots = ExpectedSession.objects.filter(date__range=(start, end))
+        if options['center']:
+            slots = slots.filter(student__center_id=options['center'])
+        if options['student']:
+            slots = slots.filter(student_id=options['student'])
+
+        result = backfill_attendance(slots, user, options['reason'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['records']} attendance records in {result['sessions']} sessions "
+            f"({result['skipped']} slots already marked, {result['conflicts']} overlapping other attendance)"
+        ))
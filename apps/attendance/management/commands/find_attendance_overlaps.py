@@ -0,0 +1,101 @@
+"""
+Management command to list overlapping attendance of students and faculty.
+
+Migration 0005_attendance_overlaps skips the PostgreSQL exclusion
+constraints while overlaps are stored. Fix the listed records, then run
+this command with --add-constraints to add them.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.attendance.constraints import add_constraints, find_violations
+from apps.attendance.models import AttendanceRecord
+from apps.attendance.overlaps import find_faculty_overlaps, find_student_overlaps
+
+
+class Command(BaseCommand):
+    help = 'List attendance records that double-book a student or a faculty member'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from',
+            dest='start',
+            help='First date (YYYY-MM-DD, default all history)',
+        )
+        parser.add_argument(
+            '--to',
+            dest='end',
+            help='Last date (YYYY-MM-DD, default all history)',
+        )
+        parser.add_argument(
+            '--center',
+            type=int,
+            help='Only records of this center (ID)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=50,
+            help='Overlaps listed per kind (default 50, 0 for all)',
+        )
+        parser.add_argument(
+            '--add-constraints',
+            action='store_true',
+            help='Add the PostgreSQL overlap constraints if no stored rows violate them',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+            end = date.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as exc:
+            raise CommandError(f'Invalid date: {exc}')
+
+        records = AttendanceRecord.objects.all()
+        if start:
+            records = records.filter(date__gte=start)
+        if end:
+            records = records.filter(date__lte=end)
+        if options['center']:
+            records = records.filter(student__center_id=options['center'])
+
+        found = 0
+        for label, pairs in (
+            ('Student', find_student_overlaps(records)),
+            ('Faculty', find_faculty_overlaps(records)),
+        ):
+            count = 0
+            for owner, day, first, second in pairs:
+                count += 1
+                if not options['limit'] or count <= options['limit']:
+                    self.stdout.write(f'{label} {owner} on {day}: records {first} and {second}')
+            self.stdout.write(f'{label} overlaps: {count}')
+            found += count
+
+        if found:
+            self.stdout.write(self.style.WARNING(
+                f'Found {found} overlapping record pairs; fix them before applying the overlap constraints'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('No overlapping attendance found'))
+
+        if options['add_constraints']:
+            self.add_constraints()
+
+    def add_constraints(self):
+        if connection.vendor != 'postgresql':
+            self.stdout.write('The overlap constraints are only used on PostgreSQL')
+            return
+        # Checked over all rows, whatever the filters above
+        violations = find_violations(connection)
+        if violations:
+            details = ', '.join(f'{count} {kind}' for kind, count in violations.items())
+            raise CommandError(f'Constraints not added, stored rows violate them: {details}')
+        added = add_constraints(connection)
+        if added:
+            self.stdout.write(self.style.SUCCESS(f"Added constraints: {', '.join(added)}"))
+        else:
+            self.stdout.write('The overlap constraints already exist')
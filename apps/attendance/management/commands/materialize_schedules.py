@@ -0,0 +1,55 @@
+"""
+Management command to materialize expected sessions from schedule templates.
+"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.attendance.models import ScheduleTemplate
+from apps.attendance.scheduling import materialize_expected_sessions
+
+
+class Command(BaseCommand):
+    help = 'Create the expected sessions of schedule templates over a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from',
+            dest='start',
+            help='First date (YYYY-MM-DD, default today)',
+        )
+        parser.add_argument(
+            '--to',
+            dest='end',
+            help='Last date (YYYY-MM-DD, default 28 days after the first date)',
+        )
+        parser.add_argument(
+            '--center',
+            type=int,
+            help='Only schedules of this center (ID)',
+        )
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Recreate existing slots in the range (after schedules changed)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else timezone.now().date()
+            end = date.fromisoformat(options['end']) if options['end'] else start + timedelta(days=28)
+        except ValueError as exc:
+            raise CommandError(f'Invalid date: {exc}')
+        if end < start:
+            raise CommandError('--to must not be before --from')
+
+        schedules = ScheduleTemplate.objects.all()
+        if options['center']:
+            schedules = schedules.filter(assignment__student__center_id=options['center'])
+
+        created = materialize_expected_sessions(schedules, start, end, replace=options['replace'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {created} expected sessions from {start} to {end}'
+        ))
@@ -0,0 +1,35 @@
+"""
+Management command to rebuild the per-assignment syllabus progress rows.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.attendance.progress import rebuild_assignment_progress
+from apps.centers.models import Center
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-assignment syllabus progress from the attendance and topic rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--center',
+            type=int,
+            help='Only rebuild progress of this center (ID)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Assignments per batch (default 500)',
+        )
+
+    def handle(self, *args, **options):
+        center = None
+        if options['center']:
+            center = Center.objects.filter(pk=options['center']).first()
+            if center is None:
+                raise CommandError(f"Center {options['center']} does not exist")
+
+        written = rebuild_assignment_progress(center, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt progress of {written} assignments'))
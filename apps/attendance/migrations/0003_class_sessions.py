@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_initial'),
+        ('faculty', '0002_initial'),
+        ('subjects', '0002_remove_center_from_subject'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Session',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(db_index=True)),
+                ('in_time', models.TimeField()),
+                ('out_time', models.TimeField()),
+                ('duration_minutes', models.IntegerField(help_text='Session duration in minutes')),
+                ('notes', models.TextField(blank=True, help_text='Notes about what was covered')),
+                ('is_backdated', models.BooleanField(default=False)),
+                ('backdated_reason', models.TextField(blank=True)),
+                ('created_by', models.ForeignKey(help_text='User who created this record', on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='sessions', to='faculty.faculty')),
+                ('marked_by', models.ForeignKey(limit_choices_to={'role': 'faculty'}, on_delete=django.db.models.deletion.PROTECT, related_name='marked_sessions', to=settings.AUTH_USER_MODEL)),
+                ('modified_by', models.ForeignKey(help_text='User who last modified this record', on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='sessions', to='subjects.subject')),
+                ('topics_covered', models.ManyToManyField(blank=True, related_name='sessions', to='subjects.topic')),
+            ],
+            options={
+                'verbose_name': 'Session',
+                'verbose_name_plural': 'Sessions',
+                'db_table': 'attendance_sessions',
+                'ordering': ['-date', '-in_time'],
+            },
+        ),
+        migrations.AddField(
+            model_name='attendancerecord',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='records', to='attendance.session'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['faculty', 'date'], name='attendance__faculty_fb932f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['subject', 'date'], name='attendance__subject_eb5921_idx'),
+        ),
+    ]
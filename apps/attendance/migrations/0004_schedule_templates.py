@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_class_sessions'),
+        ('students', '0001_initial'),
+        ('subjects', '0002_remove_center_from_subject'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('weekdays', models.JSONField(default=list, help_text='Weekday numbers of the class, Monday=0 ... Sunday=6')),
+                ('in_time', models.TimeField()),
+                ('out_time', models.TimeField()),
+                ('valid_from', models.DateField()),
+                ('valid_until', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='subjects.assignment')),
+                ('created_by', models.ForeignKey(help_text='User who created this record', on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL)),
+                ('deleted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_deleted', to=settings.AUTH_USER_MODEL)),
+                ('modified_by', models.ForeignKey(help_text='User who last modified this record', on_delete=django.db.models.deletion.PROTECT, related_name='%(class)s_modified', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Schedule Template',
+                'verbose_name_plural': 'Schedule Templates',
+                'db_table': 'schedule_templates',
+                'ordering': ['assignment', 'in_time'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExpectedSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('in_time', models.TimeField()),
+                ('out_time', models.TimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expected_sessions', to='subjects.assignment')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expected_sessions', to='students.student')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expected_sessions', to='attendance.scheduletemplate')),
+            ],
+            options={
+                'verbose_name': 'Expected Session',
+                'verbose_name_plural': 'Expected Sessions',
+                'db_table': 'expected_sessions',
+                'ordering': ['date', 'in_time'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='scheduletemplate',
+            index=models.Index(fields=['assignment', 'is_active'], name='schedule_te_assignm_2a6591_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expectedsession',
+            index=models.Index(fields=['student', 'date'], name='expected_se_student_7362cc_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='expectedsession',
+            unique_together={('assignment', 'date', 'in_time')},
+        ),
+    ]
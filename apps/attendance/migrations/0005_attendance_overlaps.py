@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:27
+
+import warnings
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.attendance.constraints import add_constraints, find_violations, remove_constraints
+
+
+def add_overlap_constraints(apps, schema_editor):
+    """
+    Add the exclusion constraints of apps/attendance/constraints.py on
+    PostgreSQL, unless stored rows violate them; those are reported and the
+    constraints are added with `find_attendance_overlaps --add-constraints`
+    once the rows are fixed.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    violations = find_violations(connection)
+    if violations:
+        details = ', '.join(f'{count} {kind}' for kind, count in violations.items())
+        warnings.warn(
+            f'Attendance overlap constraints not added: {details}. '
+            'List them with `manage.py find_attendance_overlaps`, fix them, then run '
+            '`manage.py find_attendance_overlaps --add-constraints`.',
+            RuntimeWarning
+        )
+        return
+    add_constraints(connection)
+
+
+def remove_overlap_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    remove_constraints(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_schedule_templates'),
+        ('students', '0001_initial'),
+        ('subjects', '0002_remove_center_from_subject'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attendancerecord',
+            name='attendance__student_6a013f_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['student', 'date', 'in_time', 'out_time'], name='attendance__student_285e57_idx'),
+        ),
+        migrations.RunPython(add_overlap_constraints, remove_overlap_constraints),
+    ]
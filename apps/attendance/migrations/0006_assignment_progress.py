@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_attendance_overlaps'),
+        ('students', '0001_initial'),
+        ('subjects', '0002_remove_center_from_subject'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('covered_topics', models.PositiveIntegerField(default=0)),
+                ('total_topics', models.PositiveIntegerField(default=0)),
+                ('percent_complete', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('session_count', models.PositiveIntegerField(default=0)),
+                ('last_session_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assignment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='subjects.assignment')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignment_progress', to='students.student')),
+            ],
+            options={
+                'verbose_name': 'Assignment Progress',
+                'verbose_name_plural': 'Assignment Progress',
+                'db_table': 'assignment_progress',
+                'indexes': [models.Index(fields=['percent_complete'], name='assignment_progress_pct_idx')],
+            },
+        ),
+    ]
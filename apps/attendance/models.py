@@ -5,10 +5,86 @@ Implements event-sourced attendance tracking with immutable records.
 
 from django.db import models
 from django.utils import timezone
-from apps.core.models import TimeStampedModel
+from apps.core.models import OutboxEventMixin, TimeStampedModel, SoftDeleteModel
 
 
-class AttendanceRecord(TimeStampedModel):
+class Session(TimeStampedModel):
+    """
+    A class taught by one faculty member: subject, time window and topics.
+    
+    Students who attended are recorded as AttendanceRecord rows pointing at
+    the session, so topics are stored once per class instead of once per
+    student.
+    """
+    
+    faculty = models.ForeignKey(
+        'faculty.Faculty',
+        on_delete=models.PROTECT,
+        related_name='sessions'
+    )
+    subject = models.ForeignKey(
+        'subjects.Subject',
+        on_delete=models.PROTECT,
+        related_name='sessions'
+    )
+    
+    # When
+    date = models.DateField(db_index=True)
+    in_time = models.TimeField()
+    out_time = models.TimeField()
+    duration_minutes = models.IntegerField(
+        help_text="Session duration in minutes"
+    )
+    
+    # What was taught
+    topics_covered = models.ManyToManyField(
+        'subjects.Topic',
+        related_name='sessions',
+        blank=True
+    )
+    notes = models.TextField(
+        blank=True,
+        help_text="Notes about what was covered"
+    )
+    
+    # Backdating tracking
+    is_backdated = models.BooleanField(default=False)
+    backdated_reason = models.TextField(blank=True)
+    
+    marked_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.PROTECT,
+        related_name='marked_sessions',
+        limit_choices_to={'role': 'faculty'}
+    )
+    
+    class Meta:
+        db_table = 'attendance_sessions'
+        verbose_name = 'Session'
+        verbose_name_plural = 'Sessions'
+        ordering = ['-date', '-in_time']
+        indexes = [
+            models.Index(fields=['faculty', 'date']),
+            models.Index(fields=['subject', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} - {self.date} {self.in_time:%H:%M}-{self.out_time:%H:%M}"
+    
+    def save(self, *args, **kwargs):
+        """Calculate duration and backdating before saving."""
+        if self.in_time and self.out_time:
+            from apps.core.utils import calculate_session_duration
+            self.duration_minutes = calculate_session_duration(self.in_time, self.out_time)
+        
+        if self.date < timezone.now().date():
+            from apps.core.utils import is_backdated
+            self.is_backdated = is_backdated(self.date)
+        
+        super().save(*args, **kwargs)
+
+
+class AttendanceRecord(OutboxEventMixin, TimeStampedModel):
     """
     Attendance record model.
     Immutable event-sourced record of student attendance.
@@ -40,7 +116,16 @@ class AttendanceRecord(TimeStampedModel):
         help_text="Session duration in minutes"
     )
     
-    # What was taught
+    # Class session the student attended (its topics apply to the record)
+    session = models.ForeignKey(
+        Session,
+        on_delete=models.PROTECT,
+        related_name='records',
+        null=True,
+        blank=True
+    )
+    
+    # What was taught (records marked one student at a time)
     topics_covered = models.ManyToManyField(
         'subjects.Topic',
         related_name='attendance_records',
@@ -71,13 +156,16 @@ class AttendanceRecord(TimeStampedModel):
         limit_choices_to={'role': 'faculty'}
     )
     
+    outbox_fields = ('student_id', 'assignment_id', 'session_id', 'date', 'in_time', 'out_time')
+    
     class Meta:
         db_table = 'attendance_records'
         verbose_name = 'Attendance Record'
         verbose_name_plural = 'Attendance Records'
         ordering = ['-date', '-in_time']
         indexes = [
-            models.Index(fields=['student', 'date']),
+            # Also serves the overlap check (apps/attendance/overlaps.py)
+            models.Index(fields=['student', 'date', 'in_time', 'out_time']),
             models.Index(fields=['assignment', 'date']),
             models.Index(fields=['marked_by', 'date']),
             models.Index(fields=['date', 'is_backdated']),
@@ -88,6 +176,16 @@ class AttendanceRecord(TimeStampedModel):
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.date} ({self.duration_minutes}min)"
     
+    @property
+    def covered_topics(self):
+        """
+        Topics of this record: the session's topics for records marked with
+        a class session, the record's own topics otherwise.
+        """
+        if self.session_id:
+            return self.session.topics_covered.all()
+        return self.topics_covered.all()
+    
     def save(self, *args, **kwargs):
         """Calculate duration before saving."""
         if self.in_time and self.out_time:
@@ -100,3 +198,139 @@ class AttendanceRecord(TimeStampedModel):
             self.is_backdated = is_backdated(self.date)
         
         super().save(*args, **kwargs)
+
+
+class ScheduleTemplate(TimeStampedModel, SoftDeleteModel):
+    """
+    Recurring class schedule of an assignment.
+    
+    For example "Mon/Wed/Fri 16:00-17:00". Expected sessions are
+    materialized from it (see scheduling.py) so attendance can be compared
+    with what was actually planned.
+    """
+    
+    WEEKDAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    
+    assignment = models.ForeignKey(
+        'subjects.Assignment',
+        on_delete=models.CASCADE,
+        related_name='schedules'
+    )
+    
+    weekdays = models.JSONField(
+        default=list,
+        help_text="Weekday numbers of the class, Monday=0 ... Sunday=6"
+    )
+    in_time = models.TimeField()
+    out_time = models.TimeField()
+    
+    valid_from = models.DateField()
+    valid_until = models.DateField(null=True, blank=True)
+    
+    is_active = models.BooleanField(default=True)
+    
+    class Meta:
+        db_table = 'schedule_templates'
+        verbose_name = 'Schedule Template'
+        verbose_name_plural = 'Schedule Templates'
+        ordering = ['assignment', 'in_time']
+        indexes = [
+            models.Index(fields=['assignment', 'is_active']),
+        ]
+    
+    def __str__(self):
+        days = '/'.join(self.WEEKDAY_NAMES[day] for day in sorted(self.weekdays))
+        return f"{self.assignment_id}: {days} {self.in_time:%H:%M}-{self.out_time:%H:%M}"
+    
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        
+        if not isinstance(self.weekdays, list) or not self.weekdays or \
+                any(not isinstance(day, int) or not 0 <= day <= 6 for day in self.weekdays):
+            raise ValidationError({'weekdays': 'Enter a list of weekday numbers from 0 (Monday) to 6 (Sunday).'})
+        if self.in_time and self.out_time and self.out_time <= self.in_time:
+            raise ValidationError('Out time must be after in time.')
+        if self.valid_until and self.valid_until < self.valid_from:
+            raise ValidationError({'valid_until': 'Must not be before the start date.'})
+
+
+class ExpectedSession(models.Model):
+    """
+    One planned class of an assignment, materialized from a ScheduleTemplate.
+    Student is denormalized from the assignment so expected-vs-attended
+    comparisons are single-table queries.
+    """
+    
+    schedule = models.ForeignKey(
+        ScheduleTemplate,
+        on_delete=models.CASCADE,
+        related_name='expected_sessions'
+    )
+    assignment = models.ForeignKey(
+        'subjects.Assignment',
+        on_delete=models.CASCADE,
+        related_name='expected_sessions'
+    )
+    student = models.ForeignKey(
+        'students.Student',
+        on_delete=models.CASCADE,
+        related_name='expected_sessions'
+    )
+    
+    date = models.DateField()
+    in_time = models.TimeField()
+    out_time = models.TimeField()
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'expected_sessions'
+        verbose_name = 'Expected Session'
+        verbose_name_plural = 'Expected Sessions'
+        ordering = ['date', 'in_time']
+        indexes = [
+            models.Index(fields=['student', 'date']),
+        ]
+        unique_together = [['assignment', 'date', 'in_time']]
+    
+    def __str__(self):
+        return f"{self.assignment_id} - {self.date} {self.in_time:%H:%M}"
+
+
+class AssignmentProgress(models.Model):
+    """
+    Syllabus progress of one assignment: distinct topics of the subject
+    covered by the student's attendance, out of the subject's topics.
+    Kept current from the outbox (see progress.py), so progress insights
+    are range filters on percent_complete.
+    """
+    
+    assignment = models.OneToOneField(
+        'subjects.Assignment',
+        on_delete=models.CASCADE,
+        related_name='progress'
+    )
+    student = models.ForeignKey(
+        'students.Student',
+        on_delete=models.CASCADE,
+        related_name='assignment_progress'
+    )
+    
+    covered_topics = models.PositiveIntegerField(default=0)
+    total_topics = models.PositiveIntegerField(default=0)
+    percent_complete = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    session_count = models.PositiveIntegerField(default=0)
+    last_session_date = models.DateField(null=True, blank=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'assignment_progress'
+        verbose_name = 'Assignment Progress'
+        verbose_name_plural = 'Assignment Progress'
+        indexes = [
+            models.Index(fields=['percent_complete'], name='assignment_progress_pct_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.assignment_id}: {self.covered_topics}/{self.total_topics}"
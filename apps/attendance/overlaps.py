@@ -0,0 +1,253 @@
+"""
+Overlap checks for attendance.
+
+A student cannot attend two classes at once, and a faculty member cannot
+teach two different classes at once. Windows are half-open
+([in_time, out_time)), so back-to-back classes do not overlap. Identical
+windows of a faculty member are one class (a session, or students marked
+one at a time) and are not double-booking.
+
+On PostgreSQL the student rule and the faculty rule for sessions are
+also exclusion constraints (apps/attendance/constraints.py):
+attendance_records on (student, time range) and attendance_sessions on
+(faculty, time range). Faculty overlaps between individually marked
+records (marking form, imports) are only caught by the checks below,
+which run on every backend before writing:
+
+- single writes: one query per rule on the (student, date, in_time,
+  out_time) index and the faculty's assignments, matching only the
+  overlapping rows instead of loading the day
+- bulk writes: the windows of all students and faculty involved are
+  read once for the whole date range (build_window_index) and checked in
+  memory, including the windows of the batch itself
+
+find_student_overlaps() and find_faculty_overlaps() report overlaps that
+are already stored, in one ordered pass over the records.
+"""
+
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+
+from .models import AttendanceRecord
+
+
+def windows_overlap(in_time, out_time, other_in, other_out):
+    """True if [in_time, out_time) and [other_in, other_out) intersect."""
+    return in_time < other_out and other_in < out_time
+
+
+def _overlapping(queryset, date, in_time, out_time):
+    return queryset.filter(date=date, in_time__lt=out_time, out_time__gt=in_time)
+
+
+def get_student_conflicts(student_ids, date, in_time, out_time, exclude_pk=None):
+    """
+    Attendance records of students that overlap a window.
+
+    Args:
+        student_ids: Iterable of student ids
+        date: Attendance date
+        in_time: Start time
+        out_time: End time
+        exclude_pk: Record being edited, if any
+
+    Returns:
+        QuerySet: Overlapping AttendanceRecords
+    """
+    queryset = _overlapping(
+        AttendanceRecord.objects.filter(student_id__in=list(student_ids)), date, in_time, out_time
+    )
+    if exclude_pk:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset
+
+
+def get_faculty_conflicts(faculty_id, date, in_time, out_time, exclude_pk=None):
+    """
+    Attendance records of a faculty member's other classes that overlap a window.
+
+    Records with exactly the same window belong to the same class and are
+    not conflicts.
+
+    Args:
+        faculty_id: Faculty id
+        date: Attendance date
+        in_time: Start time
+        out_time: End time
+        exclude_pk: Record being edited, if any
+
+    Returns:
+        QuerySet: Overlapping AttendanceRecords
+    """
+    queryset = _overlapping(
+        AttendanceRecord.objects.filter(assignment__faculty_id=faculty_id), date, in_time, out_time
+    ).exclude(in_time=in_time, out_time=out_time)
+    if exclude_pk:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset
+
+
+def _describe(record):
+    return f"{record.in_time:%H:%M} to {record.out_time:%H:%M}"
+
+
+def check_attendance_overlaps(student, assignment, date, in_time, out_time, exclude_pk=None):
+    """
+    Validate a single attendance write.
+
+    Args:
+        student: Student instance
+        assignment: Assignment instance (its faculty teaches the class)
+        date: Attendance date
+        in_time: Start time
+        out_time: End time
+        exclude_pk: Record being edited, if any
+
+    Raises:
+        ValidationError: If the student or the faculty member is already
+            busy during the window
+    """
+    errors = []
+
+    conflict = get_student_conflicts(
+        [student.pk], date, in_time, out_time, exclude_pk
+    ).order_by('in_time').first()
+    if conflict:
+        errors.append(
+            f"{student.get_full_name()} already has attendance on {date} from {_describe(conflict)}."
+        )
+
+    conflict = get_faculty_conflicts(
+        assignment.faculty_id, date, in_time, out_time, exclude_pk
+    ).order_by('in_time').first()
+    if conflict:
+        errors.append(
+            f"{assignment.faculty.user.get_full_name()} is teaching another class on {date} from {_describe(conflict)}."
+        )
+
+    if errors:
+        raise ValidationError(errors)
+
+
+class WindowIndex:
+    """
+    Busy windows of students and faculty, for checking a batch of writes.
+
+    Build it with build_window_index(), then call add_student() and
+    add_faculty() for every window written, so rows of the batch are
+    checked against each other as well.
+    """
+
+    def __init__(self):
+        self.students = defaultdict(set)
+        self.faculty = defaultdict(set)
+
+    def student_conflict(self, student_id, date, in_time, out_time):
+        """The student's window overlapping [in_time, out_time), or None."""
+        for window in self.students[student_id, date]:
+            if windows_overlap(in_time, out_time, *window):
+                return window
+        return None
+
+    def faculty_conflict(self, faculty_id, date, in_time, out_time):
+        """The faculty member's other-class window overlapping [in_time, out_time), or None."""
+        for window in self.faculty[faculty_id, date]:
+            if window != (in_time, out_time) and windows_overlap(in_time, out_time, *window):
+                return window
+        return None
+
+    def add_student(self, student_id, date, in_time, out_time):
+        self.students[student_id, date].add((in_time, out_time))
+
+    def add_faculty(self, faculty_id, date, in_time, out_time):
+        self.faculty[faculty_id, date].add((in_time, out_time))
+
+
+def build_window_index(student_ids, faculty_ids, start, end):
+    """
+    Read the stored windows of students and faculty over a date range.
+
+    Args:
+        student_ids: Iterable of student ids
+        faculty_ids: Iterable of faculty ids
+        start: First date (inclusive)
+        end: Last date (inclusive)
+
+    Returns:
+        WindowIndex: Windows keyed by (student or faculty id, date)
+    """
+    index = WindowIndex()
+    for student_id, date, in_time, out_time in AttendanceRecord.objects.filter(
+        student_id__in=list(student_ids),
+        date__range=(start, end)
+    ).values_list('student_id', 'date', 'in_time', 'out_time'):
+        index.add_student(student_id, date, in_time, out_time)
+
+    for faculty_id, date, in_time, out_time in AttendanceRecord.objects.filter(
+        assignment__faculty_id__in=list(faculty_ids),
+        date__range=(start, end)
+    ).order_by().values_list('assignment__faculty_id', 'date', 'in_time', 'out_time').distinct():
+        index.add_faculty(faculty_id, date, in_time, out_time)
+    return index
+
+
+def _sweep(rows, distinct_windows=False):
+    """
+    Overlapping pairs within rows ordered by (owner, date, in_time).
+
+    Args:
+        rows: Iterable of (owner, date, in_time, out_time, pk)
+        distinct_windows: Pairs with identical windows are not overlaps
+
+    Yields:
+        tuple: (owner, date, earlier row pk, later row pk)
+    """
+    group = None
+    active = []
+    for owner, date, in_time, out_time, pk in rows:
+        if (owner, date) != group:
+            group = (owner, date)
+            active = []
+        active = [row for row in active if row[1] > in_time]
+        for other_in, other_out, other_pk in active:
+            if distinct_windows and (other_in, other_out) == (in_time, out_time):
+                continue
+            yield owner, date, other_pk, pk
+        active.append((in_time, out_time, pk))
+
+
+def find_student_overlaps(queryset=None):
+    """
+    Pairs of attendance records of a student that overlap.
+
+    Args:
+        queryset: AttendanceRecord queryset to scan (defaults to all records)
+
+    Yields:
+        tuple: (student id, date, record id, record id)
+    """
+    if queryset is None:
+        queryset = AttendanceRecord.objects.all()
+    rows = queryset.order_by('student_id', 'date', 'in_time').values_list(
+        'student_id', 'date', 'in_time', 'out_time', 'pk'
+    ).iterator(chunk_size=5000)
+    yield from _sweep(rows)
+
+
+def find_faculty_overlaps(queryset=None):
+    """
+    Pairs of attendance records of different classes of a faculty member that overlap.
+
+    Args:
+        queryset: AttendanceRecord queryset to scan (defaults to all records)
+
+    Yields:
+        tuple: (faculty id, date, record id, record id)
+    """
+    if queryset is None:
+        queryset = AttendanceRecord.objects.all()
+    rows = queryset.order_by('assignment__faculty_id', 'date', 'in_time').values_list(
+        'assignment__faculty_id', 'date', 'in_time', 'out_time', 'pk'
+    ).iterator(chunk_size=5000)
+    yield from _sweep(rows, distinct_windows=True)
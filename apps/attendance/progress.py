@@ -0,0 +1,174 @@
+"""
+Per-assignment syllabus progress (AssignmentProgress).
+
+An assignment's progress is the number of distinct active topics of its
+subject covered by the student's attendance on that assignment (its own
+topics and its class session's topics), out of the subject's active
+topics, plus the number and last date of its sessions.
+
+refresh_assignment_progress() recomputes the rows of a set of assignments
+with four grouped queries, whatever the number of assignments. It runs
+from the outbox (projections.py) for the assignments touched by
+attendance, assignment and topic changes; rebuild_assignment_progress()
+recomputes everything (manage.py rebuild_assignment_progress).
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.utils import timezone
+
+from .models import AssignmentProgress, AttendanceRecord
+from .services import TOPIC_PATHS
+
+
+def _chunks(ids, size):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def percent_complete(covered, total):
+    """Covered share of the topics as a percentage with two decimals."""
+    if not total:
+        return Decimal('0.00')
+    return (Decimal(covered * 100) / total).quantize(Decimal('0.01'))
+
+
+def compute_assignment_progress(assignments):
+    """
+    Progress of assignments from the attendance and topic tables.
+
+    Args:
+        assignments: Iterable of (assignment id, student id, subject id)
+
+    Returns:
+        dict: assignment id -> dict of AssignmentProgress field values
+    """
+    from apps.subjects.models import Topic
+
+    assignments = list(assignments)
+    ids = [assignment_id for assignment_id, _student_id, _subject_id in assignments]
+
+    totals = dict(Topic.objects.filter(
+        subject_id__in={subject_id for _assignment_id, _student_id, subject_id in assignments},
+        is_active=True,
+        deleted_at__isnull=True
+    ).order_by().values('subject_id').annotate(count=Count('pk')).values_list('subject_id', 'count'))
+
+    covered = {assignment_id: set() for assignment_id in ids}
+    for path in TOPIC_PATHS:
+        for assignment_id, topic_id in AttendanceRecord.objects.filter(**{
+            'assignment_id__in': ids,
+            f'{path}__subject_id': F('assignment__subject_id'),
+            f'{path}__is_active': True,
+            f'{path}__deleted_at__isnull': True,
+        }).order_by().values_list('assignment_id', path).distinct():
+            covered[assignment_id].add(topic_id)
+
+    sessions = {
+        row['assignment_id']: row
+        for row in AttendanceRecord.objects.filter(
+            assignment_id__in=ids
+        ).order_by().values('assignment_id').annotate(count=Count('pk'), last=Max('date'))
+    }
+
+    progress = {}
+    for assignment_id, student_id, subject_id in assignments:
+        total = totals.get(subject_id, 0)
+        count = len(covered[assignment_id])
+        session = sessions.get(assignment_id, {})
+        progress[assignment_id] = {
+            'student_id': student_id,
+            'covered_topics': count,
+            'total_topics': total,
+            'percent_complete': percent_complete(count, total),
+            'session_count': session.get('count', 0),
+            'last_session_date': session.get('last'),
+        }
+    return progress
+
+
+def refresh_assignment_progress(assignment_ids, batch_size=500):
+    """
+    Recompute and store the progress rows of assignments.
+
+    Args:
+        assignment_ids: Iterable of assignment ids (unknown ids are ignored)
+        batch_size: Assignments per batch of queries
+
+    Returns:
+        int: Number of progress rows written
+    """
+    from apps.subjects.models import Assignment
+
+    fields = ['student_id', 'covered_topics', 'total_topics', 'percent_complete',
+              'session_count', 'last_session_date']
+    written = 0
+    for chunk in _chunks(set(assignment_ids), batch_size):
+        assignments = Assignment.all_objects.filter(pk__in=chunk).values_list('pk', 'student_id', 'subject_id')
+        progress = compute_assignment_progress(assignments)
+        with transaction.atomic():
+            existing = AssignmentProgress.objects.select_for_update().in_bulk(
+                progress.keys(), field_name='assignment_id'
+            )
+            changed = []
+            now = timezone.now()
+            for assignment_id, values in progress.items():
+                row = existing.get(assignment_id)
+                if row is None:
+                    continue
+                if any(getattr(row, field) != values[field] for field in fields):
+                    for field, value in values.items():
+                        setattr(row, field, value)
+                    # bulk_update does not apply auto_now
+                    row.updated_at = now
+                    changed.append(row)
+            AssignmentProgress.objects.bulk_update(changed, [*fields, 'updated_at'])
+            # ignore_conflicts: a concurrent refresh may have created the row
+            AssignmentProgress.objects.bulk_create([
+                AssignmentProgress(assignment_id=assignment_id, **values)
+                for assignment_id, values in progress.items()
+                if assignment_id not in existing
+            ], ignore_conflicts=True)
+        written += len(progress)
+    return written
+
+
+def refresh_subject_progress(subject_ids, batch_size=500):
+    """
+    Recompute the progress of every assignment of subjects (topics changed).
+
+    Args:
+        subject_ids: Iterable of subject ids
+        batch_size: Assignments per batch of queries
+
+    Returns:
+        int: Number of progress rows written
+    """
+    from apps.subjects.models import Assignment
+
+    assignment_ids = Assignment.all_objects.filter(
+        subject_id__in=set(subject_ids)
+    ).values_list('pk', flat=True)
+    return refresh_assignment_progress(assignment_ids, batch_size)
+
+
+def rebuild_assignment_progress(center=None, batch_size=500):
+    """
+    Recompute the progress rows of all assignments.
+
+    Args:
+        center: Center object (optional, defaults to all centers)
+        batch_size: Assignments per batch of queries
+
+    Returns:
+        int: Number of progress rows written
+    """
+    from apps.subjects.models import Assignment
+
+    assignments = Assignment.all_objects.all()
+    if center:
+        assignments = assignments.filter(student__center=center)
+    return refresh_assignment_progress(assignments.values_list('pk', flat=True), batch_size)
@@ -0,0 +1,56 @@
+"""
+Outbox projectors of the attendance app (see apps/core/outbox.py).
+
+Syllabus progress (progress.py) is recomputed for every assignment touched
+by a batch: attendance changes name their assignment, assignment changes
+are the assignment itself, and topic changes touch every assignment of
+the topic's subject. The data version of the centers involved is bumped
+afterwards, as cached insights read the progress rows.
+"""
+
+from django.db import transaction
+
+ATTENDANCE_TOPIC = 'attendance.attendancerecord'
+ASSIGNMENT_TOPIC = 'subjects.assignment'
+TOPIC_TOPIC = 'subjects.topic'
+
+
+def project_assignment_progress(events):
+    """Recompute the AssignmentProgress rows of the assignments in a batch."""
+    from apps.centers.cache import bump_center_data_version
+    from apps.subjects.models import Assignment
+
+    from .progress import refresh_assignment_progress, refresh_subject_progress
+
+    assignment_ids = set()
+    subject_ids = set()
+    center_ids = {event.center_id for event in events if event.center_id}
+    for event in events:
+        if event.topic == ATTENDANCE_TOPIC:
+            assignment_ids.add(event.payload['assignment_id'])
+        elif event.topic == ASSIGNMENT_TOPIC:
+            if event.action != 'deleted':
+                assignment_ids.add(event.object_id)
+        elif event.topic == TOPIC_TOPIC:
+            subject_ids.add(event.payload['subject_id'])
+
+    if subject_ids:
+        refresh_subject_progress(subject_ids)
+        center_ids.update(Assignment.all_objects.filter(
+            subject_id__in=subject_ids
+        ).order_by().values_list('student__center_id', flat=True).distinct())
+    if assignment_ids:
+        refresh_assignment_progress(assignment_ids)
+
+    for center_id in center_ids - {None}:
+        transaction.on_commit(lambda cid=center_id: bump_center_data_version(cid))
+
+
+def connect_projectors():
+    from apps.core.outbox import register_projector
+
+    register_projector(
+        'assignment_progress',
+        [ATTENDANCE_TOPIC, ASSIGNMENT_TOPIC, TOPIC_TOPIC],
+        project_assignment_progress
+    )
@@ -0,0 +1,165 @@
+"""
+Per-faculty "today roster" cache.
+
+The marking screen asks for the same data on every keystroke: the
+faculty's active assignments, the students they cover, their subjects and
+which students already have attendance today. get_today_roster() builds
+all of it in two queries and caches it per faculty and date, so the form
+and its AJAX endpoints read one cache entry.
+
+Saving attendance adds the student to the cached marked set instead of
+rebuilding (see signals.py; bulk writes call mark_roster_students()).
+Assignment and student changes drop the faculty's entry.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+ROSTER_KEY = 'attendance_roster:{faculty_id}:{date}'
+
+
+def _roster_key(faculty_id, date):
+    return ROSTER_KEY.format(faculty_id=faculty_id, date=date.isoformat())
+
+
+def build_today_roster(faculty_id, date):
+    """
+    Build the roster of a faculty member for a date (uncached).
+
+    Args:
+        faculty_id: Faculty id
+        date: Attendance date
+
+    Returns:
+        dict: 'students' (student id -> name, enrollment_number, center),
+        'assignments' (student id -> list of assignment dicts with id,
+        subject_id, subject_name, subject_code) and 'marked' (set of
+        student ids with attendance on the date)
+    """
+    from apps.subjects.models import Assignment
+
+    from .models import AttendanceRecord
+
+    students = {}
+    assignments = {}
+    for assignment in Assignment.objects.filter(
+        faculty_id=faculty_id,
+        is_active=True,
+        deleted_at__isnull=True,
+        student__deleted_at__isnull=True
+    ).select_related('student__center', 'subject').order_by(
+        'student__first_name', 'student__last_name', 'subject__name'
+    ):
+        student = assignment.student
+        if student.pk not in students:
+            students[student.pk] = {
+                'name': student.get_full_name(),
+                'enrollment_number': student.enrollment_number,
+                'center': student.center.name if student.center else '',
+            }
+        assignments.setdefault(student.pk, []).append({
+            'id': assignment.pk,
+            'subject_id': assignment.subject_id,
+            'subject_name': assignment.subject.name,
+            'subject_code': assignment.subject.code,
+        })
+
+    marked = set(AttendanceRecord.objects.filter(
+        assignment__faculty_id=faculty_id,
+        date=date
+    ).values_list('student_id', flat=True))
+
+    return {'students': students, 'assignments': assignments, 'marked': marked}
+
+
+def get_today_roster(faculty_id, date=None):
+    """
+    Roster of a faculty member for a date, cached per faculty and date.
+
+    Args:
+        faculty_id: Faculty id
+        date: Attendance date (defaults to today)
+
+    Returns:
+        dict: See build_today_roster
+    """
+    date = date or timezone.now().date()
+    key = _roster_key(faculty_id, date)
+    roster = cache.get(key)
+    if roster is None:
+        roster = build_today_roster(faculty_id, date)
+        cache.set(key, roster, getattr(settings, 'ATTENDANCE_ROSTER_CACHE_TTL', 3600))
+    return roster
+
+
+def get_unmarked_students(roster):
+    """
+    Students of a roster without attendance yet, in name order.
+
+    Args:
+        roster: Roster dict
+
+    Returns:
+        list: dicts with id, name, enrollment_number and center
+    """
+    return [
+        {'id': student_id, **student}
+        for student_id, student in roster['students'].items()
+        if student_id not in roster['marked']
+    ]
+
+
+def get_assignment_subject(roster, assignment_id):
+    """
+    Subject of one of the roster's assignments.
+
+    Args:
+        roster: Roster dict
+        assignment_id: Assignment id
+
+    Returns:
+        dict: The assignment dict (see build_today_roster), or None if the
+        assignment is not on the roster
+    """
+    for student_assignments in roster['assignments'].values():
+        for assignment in student_assignments:
+            if assignment['id'] == assignment_id:
+                return assignment
+    return None
+
+
+def mark_roster_students(faculty_id, date, student_ids):
+    """
+    Add students to the marked set of a cached roster.
+
+    Does nothing if the roster is not cached; it is built with the new
+    attendance on the next read.
+
+    Args:
+        faculty_id: Faculty id
+        date: Attendance date
+        student_ids: Iterable of student ids
+    """
+    key = _roster_key(faculty_id, date)
+    roster = cache.get(key)
+    if roster is None:
+        return
+    student_ids = set(student_ids)
+    if student_ids <= roster['marked']:
+        return
+    roster['marked'] |= student_ids
+    cache.set(key, roster, getattr(settings, 'ATTENDANCE_ROSTER_CACHE_TTL', 3600))
+
+
+def invalidate_roster(faculty_id, date=None):
+    """
+    Drop the cached roster of a faculty member.
+
+    Args:
+        faculty_id: Faculty id (None is ignored)
+        date: Attendance date (defaults to today)
+    """
+    if faculty_id is None:
+        return
+    cache.delete(_roster_key(faculty_id, date or timezone.now().date()))
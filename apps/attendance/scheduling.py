@@ -0,0 +1,286 @@
+"""
+Recurring schedules and expected sessions.
+
+A ScheduleTemplate says when an assignment's class meets ("Mon/Wed/Fri
+16:00-17:00"). materialize_expected_sessions() turns templates into
+ExpectedSession rows over a date range in one transaction, so attendance
+can be compared with what was planned: consistency and absence are set
+differences between expected slots and attendance records.
+
+backfill_attendance() marks chosen expected slots as attended, writing
+one class Session per faculty/subject/slot and the records with
+bulk_create, which makes backfilling months of history a matter of
+seconds instead of one INSERT per record.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.centers.counters import count_attendance
+from apps.core.outbox import record_events
+
+from .models import AttendanceRecord, ExpectedSession, Session
+from .overlaps import build_window_index
+from .roster import mark_roster_students
+
+
+def iter_schedule_dates(schedule, start, end):
+    """
+    Dates on which a schedule's class meets.
+
+    Args:
+        schedule: ScheduleTemplate (with assignment loaded)
+        start: First date (inclusive)
+        end: Last date (inclusive)
+
+    Yields:
+        date: Class dates within the schedule's and the assignment's validity
+    """
+    assignment = schedule.assignment
+    first = max(start, schedule.valid_from, assignment.start_date)
+    last = end
+    for limit in (schedule.valid_until, assignment.end_date):
+        if limit and limit < last:
+            last = limit
+
+    weekdays = set(schedule.weekdays)
+    day = first
+    while day <= last:
+        if day.weekday() in weekdays:
+            yield day
+        day += timedelta(days=1)
+
+
+def materialize_expected_sessions(schedules, start, end, replace=False, batch_size=1000):
+    """
+    Create the expected sessions of schedules over a date range.
+
+    Slots that already exist are left alone, so the range can be
+    materialized again at any time (e.g. by a nightly job).
+
+    Args:
+        schedules: ScheduleTemplate queryset
+        start: First date (inclusive)
+        end: Last date (inclusive)
+        replace: Delete the schedules' existing slots in the range first
+            (use after a schedule changed)
+        batch_size: Rows inserted per bulk_create call
+
+    Returns:
+        int: Number of expected sessions created
+    """
+    with transaction.atomic():
+        if replace:
+            # Also clears the slots of schedules that were deactivated
+            ExpectedSession.objects.filter(schedule__in=schedules, date__range=(start, end)).delete()
+
+        schedules = list(schedules.filter(
+            is_active=True,
+            deleted_at__isnull=True,
+            assignment__deleted_at__isnull=True
+        ).select_related('assignment'))
+        if not schedules:
+            return 0
+
+        existing = set(ExpectedSession.objects.filter(
+            assignment_id__in={schedule.assignment_id for schedule in schedules},
+            date__range=(start, end)
+        ).values_list('assignment_id', 'date', 'in_time'))
+
+        slots = []
+        for schedule in schedules:
+            for day in iter_schedule_dates(schedule, start, end):
+                key = (schedule.assignment_id, day, schedule.in_time)
+                if key in existing:
+                    continue
+                existing.add(key)
+                slots.append(ExpectedSession(
+                    schedule=schedule,
+                    assignment_id=schedule.assignment_id,
+                    student_id=schedule.assignment.student_id,
+                    date=day,
+                    in_time=schedule.in_time,
+                    out_time=schedule.out_time,
+                ))
+        ExpectedSession.objects.bulk_create(slots, batch_size=batch_size)
+    return len(slots)
+
+
+def backfill_attendance(slots, user, reason, batch_size=1000):
+    """
+    Mark expected sessions as attended.
+
+    Slots that already have an attendance record (same assignment, date
+    and start time) are skipped, and so are slots that would double-book
+    the student or the faculty member (see overlaps.py). Slots of the
+    same faculty, subject, date and time share one class Session.
+
+    Args:
+        slots: ExpectedSession queryset of the classes the students attended
+        user: User recorded as creator of the rows
+        reason: Backdated reason stored on past sessions
+        batch_size: Rows inserted per bulk_create call
+
+    Returns:
+        dict: sessions and records created, slots skipped as already
+        marked, slots rejected as conflicts
+    """
+    from apps.centers.cache import bump_center_data_version
+    from apps.core.utils import calculate_session_duration, is_backdated
+
+    slots = list(slots.select_related('assignment__faculty', 'student').order_by('date', 'in_time'))
+    if not slots:
+        return {'sessions': 0, 'records': 0, 'skipped': 0, 'conflicts': 0}
+
+    today = timezone.now().date()
+    with transaction.atomic():
+        existing = set(AttendanceRecord.objects.filter(
+            assignment_id__in={slot.assignment_id for slot in slots},
+            date__range=(slots[0].date, slots[-1].date)
+        ).values_list('assignment_id', 'date', 'in_time'))
+        windows = build_window_index(
+            {slot.student_id for slot in slots},
+            {slot.assignment.faculty_id for slot in slots},
+            slots[0].date, slots[-1].date
+        )
+
+        pending = []
+        skipped = conflicts = 0
+        for slot in slots:
+            if (slot.assignment_id, slot.date, slot.in_time) in existing:
+                skipped += 1
+                continue
+            faculty_id = slot.assignment.faculty_id
+            if (windows.student_conflict(slot.student_id, slot.date, slot.in_time, slot.out_time)
+                    or windows.faculty_conflict(faculty_id, slot.date, slot.in_time, slot.out_time)):
+                conflicts += 1
+                continue
+            windows.add_student(slot.student_id, slot.date, slot.in_time, slot.out_time)
+            windows.add_faculty(faculty_id, slot.date, slot.in_time, slot.out_time)
+            pending.append(slot)
+
+        classes = defaultdict(list)
+        for slot in pending:
+            assignment = slot.assignment
+            classes[(assignment.faculty_id, assignment.subject_id, slot.date, slot.in_time, slot.out_time)].append(slot)
+
+        sessions = []
+        for (faculty_id, subject_id, day, in_time, out_time), class_slots in classes.items():
+            backdated = day < today and is_backdated(day)
+            sessions.append(Session(
+                faculty_id=faculty_id,
+                subject_id=subject_id,
+                date=day,
+                in_time=in_time,
+                out_time=out_time,
+                duration_minutes=calculate_session_duration(in_time, out_time),
+                is_backdated=backdated,
+                backdated_reason=reason if backdated else '',
+                marked_by_id=class_slots[0].assignment.faculty.user_id,
+                created_by=user,
+                modified_by=user,
+            ))
+        Session.objects.bulk_create(sessions, batch_size=batch_size)
+
+        records = []
+        for session, class_slots in zip(sessions, classes.values()):
+            for slot in class_slots:
+                records.append(AttendanceRecord(
+                    session=session,
+                    student_id=slot.student_id,
+                    assignment_id=slot.assignment_id,
+                    date=session.date,
+                    in_time=session.in_time,
+                    out_time=session.out_time,
+                    duration_minutes=session.duration_minutes,
+                    is_backdated=session.is_backdated,
+                    backdated_reason=session.backdated_reason,
+                    marked_by_id=session.marked_by_id,
+                    created_by=user,
+                    modified_by=user,
+                ))
+        AttendanceRecord.objects.bulk_create(records, batch_size=batch_size)
+
+        # bulk_create sends no post_save, so publish the outbox events, count
+        # the records and bump the dashboards and today's rosters here
+        record_events(records, 'created')
+        count_attendance(records)
+        for center_id in {slot.student.center_id for slot in pending}:
+            transaction.on_commit(lambda cid=center_id: bump_center_data_version(cid))
+        marked_today = defaultdict(set)
+        for slot in pending:
+            if slot.date == today:
+                marked_today[slot.assignment.faculty_id].add(slot.student_id)
+        for faculty_id, student_ids in marked_today.items():
+            transaction.on_commit(
+                lambda fid=faculty_id, ids=student_ids: mark_roster_students(fid, today, ids)
+            )
+
+    return {
+        'sessions': len(sessions),
+        'records': len(records),
+        'skipped': skipped,
+        'conflicts': conflicts,
+    }
+
+
+def get_expected_attendance(student, start, end):
+    """
+    Expected sessions of a student and whether each was attended.
+
+    A slot counts as attended when the student has an attendance record
+    for the same assignment on that date (at any time).
+
+    Args:
+        student: Student instance
+        start: First date (inclusive)
+        end: Last date (inclusive)
+
+    Returns:
+        list: (date, attended) pairs in date order; empty if the student
+        has no schedule
+    """
+    slots = list(ExpectedSession.objects.filter(
+        student=student,
+        date__range=(start, end)
+    ).order_by('date', 'in_time').values_list('assignment_id', 'date'))
+    if not slots:
+        return []
+
+    attended = set(AttendanceRecord.objects.filter(
+        student=student,
+        date__range=(start, end)
+    ).values_list('assignment_id', 'date'))
+    return [(day, (assignment_id, day) in attended) for assignment_id, day in slots]
+
+
+def get_missed_sessions(student_ids, start, end):
+    """
+    Number of expected sessions each student missed.
+
+    Args:
+        student_ids: Iterable of student ids
+        start: First date (inclusive)
+        end: Last date (inclusive)
+
+    Returns:
+        dict: student id -> {'expected': int, 'missed': int}
+    """
+    student_ids = list(student_ids)
+    attended = set(AttendanceRecord.objects.filter(
+        student_id__in=student_ids,
+        date__range=(start, end)
+    ).values_list('assignment_id', 'date'))
+
+    counts = defaultdict(lambda: {'expected': 0, 'missed': 0})
+    for student_id, assignment_id, day in ExpectedSession.objects.filter(
+        student_id__in=student_ids,
+        date__range=(start, end)
+    ).values_list('student_id', 'assignment_id', 'date'):
+        counts[student_id]['expected'] += 1
+        if (assignment_id, day) not in attended:
+            counts[student_id]['missed'] += 1
+    return dict(counts)
@@ -4,8 +4,14 @@ Business logic services for attendance management.
 
 from datetime import datetime, timedelta
 from django.utils import timezone
-from django.db.models import Sum, Count, Q
-from .models import AttendanceRecord
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Sum, Count, Q, F
+from .models import AttendanceRecord, Session
+
+# Lookups from an attendance record to its topics: the record's own topics
+# (marked one student at a time) and the topics of its class session.
+TOPIC_PATHS = ('topics_covered', 'session__topics_covered')
 
 
 def calculate_session_duration(in_time, out_time):
@@ -52,7 +58,9 @@ def get_today_attendance_for_faculty(faculty):
     return AttendanceRecord.objects.filter(
         marked_by=faculty.user,
         date=today
-    ).select_related('student', 'assignment__subject').prefetch_related('topics_covered')
+    ).select_related('student', 'assignment__subject', 'session').prefetch_related(
+        'topics_covered', 'session__topics_covered'
+    )
 
 
 def get_student_attendance_summary(student, start_date=None, end_date=None):
@@ -149,3 +157,201 @@ def get_faculty_attendance_stats(faculty, start_date=None, end_date=None):
         'total_hours': round((stats['total_minutes'] or 0) / 60, 2),
         'backdated_count': stats['backdated_count'] or 0,
     }
+
+
+def get_topic_links(records):
+    """
+    (record, topic) pairs of a set of attendance records.
+    
+    Returns one AttendanceRecord queryset per topic source (the record's
+    own topics, its session's topics). Each row is one topic of one record,
+    with the topic id annotated as topic_ref and its name as topic_name, so
+    callers group or count each queryset and add the results up.
+    
+    Args:
+        records: AttendanceRecord queryset
+        
+    Returns:
+        list: Two AttendanceRecord querysets
+    """
+    return [
+        records.filter(**{f'{path}__isnull': False}).annotate(
+            topic_ref=F(path),
+            topic_name=F(f'{path}__name')
+        )
+        for path in TOPIC_PATHS
+    ]
+
+
+def count_topic_links(records):
+    """
+    Number of topics covered across a set of attendance records.
+    
+    Args:
+        records: AttendanceRecord queryset
+        
+    Returns:
+        int: Topic count (a topic taught in two sessions counts twice)
+    """
+    return sum(links.order_by().count() for links in get_topic_links(records))
+
+
+def topic_count_expression():
+    """Per-record topic count, for annotating AttendanceRecord querysets."""
+    return Count('topics_covered', distinct=True) + Count('session__topics_covered', distinct=True)
+
+
+def get_session_roster(faculty, subject, date, in_time=None):
+    """
+    Students of a faculty member's class in a subject.
+    
+    Args:
+        faculty: Faculty instance
+        subject: Subject instance
+        date: Session date
+        in_time: Session start time (optional); students already marked for
+            this subject at that date and time are flagged
+        
+    Returns:
+        list: Dicts with assignment, student and already_marked, by student name
+    """
+    from apps.subjects.models import Assignment
+    
+    assignments = Assignment.objects.filter(
+        faculty=faculty,
+        subject=subject,
+        is_active=True,
+        deleted_at__isnull=True,
+        student__deleted_at__isnull=True
+    ).select_related('student').order_by('student__first_name', 'student__last_name')
+    
+    marked = set()
+    if in_time:
+        marked = set(AttendanceRecord.objects.filter(
+            assignment__in=assignments,
+            date=date,
+            in_time=in_time
+        ).values_list('assignment_id', flat=True))
+    
+    return [
+        {
+            'assignment': assignment,
+            'student': assignment.student,
+            'already_marked': assignment.pk in marked,
+        }
+        for assignment in assignments
+    ]
+
+
+def create_session(faculty, subject, date, in_time, out_time, assignments, user,
+                   topics=(), notes='', backdated_reason=''):
+    """
+    Record a class session and the attendance of its students.
+    
+    Topics are stored once on the session; every student gets a slim
+    AttendanceRecord pointing at it. Students already marked for the same
+    assignment, date and start time are skipped. The class must not
+    overlap other attendance of its students or another class of the
+    faculty member (see overlaps.py).
+    
+    Args:
+        faculty: Faculty who taught the class
+        subject: Subject taught
+        date: Session date
+        in_time: Start time
+        out_time: End time
+        assignments: Assignments of the students present (with student loaded)
+        user: User marking the attendance
+        topics: Topics covered
+        notes: Session notes
+        backdated_reason: Reason for marking a past date
+        
+    Returns:
+        tuple: (Session, list of created AttendanceRecords, list of skipped
+        Assignments); the session is None if every student was already marked
+    
+    Raises:
+        ValidationError: If a student or the faculty member is busy during
+            the class
+    """
+    from apps.centers.cache import bump_center_data_version
+    from apps.centers.counters import count_attendance
+    from apps.core.outbox import record_events
+    
+    from .overlaps import get_faculty_conflicts, get_student_conflicts
+    from .roster import mark_roster_students
+    
+    assignments = list(assignments)
+    with transaction.atomic():
+        # One query for every record of these students overlapping the class
+        already_marked = set()
+        busy = {}
+        for record in get_student_conflicts(
+            [assignment.student_id for assignment in assignments], date, in_time, out_time
+        ).select_related('student'):
+            if record.in_time == in_time:
+                already_marked.add(record.assignment_id)
+            busy.setdefault(record.student_id, record)
+        skipped = [assignment for assignment in assignments if assignment.pk in already_marked]
+        present = [assignment for assignment in assignments if assignment.pk not in already_marked]
+        if not present:
+            return None, [], skipped
+        
+        errors = [
+            f"{record.student.get_full_name()} already has attendance from "
+            f"{record.in_time:%H:%M} to {record.out_time:%H:%M}."
+            for record in (busy.get(assignment.student_id) for assignment in present)
+            if record is not None
+        ]
+        conflict = get_faculty_conflicts(faculty.pk, date, in_time, out_time).order_by('in_time').first()
+        if conflict:
+            errors.append(
+                f"You are teaching another class from {conflict.in_time:%H:%M} to {conflict.out_time:%H:%M}."
+            )
+        if errors:
+            raise ValidationError(errors)
+        
+        session = Session(
+            faculty=faculty,
+            subject=subject,
+            date=date,
+            in_time=in_time,
+            out_time=out_time,
+            notes=notes,
+            backdated_reason=backdated_reason,
+            marked_by=user,
+            created_by=user,
+            modified_by=user
+        )
+        session.save()
+        session.topics_covered.set(topics)
+        
+        records = AttendanceRecord.objects.bulk_create([
+            AttendanceRecord(
+                session=session,
+                student_id=assignment.student_id,
+                assignment=assignment,
+                date=date,
+                in_time=in_time,
+                out_time=out_time,
+                duration_minutes=session.duration_minutes,
+                notes=notes,
+                is_backdated=session.is_backdated,
+                backdated_reason=backdated_reason,
+                marked_by=user,
+                created_by=user,
+                modified_by=user
+            )
+            for assignment in present
+        ])
+        
+        # bulk_create sends no post_save, so publish the outbox events, count
+        # the records and bump the dashboards and the faculty's roster here
+        record_events(records, 'created')
+        count_attendance(records)
+        for center_id in {assignment.student.center_id for assignment in present}:
+            transaction.on_commit(lambda cid=center_id: bump_center_data_version(cid))
+        student_ids = [assignment.student_id for assignment in present]
+        transaction.on_commit(lambda: mark_roster_students(faculty.pk, date, student_ids))
+    
+    return session, records, skipped
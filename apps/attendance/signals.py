@@ -0,0 +1,67 @@
+"""
+Signal handlers that keep the today roster cache current (see roster.py).
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from apps.students.models import Student
+from apps.subjects.models import Assignment
+
+from .models import AttendanceRecord
+from .roster import invalidate_roster, mark_roster_students
+
+
+def attendance_saved(sender, instance, created, **kwargs):
+    """New attendance is added to the cached marked set; edits rebuild it."""
+    if kwargs.get('raw'):
+        return
+    faculty_id = instance.assignment.faculty_id
+    if created:
+        transaction.on_commit(
+            lambda: mark_roster_students(faculty_id, instance.date, [instance.student_id])
+        )
+    else:
+        transaction.on_commit(lambda: invalidate_roster(faculty_id, instance.date))
+
+
+def attendance_deleted(sender, instance, **kwargs):
+    faculty_id = instance.assignment.faculty_id
+    transaction.on_commit(lambda: invalidate_roster(faculty_id, instance.date))
+
+
+def assignment_faculty_changing(sender, instance, **kwargs):
+    """Remember the previous faculty, whose roster loses the assignment."""
+    if kwargs.get('raw') or not instance.pk:
+        return
+    instance._previous_faculty_id = Assignment.all_objects.filter(
+        pk=instance.pk
+    ).values_list('faculty_id', flat=True).first()
+
+
+def assignment_changed(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    faculty_ids = {instance.faculty_id, getattr(instance, '_previous_faculty_id', None)}
+    for faculty_id in faculty_ids:
+        transaction.on_commit(lambda fid=faculty_id: invalidate_roster(fid))
+
+
+def student_changed(sender, instance, **kwargs):
+    """Names, status and deletion show on every roster the student is on."""
+    if kwargs.get('raw'):
+        return
+    faculty_ids = set(Assignment.all_objects.filter(
+        student_id=instance.pk
+    ).values_list('faculty_id', flat=True))
+    for faculty_id in faculty_ids:
+        transaction.on_commit(lambda fid=faculty_id: invalidate_roster(fid))
+
+
+def connect_signals():
+    post_save.connect(attendance_saved, sender=AttendanceRecord, dispatch_uid='attendance_roster_record_save')
+    post_delete.connect(attendance_deleted, sender=AttendanceRecord, dispatch_uid='attendance_roster_record_delete')
+    pre_save.connect(assignment_faculty_changing, sender=Assignment, dispatch_uid='attendance_roster_assignment_pre_save')
+    post_save.connect(assignment_changed, sender=Assignment, dispatch_uid='attendance_roster_assignment_save')
+    post_delete.connect(assignment_changed, sender=Assignment, dispatch_uid='attendance_roster_assignment_delete')
+    post_save.connect(student_changed, sender=Student, dispatch_uid='attendance_roster_student_save')
@@ -0,0 +1,350 @@
+import datetime
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.centers.models import Center
+from apps.core.models import Notification
+from apps.core.outbox import DISPATCH_PENDING_KEY, dispatch_events
+from apps.faculty.models import Faculty
+from apps.students.models import Student
+from apps.subjects.models import Assignment, Subject, Topic
+
+from .constraints import find_violations
+from .models import AssignmentProgress, AttendanceRecord, ExpectedSession, ScheduleTemplate, Session
+from .overlaps import build_window_index, check_attendance_overlaps, find_student_overlaps
+from .progress import rebuild_assignment_progress
+from .roster import get_today_roster
+from .scheduling import backfill_attendance, materialize_expected_sessions
+from .services import create_session
+
+DAY = datetime.date(2024, 3, 4)
+
+
+def _time(value):
+    return datetime.time.fromisoformat(value)
+
+
+class AttendanceTestData(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        cls.audit = {'created_by': cls.user, 'modified_by': cls.user}
+        cls.center = Center.objects.create(
+            name='North', code='N1', address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email='north@example.com', **cls.audit
+        )
+        cls.subject = Subject.objects.create(name='Maths', code='MATH', **cls.audit)
+        cls.faculty = cls.make_faculty('f1@example.com', 'EMP1')
+        cls.other_faculty = cls.make_faculty('f2@example.com', 'EMP2')
+        cls.asha = cls.make_student('Asha', 'E1')
+        cls.vik = cls.make_student('Vik', 'E2')
+        cls.asha_assignment = cls.make_assignment(cls.asha, cls.faculty)
+        cls.vik_assignment = cls.make_assignment(cls.vik, cls.faculty)
+
+    @classmethod
+    def make_faculty(cls, email, employee_id):
+        user = User.objects.create_user(email, 'pass', first_name=employee_id, last_name='Teacher', role=User.FACULTY)
+        return Faculty.objects.create(
+            user=user, center=cls.center, employee_id=employee_id, joining_date=DAY, **cls.audit
+        )
+
+    @classmethod
+    def make_student(cls, first_name, enrollment_number):
+        return Student.objects.create(
+            center=cls.center, first_name=first_name, last_name='Rao', phone='111',
+            enrollment_number=enrollment_number, enrollment_date=DAY,
+            guardian_name='Guardian', guardian_phone='222', **cls.audit
+        )
+
+    @classmethod
+    def make_assignment(cls, student, faculty):
+        return Assignment.objects.create(
+            student=student, subject=cls.subject, faculty=faculty, start_date=DAY, **cls.audit
+        )
+
+    def mark(self, assignment, in_time, out_time, date=DAY):
+        return AttendanceRecord.objects.create(
+            student=assignment.student, assignment=assignment, date=date,
+            in_time=_time(in_time), out_time=_time(out_time),
+            marked_by=assignment.faculty.user, **self.audit
+        )
+
+
+class OutboxTestCase(AttendanceTestData):
+
+    def setUp(self):
+        cache.clear()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+
+
+class OverlapValidationTests(AttendanceTestData):
+
+    def setUp(self):
+        self.mark(self.asha_assignment, '10:00', '11:00')
+
+    def check(self, assignment, in_time, out_time):
+        check_attendance_overlaps(
+            assignment.student, assignment, DAY, _time(in_time), _time(out_time)
+        )
+
+    def test_student_cannot_attend_overlapping_classes(self):
+        other = self.make_assignment(self.asha, self.other_faculty)
+        with self.assertRaisesMessage(ValidationError, 'already has attendance'):
+            self.check(other, '10:30', '11:30')
+
+    def test_back_to_back_classes_do_not_overlap(self):
+        other = self.make_assignment(self.asha, self.other_faculty)
+        self.check(other, '11:00', '12:00')
+        self.check(other, '09:00', '10:00')
+
+    def test_faculty_cannot_teach_overlapping_classes(self):
+        with self.assertRaisesMessage(ValidationError, 'is teaching another class'):
+            self.check(self.vik_assignment, '10:30', '11:30')
+
+    def test_same_window_is_the_same_class_for_the_faculty(self):
+        self.check(self.vik_assignment, '10:00', '11:00')
+
+    def test_edited_record_does_not_conflict_with_itself(self):
+        record = AttendanceRecord.objects.get()
+        check_attendance_overlaps(
+            self.asha, self.asha_assignment, DAY, _time('10:15'), _time('11:15'), exclude_pk=record.pk
+        )
+
+    def test_window_index_checks_stored_and_batch_windows(self):
+        index = build_window_index([self.asha.pk, self.vik.pk], [self.faculty.pk], DAY, DAY)
+
+        self.assertIsNotNone(index.student_conflict(self.asha.pk, DAY, _time('10:59'), _time('12:00')))
+        self.assertIsNone(index.student_conflict(self.vik.pk, DAY, _time('10:30'), _time('11:30')))
+        self.assertIsNone(index.faculty_conflict(self.faculty.pk, DAY, _time('10:00'), _time('11:00')))
+        self.assertIsNotNone(index.faculty_conflict(self.faculty.pk, DAY, _time('10:30'), _time('11:30')))
+
+        index.add_student(self.vik.pk, DAY, _time('14:00'), _time('15:00'))
+        self.assertIsNotNone(index.student_conflict(self.vik.pk, DAY, _time('14:30'), _time('15:30')))
+
+    def test_stored_overlaps_are_reported(self):
+        other = self.make_assignment(self.asha, self.other_faculty)
+        overlapping = self.mark(other, '10:30', '11:30')
+        self.mark(other, '11:30', '12:00', date=DAY + datetime.timedelta(days=1))
+
+        pairs = list(find_student_overlaps())
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual(pairs[0][3], overlapping.pk)
+
+    def test_rows_blocking_the_constraints_are_counted(self):
+        self.assertEqual(find_violations(connection), {})
+
+        other = self.make_assignment(self.asha, self.other_faculty)
+        self.mark(other, '10:30', '11:30')
+        self.mark(other, '12:00', '11:45')
+        self.assertEqual(find_violations(connection), {
+            'student overlaps': 1, 'records ending before they start': 1,
+        })
+
+
+class TodayRosterCacheTests(AttendanceTestData):
+
+    def setUp(self):
+        cache.clear()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        self.today = timezone.now().date()
+
+    def test_roster_is_served_from_cache(self):
+        get_today_roster(self.faculty.pk)
+        with self.assertNumQueries(0):
+            roster = get_today_roster(self.faculty.pk)
+        self.assertEqual(set(roster['students']), {self.asha.pk, self.vik.pk})
+        self.assertEqual(roster['marked'], set())
+
+    def test_marking_attendance_updates_cached_roster(self):
+        get_today_roster(self.faculty.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mark(self.asha_assignment, '10:00', '11:00', date=self.today)
+
+        with self.assertNumQueries(0):
+            roster = get_today_roster(self.faculty.pk)
+        self.assertEqual(roster['marked'], {self.asha.pk})
+
+    def test_assignment_change_drops_cached_roster(self):
+        get_today_roster(self.faculty.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vik_assignment.is_active = False
+            self.vik_assignment.save()
+
+        roster = get_today_roster(self.faculty.pk)
+        self.assertEqual(set(roster['students']), {self.asha.pk})
+
+    def test_student_change_drops_cached_roster(self):
+        get_today_roster(self.faculty.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vik.first_name = 'Vikram'
+            self.vik.save()
+
+        roster = get_today_roster(self.faculty.pk)
+        self.assertEqual(roster['students'][self.vik.pk]['name'], 'Vikram Rao')
+
+
+class ReadyToTransferTests(AttendanceTestData):
+
+    def setUp(self):
+        cache.clear()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        self.center.center_heads.add(self.user)
+        self.client.force_login(self.faculty.user)
+
+    def test_center_head_is_notified(self):
+        response = self.client.post(reverse('attendance:mark'), {
+            'student': self.asha.pk, 'assignment': self.asha_assignment.pk,
+            'date': timezone.now().date().isoformat(), 'in_time': '10:00', 'out_time': '11:00',
+            'status': 'ready_to_transfer',
+        })
+
+        self.assertRedirects(response, reverse('attendance:today'), fetch_redirect_response=False)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.user)
+        self.assertEqual(notification.title, 'Student Ready for Transfer: Asha Rao')
+
+
+class SessionTests(OutboxTestCase):
+
+    def create(self, assignments, in_time='10:00', out_time='11:00', topics=()):
+        return create_session(
+            self.faculty, self.subject, DAY, _time(in_time), _time(out_time),
+            assignments, self.user, topics=topics, backdated_reason='Late entry'
+        )
+
+    def test_one_record_per_student_and_topics_on_the_session(self):
+        topic = Topic.objects.create(subject=self.subject, name='Fractions', sequence_number=1, **self.audit)
+
+        session, records, skipped = self.create([self.asha_assignment, self.vik_assignment], topics=[topic])
+
+        self.assertEqual(skipped, [])
+        self.assertEqual(
+            sorted(AttendanceRecord.objects.filter(session=session).values_list('student_id', flat=True)),
+            sorted([self.asha.pk, self.vik.pk])
+        )
+        self.assertEqual(list(session.topics_covered.all()), [topic])
+        self.assertFalse(AttendanceRecord.topics_covered.through.objects.exists())
+        self.assertEqual({record.duration_minutes for record in records}, {60})
+
+    def test_students_already_marked_are_skipped(self):
+        self.mark(self.asha_assignment, '10:00', '11:00')
+
+        session, records, skipped = self.create([self.asha_assignment, self.vik_assignment])
+
+        self.assertEqual(skipped, [self.asha_assignment])
+        self.assertEqual([record.student_id for record in records], [self.vik.pk])
+        self.assertEqual(AttendanceRecord.objects.filter(student=self.asha).count(), 1)
+
+        self.assertEqual(self.create([self.asha_assignment, self.vik_assignment])[:2], (None, []))
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_busy_student_rejects_the_class(self):
+        self.mark(self.make_assignment(self.asha, self.other_faculty), '10:30', '11:30')
+
+        with self.assertRaisesMessage(ValidationError, 'already has attendance'):
+            self.create([self.asha_assignment, self.vik_assignment])
+        self.assertFalse(Session.objects.exists())
+
+
+class ScheduleTests(OutboxTestCase):
+
+    def schedule(self, assignment, weekdays, in_time='16:00', out_time='17:00'):
+        return ScheduleTemplate.objects.create(
+            assignment=assignment, weekdays=weekdays, in_time=_time(in_time),
+            out_time=_time(out_time), valid_from=DAY, **self.audit
+        )
+
+    def test_expected_sessions_are_created_once(self):
+        # DAY is a Monday
+        self.schedule(self.asha_assignment, [0, 2])
+        self.schedule(self.vik_assignment, [0])
+        schedules = ScheduleTemplate.objects.all()
+        end = DAY + datetime.timedelta(days=6)
+
+        self.assertEqual(materialize_expected_sessions(schedules, DAY, end), 3)
+        self.assertEqual(materialize_expected_sessions(schedules, DAY, end), 0)
+        self.assertEqual(
+            list(ExpectedSession.objects.filter(student=self.asha).values_list('date', flat=True)),
+            [DAY, DAY + datetime.timedelta(days=2)]
+        )
+
+    def test_backfill_counts_marked_and_conflicting_slots(self):
+        self.schedule(self.asha_assignment, [0, 2])
+        self.schedule(self.vik_assignment, [0])
+        materialize_expected_sessions(ScheduleTemplate.objects.all(), DAY, DAY + datetime.timedelta(days=6))
+        self.mark(self.asha_assignment, '16:00', '17:00')
+        self.mark(
+            self.make_assignment(self.asha, self.other_faculty), '16:30', '17:30',
+            date=DAY + datetime.timedelta(days=2)
+        )
+
+        result = backfill_attendance(ExpectedSession.objects.all(), self.user, 'Register import')
+
+        self.assertEqual(result, {'sessions': 1, 'records': 1, 'skipped': 1, 'conflicts': 1})
+        record = AttendanceRecord.objects.get(student=self.vik)
+        self.assertEqual((record.date, record.in_time), (DAY, _time('16:00')))
+        self.assertEqual(record.session.faculty, self.faculty)
+        self.assertEqual(backfill_attendance(ExpectedSession.objects.all(), self.user, 'Again')['records'], 0)
+
+
+class AssignmentProgressTests(OutboxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.topics = [
+            Topic.objects.create(subject=self.subject, name=f'Topic {number}', sequence_number=number, **self.audit)
+            for number in (1, 2, 3, 4)
+        ]
+
+    def progress(self):
+        return {
+            row['assignment_id']: row
+            for row in AssignmentProgress.objects.values(
+                'assignment_id', 'student_id', 'covered_topics', 'total_topics',
+                'percent_complete', 'session_count', 'last_session_date'
+            )
+        }
+
+    def assert_matches_rebuild(self):
+        refreshed = self.progress()
+        AssignmentProgress.objects.all().delete()
+        rebuild_assignment_progress()
+        self.assertEqual(refreshed, self.progress())
+        return refreshed
+
+    def test_refresh_matches_a_full_rebuild(self):
+        record = self.mark(self.asha_assignment, '09:00', '10:00')
+        record.topics_covered.set(self.topics[:1])
+        create_session(
+            self.faculty, self.subject, DAY + datetime.timedelta(days=1), _time('10:00'), _time('11:00'),
+            [self.asha_assignment, self.vik_assignment], self.user,
+            topics=self.topics[1:3], backdated_reason='Late entry'
+        )
+        dispatch_events()
+
+        progress = self.assert_matches_rebuild()
+        self.assertEqual(progress[self.asha_assignment.pk]['covered_topics'], 3)
+        self.assertEqual(progress[self.asha_assignment.pk]['session_count'], 2)
+        self.assertEqual(str(progress[self.vik_assignment.pk]['percent_complete']), '50.00')
+
+        self.topics[3].is_active = False
+        self.topics[3].save()
+        record.delete()
+        dispatch_events()
+
+        progress = self.assert_matches_rebuild()
+        self.assertEqual(progress[self.asha_assignment.pk]['covered_topics'], 2)
+        self.assertEqual(str(progress[self.asha_assignment.pk]['percent_complete']), '66.67')
+        self.assertEqual(progress[self.asha_assignment.pk]['session_count'], 1)
@@ -10,6 +10,7 @@ app_name = 'attendance'
 urlpatterns = [
     path('today/', views.TodayAttendanceView.as_view(), name='today'),
     path('mark/', views.MarkAttendanceView.as_view(), name='mark'),
+    path('mark/session/', views.MarkSessionView.as_view(), name='mark_session'),
     path('history/', views.AttendanceHistoryView.as_view(), name='history'),
     
     # AJAX endpoints
@@ -2,21 +2,30 @@
 Views for attendance management.
 """
 
+import logging
+
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import render, redirect, get_object_or_404
+from django.db import DatabaseError, transaction
+from django.shortcuts import render, redirect
 from django.views import View
-from django.views.generic import ListView, CreateView
+from django.views.generic import ListView, CreateView, FormView
 from django.contrib import messages
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.http import JsonResponse
 
 from apps.core.mixins import FacultyRequiredMixin, SetCreatedByMixin, AuditLogMixin
+from apps.core.principal import get_principal
 from .models import AttendanceRecord
-from .forms import AttendanceForm
-from .services import get_today_attendance_for_faculty, get_faculty_attendance_stats
-from apps.subjects.models import Topic, Assignment
-from apps.students.models import Student
+from .forms import AttendanceForm, SessionForm
+from .services import (
+    create_session, get_faculty_attendance_stats, get_session_roster,
+    get_today_attendance_for_faculty,
+)
+from .roster import get_assignment_subject, get_today_roster, get_unmarked_students
+from apps.subjects.models import Topic
+
+logger = logging.getLogger(__name__)
 
 
 class TodayAttendanceView(LoginRequiredMixin, FacultyRequiredMixin, ListView):
@@ -29,12 +38,12 @@ class TodayAttendanceView(LoginRequiredMixin, FacultyRequiredMixin, ListView):
     
     def get_queryset(self):
         """Get today's attendance for this faculty."""
-        faculty = self.request.user.faculty_profile
+        faculty = get_principal(self.request).faculty_profile
         return get_today_attendance_for_faculty(faculty)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        faculty = self.request.user.faculty_profile
+        faculty = get_principal(self.request).faculty_profile
         
         # Get today's stats
         today = timezone.now().date()
@@ -43,6 +52,7 @@ class TodayAttendanceView(LoginRequiredMixin, FacultyRequiredMixin, ListView):
         context['today'] = today
         context['stats'] = stats
         context['faculty'] = faculty
+        context['unmarked_count'] = len(get_unmarked_students(get_today_roster(faculty.pk, today)))
         
         return context
 
@@ -60,7 +70,7 @@ class MarkAttendanceView(LoginRequiredMixin, FacultyRequiredMixin, SetCreatedByM
     def get_form_kwargs(self):
         """Pass faculty to form."""
         kwargs = super().get_form_kwargs()
-        kwargs['faculty'] = self.request.user.faculty_profile
+        kwargs['faculty'] = get_principal(self.request).faculty_profile
         return kwargs
     
     def form_invalid(self, form):
@@ -123,19 +133,20 @@ class MarkAttendanceView(LoginRequiredMixin, FacultyRequiredMixin, SetCreatedByM
         # Handle Ready to Transfer status
         elif status == 'ready_to_transfer':
             # Create notification for center admin
-            from apps.core.services import create_notification
+            from apps.core.services import notify_many
             try:
                 center_head = student.center.center_heads.first()
                 if center_head:
-                    create_notification(
-                        user=center_head.user,
-                        title=f"Student Ready for Transfer: {student.get_full_name()}",
-                        message=f"Student {student.get_full_name()} has been marked as ready to transfer by {self.request.user.get_full_name()}.",
-                        notification_type='info',
-                        action_url=f'/students/{student.id}/'
-                    )
-            except Exception as e:
-                print(f"Notification error: {e}")  # Log error
+                    with transaction.atomic():
+                        notify_many(
+                            [center_head],
+                            title=f"Student Ready for Transfer: {student.get_full_name()}",
+                            message=f"Student {student.get_full_name()} has been marked as ready to transfer by {self.request.user.get_full_name()}.",
+                            notification_type='info',
+                            action_url=f'/students/{student.id}/'
+                        )
+            except DatabaseError:
+                logger.exception("Ready-to-transfer notification failed for student %s", student.pk)
             
             messages.info(
                 self.request,
@@ -153,6 +164,95 @@ class MarkAttendanceView(LoginRequiredMixin, FacultyRequiredMixin, SetCreatedByM
         return response
 
 
+class MarkSessionView(LoginRequiredMixin, FacultyRequiredMixin, FormView):
+    """
+    Roster view to mark attendance for a whole class at once.
+    
+    Choosing a subject lists the faculty's students in it; the checked
+    students are marked present for one session whose topics are stored
+    once.
+    """
+    form_class = SessionForm
+    template_name = 'attendance/mark_session.html'
+    success_url = reverse_lazy('attendance:today')
+    
+    def get_initial(self):
+        initial = super().get_initial()
+        if self.request.GET.get('subject'):
+            initial['subject'] = self.request.GET['subject']
+        return initial
+    
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['faculty'] = get_principal(self.request).faculty_profile
+        return kwargs
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = context['form']
+        subject_id = form['subject'].value()
+        roster = []
+        if subject_id:
+            subject = form.fields['subject'].queryset.filter(pk=subject_id).first()
+            if subject:
+                cleaned = getattr(form, 'cleaned_data', {})
+                roster = get_session_roster(
+                    get_principal(self.request).faculty_profile,
+                    subject,
+                    cleaned.get('date') or timezone.now().date(),
+                    cleaned.get('in_time')
+                )
+        
+        selected = {str(value) for value in (form['assignments'].value() or [])}
+        for entry in roster:
+            entry['checked'] = not form.is_bound or str(entry['assignment'].pk) in selected
+        context['roster'] = roster
+        return context
+    
+    def form_valid(self, form):
+        from django.core.exceptions import ValidationError
+        from apps.core.models import AuditLog
+        
+        data = form.cleaned_data
+        try:
+            session, records, skipped = create_session(
+                faculty=get_principal(self.request).faculty_profile,
+                subject=data['subject'],
+                date=data['date'],
+                in_time=data['in_time'],
+                out_time=data['out_time'],
+                assignments=data['assignments'],
+                user=self.request.user,
+                topics=data['topics_covered'],
+                notes=data['notes'],
+                backdated_reason=data['backdated_reason']
+            )
+        except ValidationError as exc:
+            form.add_error(None, exc)
+            return self.form_invalid(form)
+        if session is None:
+            form.add_error(None, 'All selected students are already marked for this session.')
+            return self.form_invalid(form)
+        
+        AuditLog.log_action(
+            user=self.request.user,
+            action='CREATE',
+            obj=session,
+            changes={'students': len(records)},
+            request=self.request,
+        )
+        
+        messages.success(
+            self.request,
+            f'Attendance marked for {len(records)} student{"s" if len(records) != 1 else ""} - '
+            f'{session.duration_minutes} minutes, {len(data["topics_covered"])} topics covered'
+        )
+        if skipped:
+            names = ', '.join(assignment.student.get_full_name() for assignment in skipped)
+            messages.warning(self.request, f'Already marked for this session: {names}')
+        return super().form_valid(form)
+
+
 class AttendanceHistoryView(LoginRequiredMixin, FacultyRequiredMixin, ListView):
     """
     View to show attendance history for faculty.
@@ -164,18 +264,18 @@ class AttendanceHistoryView(LoginRequiredMixin, FacultyRequiredMixin, ListView):
     
     def get_queryset(self):
         """Get attendance history for this faculty."""
-        faculty = self.request.user.faculty_profile
+        faculty = get_principal(self.request).faculty_profile
         return AttendanceRecord.objects.filter(
             marked_by=faculty.user
         ).select_related(
-            'student', 'assignment__subject'
+            'student', 'assignment__subject', 'session'
         ).prefetch_related(
-            'topics_covered'
+            'topics_covered', 'session__topics_covered'
         ).order_by('-date', '-in_time')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        faculty = self.request.user.faculty_profile
+        faculty = get_principal(self.request).faculty_profile
         
         # Get overall stats
         stats = get_faculty_attendance_stats(faculty)
@@ -194,16 +294,16 @@ class GetTopicsBySubjectView(LoginRequiredMixin, FacultyRequiredMixin, View):
     
     def get(self, request, assignment_id):
         try:
-            # Get the assignment
-            assignment = get_object_or_404(Assignment, pk=assignment_id)
-            
             # Verify faculty has access to this assignment
-            if assignment.faculty != request.user.faculty_profile:
+            assignment = get_assignment_subject(
+                get_today_roster(get_principal(request).faculty_profile.pk), assignment_id
+            )
+            if assignment is None:
                 return JsonResponse({'error': 'Permission denied'}, status=403)
             
             # Get topics for the subject
             topics = Topic.objects.filter(
-                subject=assignment.subject,
+                subject_id=assignment['subject_id'],
                 deleted_at__isnull=True
             ).order_by('sequence_number', 'name')
             
@@ -220,11 +320,9 @@ class GetTopicsBySubjectView(LoginRequiredMixin, FacultyRequiredMixin, View):
             return JsonResponse({
                 'status': 'success',
                 'topics': topics_data,
-                'subject_name': assignment.subject.name
+                'subject_name': assignment['subject_name']
             })
             
-        except Assignment.DoesNotExist:
-            return JsonResponse({'error': 'Assignment not found'}, status=404)
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
 
@@ -237,38 +335,8 @@ class GetStudentsWithoutTodayAttendanceView(LoginRequiredMixin, FacultyRequiredM
     
     def get(self, request):
         try:
-            faculty = request.user.faculty_profile
-            today = timezone.now().date()
-            
-            # Get students who already have attendance today
-            students_with_attendance_today = AttendanceRecord.objects.filter(
-                marked_by=request.user,
-                date=today
-            ).values_list('student_id', flat=True).distinct()
-            
-            # Get all active students assigned to this faculty
-            student_ids = faculty.assignments.filter(
-                is_active=True
-            ).values_list('student_id', flat=True).distinct()
-            
-            # Filter out students who already have attendance
-            students = Student.objects.filter(
-                id__in=student_ids,
-                deleted_at__isnull=True
-            ).exclude(
-                id__in=students_with_attendance_today
-            ).select_related('center')
-            
-            # Format response
-            students_data = [
-                {
-                    'id': student.id,
-                    'name': student.get_full_name(),
-                    'enrollment_number': student.enrollment_number,
-                    'center': student.center.name if student.center else ''
-                }
-                for student in students
-            ]
+            roster = get_today_roster(get_principal(request).faculty_profile.pk)
+            students_data = get_unmarked_students(roster)
             
             return JsonResponse({
                 'status': 'success',
@@ -288,27 +356,20 @@ class GetStudentSubjectsView(LoginRequiredMixin, FacultyRequiredMixin, View):
     
     def get(self, request, student_id):
         try:
-            faculty = request.user.faculty_profile
-            
-            # Get assignments for this student and faculty
-            assignments = Assignment.objects.filter(
-                student_id=student_id,
-                faculty=faculty,
-                is_active=True,
-                deleted_at__isnull=True
-            ).select_related('subject', 'student')
+            roster = get_today_roster(get_principal(request).faculty_profile.pk)
             
             # Verify faculty has access to this student
-            if not assignments.exists():
+            assignments = roster['assignments'].get(student_id)
+            if not assignments:
                 return JsonResponse({'error': 'No assignments found for this student'}, status=404)
             
             # Format response
             assignments_data = [
                 {
-                    'id': assignment.id,
-                    'subject_id': assignment.subject.id,
-                    'subject_name': assignment.subject.name,
-                    'subject_code': assignment.subject.code if hasattr(assignment.subject, 'code') else '',
+                    'id': assignment['id'],
+                    'subject_id': assignment['subject_id'],
+                    'subject_name': assignment['subject_name'],
+                    'subject_code': assignment['subject_code'],
                 }
                 for assignment in assignments
             ]
@@ -316,11 +377,9 @@ class GetStudentSubjectsView(LoginRequiredMixin, FacultyRequiredMixin, View):
             return JsonResponse({
                 'status': 'success',
                 'assignments': assignments_data,
-                'student_name': assignments.first().student.get_full_name(),
+                'student_name': roster['students'][student_id]['name'],
                 'count': len(assignments_data)
             })
             
-        except Assignment.DoesNotExist:
-            return JsonResponse({'error': 'No assignments found'}, status=404)
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
@@ -5,3 +5,7 @@ class CentersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.centers'
     verbose_name = 'Centers'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
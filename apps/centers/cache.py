@@ -0,0 +1,187 @@
+"""
+Per-center data versioning and dashboard section cache.
+
+Every write that affects a center's dashboards bumps that center's data
+version (see signals.py). Dashboard sections are cached under a key that
+includes the version, so a write makes all of that center's cached sections
+unreachable at once while other centers keep their entries.
+
+The page chrome's center lookups (the master account's active center and
+the center switcher list) are cached too and dropped when a center is
+saved or deleted.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'center_data_version:{center_id}'
+SECTION_KEY = 'center_dashboard:{center_id}:v{version}:{section}'
+CENTER_KEY = 'center:{center_id}'
+SWITCH_CENTERS_KEY = 'center_switch_list'
+
+
+def _initial_version():
+    # Seed from the clock so a version key evicted from the cache never
+    # restarts below a version that may still have live section entries.
+    return int(time.time() * 1000)
+
+
+def get_center_data_version(center_id):
+    """
+    Get the current data version of a center.
+
+    Args:
+        center_id: Center primary key
+
+    Returns:
+        int: Monotonically increasing version number
+    """
+    key = VERSION_KEY.format(center_id=center_id)
+    version = cache.get(key)
+    if version is None:
+        version = _initial_version()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_center_data_version(center_id):
+    """
+    Invalidate all cached dashboard sections of a center.
+
+    Args:
+        center_id: Center primary key (None is ignored)
+
+    Returns:
+        int: The new version, or None if no center was given
+    """
+    if center_id is None:
+        return None
+    key = VERSION_KEY.format(center_id=center_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def get_cached_section(center_id, section, builder, version=None, timeout=None):
+    """
+    Return a cached dashboard section, building it on a miss.
+
+    Args:
+        center_id: Center primary key
+        section: Section name (include any date or parameters it depends on)
+        builder: Callable returning the section data (must be picklable)
+        version: Data version to use; pass the same value for every section
+            of one page so they are consistent with each other
+        timeout: Cache timeout in seconds (defaults to DASHBOARD_CACHE_TTL)
+
+    Returns:
+        The section data
+    """
+    if version is None:
+        version = get_center_data_version(center_id)
+    key = SECTION_KEY.format(center_id=center_id, version=version, section=section)
+
+    data = cache.get(key)
+    if data is None:
+        data = builder()
+        cache.set(key, data, timeout or settings.DASHBOARD_CACHE_TTL)
+    return data
+
+
+def get_cached_sections(center_ids, section, builder, timeout=None):
+    """
+    Return one cached section for each of several centers, building the misses together.
+
+    Args:
+        center_ids: Iterable of center primary keys
+        section: Section name (include any date or parameters it depends on)
+        builder: Callable taking the list of center ids without a cache
+            entry and returning a dict of center id -> section data
+        timeout: Cache timeout in seconds (defaults to DASHBOARD_CACHE_TTL)
+
+    Returns:
+        dict: center id -> section data
+    """
+    center_ids = list(dict.fromkeys(center_ids))
+    if not center_ids:
+        return {}
+
+    version_keys = {VERSION_KEY.format(center_id=center_id): center_id for center_id in center_ids}
+    versions = {version_keys[key]: version for key, version in cache.get_many(list(version_keys)).items()}
+    for center_id in center_ids:
+        if center_id not in versions:
+            versions[center_id] = get_center_data_version(center_id)
+
+    section_keys = {
+        SECTION_KEY.format(center_id=center_id, version=versions[center_id], section=section): center_id
+        for center_id in center_ids
+    }
+    sections = {section_keys[key]: data for key, data in cache.get_many(list(section_keys)).items()}
+
+    missing = [center_id for center_id in center_ids if center_id not in sections]
+    if missing:
+        built = builder(missing)
+        cache.set_many(
+            {
+                SECTION_KEY.format(center_id=center_id, version=versions[center_id], section=section): built[center_id]
+                for center_id in missing
+            },
+            timeout or settings.DASHBOARD_CACHE_TTL
+        )
+        sections.update(built)
+    return sections
+
+
+def get_cached_center(center_id):
+    """
+    Return a center that is not deleted, from the cache when possible.
+
+    The counter columns are left out of the cached copy and load from the
+    database if read (they change with every student and attendance write).
+
+    Args:
+        center_id: Center primary key
+
+    Returns:
+        Center: The center, or None if it does not exist or is deleted
+    """
+    from .models import Center
+
+    key = CENTER_KEY.format(center_id=center_id)
+    center = cache.get(key)
+    if center is None:
+        center = Center.objects.defer(*Center.counter_fields).filter(pk=center_id).first()
+        if center is None:
+            return None
+        cache.set(key, center, settings.LAYOUT_CACHE_TTL)
+    return center
+
+
+def get_switch_centers():
+    """
+    Active centers for the master account's center switcher.
+
+    Returns:
+        list: Dicts with id, name, code and city, ordered by name
+    """
+    centers = cache.get(SWITCH_CENTERS_KEY)
+    if centers is None:
+        from .models import Center
+
+        centers = list(Center.objects.filter(
+            deleted_at__isnull=True,
+            is_active=True
+        ).order_by('name').values('id', 'name', 'code', 'city'))
+        cache.set(SWITCH_CENTERS_KEY, centers, settings.LAYOUT_CACHE_TTL)
+    return centers
+
+
+def invalidate_center_cache(center_id):
+    """Drop the cached copy of a center and the switcher list."""
+    cache.delete_many([CENTER_KEY.format(center_id=center_id), SWITCH_CENTERS_KEY])
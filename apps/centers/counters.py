@@ -0,0 +1,271 @@
+"""
+Denormalized counter columns of centers, faculty and subjects.
+
+List pages sort and filter on plain columns instead of joining and
+counting on every render:
+
+- Center: student_count, active_student_count, faculty_count,
+  assignment_count, attendance_this_month
+- Faculty: assignment_count, attendance_this_month
+- Subject: topic_count, assignment_count
+
+Signals (signals.py) compare what a row counted towards before and after
+each save or delete and apply the difference with one F() UPDATE per
+counter row, in the same transaction as the write. Bulk writes call
+count_attendance() or reconcile_counters(), which recomputes the columns
+with grouped queries and writes only those that drifted; it also runs
+nightly (manage.py reconcile_counters, apps.centers.tasks) and filled the
+columns when they were added (migration centers 0004_fill_counters).
+
+attendance_this_month counts records dated in attendance_month; the
+first record of a new month restarts it from zero.
+"""
+
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+
+def _models():
+    from apps.faculty.models import Faculty
+    from apps.students.models import Student
+    from apps.subjects.models import Assignment, Subject, Topic
+
+    from .models import Center
+    return Center, Faculty, Subject, Student, Assignment, Topic
+
+
+def contributions(instance, center_id=None):
+    """
+    Counters a row currently counts towards.
+
+    Args:
+        instance: Student, Faculty, Assignment or Topic
+        center_id: Center of an assignment's student (looked up if omitted)
+
+    Returns:
+        list: (counter model, counter row id, field) tuples
+    """
+    Center, Faculty, Subject, Student, Assignment, Topic = _models()
+
+    if instance.is_deleted:
+        return []
+    if isinstance(instance, Student):
+        keys = [(Center, instance.center_id, 'student_count')]
+        if instance.status == 'active':
+            keys.append((Center, instance.center_id, 'active_student_count'))
+        return keys
+    if isinstance(instance, Faculty):
+        return [(Center, instance.center_id, 'faculty_count')]
+    if isinstance(instance, Assignment):
+        if not instance.is_active:
+            return []
+        if center_id is None:
+            center_id = Student.all_objects.filter(pk=instance.student_id).values_list('center_id', flat=True).first()
+        return [
+            (Center, center_id, 'assignment_count'),
+            (Faculty, instance.faculty_id, 'assignment_count'),
+            (Subject, instance.subject_id, 'assignment_count'),
+        ]
+    if isinstance(instance, Topic):
+        return [(Subject, instance.subject_id, 'topic_count')] if instance.is_active else []
+    return []
+
+
+def previous_contributions(instance):
+    """Counters the stored version of a row counts towards (before a save)."""
+    Center, Faculty, Subject, Student, Assignment, Topic = _models()
+
+    if not instance.pk:
+        return []
+    queryset = type(instance).all_objects.filter(pk=instance.pk)
+    if isinstance(instance, Assignment):
+        queryset = queryset.select_related('student')
+    previous = queryset.first()
+    if previous is None:
+        return []
+    if isinstance(previous, Assignment):
+        return contributions(previous, center_id=previous.student.center_id)
+    return contributions(previous)
+
+
+def apply_counter_changes(before, after):
+    """
+    Apply the difference between two contribution lists.
+
+    Args:
+        before: Contributions before the write
+        after: Contributions after the write
+    """
+    changes = Counter(after)
+    changes.subtract(Counter(before))
+    by_row = defaultdict(dict)
+    for (model, pk, field), delta in changes.items():
+        if delta and pk is not None:
+            by_row[model, pk][field] = delta
+
+    for (model, pk), deltas in by_row.items():
+        model.all_objects.filter(pk=pk).update(**{
+            field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()
+        })
+
+
+def _add_attendance(model, counts, month):
+    for pk, count in counts.items():
+        if pk is None or not count:
+            continue
+        if count > 0:
+            model.all_objects.filter(pk=pk).update(
+                attendance_this_month=Case(
+                    When(attendance_month=month, then=F('attendance_this_month') + count),
+                    default=Value(count)
+                ),
+                attendance_month=month
+            )
+        else:
+            model.all_objects.filter(pk=pk, attendance_month=month).update(
+                attendance_this_month=Greatest(F('attendance_this_month') + count, 0)
+            )
+
+
+def count_attendance(records, sign=1):
+    """
+    Add (or with sign=-1 remove) attendance records to the monthly counters.
+
+    Records dated outside the current month do not count.
+
+    Args:
+        records: AttendanceRecord instances
+        sign: 1 for created records, -1 for deleted ones
+    """
+    Center, Faculty, Subject, Student, Assignment, Topic = _models()
+
+    month = timezone.now().date().replace(day=1)
+    records = [record for record in records if record.date.replace(day=1) == month]
+    if not records:
+        return
+
+    student_centers = dict(Student.all_objects.filter(
+        pk__in={record.student_id for record in records}
+    ).values_list('pk', 'center_id'))
+    assignment_faculty = dict(Assignment.all_objects.filter(
+        pk__in={record.assignment_id for record in records}
+    ).values_list('pk', 'faculty_id'))
+
+    center_counts = Counter()
+    faculty_counts = Counter()
+    for record in records:
+        center_counts[student_centers.get(record.student_id)] += sign
+        faculty_counts[assignment_faculty.get(record.assignment_id)] += sign
+    _add_attendance(Center, center_counts, month)
+    _add_attendance(Faculty, faculty_counts, month)
+
+
+def _grouped(queryset, group_field, **aggregates):
+    return {
+        row[group_field]: row
+        for row in queryset.order_by().values(group_field).annotate(**aggregates)
+    }
+
+
+def _write_drift(model, queryset, expected, fields):
+    """Save the rows whose counters differ from the expected values."""
+    drifted = []
+    for row in queryset.only('pk', *fields):
+        values = expected(row.pk)
+        if any(getattr(row, field) != values[field] for field in fields):
+            for field in fields:
+                setattr(row, field, values[field])
+            drifted.append(row)
+    model.all_objects.bulk_update(drifted, fields, batch_size=500)
+    return len(drifted)
+
+
+def reconcile_counters(center=None):
+    """
+    Recompute the counter columns and repair the ones that drifted.
+
+    Args:
+        center: Center object (optional, defaults to all centers); subject
+            counters span centers and are always reconciled
+
+    Returns:
+        dict: Number of repaired 'centers', 'faculty' and 'subjects' rows
+    """
+    from apps.attendance.models import AttendanceRecord
+
+    Center, Faculty, Subject, Student, Assignment, Topic = _models()
+
+    month = timezone.now().date().replace(day=1)
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    live_assignments = Assignment.objects.filter(is_active=True)
+    month_attendance = AttendanceRecord.objects.filter(date__gte=month, date__lt=next_month)
+
+    centers = Center.all_objects.all()
+    faculty = Faculty.all_objects.all()
+    students = Student.objects.all()
+    if center:
+        centers = centers.filter(pk=center.pk)
+        faculty = faculty.filter(center=center)
+        students = students.filter(center=center)
+        live_assignments_of_center = live_assignments.filter(student__center=center)
+        month_attendance_of_center = month_attendance.filter(student__center=center)
+    else:
+        live_assignments_of_center = live_assignments
+        month_attendance_of_center = month_attendance
+
+    student_counts = _grouped(
+        students, 'center_id', total=Count('pk'), active=Count('pk', filter=Q(status='active'))
+    )
+    faculty_counts = _grouped(faculty.filter(is_deleted=False), 'center_id', total=Count('pk'))
+    center_assignments = _grouped(live_assignments_of_center, 'student__center_id', total=Count('pk'))
+    center_attendance = _grouped(month_attendance_of_center, 'student__center_id', total=Count('pk'))
+
+    def center_values(pk):
+        return {
+            'student_count': student_counts.get(pk, {}).get('total', 0),
+            'active_student_count': student_counts.get(pk, {}).get('active', 0),
+            'faculty_count': faculty_counts.get(pk, {}).get('total', 0),
+            'assignment_count': center_assignments.get(pk, {}).get('total', 0),
+            'attendance_this_month': center_attendance.get(pk, {}).get('total', 0),
+            'attendance_month': month,
+        }
+
+    faculty_assignments = _grouped(
+        live_assignments.filter(faculty__in=faculty.values('pk')), 'faculty_id', total=Count('pk')
+    )
+    faculty_attendance = _grouped(
+        month_attendance.filter(assignment__faculty__in=faculty.values('pk')), 'assignment__faculty_id', total=Count('pk')
+    )
+
+    def faculty_values(pk):
+        return {
+            'assignment_count': faculty_assignments.get(pk, {}).get('total', 0),
+            'attendance_this_month': faculty_attendance.get(pk, {}).get('total', 0),
+            'attendance_month': month,
+        }
+
+    subject_topics = _grouped(Topic.objects.filter(is_active=True), 'subject_id', total=Count('pk'))
+    subject_assignments = _grouped(live_assignments, 'subject_id', total=Count('pk'))
+
+    def subject_values(pk):
+        return {
+            'topic_count': subject_topics.get(pk, {}).get('total', 0),
+            'assignment_count': subject_assignments.get(pk, {}).get('total', 0),
+        }
+
+    return {
+        'centers': _write_drift(Center, centers, center_values, [
+            'student_count', 'active_student_count', 'faculty_count', 'assignment_count',
+            'attendance_this_month', 'attendance_month',
+        ]),
+        'faculty': _write_drift(Faculty, faculty, faculty_values, [
+            'assignment_count', 'attendance_this_month', 'attendance_month',
+        ]),
+        'subjects': _write_drift(Subject, Subject.all_objects.all(), subject_values, [
+            'topic_count', 'assignment_count',
+        ]),
+    }
@@ -0,0 +1,32 @@
+"""
+Management command to repair drifted counter columns of centers, faculty and subjects.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.centers.counters import reconcile_counters
+from apps.centers.models import Center
+
+
+class Command(BaseCommand):
+    help = 'Recompute the counter columns of centers, faculty and subjects and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--center',
+            type=int,
+            help='Only reconcile this center and its faculty (ID); subjects are always reconciled',
+        )
+
+    def handle(self, *args, **options):
+        center = None
+        if options['center']:
+            center = Center.objects.filter(pk=options['center']).first()
+            if center is None:
+                raise CommandError(f"Center {options['center']} does not exist")
+
+        repaired = reconcile_counters(center)
+        self.stdout.write(self.style.SUCCESS(
+            f"Repaired counters of {repaired['centers']} centers, "
+            f"{repaired['faculty']} faculty and {repaired['subjects']} subjects"
+        ))
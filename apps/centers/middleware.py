@@ -4,7 +4,9 @@ T118: Center context middleware for session-based center switching.
 """
 
 from django.utils.deprecation import MiddlewareMixin
-from .models import Center
+
+from apps.core.principal import get_principal
+from .cache import get_cached_center
 
 
 class CenterContextMiddleware(MiddlewareMixin):
@@ -25,25 +27,18 @@ class CenterContextMiddleware(MiddlewareMixin):
         if request.user.is_master_account:
             center_id = request.session.get('active_center_id')
             if center_id:
-                try:
-                    center = Center.objects.get(pk=center_id, deleted_at__isnull=True)
+                center = get_cached_center(center_id)
+                if center:
                     request.active_center = center
                     request.active_center_name = center.name
-                except Center.DoesNotExist:
+                else:
                     # Clear invalid center from session
                     request.session.pop('active_center_id', None)
                     request.session.pop('active_center_name', None)
         
-        # Center heads: Get their assigned center
-        elif request.user.is_center_head:
-            if hasattr(request.user, 'center_head_profile'):
-                center = request.user.center_head_profile.center
-                request.active_center = center
-                request.active_center_name = center.name
-        
-        # Faculty: Get their assigned center
-        elif request.user.is_faculty_member:
-            if hasattr(request.user, 'faculty_profile'):
-                center = request.user.faculty_profile.center
+        # Center heads and faculty: Get their assigned center
+        else:
+            center = get_principal(request).center
+            if center:
                 request.active_center = center
                 request.active_center_name = center.name
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('centers', '0002_centerhead'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='center',
+            name='active_student_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Active students'),
+        ),
+        migrations.AddField(
+            model_name='center',
+            name='assignment_count',
+            field=models.PositiveIntegerField(default=0, help_text="Active assignments of the center's students"),
+        ),
+        migrations.AddField(
+            model_name='center',
+            name='attendance_month',
+            field=models.DateField(blank=True, help_text='Month counted by attendance_this_month', null=True),
+        ),
+        migrations.AddField(
+            model_name='center',
+            name='attendance_this_month',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Attendance records dated in attendance_month'),
+        ),
+        migrations.AddField(
+            model_name='center',
+            name='faculty_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Faculty members not deleted'),
+        ),
+        migrations.AddField(
+            model_name='center',
+            name='student_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Students not deleted'),
+        ),
+    ]
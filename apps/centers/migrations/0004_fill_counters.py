@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def fill_counters(apps, schema_editor):
+    # The live reconciliation (apps/centers/counters.py) knows which rows
+    # count; it only reads and writes the columns it needs.
+    from apps.centers.counters import reconcile_counters
+
+    reconcile_counters()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('centers', '0003_counters'),
+        ('faculty', '0003_counters'),
+        ('subjects', '0003_counters'),
+        ('students', '0001_initial'),
+        ('attendance', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
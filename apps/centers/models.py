@@ -3,10 +3,11 @@ Center models for Disha LMS.
 """
 
 from django.db import models
-from apps.core.models import TimeStampedModel, SoftDeleteModel
+from django.utils import timezone
+from apps.core.models import CounterFieldsMixin, TimeStampedModel, SoftDeleteModel
 
 
-class Center(TimeStampedModel, SoftDeleteModel):
+class Center(CounterFieldsMixin, TimeStampedModel, SoftDeleteModel):
     """
     Learning center model.
     Represents a physical location where teaching happens.
@@ -30,6 +31,22 @@ class Center(TimeStampedModel, SoftDeleteModel):
     
     is_active = models.BooleanField(default=True)
     
+    # Counters kept current by signals (see counters.py)
+    student_count = models.PositiveIntegerField(default=0, db_index=True, help_text="Students not deleted")
+    active_student_count = models.PositiveIntegerField(default=0, db_index=True, help_text="Active students")
+    faculty_count = models.PositiveIntegerField(default=0, db_index=True, help_text="Faculty members not deleted")
+    assignment_count = models.PositiveIntegerField(default=0, help_text="Active assignments of the center's students")
+    attendance_this_month = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        help_text="Attendance records dated in attendance_month"
+    )
+    attendance_month = models.DateField(null=True, blank=True, help_text="Month counted by attendance_this_month")
+    counter_fields = (
+        'student_count', 'active_student_count', 'faculty_count', 'assignment_count',
+        'attendance_this_month', 'attendance_month',
+    )
+    
     class Meta:
         db_table = 'centers'
         verbose_name = 'Center'
@@ -38,6 +55,13 @@ class Center(TimeStampedModel, SoftDeleteModel):
     
     def __str__(self):
         return f"{self.name} ({self.code})"
+    
+    @property
+    def current_month_attendance(self):
+        """attendance_this_month, or 0 if the month it counted is over."""
+        if self.attendance_month != timezone.now().date().replace(day=1):
+            return 0
+        return self.attendance_this_month
 
 
 class CenterHead(TimeStampedModel, SoftDeleteModel):
@@ -0,0 +1,146 @@
+"""
+Signal handlers that bump a center's data version on relevant writes,
+drop the cached copies of changed centers and keep the counter columns of
+centers, faculty and subjects current (counters.py).
+"""
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+
+from apps.attendance.models import AttendanceRecord, Session
+from apps.faculty.models import Faculty
+from apps.feedback.models import FacultyFeedback, FeedbackResponse
+from apps.students.models import Student
+from apps.subjects.models import Assignment, Topic
+
+from .cache import bump_center_data_version, invalidate_center_cache
+from .counters import apply_counter_changes, contributions, count_attendance, previous_contributions
+from .models import Center
+
+
+def _bump_on_commit(*center_ids):
+    """Bump versions once the write is committed, so readers never cache pre-commit data."""
+    for center_id in {cid for cid in center_ids if cid is not None}:
+        transaction.on_commit(lambda cid=center_id: bump_center_data_version(cid))
+
+
+def _student_center_id(instance):
+    try:
+        return instance.student.center_id
+    except ObjectDoesNotExist:
+        return None
+
+
+def _center_id_for(instance):
+    if isinstance(instance, (Student, Faculty, FacultyFeedback)):
+        return [instance.center_id]
+    if isinstance(instance, FeedbackResponse):
+        try:
+            survey_center_id = instance.survey.center_id
+        except ObjectDoesNotExist:
+            survey_center_id = None
+        return [_student_center_id(instance), survey_center_id]
+    # AttendanceRecord and Assignment belong to the student's center
+    return [_student_center_id(instance)]
+
+
+def center_data_changed(sender, instance, **kwargs):
+    """Bump the data version of the center(s) affected by a write."""
+    if kwargs.get('raw'):
+        return
+    _bump_on_commit(*_center_id_for(instance))
+
+
+def attendance_topics_changed(sender, instance, action, **kwargs):
+    """Topics covered feed the skipped-topics and progress sections."""
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, AttendanceRecord):
+        _bump_on_commit(_student_center_id(instance))
+
+
+def session_topics_changed(sender, instance, action, **kwargs):
+    """Topics of a class session apply to every record of the session."""
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Session):
+        _bump_on_commit(*instance.records.values_list('student__center_id', flat=True).distinct())
+
+
+def center_changed(sender, instance, **kwargs):
+    """Drop the page chrome's cached copies of a center once the write commits."""
+    transaction.on_commit(lambda: invalidate_center_cache(instance.pk))
+
+
+def connect_signals():
+    connect_counter_signals()
+    post_save.connect(center_changed, sender=Center, dispatch_uid='center_cache_save')
+    post_delete.connect(center_changed, sender=Center, dispatch_uid='center_cache_delete')
+    for model in (AttendanceRecord, Student, Assignment, Faculty, FeedbackResponse, FacultyFeedback):
+        dispatch_uid = f'center_data_version_{model._meta.label_lower}'
+        post_save.connect(center_data_changed, sender=model, dispatch_uid=f'{dispatch_uid}_save')
+        post_delete.connect(center_data_changed, sender=model, dispatch_uid=f'{dispatch_uid}_delete')
+
+    m2m_changed.connect(
+        attendance_topics_changed,
+        sender=AttendanceRecord.topics_covered.through,
+        dispatch_uid='center_data_version_attendance_topics',
+    )
+    m2m_changed.connect(
+        session_topics_changed,
+        sender=Session.topics_covered.through,
+        dispatch_uid='center_data_version_session_topics',
+    )
+
+
+def counters_changing(sender, instance, **kwargs):
+    """Remember what the stored row counted towards (see counters.py)."""
+    if kwargs.get('raw'):
+        return
+    instance._previous_counters = previous_contributions(instance)
+    if isinstance(instance, Student) and instance.pk:
+        instance._previous_center_id = Student.all_objects.filter(
+            pk=instance.pk
+        ).values_list('center_id', flat=True).first()
+
+
+def counters_saved(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    center_id = None
+    if isinstance(instance, Assignment):
+        center_id = _student_center_id(instance)
+    apply_counter_changes(
+        getattr(instance, '_previous_counters', []), contributions(instance, center_id=center_id)
+    )
+    previous_center_id = getattr(instance, '_previous_center_id', None)
+    if isinstance(instance, Student) and previous_center_id not in (None, instance.center_id):
+        # The student's active assignments move to the new center
+        moved = Assignment.objects.filter(student=instance, is_active=True).count()
+        apply_counter_changes(
+            [(Center, previous_center_id, 'assignment_count')] * moved,
+            [(Center, instance.center_id, 'assignment_count')] * moved
+        )
+
+
+def counters_deleted(sender, instance, **kwargs):
+    center_id = None
+    if isinstance(instance, Assignment):
+        center_id = _student_center_id(instance)
+    apply_counter_changes(contributions(instance, center_id=center_id), [])
+
+
+def attendance_counted(sender, instance, created, **kwargs):
+    if created and not kwargs.get('raw'):
+        count_attendance([instance])
+
+
+def attendance_uncounted(sender, instance, **kwargs):
+    count_attendance([instance], sign=-1)
+
+
+def connect_counter_signals():
+    for model in (Student, Faculty, Assignment, Topic):
+        dispatch_uid = f'center_counters_{model._meta.label_lower}'
+        pre_save.connect(counters_changing, sender=model, dispatch_uid=f'{dispatch_uid}_pre_save')
+        post_save.connect(counters_saved, sender=model, dispatch_uid=f'{dispatch_uid}_save')
+        post_delete.connect(counters_deleted, sender=model, dispatch_uid=f'{dispatch_uid}_delete')
+    post_save.connect(attendance_counted, sender=AttendanceRecord, dispatch_uid='center_counters_attendance_save')
+    post_delete.connect(attendance_uncounted, sender=AttendanceRecord, dispatch_uid='center_counters_attendance_delete')
@@ -0,0 +1,180 @@
+"""
+Center statistics provider.
+
+Student, faculty, subject and attendance counts of any number of centers
+come from three grouped queries (one per table family) with conditional
+aggregates, instead of a dozen COUNT queries per center. Results are
+cached per center under the center's data version, so a master dashboard
+polling every center only queries the centers that changed.
+
+Subjects are not tied to a center; a center's subjects are the distinct
+subjects of its students' assignments.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Exists, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .cache import get_cached_sections
+
+# Window of the attendance rate (same as calculate_center_metrics)
+ATTENDANCE_RATE_DAYS = 30
+
+
+def _count_subquery(queryset, group_field, count_field='pk', distinct=False):
+    """Correlated COUNT subquery for a queryset already filtered on OuterRef('pk')."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_field).annotate(
+                n=Count(count_field, distinct=distinct)
+            ).values('n')[:1],
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def annotate_center_counts(queryset):
+    """
+    Annotate a Center queryset with subject_count.
+
+    student_count and faculty_count are counter columns of Center (see
+    counters.py). The subject count is a correlated subquery, so it does not
+    multiply other counts the way a joined Count() annotation does.
+
+    Args:
+        queryset: Center queryset
+
+    Returns:
+        QuerySet: The annotated queryset
+    """
+    from apps.subjects.models import Assignment
+
+    return queryset.annotate(
+        subject_count=_count_subquery(
+            Assignment.objects.filter(student__center=OuterRef('pk'), deleted_at__isnull=True),
+            'student__center', 'subject', distinct=True
+        ),
+    )
+
+
+def _empty_statistics():
+    return {
+        'students': {'total': 0, 'active': 0, 'inactive': 0, 'completed': 0, 'needing_attention': 0},
+        'faculty': {'total': 0, 'active': 0},
+        'subjects': {'total': 0, 'active': 0},
+        'attendance': {
+            'total': 0, 'this_week': 0, 'this_month': 0,
+            'avg_duration_minutes': 0, 'attendance_rate': 0,
+        },
+    }
+
+
+def compute_center_statistics(center_ids, today=None):
+    """
+    Compute the statistics of several centers (uncached).
+
+    Args:
+        center_ids: Iterable of center ids
+        today: Reference date (defaults to today)
+
+    Returns:
+        dict: center id -> statistics dict with 'students', 'faculty',
+        'subjects' and 'attendance' sections
+    """
+    from apps.attendance.models import AttendanceRecord
+    from apps.faculty.models import Faculty
+    from apps.students.models import Student
+    from apps.subjects.models import Assignment
+
+    from .models import Center
+
+    center_ids = list(center_ids)
+    today = today or timezone.now().date()
+    week_ago = today - timedelta(days=7)
+    month_ago = today - timedelta(days=ATTENDANCE_RATE_DAYS)
+    statistics = {center_id: _empty_statistics() for center_id in center_ids}
+    if not center_ids:
+        return statistics
+
+    # Faculty and subjects: one row per center with correlated subqueries
+    faculty = Faculty.objects.filter(center=OuterRef('pk'), deleted_at__isnull=True)
+    assignments = Assignment.objects.filter(student__center=OuterRef('pk'), deleted_at__isnull=True)
+    rows = Center.all_objects.filter(pk__in=center_ids).annotate(
+        faculty_total=_count_subquery(faculty, 'center'),
+        faculty_active=_count_subquery(faculty.filter(is_active=True), 'center'),
+        subjects_total=_count_subquery(assignments, 'student__center', 'subject', distinct=True),
+        subjects_active=_count_subquery(
+            assignments.filter(is_active=True), 'student__center', 'subject', distinct=True
+        ),
+    ).values('pk', 'faculty_total', 'faculty_active', 'subjects_total', 'subjects_active')
+    for row in rows:
+        stats = statistics[row['pk']]
+        stats['faculty'] = {'total': row['faculty_total'], 'active': row['faculty_active']}
+        stats['subjects'] = {'total': row['subjects_total'], 'active': row['subjects_active']}
+
+    # Students, with the active ones that have no attendance in the last week
+    recent_attendance = AttendanceRecord.objects.filter(student=OuterRef('pk'), date__gte=week_ago)
+    rows = Student.objects.filter(
+        center_id__in=center_ids, deleted_at__isnull=True
+    ).order_by().values('center_id').annotate(
+        total=Count('pk'),
+        active=Count('pk', filter=Q(status='active')),
+        inactive=Count('pk', filter=Q(status='inactive')),
+        completed=Count('pk', filter=Q(status='completed')),
+        needing_attention=Count('pk', filter=Q(status='active') & ~Q(Exists(recent_attendance))),
+    )
+    for row in rows:
+        statistics[row['center_id']]['students'] = {
+            'total': row['total'],
+            'active': row['active'],
+            'inactive': row['inactive'],
+            'completed': row['completed'],
+            'needing_attention': row['needing_attention'],
+        }
+
+    # Attendance
+    rows = AttendanceRecord.objects.filter(
+        student__center_id__in=center_ids
+    ).order_by().values('student__center_id').annotate(
+        total=Count('pk'),
+        this_week=Count('pk', filter=Q(date__gte=week_ago)),
+        this_month=Count('pk', filter=Q(date__gte=month_ago)),
+        avg_duration=Avg('duration_minutes'),
+    )
+    for row in rows:
+        stats = statistics[row['student__center_id']]
+        expected = stats['students']['active'] * ATTENDANCE_RATE_DAYS
+        stats['attendance'] = {
+            'total': row['total'],
+            'this_week': row['this_week'],
+            'this_month': row['this_month'],
+            'avg_duration_minutes': round(row['avg_duration'] or 0, 1),
+            'attendance_rate': round(row['this_month'] / expected * 100, 1) if expected else 0,
+        }
+
+    return statistics
+
+
+def get_center_statistics(center_ids, today=None):
+    """
+    Statistics of several centers, cached under each center's data version.
+
+    Only the centers without a current cache entry are computed, in one
+    batch of at most three queries.
+
+    Args:
+        center_ids: Iterable of center ids
+        today: Reference date (defaults to today)
+
+    Returns:
+        dict: center id -> statistics dict (see compute_center_statistics)
+    """
+    today = today or timezone.now().date()
+    return get_cached_sections(
+        center_ids,
+        f'statistics:{today.isoformat()}',
+        lambda missing_ids: compute_center_statistics(missing_ids, today)
+    )
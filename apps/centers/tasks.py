@@ -0,0 +1,28 @@
+"""
+Celery tasks for center maintenance jobs.
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_counters():
+    """
+    Repair drifted counter columns (apps/centers/counters.py).
+
+    Run nightly by beat; just after midnight it also restarts the monthly
+    attendance counters of centers without attendance in the new month.
+
+    Returns:
+        dict: Number of repaired 'centers', 'faculty' and 'subjects' rows
+    """
+    from .counters import reconcile_counters as run_reconcile
+
+    repaired = run_reconcile()
+    if any(repaired.values()):
+        logger.warning("Repaired drifted counters: %s", repaired)
+    return repaired
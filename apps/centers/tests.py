@@ -0,0 +1,260 @@
+import datetime
+
+from django.core.cache import cache
+from django.db.models import Avg
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.attendance.models import AttendanceRecord
+from apps.core.outbox import DISPATCH_PENDING_KEY
+from apps.faculty.models import Faculty
+from apps.students.models import Student
+from apps.subjects.models import Assignment, Subject, Topic
+
+from .cache import get_cached_center, get_switch_centers
+from .counters import reconcile_counters
+from .models import Center
+from .statistics import compute_center_statistics
+
+COUNTERS = ('student_count', 'active_student_count', 'faculty_count', 'assignment_count', 'attendance_this_month')
+
+
+class CenterTestData(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        cls.audit = {'created_by': cls.user, 'modified_by': cls.user}
+        cls.north = cls.make_center('North', 'N1')
+        cls.south = cls.make_center('South', 'S1')
+        cls.subject = Subject.objects.create(name='Maths', code='MATH', **cls.audit)
+        faculty_user = User.objects.create_user(
+            'f1@example.com', 'pass', first_name='Mira', last_name='Iyer', role=User.FACULTY
+        )
+        cls.faculty = Faculty.objects.create(
+            user=faculty_user, center=cls.north, employee_id='EMP1',
+            joining_date=datetime.date(2024, 1, 1), **cls.audit
+        )
+
+    @classmethod
+    def make_center(cls, name, code):
+        return Center.objects.create(
+            name=name, code=code, address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email=f'{code.lower()}@example.com', **cls.audit
+        )
+
+    def make_student(self, enrollment_number, status='active', center=None):
+        return Student.objects.create(
+            center=center or self.north, first_name='Asha', last_name='Rao', phone='111',
+            enrollment_number=enrollment_number, enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Guardian', guardian_phone='222', status=status, **self.audit
+        )
+
+    def make_assignment(self, student):
+        return Assignment.objects.create(
+            student=student, subject=self.subject, faculty=self.faculty,
+            start_date=datetime.date(2024, 1, 1), **self.audit
+        )
+
+    def counters(self, center):
+        return Center.objects.values(*COUNTERS).get(pk=center.pk)
+
+
+class CounterTests(CenterTestData):
+
+    def setUp(self):
+        self.asha = self.make_student('E1')
+        self.vik = self.make_student('E2', status='inactive')
+        self.assignment = self.make_assignment(self.asha)
+        Topic.objects.create(subject=self.subject, name='Algebra', sequence_number=1, **self.audit)
+        AttendanceRecord.objects.create(
+            student=self.asha, assignment=self.assignment, date=timezone.now().date(),
+            in_time=datetime.time(10), out_time=datetime.time(11), marked_by=self.faculty.user, **self.audit
+        )
+
+    def test_writes_update_counters(self):
+        self.assertEqual(self.counters(self.north), {
+            'student_count': 2, 'active_student_count': 1, 'faculty_count': 1,
+            'assignment_count': 1, 'attendance_this_month': 1,
+        })
+        self.faculty.refresh_from_db()
+        self.assertEqual((self.faculty.assignment_count, self.faculty.attendance_this_month), (1, 1))
+        self.subject.refresh_from_db()
+        self.assertEqual((self.subject.topic_count, self.subject.assignment_count), (1, 1))
+
+    def test_attendance_of_a_past_month_reads_as_zero(self):
+        self.north.refresh_from_db()
+        self.assertEqual(self.north.current_month_attendance, 1)
+
+        last_month = (timezone.now().date().replace(day=1) - datetime.timedelta(days=1)).replace(day=1)
+        Center.objects.filter(pk=self.north.pk).update(attendance_month=last_month)
+        self.north.refresh_from_db()
+        self.assertEqual(self.north.attendance_this_month, 1)
+        self.assertEqual(self.north.current_month_attendance, 0)
+
+    def test_status_change_and_soft_delete_update_counters(self):
+        self.vik.status = 'active'
+        self.vik.save()
+        self.assertEqual(self.counters(self.north)['active_student_count'], 2)
+
+        self.vik.soft_delete(self.user)
+        counters = self.counters(self.north)
+        self.assertEqual((counters['student_count'], counters['active_student_count']), (1, 1))
+
+        self.assignment.is_active = False
+        self.assignment.save()
+        self.assertEqual(self.counters(self.north)['assignment_count'], 0)
+
+    def test_moving_a_student_moves_its_assignments(self):
+        self.asha.center = self.south
+        self.asha.save()
+
+        self.assertEqual(self.counters(self.north)['assignment_count'], 0)
+        self.assertEqual(self.counters(self.south)['assignment_count'], 1)
+        self.assertEqual(self.counters(self.south)['student_count'], 1)
+
+    def test_saving_a_stale_center_keeps_counters(self):
+        stale = Center.objects.get(pk=self.north.pk)
+        self.make_student('E3')
+        stale.name = 'North Campus'
+        stale.save()
+
+        self.assertEqual(self.counters(self.north)['student_count'], 3)
+
+    def test_reconcile_repairs_drift(self):
+        # Signals keep the counts; only the month marker of South, which has
+        # no attendance yet, is filled in
+        self.assertEqual(reconcile_counters(), {'centers': 1, 'faculty': 0, 'subjects': 0})
+        self.assertEqual(self.counters(self.north)['student_count'], 2)
+
+        Center.objects.filter(pk=self.north.pk).update(student_count=0, assignment_count=7)
+        Subject.objects.filter(pk=self.subject.pk).update(topic_count=5)
+
+        self.assertEqual(reconcile_counters(), {'centers': 1, 'faculty': 0, 'subjects': 1})
+        self.assertEqual(self.counters(self.north)['student_count'], 2)
+        self.assertEqual(self.counters(self.north)['assignment_count'], 1)
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.topic_count, 1)
+        self.assertEqual(reconcile_counters(), {'centers': 0, 'faculty': 0, 'subjects': 0})
+
+    def test_reconcile_of_one_center_leaves_others(self):
+        Center.objects.filter(pk__in=[self.north.pk, self.south.pk]).update(student_count=9)
+
+        self.assertEqual(reconcile_counters(self.north)['centers'], 1)
+        self.assertEqual(self.counters(self.north)['student_count'], 2)
+        self.assertEqual(self.counters(self.south)['student_count'], 9)
+
+
+class CenterCacheTests(CenterTestData):
+
+    def setUp(self):
+        cache.clear()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+
+    def test_center_is_served_from_cache(self):
+        get_cached_center(self.north.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_center(self.north.pk).name, 'North')
+
+    def test_center_save_drops_cached_copies(self):
+        get_cached_center(self.north.pk)
+        self.assertEqual([center['name'] for center in get_switch_centers()], ['North', 'South'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.north.name = 'Zenith'
+            self.north.save()
+
+        self.assertEqual(get_cached_center(self.north.pk).name, 'Zenith')
+        self.assertEqual([center['name'] for center in get_switch_centers()], ['South', 'Zenith'])
+
+    def test_deleted_center_leaves_the_switcher(self):
+        get_switch_centers()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.south.soft_delete(self.user)
+
+        self.assertIsNone(get_cached_center(self.south.pk))
+        self.assertEqual([center['name'] for center in get_switch_centers()], ['North'])
+
+
+class CenterStatisticsTests(CenterTestData):
+
+    def setUp(self):
+        cache.clear()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        self.today = timezone.now().date()
+        asha = self.make_student('E1')
+        self.make_student('E2', status='inactive')
+        self.make_student('E3', status='completed')
+        idle = self.make_student('E4')
+        self.make_assignment(idle)
+        assignment = self.make_assignment(asha)
+        for days_ago, minutes in ((0, 60), (10, 90), (45, 30)):
+            AttendanceRecord.objects.create(
+                student=asha, assignment=assignment, date=self.today - datetime.timedelta(days=days_ago),
+                in_time=datetime.time(10), out_time=datetime.time(11), duration_minutes=minutes,
+                marked_by=self.faculty.user, **self.audit
+            )
+        self.make_student('E5', center=self.south)
+
+    def direct_statistics(self, center):
+        """A center's statistics with one COUNT per figure."""
+        from apps.students.models import Student
+
+        students = Student.objects.filter(center=center, deleted_at__isnull=True)
+        active = students.filter(status='active')
+        faculty = Faculty.objects.filter(center=center, deleted_at__isnull=True)
+        assignments = Assignment.objects.filter(student__center=center, deleted_at__isnull=True)
+        records = AttendanceRecord.objects.filter(student__center=center)
+        week_ago = self.today - datetime.timedelta(days=7)
+        this_month = records.filter(date__gte=self.today - datetime.timedelta(days=30)).count()
+        expected = active.count() * 30
+        return {
+            'students': {
+                'total': students.count(),
+                'active': active.count(),
+                'inactive': students.filter(status='inactive').count(),
+                'completed': students.filter(status='completed').count(),
+                'needing_attention': active.exclude(attendance_records__date__gte=week_ago).count(),
+            },
+            'faculty': {'total': faculty.count(), 'active': faculty.filter(is_active=True).count()},
+            'subjects': {
+                'total': assignments.values('subject').distinct().count(),
+                'active': assignments.filter(is_active=True).values('subject').distinct().count(),
+            },
+            'attendance': {
+                'total': records.count(),
+                'this_week': records.filter(date__gte=week_ago).count(),
+                'this_month': this_month,
+                'avg_duration_minutes': round(records.aggregate(avg=Avg('duration_minutes'))['avg'] or 0, 1),
+                'attendance_rate': round(this_month / expected * 100, 1) if expected else 0,
+            },
+        }
+
+    def test_batch_matches_per_center_counts(self):
+        statistics = compute_center_statistics([self.north.pk, self.south.pk], self.today)
+
+        self.assertEqual(statistics[self.north.pk], self.direct_statistics(self.north))
+        self.assertEqual(statistics[self.south.pk], self.direct_statistics(self.south))
+        self.assertEqual(statistics[self.north.pk]['students']['needing_attention'], 1)
+
+    def test_batch_endpoint_matches_the_detail_endpoint(self):
+        master = User.objects.create_user(
+            'master@example.com', 'pass', first_name='Master', last_name='User', role=User.MASTER_ACCOUNT
+        )
+        client = APIClient()
+        client.force_authenticate(master)
+
+        response = client.get('/api/v1/centers/statistics/', {'centers': f'{self.north.pk},{self.south.pk}'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        for result in response.data['results']:
+            center_id = result['center']['id']
+            self.assertEqual(result, client.get(f'/api/v1/centers/{center_id}/statistics/').data)
+        self.assertEqual(client.get('/api/v1/centers/statistics/', {'centers': 'north'}).status_code, 400)
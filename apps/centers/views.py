@@ -14,6 +14,9 @@ from django.core.paginator import Paginator
 from datetime import timedelta, date
 
 from apps.core.mixins import CenterHeadRequiredMixin, SetCreatedByMixin, AuditLogMixin
+from apps.core.mixins import MasterAccountRedirectMixin
+from apps.core.principal import get_principal
+from .cache import get_center_data_version, get_cached_section
 from .models import Center, CenterHead
 from .forms import CenterForm
 
@@ -44,8 +47,9 @@ class CenterDashboardView(LoginRequiredMixin, TemplateView):
             return None
         
         # Center heads see their own center
-        if hasattr(self.request.user, 'center_head_profile'):
-            return self.request.user.center_head_profile.center
+        center_head_profile = get_principal(self.request).center_head_profile
+        if center_head_profile:
+            return center_head_profile.center
         
         return None
     
@@ -66,96 +70,21 @@ class CenterDashboardView(LoginRequiredMixin, TemplateView):
         week_ago = today - timedelta(days=7)
         month_ago = today - timedelta(days=30)
         
-        # Student Statistics
-        from apps.students.models import Student
-        students = Student.objects.filter(center=center, deleted_at__isnull=True)
-        context['total_students'] = students.count()
-        context['active_students'] = students.filter(status='active').count()
-        context['inactive_students'] = students.filter(status='inactive').count()
-        context['completed_students'] = students.filter(status='completed').count()
-        
-        # Faculty Statistics
-        from apps.faculty.models import Faculty
-        faculty = Faculty.objects.filter(center=center, deleted_at__isnull=True)
-        context['total_faculty'] = faculty.count()
-        context['active_faculty'] = faculty.filter(is_active=True).count()
-        
-        # Subject Statistics (subjects are common across all centers)
-        from apps.subjects.models import Subject
-        subjects = Subject.objects.filter(deleted_at__isnull=True)
-        context['total_subjects'] = subjects.count()
-        context['active_subjects'] = subjects.filter(is_active=True).count()
-        
-        # Assignment Statistics
-        from apps.subjects.models import Assignment
-        assignments = Assignment.objects.filter(student__center=center)
-        context['total_assignments'] = assignments.count()
-        context['active_assignments'] = assignments.filter(is_active=True).count()
+        # Every section is cached under the center's data version, which is
+        # bumped by writes to that center (see apps/centers/signals.py).
+        version = get_center_data_version(center.pk)
         
-        # Attendance Statistics
-        from apps.attendance.models import AttendanceRecord
-        attendance_records = AttendanceRecord.objects.filter(
-            student__center=center
-        )
-        context['total_attendance_records'] = attendance_records.count()
-        context['attendance_this_week'] = attendance_records.filter(
-            date__gte=week_ago
-        ).count()
-        context['attendance_this_month'] = attendance_records.filter(
-            date__gte=month_ago
-        ).count()
+        def section(name, builder):
+            return get_cached_section(center.pk, f'{name}:{today.isoformat()}', builder, version=version)
         
-        # Recent Students (last 5)
-        context['recent_students'] = students.order_by('-created_at')[:5]
-        
-        # Recent Attendance (today)
-        context['today_attendance'] = attendance_records.filter(
-            date=today
-        ).select_related('student', 'marked_by').order_by('-in_time')[:10]
-        
-        # Students needing attention (no attendance in 7 days)
-        students_with_recent_attendance = attendance_records.filter(
-            date__gte=week_ago
-        ).values_list('student_id', flat=True).distinct()
-        
-        context['students_needing_attention'] = students.filter(
-            status='active'
-        ).exclude(
-            id__in=students_with_recent_attendance
-        )[:10]
-        
-        # Faculty performance (attendance marked this month)
-        from django.db.models import Count
-        context['faculty_performance'] = faculty.filter(
-            is_active=True
-        ).annotate(
-            attendance_count=Count(
-                'user__marked_attendance_records',
-                filter=Q(user__marked_attendance_records__date__gte=month_ago)
-            )
-        ).order_by('-attendance_count')[:5]
-        
-        # Chart data for attendance trend (last 7 days)
-        attendance_trend = []
-        labels = []
-        data = []
-        for i in range(6, -1, -1):
-            date = today - timedelta(days=i)
-            count = attendance_records.filter(date=date).count()
-            labels.append(date.strftime('%a'))
-            data.append(count)
-            attendance_trend.append({
-                'date': date.strftime('%a'),
-                'count': count
-            })
-        context['attendance_trend'] = attendance_trend
-        
-        # Prepare JSON data for Chart.js
-        import json
-        context['attendance_trend_json'] = json.dumps({
-            'labels': labels,
-            'data': data
-        })
+        stats = section('stats', lambda: self._build_stats(center, today, week_ago, month_ago))
+        context.update(stats)
+        context.update(section('overview', lambda: self._build_overview(center, today, week_ago)))
+        context.update(section('faculty_performance', lambda: self._build_faculty_performance(center, month_ago)))
+        context.update(section('at_risk', lambda: self._build_at_risk(center)))
+        context.update(section('feedback', lambda: self._build_feedback(center, month_ago)))
+        context.update(section('workload', lambda: self._build_workload(center, month_ago)))
+        context.update(section('inactive_faculty', lambda: get_inactive_faculty_section(center, today)))
         
         # Center information
         context['center'] = center
@@ -168,61 +97,6 @@ class CenterDashboardView(LoginRequiredMixin, TemplateView):
                 is_active=True
             ).order_by('name')
         
-        # Enhanced insights - Students absent > 4 days
-        from apps.reports.services import (
-            get_at_risk_students, get_delayed_students, get_irregular_students,
-            get_faculty_free_slots, get_skipped_topics, prepare_gantt_chart_data
-        )
-        
-        at_risk_4days = get_at_risk_students(center, days_threshold=4)
-        context['students_absent_4days'] = list(at_risk_4days[:10])
-        context['students_absent_4days_count'] = at_risk_4days.count()
-        
-        # Delayed students (enrolled > 6 months, low progress)
-        delayed = get_delayed_students(center, months_threshold=6, progress_threshold=50)
-        context['delayed_students'] = delayed[:10]
-        context['delayed_students_count'] = len(delayed)
-        
-        # Irregular students
-        irregular = get_irregular_students(center, days_window=30, gap_threshold=3)
-        context['irregular_students'] = irregular[:10]
-        context['irregular_students_count'] = len(irregular)
-        
-        # Faculty insights with free time slots (for today)
-        faculty_slots = get_faculty_free_slots(center=center, date=today)
-        context['faculty_free_slots'] = faculty_slots[:5]  # Top 5 faculty
-        
-        # Gantt chart data for faculty schedules (last 7 days)
-        faculty_list = faculty.filter(is_active=True)[:3]  # Top 3 active faculty
-        gantt_data_all = []
-        for fac in faculty_list:
-            gantt_data = prepare_gantt_chart_data(faculty=fac, days=7)
-            if len(gantt_data) > 1:  # Has data beyond header
-                gantt_data_all.append({
-                    'faculty': fac,
-                    'data': json.dumps(gantt_data)
-                })
-        context['faculty_gantt_data'] = gantt_data_all
-        
-        # Skipped topics
-        skipped = get_skipped_topics(center=center, days=30)
-        context['skipped_topics'] = skipped[:15]
-        context['skipped_topics_count'] = len(skipped)
-        
-        # Feedback integration - average satisfaction
-        from apps.feedback.models import FeedbackResponse
-        from django.db.models import Avg
-        avg_satisfaction = FeedbackResponse.objects.filter(
-            survey__center=center
-        ).aggregate(avg=Avg('satisfaction_score'))['avg']
-        context['avg_satisfaction'] = round(avg_satisfaction, 1) if avg_satisfaction else 0
-        
-        # Recent feedback count
-        context['recent_feedback_count'] = FeedbackResponse.objects.filter(
-            survey__center=center,
-            created_at__gte=month_ago
-        ).count()
-        
         # Faculty performance with satisfaction scores
         faculty_with_satisfaction = []
         for fac in context['faculty_performance']:
@@ -236,6 +110,7 @@ class CenterDashboardView(LoginRequiredMixin, TemplateView):
         context['faculty_with_satisfaction'] = faculty_with_satisfaction
         
         # ENHANCED ANALYTICS FOR CENTER ADMIN DASHBOARD
+        # (derived from the cached sections, no further queries)
         
         # 1. Center Performance Score (0-100)
         # Based on: Student Attendance (30%), Faculty Activity (25%), Student Progress (25%), Feedback (20%)
@@ -282,45 +157,17 @@ class CenterDashboardView(LoginRequiredMixin, TemplateView):
             context['performance_grade'] = 'C'
             context['grade_color'] = 'warning'
         
-        # 2. Faculty Workload Analysis
-        faculty_workload = []
-        for fac in faculty.filter(is_active=True):
-            # Get student count
-            student_count = Student.objects.filter(
-                assignments__faculty=fac,
-                center=center,
-                status='active',
-                deleted_at__isnull=True
-            ).distinct().count()
-            
-            # Get sessions this month
-            sessions_count = attendance_records.filter(
-                marked_by=fac.user,
-                date__gte=month_ago
-            ).count()
-            
-            # Calculate workload score (sessions + students)
-            workload_score = sessions_count + (student_count * 2)
-            
-            faculty_workload.append({
-                'faculty': fac,
-                'student_count': student_count,
-                'sessions_count': sessions_count,
-                'workload_score': workload_score,
-                'status': 'overloaded' if workload_score > 60 else ('balanced' if workload_score > 30 else 'underutilized')
-            })
-        
-        faculty_workload.sort(key=lambda x: x['workload_score'], reverse=True)
+        # 2. Faculty Workload Analysis (statuses)
+        faculty_workload = context.pop('faculty_workload_all')
         context['faculty_workload'] = faculty_workload[:10]
         context['overloaded_faculty'] = [f for f in faculty_workload if f['status'] == 'overloaded']
         context['underutilized_faculty'] = [f for f in faculty_workload if f['status'] == 'underutilized']
         
         # 3. Student Engagement Metrics
         # Active students (attended in last 7 days)
-        active_last_week = len(students_with_recent_attendance)
+        active_last_week = context['active_last_week']
         engagement_rate = (active_last_week / context['active_students'] * 100) if context['active_students'] > 0 else 0
         context['engagement_rate'] = round(engagement_rate, 1)
-        context['active_last_week'] = active_last_week
         
         # Average sessions per student (this month)
         avg_sessions_per_student = context['attendance_this_month'] / context['active_students'] if context['active_students'] > 0 else 0
@@ -333,11 +180,7 @@ class CenterDashboardView(LoginRequiredMixin, TemplateView):
         context['projected_annual_revenue'] = estimated_monthly_revenue * 12
         
         # 5. Trend Analysis (Week over Week)
-        last_week_start = week_ago - timedelta(days=7)
-        last_week_attendance = attendance_records.filter(
-            date__gte=last_week_start,
-            date__lt=week_ago
-        ).count()
+        last_week_attendance = stats['attendance_last_week']
         
         if last_week_attendance > 0:
             wow_change = ((context['attendance_this_week'] - last_week_attendance) / last_week_attendance * 100)
@@ -400,62 +243,16 @@ class CenterDashboardView(LoginRequiredMixin, TemplateView):
                 'action': 'Encourage students to provide feedback after sessions.'
             })
         
-        context['action_items'] = action_items
-        context['critical_actions'] = [a for a in action_items if a['priority'] == 'critical']
-        context['high_actions'] = [a for a in action_items if a['priority'] == 'high']
-        
         # 7. Quick Stats Summary
         context['quick_stats'] = {
-            'total_sessions_today': attendance_records.filter(date=today).count(),
-            'total_hours_this_month': round(attendance_records.filter(date__gte=month_ago).aggregate(
-                total=Sum('duration_minutes'))['total'] or 0 / 60, 1),
-            'avg_session_duration': round(attendance_records.filter(date__gte=month_ago).aggregate(
-                avg=Avg('duration_minutes'))['avg'] or 0, 0),
+            'total_sessions_today': stats['attendance_today'],
+            'total_hours_this_month': round(stats['minutes_this_month'] / 60, 1),
+            'avg_session_duration': round(stats['avg_duration_this_month'], 0),
             'completion_rate': round((context['completed_students'] / context['total_students'] * 100) if context['total_students'] > 0 else 0, 1)
         }
         
-        # 8. INACTIVE FACULTY INSIGHTS - Faculty who haven't marked attendance in last 4 days
-        four_days_ago = today - timedelta(days=4)
-        
-        # Get faculty who have marked attendance in last 4 days
-        active_faculty_ids = attendance_records.filter(
-            date__gte=four_days_ago
-        ).values_list('marked_by_id', flat=True).distinct()
-        
-        # Get inactive faculty (haven't marked attendance in 4+ days)
-        inactive_faculty = faculty.filter(
-            is_active=True
-        ).exclude(
-            user_id__in=active_faculty_ids
-        ).select_related('user', 'center').annotate(
-            last_attendance_date=Max('user__marked_attendance_records__date'),
-            total_students=Count('assignments__student', filter=Q(
-                assignments__is_active=True,
-                assignments__student__status='active',
-                assignments__deleted_at__isnull=True
-            ), distinct=True)
-        ).order_by('last_attendance_date')
-        
-        # Calculate days since last attendance for each inactive faculty
-        inactive_faculty_list = []
-        for fac in inactive_faculty:
-            days_inactive = (today - fac.last_attendance_date).days if fac.last_attendance_date else 999
-            inactive_faculty_list.append({
-                'faculty': fac,
-                'name': fac.user.get_full_name(),
-                'email': fac.user.email,
-                'phone': fac.user.phone,
-                'center': fac.center.name,
-                'employee_id': fac.employee_id,
-                'last_attendance_date': fac.last_attendance_date,
-                'days_inactive': days_inactive,
-                'total_students': fac.total_students
-            })
-        
-        context['inactive_faculty'] = inactive_faculty_list
-        context['inactive_faculty_count'] = len(inactive_faculty_list)
-        
-        # Add to action items if there are inactive faculty
+        # 8. Add to action items if there are inactive faculty
+        inactive_faculty_list = context['inactive_faculty']
         if len(inactive_faculty_list) > 0:
             action_items.append({
                 'priority': 'high',
@@ -464,10 +261,241 @@ class CenterDashboardView(LoginRequiredMixin, TemplateView):
                 'message': f'{len(inactive_faculty_list)} faculty members haven\'t marked attendance in the last 4 days.',
                 'action': 'Contact inactive faculty immediately to check on their status and schedule.'
             })
-            context['action_items'] = action_items
-            context['high_actions'] = [a for a in action_items if a['priority'] == 'high']
+        
+        context['action_items'] = action_items
+        context['critical_actions'] = [a for a in action_items if a['priority'] == 'critical']
+        context['high_actions'] = [a for a in action_items if a['priority'] == 'high']
         
         return context
+    
+    def _build_stats(self, center, today, week_ago, month_ago):
+        """Headline counts, using one conditional aggregate per model."""
+        from apps.students.models import Student
+        from apps.faculty.models import Faculty
+        from apps.subjects.models import Subject, Assignment
+        from apps.attendance.models import AttendanceRecord
+        
+        student_stats = Student.objects.filter(center=center, deleted_at__isnull=True).aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='active')),
+            inactive=Count('id', filter=Q(status='inactive')),
+            completed=Count('id', filter=Q(status='completed')),
+        )
+        faculty_stats = Faculty.objects.filter(center=center, deleted_at__isnull=True).aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+        )
+        # Subjects are common across all centers
+        subject_stats = Subject.objects.filter(deleted_at__isnull=True).aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+        )
+        assignment_stats = Assignment.objects.filter(student__center=center).aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+        )
+        last_week_start = week_ago - timedelta(days=7)
+        month_filter = Q(date__gte=month_ago)
+        attendance_stats = AttendanceRecord.objects.filter(student__center=center).aggregate(
+            total=Count('id'),
+            this_week=Count('id', filter=Q(date__gte=week_ago)),
+            this_month=Count('id', filter=month_filter),
+            last_week=Count('id', filter=Q(date__gte=last_week_start, date__lt=week_ago)),
+            today=Count('id', filter=Q(date=today)),
+            minutes_this_month=Sum('duration_minutes', filter=month_filter),
+            avg_duration_this_month=Avg('duration_minutes', filter=month_filter),
+        )
+        
+        return {
+            'total_students': student_stats['total'],
+            'active_students': student_stats['active'],
+            'inactive_students': student_stats['inactive'],
+            'completed_students': student_stats['completed'],
+            'total_faculty': faculty_stats['total'],
+            'active_faculty': faculty_stats['active'],
+            'total_subjects': subject_stats['total'],
+            'active_subjects': subject_stats['active'],
+            'total_assignments': assignment_stats['total'],
+            'active_assignments': assignment_stats['active'],
+            'total_attendance_records': attendance_stats['total'],
+            'attendance_this_week': attendance_stats['this_week'],
+            'attendance_this_month': attendance_stats['this_month'],
+            'attendance_last_week': attendance_stats['last_week'],
+            'attendance_today': attendance_stats['today'],
+            'minutes_this_month': attendance_stats['minutes_this_month'] or 0,
+            'avg_duration_this_month': attendance_stats['avg_duration_this_month'] or 0,
+        }
+    
+    def _build_overview(self, center, today, week_ago):
+        """Recent students, today's attendance and students needing attention."""
+        from apps.students.models import Student
+        from apps.attendance.models import AttendanceRecord
+        
+        students = Student.objects.filter(center=center, deleted_at__isnull=True)
+        students_with_recent_attendance = set(AttendanceRecord.objects.filter(
+            student__center=center,
+            date__gte=week_ago
+        ).values_list('student_id', flat=True).distinct())
+        
+        return {
+            'recent_students': list(students.order_by('-created_at')[:5]),
+            'today_attendance': list(AttendanceRecord.objects.filter(
+                student__center=center,
+                date=today
+            ).select_related('student', 'marked_by').order_by('-in_time')[:10]),
+            # Students needing attention (no attendance in 7 days)
+            'students_needing_attention': list(students.filter(
+                status='active'
+            ).exclude(
+                id__in=students_with_recent_attendance
+            )[:10]),
+            'active_last_week': len(students_with_recent_attendance),
+        }
+    
+    def _build_faculty_performance(self, center, month_ago):
+        """Top faculty by attendance marked this month."""
+        from apps.faculty.models import Faculty
+        
+        return {
+            'faculty_performance': list(Faculty.objects.filter(
+                center=center,
+                deleted_at__isnull=True,
+                is_active=True
+            ).annotate(
+                attendance_count=Count(
+                    'user__marked_attendance_records',
+                    filter=Q(user__marked_attendance_records__date__gte=month_ago)
+                )
+            ).order_by('-attendance_count')[:5]),
+        }
+    
+    def _build_at_risk(self, center):
+        """
+        Count of students absent 4+ days, for the action items. The student
+        lists and the other insights are served by the lazily loaded
+        reports:center_dashboard_panel endpoints.
+        """
+        from apps.reports.services import get_at_risk_students
+        
+        return {
+            'students_absent_4days_count': get_at_risk_students(center, days_threshold=4).count(),
+        }
+    
+    def _build_feedback(self, center, month_ago):
+        """Average satisfaction and recent feedback count."""
+        from apps.feedback.models import FeedbackResponse
+        
+        feedback_stats = FeedbackResponse.objects.filter(
+            survey__center=center
+        ).aggregate(
+            avg=Avg('satisfaction_score'),
+            recent=Count('id', filter=Q(created_at__gte=month_ago)),
+        )
+        avg_satisfaction = feedback_stats['avg']
+        
+        return {
+            'avg_satisfaction': round(avg_satisfaction, 1) if avg_satisfaction else 0,
+            'recent_feedback_count': feedback_stats['recent'],
+        }
+    
+    def _build_workload(self, center, month_ago):
+        """Faculty workload (sessions + students), from two grouped queries."""
+        from apps.faculty.models import Faculty
+        from apps.subjects.models import Assignment
+        from apps.attendance.models import AttendanceRecord
+        
+        active_faculty = list(Faculty.objects.filter(
+            center=center,
+            deleted_at__isnull=True,
+            is_active=True
+        ).select_related('user'))
+        
+        student_counts = dict(Assignment.objects.filter(
+            faculty__in=active_faculty,
+            student__center=center,
+            student__status='active',
+            student__deleted_at__isnull=True
+        ).values('faculty_id').annotate(
+            count=Count('student_id', distinct=True)
+        ).values_list('faculty_id', 'count'))
+        
+        session_counts = dict(AttendanceRecord.objects.filter(
+            student__center=center,
+            marked_by_id__in=[fac.user_id for fac in active_faculty],
+            date__gte=month_ago
+        ).values('marked_by_id').annotate(
+            count=Count('id')
+        ).values_list('marked_by_id', 'count'))
+        
+        faculty_workload = []
+        for fac in active_faculty:
+            student_count = student_counts.get(fac.pk, 0)
+            sessions_count = session_counts.get(fac.user_id, 0)
+            
+            # Calculate workload score (sessions + students)
+            workload_score = sessions_count + (student_count * 2)
+            
+            faculty_workload.append({
+                'faculty': fac,
+                'student_count': student_count,
+                'sessions_count': sessions_count,
+                'workload_score': workload_score,
+                'status': 'overloaded' if workload_score > 60 else ('balanced' if workload_score > 30 else 'underutilized')
+            })
+        
+        faculty_workload.sort(key=lambda x: x['workload_score'], reverse=True)
+        return {'faculty_workload_all': faculty_workload}
+
+
+def get_inactive_faculty_section(center, today):
+    """Faculty who haven't marked attendance in the last 4 days."""
+    from apps.faculty.models import Faculty
+    from apps.attendance.models import AttendanceRecord
+    
+    four_days_ago = today - timedelta(days=4)
+    
+    # Get faculty who have marked attendance in last 4 days
+    active_faculty_ids = AttendanceRecord.objects.filter(
+        student__center=center,
+        date__gte=four_days_ago
+    ).values_list('marked_by_id', flat=True).distinct()
+    
+    # Get inactive faculty (haven't marked attendance in 4+ days)
+    inactive_faculty = Faculty.objects.filter(
+        center=center,
+        deleted_at__isnull=True,
+        is_active=True
+    ).exclude(
+        user_id__in=active_faculty_ids
+    ).select_related('user', 'center').annotate(
+        last_attendance_date=Max('user__marked_attendance_records__date'),
+        total_students=Count('assignments__student', filter=Q(
+            assignments__is_active=True,
+            assignments__student__status='active',
+            assignments__deleted_at__isnull=True
+        ), distinct=True)
+    ).order_by('last_attendance_date')
+    
+    # Calculate days since last attendance for each inactive faculty
+    inactive_faculty_list = []
+    for fac in inactive_faculty:
+        days_inactive = (today - fac.last_attendance_date).days if fac.last_attendance_date else 999
+        inactive_faculty_list.append({
+            'faculty': fac,
+            'name': fac.user.get_full_name(),
+            'email': fac.user.email,
+            'phone': fac.user.phone,
+            'center': fac.center.name,
+            'employee_id': fac.employee_id,
+            'last_attendance_date': fac.last_attendance_date,
+            'days_inactive': days_inactive,
+            'total_students': fac.total_students
+        })
+    
+    return {
+        'inactive_faculty': inactive_faculty_list,
+        'inactive_faculty_count': len(inactive_faculty_list),
+    }
 
 
 # T116: AccessCenterDashboardView - Master Account Center Switching
@@ -511,33 +539,24 @@ class AccessCenterDashboardView(LoginRequiredMixin, View):
 
 # Master Account - Center Management Views (T110)
 
-class MasterAccountRequiredMixin(LoginRequiredMixin):
-    """Mixin to ensure only master accounts can access."""
-    
-    def dispatch(self, request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            return super().dispatch(request, *args, **kwargs)
-        if not request.user.is_master_account:
-            messages.error(request, 'You do not have permission to access this page.')
-            from django.shortcuts import redirect
-            return redirect('accounts:profile')
-        return super().dispatch(request, *args, **kwargs)
-
-
-class CenterListView(MasterAccountRequiredMixin, ListView):
+class CenterListView(MasterAccountRedirectMixin, ListView):
     """List all centers (Master Account only)."""
     model = Center
     template_name = 'centers/center_list.html'
     context_object_name = 'centers'
     paginate_by = 20
+    # ?sort= value -> (label, ordering); the counts are maintained columns
+    SORT_OPTIONS = {
+        'newest': ('Newest', ['-created_at']),
+        'name': ('Name', ['name']),
+        'students': ('Most students', ['-student_count', 'name']),
+        'active_students': ('Most active students', ['-active_student_count', 'name']),
+        'faculty': ('Most faculty', ['-faculty_count', 'name']),
+        'attendance': ('Most attendance this month', ['-attendance_this_month', 'name']),
+    }
     
     def get_queryset(self):
-        queryset = Center.objects.filter(
-            deleted_at__isnull=True
-        ).annotate(
-            student_count=Count('students', filter=Q(students__deleted_at__isnull=True)),
-            faculty_count=Count('faculty_members', filter=Q(faculty_members__deleted_at__isnull=True))
-        )
+        queryset = Center.objects.filter(deleted_at__isnull=True)
         
         # Search functionality
         search = self.request.GET.get('search')
@@ -556,16 +575,26 @@ class CenterListView(MasterAccountRequiredMixin, ListView):
         elif status == 'inactive':
             queryset = queryset.filter(is_active=False)
         
-        return queryset.order_by('-created_at')
+        # Centers with at least this many students
+        min_students = self.request.GET.get('min_students', '')
+        if min_students.isdigit():
+            queryset = queryset.filter(student_count__gte=int(min_students))
+        
+        ordering = self.SORT_OPTIONS.get(self.request.GET.get('sort'), self.SORT_OPTIONS['newest'])[1]
+        return queryset.order_by(*ordering)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['search'] = self.request.GET.get('search', '')
         context['status_filter'] = self.request.GET.get('status', '')
+        context['min_students'] = self.request.GET.get('min_students', '')
+        sort = self.request.GET.get('sort')
+        context['sort'] = sort if sort in self.SORT_OPTIONS else 'newest'
+        context['sort_options'] = [(value, option[0]) for value, option in self.SORT_OPTIONS.items()]
         return context
 
 
-class CenterCreateView(MasterAccountRequiredMixin, SetCreatedByMixin, AuditLogMixin, CreateView):
+class CenterCreateView(MasterAccountRedirectMixin, SetCreatedByMixin, AuditLogMixin, CreateView):
     """Create a new center (Master Account only)."""
     model = Center
     form_class = CenterForm
@@ -578,7 +607,7 @@ class CenterCreateView(MasterAccountRequiredMixin, SetCreatedByMixin, AuditLogMi
         return super().form_valid(form)
 
 
-class CenterDetailView(MasterAccountRequiredMixin, DetailView):
+class CenterDetailView(MasterAccountRedirectMixin, DetailView):
     """View center details (Master Account only)."""
     model = Center
     template_name = 'centers/center_detail.html'
@@ -592,20 +621,16 @@ class CenterDetailView(MasterAccountRequiredMixin, DetailView):
         
         # Get center statistics
         from apps.students.models import Student
-        from apps.faculty.models import Faculty
         from apps.subjects.models import Subject
         from apps.attendance.models import AttendanceRecord
         
         center = self.object
         
+        # The totals are the center's counter columns
         context['students'] = Student.objects.filter(
             center=center,
             deleted_at__isnull=True
-        )
-        context['faculty'] = Faculty.objects.filter(
-            center=center,
-            deleted_at__isnull=True
-        )
+        ).order_by('first_name', 'last_name')[:10]
         # Subjects are common across all centers
         context['subjects'] = Subject.objects.filter(
             deleted_at__isnull=True
@@ -614,13 +639,11 @@ class CenterDetailView(MasterAccountRequiredMixin, DetailView):
         # Attendance statistics
         today = timezone.now().date()
         week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
         
-        attendance_records = AttendanceRecord.objects.filter(
-            student__center=center
-        )
-        context['attendance_this_week'] = attendance_records.filter(date__gte=week_ago).count()
-        context['attendance_this_month'] = attendance_records.filter(date__gte=month_ago).count()
+        context['attendance_this_week'] = AttendanceRecord.objects.filter(
+            student__center=center,
+            date__gte=week_ago
+        ).count()
         
         # Center heads
         context['center_heads'] = CenterHead.objects.filter(
@@ -631,7 +654,7 @@ class CenterDetailView(MasterAccountRequiredMixin, DetailView):
         return context
 
 
-class CenterUpdateView(MasterAccountRequiredMixin, AuditLogMixin, UpdateView):
+class CenterUpdateView(MasterAccountRedirectMixin, AuditLogMixin, UpdateView):
     """Update center information (Master Account only)."""
     model = Center
     form_class = CenterForm
@@ -649,7 +672,7 @@ class CenterUpdateView(MasterAccountRequiredMixin, AuditLogMixin, UpdateView):
         return super().form_valid(form)
 
 
-class CenterDeleteView(MasterAccountRequiredMixin, AuditLogMixin, DeleteView):
+class CenterDeleteView(MasterAccountRedirectMixin, AuditLogMixin, DeleteView):
     """Soft delete a center (Master Account only)."""
     model = Center
     template_name = 'centers/center_confirm_delete.html'
@@ -693,8 +716,9 @@ class CenterAdminDashboardView(LoginRequiredMixin, View):
                 return get_object_or_404(Center, pk=center_id, deleted_at__isnull=True)
             return None
         
-        if hasattr(self.request.user, 'center_head_profile'):
-            return self.request.user.center_head_profile.center
+        center_head_profile = get_principal(self.request).center_head_profile
+        if center_head_profile:
+            return center_head_profile.center
         return None
     
     def get(self, request):
@@ -705,10 +729,32 @@ class CenterAdminDashboardView(LoginRequiredMixin, View):
             messages.error(request, 'No center assigned to your account.')
             return redirect('accounts:profile')
         
+        today = timezone.now().date()
+        version = get_center_data_version(center.pk)
+        
+        context = {
+            'center': center,
+            'today': today,
+        }
+        context.update(get_cached_section(
+            center.pk, f'admin_students:{today.isoformat()}',
+            lambda: self._build_student_sections(center, today),
+            version=version
+        ))
+        # Inactive faculty insights (shared with the main dashboard cache entry)
+        context.update(get_cached_section(
+            center.pk, f'inactive_faculty:{today.isoformat()}',
+            lambda: get_inactive_faculty_section(center, today),
+            version=version
+        ))
+        
+        return render(request, self.template_name, context)
+    
+    def _build_student_sections(self, center, today):
+        """Student category counts and previews."""
         from apps.students.models import Student
         from apps.attendance.models import AttendanceRecord
         
-        today = timezone.now().date()
         three_days_ago = today - timedelta(days=3)
         thirty_days_ago = today - timedelta(days=30)
         
@@ -749,56 +795,8 @@ class CenterAdminDashboardView(LoginRequiredMixin, View):
             last_attendance=Max('attendance_records__date')
         )
         
-        # INACTIVE FACULTY INSIGHTS - Faculty who haven't marked attendance in last 4 days
-        from apps.faculty.models import Faculty
-        four_days_ago = today - timedelta(days=4)
-        
-        # Get attendance records for this center
-        attendance_records = AttendanceRecord.objects.filter(
-            student__center=center
-        )
-        
-        # Get faculty who have marked attendance in last 4 days
-        active_faculty_ids = attendance_records.filter(
-            date__gte=four_days_ago
-        ).values_list('marked_by_id', flat=True).distinct()
-        
-        # Get inactive faculty (haven't marked attendance in 4+ days)
-        inactive_faculty = Faculty.objects.filter(
-            center=center,
-            is_active=True,
-            deleted_at__isnull=True
-        ).exclude(
-            user_id__in=active_faculty_ids
-        ).select_related('user', 'center').annotate(
-            last_attendance_date=Max('user__marked_attendance_records__date'),
-            total_students=Count('assignments__student', filter=Q(
-                assignments__is_active=True,
-                assignments__student__status='active',
-                assignments__deleted_at__isnull=True
-            ), distinct=True)
-        ).order_by('last_attendance_date')
-        
-        # Calculate days since last attendance for each inactive faculty
-        inactive_faculty_list = []
-        for fac in inactive_faculty:
-            days_inactive = (today - fac.last_attendance_date).days if fac.last_attendance_date else 999
-            inactive_faculty_list.append({
-                'faculty': fac,
-                'name': fac.user.get_full_name(),
-                'email': fac.user.email,
-                'phone': fac.user.phone,
-                'center': fac.center.name,
-                'employee_id': fac.employee_id,
-                'last_attendance_date': fac.last_attendance_date,
-                'days_inactive': days_inactive,
-                'total_students': fac.total_students
-            })
-        
         # Summary statistics
-        context = {
-            'center': center,
-            'today': today,
+        return {
             'total_students': students.count(),
             'absent_3days_count': absent_students.count(),
             'irregular_count': len(irregular_students),
@@ -806,29 +804,32 @@ class CenterAdminDashboardView(LoginRequiredMixin, View):
             'extended_count': extended_students.count(),
             
             # Preview lists (first 5)
-            'absent_students_preview': absent_students[:5],
+            'absent_students_preview': list(absent_students[:5]),
             'irregular_students_preview': irregular_students[:5],
             'on_track_students_preview': on_track_students[:5],
-            'extended_students_preview': extended_students[:5],
-            
-            # Inactive faculty insights
-            'inactive_faculty': inactive_faculty_list,
-            'inactive_faculty_count': len(inactive_faculty_list),
+            'extended_students_preview': list(extended_students[:5]),
         }
+    
+    def _attendance_dates_by_student(self, students, start_date, end_date):
+        """Map student id -> sorted attendance dates in the window, from one query."""
+        from apps.attendance.models import AttendanceRecord
         
-        return render(request, self.template_name, context)
+        dates_by_student = {}
+        for student_id, attendance_date in AttendanceRecord.objects.filter(
+            student__in=students,
+            date__gte=start_date,
+            date__lte=end_date
+        ).values_list('student_id', 'date').order_by('student_id', 'date'):
+            dates_by_student.setdefault(student_id, []).append(attendance_date)
+        return dates_by_student
     
     def get_irregular_students(self, center, students, start_date, end_date):
         """Get students with irregular attendance patterns."""
-        from apps.attendance.models import AttendanceRecord
+        dates_by_student = self._attendance_dates_by_student(students, start_date, end_date)
         
         irregular = []
         for student in students:
-            attendance_dates = list(AttendanceRecord.objects.filter(
-                student=student,
-                date__gte=start_date,
-                date__lte=end_date
-            ).values_list('date', flat=True).order_by('date'))
+            attendance_dates = dates_by_student.get(student.pk, [])
             
             if len(attendance_dates) < 5:  # Less than 5 sessions in 30 days
                 continue
@@ -853,21 +854,22 @@ class CenterAdminDashboardView(LoginRequiredMixin, View):
         """Get students with regular attendance."""
         from apps.attendance.models import AttendanceRecord
         
-        on_track = []
-        for student in students:
-            attendance_count = AttendanceRecord.objects.filter(
-                student=student,
-                date__gte=start_date,
-                date__lte=end_date
-            ).count()
-            
-            # On track: at least 12 sessions in 30 days (3 per week average)
-            if attendance_count >= 12:
-                student.total_sessions = attendance_count
-                student.last_attendance = AttendanceRecord.objects.filter(
-                    student=student
-                ).aggregate(Max('date'))['date__max']
-                on_track.append(student)
+        dates_by_student = self._attendance_dates_by_student(students, start_date, end_date)
+        
+        # On track: at least 12 sessions in 30 days (3 per week average)
+        on_track = [
+            student for student in students
+            if len(dates_by_student.get(student.pk, [])) >= 12
+        ]
+        last_attendance = dict(AttendanceRecord.objects.filter(
+            student__in=on_track
+        ).values('student_id').annotate(
+            last=Max('date')
+        ).values_list('student_id', 'last'))
+        
+        for student in on_track:
+            student.total_sessions = len(dates_by_student[student.pk])
+            student.last_attendance = last_attendance.get(student.pk)
         
         return on_track
 
@@ -890,8 +892,9 @@ class StudentCategoryListView(LoginRequiredMixin, View):
                 return get_object_or_404(Center, pk=center_id, deleted_at__isnull=True)
             return None
         
-        if hasattr(self.request.user, 'center_head_profile'):
-            return self.request.user.center_head_profile.center
+        center_head_profile = get_principal(self.request).center_head_profile
+        if center_head_profile:
+            return center_head_profile.center
         return None
     
     def get(self, request, category):
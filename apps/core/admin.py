@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AuditLog
+from .models import AuditLog, AuditLogArchive, OutboxEvent
 
 
 @admin.register(AuditLog)
@@ -18,3 +18,35 @@ class AuditLogAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         # Audit logs should never be deleted
         return False
+
+
+@admin.register(AuditLogArchive)
+class AuditLogArchiveAdmin(admin.ModelAdmin):
+    list_display = ['month', 'entry_count', 'first_timestamp', 'last_timestamp', 'path', 'modified_at']
+    readonly_fields = ['month', 'path', 'entry_count', 'first_timestamp', 'last_timestamp',
+                       'created_at', 'modified_at']
+
+    def has_add_permission(self, request):
+        # Archive entries are written by the archival job only
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'topic', 'action', 'object_id', 'center_id', 'created_at', 'processed_at', 'attempts']
+    list_filter = ['topic', 'action', ('processed_at', admin.EmptyFieldListFilter)]
+    readonly_fields = ['topic', 'action', 'object_id', 'center_id', 'payload', 'created_at',
+                       'processed_at', 'attempts', 'last_error']
+    actions = ['retry_events']
+
+    def has_add_permission(self, request):
+        # Events are written with the changes they describe
+        return False
+
+    @admin.action(description='Retry selected failed events')
+    def retry_events(self, request, queryset):
+        updated = queryset.filter(processed_at__isnull=True).update(attempts=0, last_error='')
+        self.message_user(request, f'{updated} events queued for retry')
@@ -0,0 +1,243 @@
+"""
+Audit log retention and archival.
+
+Entries older than AUDIT_LOG_RETENTION_DAYS are moved out of the hot
+``audit_logs`` table into append-only, gzip-compressed JSONL files (one per
+month) and deleted from the table in bounded chunks. ``query_audit_logs``
+searches the hot table and the archives together.
+"""
+
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import AuditLog, AuditLogArchive
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = [
+    'id', 'user_id', 'ip_address', 'user_agent', 'action', 'model_name',
+    'object_id', 'object_repr', 'changes', 'reason', 'timestamp', 'request_path',
+]
+
+
+def get_archive_dir():
+    """Return the directory holding audit log archive files."""
+    return str(getattr(settings, 'AUDIT_LOG_ARCHIVE_DIR', os.path.join(settings.BASE_DIR, 'archives', 'audit_logs')))
+
+
+def _month_start(value):
+    """Return the first day of the (local) month of a datetime."""
+    return timezone.localtime(value).date().replace(day=1)
+
+
+def _archive_filename(month):
+    return f"audit_logs_{month:%Y_%m}.jsonl.gz"
+
+
+def _append_entries(month, entries):
+    """
+    Append entries to the archive file of a month.
+
+    Each call writes a new gzip member, so existing data is never rewritten.
+    The file is fsynced before returning so rows are only deleted from the
+    hot table once they are durable on disk.
+    """
+    archive_dir = get_archive_dir()
+    os.makedirs(archive_dir, exist_ok=True)
+    filename = _archive_filename(month)
+
+    with open(os.path.join(archive_dir, filename), 'ab') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='ab') as gz:
+            for entry in entries:
+                line = json.dumps(entry, cls=DjangoJSONEncoder, separators=(',', ':'))
+                gz.write(line.encode('utf-8') + b'\n')
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    return filename
+
+
+def _update_manifest(month, filename, entries):
+    """Record an appended batch in the archive manifest."""
+    timestamps = [entry['timestamp'] for entry in entries]
+    archive, _ = AuditLogArchive.objects.select_for_update().get_or_create(
+        month=month,
+        defaults={'path': filename},
+    )
+    archive.entry_count += len(entries)
+    first, last = min(timestamps), max(timestamps)
+    if archive.first_timestamp is None or first < archive.first_timestamp:
+        archive.first_timestamp = first
+    if archive.last_timestamp is None or last > archive.last_timestamp:
+        archive.last_timestamp = last
+    archive.save()
+
+
+def archive_audit_logs(retention_days=None, chunk_size=None, dry_run=False):
+    """
+    Move audit log entries older than the retention horizon to the archive.
+
+    Rows are processed in primary-key order, ``chunk_size`` at a time. Each
+    chunk is written to its monthly archive file first and then deleted from
+    the hot table in a short transaction, so lock time and index churn per
+    statement stay bounded regardless of backlog size.
+
+    Args:
+        retention_days: Days of history to keep in the hot table
+            (defaults to AUDIT_LOG_RETENTION_DAYS)
+        chunk_size: Rows moved per batch (defaults to AUDIT_LOG_ARCHIVE_CHUNK_SIZE)
+        dry_run: Only count eligible rows, do not archive or delete
+
+    Returns:
+        dict: cutoff, archived count and the months touched
+    """
+    if retention_days is None:
+        retention_days = settings.AUDIT_LOG_RETENTION_DAYS
+    if chunk_size is None:
+        chunk_size = settings.AUDIT_LOG_ARCHIVE_CHUNK_SIZE
+
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    eligible = AuditLog.objects.filter(timestamp__lt=cutoff)
+
+    if dry_run:
+        return {'cutoff': cutoff, 'archived': eligible.count(), 'months': []}
+
+    archived = 0
+    months = set()
+    while True:
+        rows = list(eligible.order_by('id').values(*ARCHIVE_FIELDS)[:chunk_size])
+        if not rows:
+            break
+
+        by_month = defaultdict(list)
+        for row in rows:
+            by_month[_month_start(row['timestamp'])].append(row)
+
+        files = {month: _append_entries(month, entries) for month, entries in by_month.items()}
+
+        with transaction.atomic():
+            for month, entries in by_month.items():
+                _update_manifest(month, files[month], entries)
+            AuditLog.objects.filter(id__in=[row['id'] for row in rows]).delete()
+
+        archived += len(rows)
+        months.update(by_month)
+        logger.info("Archived %s audit log entries (total %s)", len(rows), archived)
+
+    return {'cutoff': cutoff, 'archived': archived, 'months': sorted(months)}
+
+
+def vacuum_audit_log_table():
+    """
+    Reclaim space in the hot table after a large archive run.
+
+    Only PostgreSQL needs (and supports) this; other backends are skipped.
+
+    Returns:
+        bool: True if a VACUUM was issued
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(f'VACUUM (ANALYZE) {AuditLog._meta.db_table}')
+    return True
+
+
+def _read_archive(path):
+    """Yield entries from an archive file, parsing timestamps."""
+    full_path = os.path.join(get_archive_dir(), path)
+    if not os.path.exists(full_path):
+        logger.warning("Audit log archive %s listed in manifest but missing on disk", full_path)
+        return
+    with gzip.open(full_path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            entry['timestamp'] = parse_datetime(entry['timestamp'])
+            yield entry
+
+
+def _matches(entry, filters, start, end):
+    for field, value in filters.items():
+        if entry.get(field) != value:
+            return False
+    if start and entry['timestamp'] < start:
+        return False
+    if end and entry['timestamp'] >= end:
+        return False
+    return True
+
+
+def query_audit_logs(model_name=None, object_id=None, user_id=None, action=None,
+                     start=None, end=None, limit=None):
+    """
+    Search audit log entries across the hot table and the archives.
+
+    The hot table is queried through its indexes; archive files are only
+    opened for months whose manifest range overlaps ``start``/``end``.
+    An entry re-archived after an interrupted run is returned once.
+
+    Args:
+        model_name: Filter by model name
+        object_id: Filter by object ID
+        user_id: Filter by acting user ID
+        action: Filter by action type
+        start: Only entries at or after this datetime
+        end: Only entries before this datetime
+        limit: Maximum number of entries to return
+
+    Returns:
+        list: Entry dicts (ARCHIVE_FIELDS keys), newest first
+    """
+    filters = {
+        key: value for key, value in {
+            'model_name': model_name,
+            'object_id': object_id,
+            'user_id': user_id,
+            'action': action,
+        }.items() if value is not None
+    }
+
+    hot = AuditLog.objects.filter(**filters)
+    if start:
+        hot = hot.filter(timestamp__gte=start)
+    if end:
+        hot = hot.filter(timestamp__lt=end)
+    hot = hot.order_by('-timestamp', '-id').values(*ARCHIVE_FIELDS)
+    results = list(hot[:limit] if limit else hot)
+    if limit and len(results) >= limit:
+        return results
+
+    archives = AuditLogArchive.objects.all()
+    if start:
+        archives = archives.filter(last_timestamp__gte=start)
+    if end:
+        archives = archives.filter(first_timestamp__lt=end)
+
+    seen = {entry['id'] for entry in results}
+    for archive in archives.order_by('-month'):
+        matched = [
+            entry for entry in _read_archive(archive.path)
+            if entry['id'] not in seen and _matches(entry, filters, start, end)
+        ]
+        matched.sort(key=lambda entry: (entry['timestamp'], entry['id']), reverse=True)
+        for entry in matched:
+            if entry['id'] in seen:
+                continue
+            seen.add(entry['id'])
+            results.append(entry)
+            if limit and len(results) >= limit:
+                return results
+
+    return results
@@ -0,0 +1,65 @@
+"""
+Template context of the page chrome (sidebar and top bar).
+
+Every authenticated page renders the center switcher, the user's center
+and the unread notification badge. layout() adds a LayoutContext whose
+values are computed on first use, at most once per request, from cached
+entries: pages that do not render the chrome pay nothing, and in steady
+state the chrome runs no queries. The entries are dropped when a center
+or one of the user's notifications changes (see apps/centers/signals.py
+and apps/core/signals.py).
+"""
+
+from django.utils.functional import cached_property
+
+
+class LayoutContext:
+    """Lazily computed page chrome data for one request."""
+
+    def __init__(self, request):
+        self.request = request
+        self.user = request.user
+
+    @cached_property
+    def switch_centers(self):
+        """Active centers offered by the master account's center switcher."""
+        from apps.centers.cache import get_switch_centers
+
+        if not self.user.is_authenticated or not self.user.is_master_account:
+            return []
+        return get_switch_centers()
+
+    @cached_property
+    def user_center(self):
+        """The center a master account is viewing, or a center head's center."""
+        if not self.user.is_authenticated:
+            return None
+        if self.user.is_master_account:
+            # Resolved by CenterContextMiddleware from the session
+            return getattr(self.request, 'active_center', None)
+        if self.user.is_center_head:
+            from .principal import get_principal
+
+            return get_principal(self.request).center
+        return None
+
+    @cached_property
+    def unread_notification_count(self):
+        from .services import get_unread_notification_count
+
+        if not self.user.is_authenticated:
+            return 0
+        return get_unread_notification_count(self.user.pk)
+
+
+def get_layout_context(request):
+    """The request's LayoutContext (created on first use)."""
+    layout_context = getattr(request, '_layout_context', None)
+    if layout_context is None:
+        layout_context = LayoutContext(request)
+        request._layout_context = layout_context
+    return layout_context
+
+
+def layout(request):
+    return {'layout': get_layout_context(request)}
@@ -0,0 +1,716 @@
+"""
+Bulk import of students, assignments and attendance from CSV or XLSX.
+
+Rows are streamed from the file (csv.reader, or openpyxl in read-only
+mode) and handled in chunks of IMPORT_CHUNK_SIZE rows, so memory stays
+bounded by the chunk and the lookup dicts, not by the file:
+
+- foreign keys (enrollment numbers, subject codes, faculty emails,
+  assignments) are resolved through dicts preloaded once per import
+- each chunk is validated with the model fields' own clean() and checked
+  against the database with one query per table
+- a chunk is written with bulk_create/bulk_update inside its own atomic
+  block, so a failing batch rolls back alone and is reported as errors
+
+A dry run validates everything and reports a diff (rows that would be
+created or updated, with the changed fields) without writing. Rows that
+already exist unchanged are skipped, which makes re-running an import
+after a failure safe.
+
+All rows go to one center. Students are keyed by enrollment number,
+assignments by (student, subject, faculty, start date) and attendance by
+(student, assignment, date, in time); attendance that overlaps other
+attendance of the student or faculty is rejected (see
+apps/attendance/overlaps.py).
+
+run_import() is the entry point; apps/core/tasks.py runs it as a Celery
+task that reports progress, and `manage.py import_data` runs it inline.
+"""
+
+import csv
+import datetime
+import io
+import os
+from itertools import chain, islice, repeat
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+IMPORT_KINDS = ('students', 'assignments', 'attendance')
+FILE_FORMATS = ('csv', 'xlsx')
+
+# Rows listed in the result (errors and dry-run changes)
+SAMPLE_LIMIT = 200
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+TIME_FORMATS = ('%H:%M', '%H:%M:%S', '%I:%M %p')
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all (format, missing columns)."""
+
+
+class RowError(ValueError):
+    """A row is invalid; the message is reported with its line number."""
+
+
+# File reading
+
+def file_format_for(name):
+    """
+    File format of an upload from its name.
+
+    Raises:
+        ImportFileError: If the extension is not .csv or .xlsx
+    """
+    file_format = os.path.splitext(name)[1].lstrip('.').lower()
+    if file_format not in FILE_FORMATS:
+        raise ImportFileError('Upload a .csv or .xlsx file.')
+    return file_format
+
+
+def _header(values):
+    return [str(value or '').strip().lower().replace(' ', '_') for value in values]
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store phone and enrollment numbers as floats
+        return str(int(value))
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def read_rows(fileobj, file_format):
+    """
+    Stream the rows of an uploaded file.
+
+    Args:
+        fileobj: Binary file object
+        file_format: 'csv' or 'xlsx'
+
+    Yields:
+        tuple: (line number, dict of column name -> value); blank rows are
+        skipped. Column names are lowercased with spaces as underscores;
+        every row has all the header's columns (short rows are padded with
+        blanks).
+    """
+    if file_format == 'csv':
+        text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+        reader = csv.reader(text)
+        header = _header(next(reader, []))
+        for line, values in enumerate(reader, start=2):
+            values = [value.strip() for value in values]
+            if any(values):
+                yield line, dict(zip(header, chain(values, repeat(''))))
+        text.detach()
+        return
+
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('Importing .xlsx files requires the openpyxl package.')
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _header(next(rows, []))
+        for line, values in enumerate(rows, start=2):
+            values = [_cell(value) for value in values]
+            if any(value != '' for value in values):
+                yield line, dict(zip(header, chain(values, repeat(''))))
+    finally:
+        workbook.close()
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Value parsing
+
+def _parse(value, formats, kind):
+    try:
+        # Fast path for ISO values, the common case of large exports
+        return datetime.datetime.fromisoformat(value if kind == 'date' else f'2000-01-01T{value}')
+    except ValueError:
+        pass
+    for fmt in formats:
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise RowError(f"Invalid {kind}: {value}")
+
+
+def parse_date(value):
+    """Date from a cell (date, datetime or YYYY-MM-DD / DD/MM/YYYY text); None if empty."""
+    if value in ('', None):
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return _parse(str(value), DATE_FORMATS, 'date').date()
+
+
+def parse_time(value):
+    """Time from a cell (time, datetime or HH:MM / HH:MM:SS / 4:30 PM text); None if empty."""
+    if value in ('', None):
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.time()
+    if isinstance(value, datetime.time):
+        return value
+    return _parse(str(value).upper(), TIME_FORMATS, 'time').time()
+
+
+def parse_bool(value, default=True):
+    if value in ('', None):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'y', 'active')
+
+
+def _required(row, column):
+    value = row.get(column, '')
+    if value in ('', None):
+        raise RowError(f"{column} is required")
+    return str(value)
+
+
+def _clean_fields(model, values):
+    """Run the model fields' clean() (type, length, choices, blank) without touching the database."""
+    cleaned = {}
+    for name, value in values.items():
+        field = model._meta.get_field(name)
+        try:
+            cleaned[name] = field.clean(value, None)
+        except ValidationError as exc:
+            raise RowError(f"{name}: {' '.join(exc.messages)}")
+    return cleaned
+
+
+def _display(value):
+    return '' if value is None else str(value)
+
+
+# Importers
+
+class BaseImporter:
+    """
+    One import of one kind of row into one center.
+
+    Subclasses load their lookup dicts in load_lookups() and implement
+    plan_chunk(), which validates a chunk and returns the objects to
+    create and update; write() saves a plan.
+    """
+
+    kind = None
+    model = None
+    required_columns = ()
+    update_fields = ()
+
+    def __init__(self, user, center, dry_run=False):
+        self.user = user
+        self.center = center
+        self.dry_run = dry_run
+        self.result = {
+            'kind': self.kind,
+            'dry_run': dry_run,
+            'rows': 0,
+            'created': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'errors': 0,
+            'error_rows': [],
+            'changes': [],
+        }
+
+    def load_lookups(self):
+        pass
+
+    def check_columns(self, columns):
+        missing = [column for column in self.required_columns if column not in columns]
+        if missing:
+            raise ImportFileError(f"Missing columns: {', '.join(missing)}")
+
+    def add_error(self, line, message):
+        self.result['errors'] += 1
+        if len(self.result['error_rows']) < SAMPLE_LIMIT:
+            self.result['error_rows'].append({'line': line, 'error': message})
+
+    def add_change(self, line, action, key, changes=None):
+        self.result[action + 'd'] += 1
+        if self.dry_run and len(self.result['changes']) < SAMPLE_LIMIT:
+            self.result['changes'].append({
+                'line': line, 'action': action, 'key': key, 'fields': changes or {},
+            })
+
+    def plan_chunk(self, chunk):
+        """
+        Validate a chunk.
+
+        Args:
+            chunk: List of (line, row) pairs
+
+        Returns:
+            tuple: (objects to create, objects to update), each a list of
+            (line, instance) pairs
+        """
+        raise NotImplementedError
+
+    def write(self, to_create, to_update):
+        from .outbox import record_events
+
+        batch_size = getattr(settings, 'IMPORT_CHUNK_SIZE', 2000)
+        self.model.objects.bulk_create([obj for line, obj in to_create], batch_size=batch_size)
+        record_events([obj for line, obj in to_create], 'created')
+        if to_update:
+            # bulk_update does not apply auto_now
+            now = timezone.now()
+            for line, obj in to_update:
+                obj.modified_by = self.user
+                obj.modified_at = now
+            self.model.objects.bulk_update(
+                [obj for line, obj in to_update],
+                [*self.update_fields, 'modified_by', 'modified_at'],
+                batch_size=batch_size
+            )
+            record_events([obj for line, obj in to_update], 'updated')
+
+    def after_import(self):
+        """Called once after the last chunk was written (not on dry runs)."""
+        from apps.centers.cache import bump_center_data_version
+        from apps.centers.counters import reconcile_counters
+        # bulk writes send no signals
+        bump_center_data_version(self.center.pk)
+        reconcile_counters(self.center)
+
+    def process(self, chunk):
+        to_create, to_update = self.plan_chunk(chunk)
+        self.result['rows'] += len(chunk)
+        if self.dry_run or not (to_create or to_update):
+            return
+        try:
+            with transaction.atomic():
+                self.write(to_create, to_update)
+        except DatabaseError as exc:
+            # The batch was rolled back; report its rows and carry on
+            for action, rows in (('create', to_create), ('update', to_update)):
+                self.result[action + 'd'] -= len(rows)
+                for line, obj in rows:
+                    self.add_error(line, f"Not saved: {exc}")
+
+
+class StudentImporter(BaseImporter):
+    """
+    Students keyed by enrollment number; existing students are updated.
+
+    Only the columns in the file are written: a column left out keeps the
+    students' current values, while a blank cell in a present column
+    clears the value.
+    """
+
+    kind = 'students'
+    required_columns = (
+        'first_name', 'last_name', 'phone', 'enrollment_number', 'enrollment_date',
+        'guardian_name', 'guardian_phone',
+    )
+    update_fields = (
+        'first_name', 'last_name', 'email', 'phone', 'date_of_birth', 'enrollment_date',
+        'status', 'guardian_name', 'guardian_phone', 'guardian_email', 'address', 'city',
+        'state', 'pincode', 'notes',
+    )
+
+    def __init__(self, *args, **kwargs):
+        from apps.students.models import Student
+        self.model = Student
+        super().__init__(*args, **kwargs)
+        self.seen = set()
+
+    def check_columns(self, columns):
+        super().check_columns(columns)
+        # Narrows the fields compared, set and written by bulk_update
+        self.update_fields = tuple(field for field in self.update_fields if field in columns)
+
+    def plan_chunk(self, chunk):
+        parsed = []
+        for line, row in chunk:
+            try:
+                values = {field: row[field] for field in self.update_fields}
+                values['enrollment_number'] = _required(row, 'enrollment_number')
+                values['enrollment_date'] = parse_date(values['enrollment_date'])
+                if 'date_of_birth' in values:
+                    values['date_of_birth'] = parse_date(values['date_of_birth'])
+                if 'status' in values:
+                    values['status'] = str(values['status'] or 'active').lower()
+                values = _clean_fields(self.model, values)
+            except RowError as exc:
+                self.add_error(line, str(exc))
+                continue
+            if values['enrollment_number'] in self.seen:
+                self.add_error(line, f"Duplicate enrollment number {values['enrollment_number']} in file")
+                continue
+            self.seen.add(values['enrollment_number'])
+            parsed.append((line, values))
+
+        existing = self.model.all_objects.in_bulk(
+            [values['enrollment_number'] for line, values in parsed], field_name='enrollment_number'
+        )
+
+        to_create, to_update = [], []
+        for line, values in parsed:
+            key = values['enrollment_number']
+            student = existing.get(key)
+            if student is None:
+                to_create.append((line, self.model(
+                    center=self.center, created_by=self.user, modified_by=self.user, **values
+                )))
+                self.add_change(line, 'create', key)
+                continue
+            if student.center_id != self.center.pk or student.deleted_at:
+                self.add_error(line, f"Enrollment number {key} belongs to a deleted student or another center")
+                continue
+            changes = {
+                field: [_display(getattr(student, field)), _display(values[field])]
+                for field in self.update_fields
+                if getattr(student, field) != values[field]
+            }
+            if not changes:
+                self.result['unchanged'] += 1
+                continue
+            for field in changes:
+                setattr(student, field, values[field])
+            to_update.append((line, student))
+            self.add_change(line, 'update', key, changes)
+        return to_create, to_update
+
+
+class AssignmentImporter(BaseImporter):
+    """Assignments keyed by student, subject, faculty and start date."""
+
+    kind = 'assignments'
+    required_columns = ('enrollment_number', 'subject_code', 'faculty_email', 'start_date')
+    update_fields = ('end_date', 'is_active')
+
+    def __init__(self, *args, **kwargs):
+        from apps.subjects.models import Assignment
+        self.model = Assignment
+        super().__init__(*args, **kwargs)
+        self.seen = set()
+        self.faculty_ids = set()
+
+    def load_lookups(self):
+        from apps.faculty.models import Faculty
+        from apps.students.models import Student
+        from apps.subjects.models import Subject
+
+        self.students = dict(Student.objects.filter(
+            center=self.center
+        ).values_list('enrollment_number', 'pk'))
+        self.subjects = dict(Subject.objects.values_list('code', 'pk'))
+        self.faculty = {
+            email.lower(): pk for email, pk in Faculty.objects.filter(
+                center=self.center
+            ).values_list('user__email', 'pk')
+        }
+
+    def plan_chunk(self, chunk):
+        parsed = []
+        for line, row in chunk:
+            try:
+                enrollment_number = _required(row, 'enrollment_number')
+                subject_code = _required(row, 'subject_code')
+                faculty_email = _required(row, 'faculty_email').lower()
+                if enrollment_number not in self.students:
+                    raise RowError(f"Unknown student {enrollment_number}")
+                if subject_code not in self.subjects:
+                    raise RowError(f"Unknown subject {subject_code}")
+                if faculty_email not in self.faculty:
+                    raise RowError(f"Unknown faculty {faculty_email}")
+                start_date = parse_date(_required(row, 'start_date'))
+                end_date = parse_date(row.get('end_date'))
+                if end_date and end_date < start_date:
+                    raise RowError('end_date is before start_date')
+            except RowError as exc:
+                self.add_error(line, str(exc))
+                continue
+            key = (
+                self.students[enrollment_number], self.subjects[subject_code],
+                self.faculty[faculty_email], start_date
+            )
+            if key in self.seen:
+                self.add_error(line, 'Duplicate assignment in file')
+                continue
+            self.seen.add(key)
+            label = f"{enrollment_number} {subject_code} {faculty_email} {start_date}"
+            values = {'end_date': end_date, 'is_active': parse_bool(row.get('is_active'))}
+            parsed.append((line, key, label, values))
+
+        existing = {
+            (obj.student_id, obj.subject_id, obj.faculty_id, obj.start_date): obj
+            for obj in self.model.all_objects.filter(
+                student_id__in={key[0] for line, key, label, values in parsed}
+            )
+        }
+
+        to_create, to_update = [], []
+        for line, key, label, values in parsed:
+            student_id, subject_id, faculty_id, start_date = key
+            assignment = existing.get(key)
+            if assignment is None:
+                to_create.append((line, self.model(
+                    student_id=student_id, subject_id=subject_id, faculty_id=faculty_id,
+                    start_date=start_date, created_by=self.user, modified_by=self.user, **values
+                )))
+                self.faculty_ids.add(faculty_id)
+                self.add_change(line, 'create', label)
+                continue
+            changes = {
+                field: [_display(getattr(assignment, field)), _display(value)]
+                for field, value in values.items()
+                if getattr(assignment, field) != value
+            }
+            if not changes:
+                self.result['unchanged'] += 1
+                continue
+            for field, value in values.items():
+                setattr(assignment, field, value)
+            to_update.append((line, assignment))
+            self.faculty_ids.add(faculty_id)
+            self.add_change(line, 'update', label, changes)
+        return to_create, to_update
+
+    def after_import(self):
+        from apps.attendance.roster import invalidate_roster
+
+        super().after_import()
+        for faculty_id in self.faculty_ids:
+            invalidate_roster(faculty_id)
+
+
+class AttendanceImporter(BaseImporter):
+    """
+    Historical attendance keyed by student, assignment, date and in time.
+
+    The assignment is the student's assignment in the subject (with the
+    given faculty, if any) whose dates cover the attendance date. Records
+    are marked by the assignment's faculty and are never updated.
+    """
+
+    kind = 'attendance'
+    required_columns = ('enrollment_number', 'subject_code', 'date', 'in_time', 'out_time')
+
+    def __init__(self, *args, **kwargs):
+        from apps.attendance.models import AttendanceRecord
+        self.model = AttendanceRecord
+        super().__init__(*args, **kwargs)
+        self.today = timezone.now().date()
+        self.marked_today = {}
+        # Rows repeat few dates and time slots
+        self.backdated = {}
+        self.durations = {}
+
+    def load_lookups(self):
+        from apps.faculty.models import Faculty
+        from apps.students.models import Student
+        from apps.subjects.models import Assignment, Subject
+
+        self.students = dict(Student.objects.filter(
+            center=self.center
+        ).values_list('enrollment_number', 'pk'))
+        self.subjects = dict(Subject.objects.values_list('code', 'pk'))
+        self.faculty = {
+            email.lower(): pk for email, pk in Faculty.objects.filter(
+                center=self.center
+            ).values_list('user__email', 'pk')
+        }
+        self.faculty_users = dict(Faculty.objects.filter(
+            center=self.center
+        ).values_list('pk', 'user_id'))
+
+        # (student, subject) -> [(assignment, faculty, start, end)]
+        self.assignments = {}
+        for row in Assignment.objects.filter(
+            student__center=self.center
+        ).values_list('pk', 'student_id', 'subject_id', 'faculty_id', 'start_date', 'end_date'):
+            pk, student_id, subject_id, faculty_id, start_date, end_date = row
+            self.assignments.setdefault((student_id, subject_id), []).append(
+                (pk, faculty_id, start_date, end_date)
+            )
+
+    def resolve_assignment(self, student_id, subject_id, faculty_id, date):
+        candidates = [
+            candidate for candidate in self.assignments.get((student_id, subject_id), ())
+            if faculty_id is None or candidate[1] == faculty_id
+        ]
+        if not candidates:
+            raise RowError('No assignment for this student and subject')
+        covering = [
+            candidate for candidate in candidates
+            if candidate[2] <= date and (candidate[3] is None or date <= candidate[3])
+        ]
+        if len(covering) == 1 or (covering and faculty_id is not None):
+            return covering[0]
+        if not covering:
+            raise RowError(f"No assignment covers {date}")
+        raise RowError('Several assignments match; give faculty_email')
+
+    def plan_chunk(self, chunk):
+        from apps.attendance.overlaps import build_window_index
+        from apps.core.utils import calculate_session_duration, is_backdated
+
+        parsed = []
+        for line, row in chunk:
+            try:
+                enrollment_number = _required(row, 'enrollment_number')
+                subject_code = _required(row, 'subject_code')
+                if enrollment_number not in self.students:
+                    raise RowError(f"Unknown student {enrollment_number}")
+                if subject_code not in self.subjects:
+                    raise RowError(f"Unknown subject {subject_code}")
+                faculty_id = None
+                if row.get('faculty_email'):
+                    faculty_email = str(row['faculty_email']).lower()
+                    if faculty_email not in self.faculty:
+                        raise RowError(f"Unknown faculty {faculty_email}")
+                    faculty_id = self.faculty[faculty_email]
+
+                date = parse_date(_required(row, 'date'))
+                in_time = parse_time(_required(row, 'in_time'))
+                out_time = parse_time(_required(row, 'out_time'))
+                if out_time <= in_time:
+                    raise RowError('out_time must be after in_time')
+                if date > self.today:
+                    raise RowError('Attendance cannot be in the future')
+
+                student_id = self.students[enrollment_number]
+                assignment_id, faculty_id, start, end = self.resolve_assignment(
+                    student_id, self.subjects[subject_code], faculty_id, date
+                )
+            except RowError as exc:
+                self.add_error(line, str(exc))
+                continue
+            label = f"{enrollment_number} {subject_code} {date} {in_time:%H:%M}"
+            parsed.append((line, label, student_id, assignment_id, faculty_id, date, in_time, out_time,
+                           str(row.get('notes') or '')))
+        if not parsed:
+            return [], []
+
+        student_ids = {item[2] for item in parsed}
+        start = min(item[5] for item in parsed)
+        end = max(item[5] for item in parsed)
+        existing = set(self.model.objects.filter(
+            student_id__in=student_ids,
+            date__range=(start, end)
+        ).values_list('student_id', 'assignment_id', 'date', 'in_time'))
+        windows = build_window_index(student_ids, {item[4] for item in parsed}, start, end)
+
+        to_create = []
+        for line, label, student_id, assignment_id, faculty_id, date, in_time, out_time, notes in parsed:
+            key = (student_id, assignment_id, date, in_time)
+            if key in existing:
+                self.result['unchanged'] += 1
+                continue
+            if windows.student_conflict(student_id, date, in_time, out_time):
+                self.add_error(line, 'Overlaps other attendance of the student')
+                continue
+            if windows.faculty_conflict(faculty_id, date, in_time, out_time):
+                self.add_error(line, "Overlaps another class of the faculty")
+                continue
+            existing.add(key)
+            windows.add_student(student_id, date, in_time, out_time)
+            windows.add_faculty(faculty_id, date, in_time, out_time)
+
+            if date not in self.backdated:
+                self.backdated[date] = date < self.today and is_backdated(date)
+            backdated = self.backdated[date]
+            if (in_time, out_time) not in self.durations:
+                self.durations[in_time, out_time] = calculate_session_duration(in_time, out_time)
+            to_create.append((line, self.model(
+                student_id=student_id,
+                assignment_id=assignment_id,
+                date=date,
+                in_time=in_time,
+                out_time=out_time,
+                duration_minutes=self.durations[in_time, out_time],
+                notes=notes,
+                is_backdated=backdated,
+                backdated_reason='Imported' if backdated else '',
+                marked_by_id=self.faculty_users[faculty_id],
+                created_by=self.user,
+                modified_by=self.user,
+            )))
+            if date == self.today:
+                self.marked_today.setdefault(faculty_id, set()).add(student_id)
+            self.add_change(line, 'create', label)
+        return to_create, []
+
+    def after_import(self):
+        from apps.attendance.roster import mark_roster_students
+
+        super().after_import()
+        for faculty_id, student_ids in self.marked_today.items():
+            mark_roster_students(faculty_id, self.today, student_ids)
+
+
+IMPORTERS = {
+    'students': StudentImporter,
+    'assignments': AssignmentImporter,
+    'attendance': AttendanceImporter,
+}
+
+
+def run_import(kind, fileobj, file_format, user, center, dry_run=False, chunk_size=None, progress=None):
+    """
+    Import a CSV or XLSX file.
+
+    Args:
+        kind: 'students', 'assignments' or 'attendance'
+        fileobj: Binary file object
+        file_format: 'csv' or 'xlsx'
+        user: User recorded as creator of the rows
+        center: Center the rows belong to
+        dry_run: Validate and report the diff without writing
+        chunk_size: Rows per chunk (defaults to IMPORT_CHUNK_SIZE)
+        progress: Callable receiving the result dict after every chunk
+
+    Returns:
+        dict: kind, dry_run, rows, created, updated, unchanged and errors
+        counts; error_rows and (dry run) changes list up to SAMPLE_LIMIT
+        rows each
+
+    Raises:
+        ImportFileError: If the file cannot be read or lacks columns
+    """
+    if kind not in IMPORTERS:
+        raise ImportFileError(f"Unknown import kind: {kind}")
+    importer = IMPORTERS[kind](user, center, dry_run=dry_run)
+    chunk_size = chunk_size or getattr(settings, 'IMPORT_CHUNK_SIZE', 2000)
+
+    rows = read_rows(fileobj, file_format)
+    first = next(rows, None)
+    if first is None:
+        return importer.result
+    importer.check_columns(first[1].keys())
+    importer.load_lookups()
+
+    for chunk in _chunks(chain([first], rows), chunk_size):
+        importer.process(chunk)
+        if progress:
+            progress(importer.result)
+
+    if not dry_run and (importer.result['created'] or importer.result['updated']):
+        importer.after_import()
+    return importer.result
@@ -0,0 +1,60 @@
+"""
+Management command to archive expired audit log entries.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.audit_archive import archive_audit_logs, vacuum_audit_log_table
+
+
+class Command(BaseCommand):
+    help = 'Move audit log entries older than the retention horizon into compressed monthly archives'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.AUDIT_LOG_RETENTION_DAYS,
+            help='Keep this many days of entries in the audit_logs table',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.AUDIT_LOG_ARCHIVE_CHUNK_SIZE,
+            help='Number of entries moved per batch',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many entries would be archived',
+        )
+        parser.add_argument(
+            '--vacuum',
+            action='store_true',
+            help='Run VACUUM ANALYZE on the audit_logs table afterwards (PostgreSQL only)',
+        )
+
+    def handle(self, *args, **options):
+        result = archive_audit_logs(
+            retention_days=options['days'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(
+                f"{result['archived']} entries older than {result['cutoff']:%Y-%m-%d %H:%M} would be archived"
+            )
+            return
+
+        months = ', '.join(f'{month:%Y-%m}' for month in result['months']) or 'none'
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {result['archived']} entries (months: {months})"
+        ))
+
+        if options['vacuum'] and result['archived']:
+            if vacuum_audit_log_table():
+                self.stdout.write('Vacuumed audit_logs table')
+            else:
+                self.stdout.write('VACUUM skipped (not supported by this database)')
@@ -6,6 +6,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from apps.core.models import Notification, Task
+from apps.core.services import create_notifications, create_tasks_bulk
 from apps.accounts.models import User
 from apps.centers.models import Center
 
@@ -37,39 +38,45 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS('Cleared successfully'))
 
         # Get users
-        master_users = User.objects.filter(role=User.MASTER_ACCOUNT, is_active=True)
-        center_heads = User.objects.filter(role=User.CENTER_HEAD, is_active=True)
+        master_users = list(User.objects.filter(role=User.MASTER_ACCOUNT, is_active=True))
+        center_heads = list(User.objects.filter(
+            role=User.CENTER_HEAD, is_active=True
+        ).select_related('center_head_profile__center'))
         
-        if not master_users.exists() and not center_heads.exists():
+        if not master_users and not center_heads:
             self.stdout.write(self.style.WARNING('No master or center head users found'))
             return
 
         # Get centers
-        centers = Center.objects.filter(deleted_at__isnull=True, is_active=True)
+        centers = list(Center.objects.filter(deleted_at__isnull=True, is_active=True))
 
-        notifications_created = 0
-        tasks_created = 0
+        # Collected for all users, then inserted with one bulk INSERT each
+        notifications = []
+        tasks = []
 
         # Create notifications for master accounts
         for user in master_users:
-            notifications_created += self.create_master_notifications(user, count)
-            tasks_created += self.create_master_tasks(user, count, centers)
+            notifications += self.create_master_notifications(user, count)
+            tasks += self.create_master_tasks(user, count, centers)
 
         # Create notifications for center heads
         for user in center_heads:
             try:
                 center = user.center_head_profile.center
-                notifications_created += self.create_center_head_notifications(user, count, center)
-                tasks_created += self.create_center_head_tasks(user, count // 2, center)
-            except:
+            except User.center_head_profile.RelatedObjectDoesNotExist:
                 continue
+            notifications += self.create_center_head_notifications(user, count, center)
+            tasks += self.create_center_head_tasks(user, count // 2, center)
+
+        notifications_created = len(create_notifications(notifications))
+        tasks_created = len(create_tasks_bulk(tasks, notify=False))
 
         self.stdout.write(self.style.SUCCESS(
             f'Successfully created {notifications_created} notifications and {tasks_created} tasks'
         ))
 
     def create_master_notifications(self, user, count):
-        """Create sample notifications for master account."""
+        """Sample notifications for a master account (unsaved)."""
         notification_templates = [
             {
                 'title': '🚨 Low Attendance Alert',
@@ -133,10 +140,10 @@ class Command(BaseCommand):
             },
         ]
 
-        created = 0
+        notifications = []
         for i in range(min(count, len(notification_templates))):
             template = notification_templates[i]
-            Notification.objects.create(
+            notifications.append(Notification(
                 user=user,
                 title=template['title'],
                 message=template['message'],
@@ -144,13 +151,12 @@ class Command(BaseCommand):
                 action_url=template['action_url'],
                 is_read=(i % 3 == 0),  # Mark some as read
                 created_at=timezone.now() - timedelta(hours=i)
-            )
-            created += 1
+            ))
 
-        return created
+        return notifications
 
     def create_center_head_notifications(self, user, count, center):
-        """Create sample notifications for center head."""
+        """Sample notifications for a center head (unsaved)."""
         notification_templates = [
             {
                 'title': '👨‍🎓 Student Absent Alert',
@@ -184,10 +190,10 @@ class Command(BaseCommand):
             },
         ]
 
-        created = 0
+        notifications = []
         for i in range(min(count, len(notification_templates))):
             template = notification_templates[i]
-            Notification.objects.create(
+            notifications.append(Notification(
                 user=user,
                 title=template['title'],
                 message=template['message'],
@@ -195,13 +201,12 @@ class Command(BaseCommand):
                 action_url=template['action_url'],
                 is_read=(i % 2 == 0),
                 created_at=timezone.now() - timedelta(hours=i)
-            )
-            created += 1
+            ))
 
-        return created
+        return notifications
 
     def create_master_tasks(self, user, count, centers):
-        """Create sample tasks for master account."""
+        """Sample tasks for a master account (unsaved)."""
         task_templates = [
             {
                 'title': 'Review Low-Performing Centers',
@@ -240,12 +245,12 @@ class Command(BaseCommand):
             },
         ]
 
-        created = 0
+        tasks = []
         for i in range(min(count, len(task_templates))):
             template = task_templates[i]
-            center = centers[i % centers.count()] if centers.exists() else None
+            center = centers[i % len(centers)] if centers else None
             
-            Task.objects.create(
+            tasks.append(Task(
                 assigned_to=user,
                 title=template['title'],
                 description=template['description'],
@@ -255,13 +260,12 @@ class Command(BaseCommand):
                 related_center=center,
                 due_date=template['due_date'],
                 created_by=user
-            )
-            created += 1
+            ))
 
-        return created
+        return tasks
 
     def create_center_head_tasks(self, user, count, center):
-        """Create sample tasks for center head."""
+        """Sample tasks for a center head (unsaved)."""
         task_templates = [
             {
                 'title': 'Follow Up with Absent Students',
@@ -286,11 +290,11 @@ class Command(BaseCommand):
             },
         ]
 
-        created = 0
+        tasks = []
         for i in range(min(count, len(task_templates))):
             template = task_templates[i]
             
-            Task.objects.create(
+            tasks.append(Task(
                 assigned_to=user,
                 title=template['title'],
                 description=template['description'],
@@ -300,7 +304,6 @@ class Command(BaseCommand):
                 related_center=center,
                 due_date=template['due_date'],
                 created_by=user
-            )
-            created += 1
+            ))
 
-        return created
+        return tasks
@@ -0,0 +1,37 @@
+"""
+Management command to deliver pending outbox events to the projectors.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.outbox import dispatch_pending, purge_processed_events
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending outbox events to the registered projectors'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Events per batch (default OUTBOX_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Also delete processed events past OUTBOX_RETENTION_DAYS',
+        )
+
+    def handle(self, *args, **options):
+        result = dispatch_pending(batch_size=options['batch_size'])
+        self.stdout.write(
+            f"Delivered {result['delivered']} events in {result['batches']} batches"
+        )
+        if result['failed']:
+            self.stdout.write(self.style.WARNING(
+                f"{result['failed']} events failed; see last_error in the admin"
+            ))
+        if options['purge']:
+            deleted = purge_processed_events()
+            self.stdout.write(f'Purged {deleted} processed events')
+        self.stdout.write(self.style.SUCCESS('Outbox dispatch finished'))
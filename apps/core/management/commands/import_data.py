@@ -0,0 +1,74 @@
+"""
+Management command to import students, assignments or attendance from a CSV or XLSX file.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.centers.models import Center
+from apps.core.imports import IMPORT_KINDS, ImportFileError, file_format_for, run_import
+
+
+class Command(BaseCommand):
+    help = 'Import students, assignments or attendance of a center from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=IMPORT_KINDS)
+        parser.add_argument('path', help='CSV or XLSX file')
+        parser.add_argument(
+            '--center',
+            required=True,
+            help='Center code the rows belong to',
+        )
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='Email of the user recorded as creator',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate and list the changes without writing',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Rows per batch (default IMPORT_CHUNK_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            center = Center.objects.get(code=options['center'])
+        except Center.DoesNotExist:
+            raise CommandError(f"Center {options['center']} does not exist")
+        try:
+            user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        def progress(result):
+            self.stdout.write(
+                f"{result['rows']} rows: {result['created']} created, {result['updated']} updated, "
+                f"{result['unchanged']} unchanged, {result['errors']} errors"
+            )
+
+        try:
+            with open(options['path'], 'rb') as fileobj:
+                result = run_import(
+                    options['kind'], fileobj, file_format_for(options['path']), user, center,
+                    dry_run=options['dry_run'], chunk_size=options['chunk_size'], progress=progress
+                )
+        except (ImportFileError, OSError) as exc:
+            raise CommandError(str(exc))
+
+        for change in result['changes']:
+            fields = ', '.join(f"{name}: {old!r} -> {new!r}" for name, (old, new) in change['fields'].items())
+            self.stdout.write(f"line {change['line']}: {change['action']} {change['key']} {fields}".rstrip())
+        for error in result['error_rows']:
+            self.stdout.write(self.style.ERROR(f"line {error['line']}: {error['error']}"))
+
+        verb = 'Would import' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['rows']} rows: {result['created']} created, {result['updated']} updated, "
+            f"{result['unchanged']} unchanged, {result['errors']} errors"
+        ))
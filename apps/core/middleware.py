@@ -87,8 +87,8 @@ class CenterContextMiddleware(MiddlewareMixin):
             
             elif request.user.is_faculty_member:
                 # Faculty's center
-                if hasattr(request.user, 'faculty_profile'):
-                    center = request.user.faculty_profile.center
+                from .principal import get_principal
+                center = get_principal(request).center
             
             request.current_center = center
         
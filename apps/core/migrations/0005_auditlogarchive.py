@@ -0,0 +1,32 @@
+# Generated migration for AuditLogArchive model
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_systemconfiguration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the archived month', unique=True)),
+                ('path', models.CharField(help_text='Archive file path relative to AUDIT_LOG_ARCHIVE_DIR', max_length=500)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('first_timestamp', models.DateTimeField(blank=True, null=True)),
+                ('last_timestamp', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Audit Log Archive',
+                'verbose_name_plural': 'Audit Log Archives',
+                'db_table': 'audit_log_archives',
+                'ordering': ['-month'],
+            },
+        ),
+    ]
@@ -3,10 +3,12 @@ View mixins for Disha LMS.
 Provides reusable functionality for views.
 """
 
-from django.contrib.auth.mixins import UserPassesTestMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
 
+from .principal import get_principal
+
 
 class RoleRequiredMixin(UserPassesTestMixin):
     """
@@ -33,6 +35,24 @@ class MasterAccountRequiredMixin(RoleRequiredMixin):
     required_role = 'master'
 
 
+class MasterAccountRedirectMixin(LoginRequiredMixin):
+    """
+    Require Master Account role, sending other users back to their
+    profile with an error message instead of a 403 page.
+    """
+    permission_denied_message = 'You do not have permission to access this page.'
+    
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        if not get_principal(request).is_master:
+            from django.contrib import messages
+            from django.shortcuts import redirect
+            messages.error(request, self.permission_denied_message)
+            return redirect('accounts:profile')
+        return super().dispatch(request, *args, **kwargs)
+
+
 class CenterHeadRequiredMixin:
     """
     Mixin to restrict access to center head users (or master account).
@@ -45,16 +65,17 @@ class CenterHeadRequiredMixin:
             from django.contrib.auth.views import redirect_to_login
             return redirect_to_login(request.get_full_path())
         
+        principal = get_principal(request)
+        
         # Master account has access to everything
-        if request.user.is_master_account:
+        if principal.is_master:
             return super().dispatch(request, *args, **kwargs)
         
-        if not request.user.is_center_head:
-            from django.core.exceptions import PermissionDenied
+        if not principal.is_center_head:
             raise PermissionDenied("You must be a center head or master account to access this page.")
         
         # Check if center head profile exists
-        if not hasattr(request.user, 'center_head_profile'):
+        if not principal.has_profile:
             from django.contrib import messages
             from django.shortcuts import redirect
             messages.error(request, "Your center head profile is not set up. Please contact the administrator.")
@@ -75,16 +96,17 @@ class FacultyRequiredMixin:
             from django.contrib.auth.views import redirect_to_login
             return redirect_to_login(request.get_full_path())
         
+        principal = get_principal(request)
+        
         # Master account has access to everything
-        if request.user.is_master_account:
+        if principal.is_master:
             return super().dispatch(request, *args, **kwargs)
         
-        if not request.user.is_faculty_member:
-            from django.core.exceptions import PermissionDenied
+        if not principal.is_faculty:
             raise PermissionDenied("You must be a faculty member or master account to access this page.")
         
         # Check if faculty profile exists
-        if not hasattr(request.user, 'faculty_profile'):
+        if not principal.has_profile:
             from django.contrib import messages
             from django.shortcuts import redirect
             messages.error(request, "Your faculty profile is not set up. Please contact the administrator.")
@@ -105,8 +127,8 @@ class AdminOrMasterRequiredMixin:
             return redirect_to_login(request.get_full_path())
         
         # Allow master account or center head
-        if not (request.user.is_master_account or request.user.is_center_head):
-            from django.core.exceptions import PermissionDenied
+        principal = get_principal(request)
+        if not (principal.is_master or principal.is_center_head):
             raise PermissionDenied("You must be a Master Account or Center Head to access this page.")
         
         return super().dispatch(request, *args, **kwargs)
@@ -124,8 +146,8 @@ class AdminOrFacultyRequiredMixin:
             return redirect_to_login(request.get_full_path())
         
         # Allow master account, center head, or faculty
-        if not (request.user.is_master_account or request.user.is_center_head or request.user.is_faculty_member):
-            from django.core.exceptions import PermissionDenied
+        principal = get_principal(request)
+        if not (principal.is_master or principal.is_center_head or principal.is_faculty):
             raise PermissionDenied("You must be a Master Account, Center Head, or Faculty member to access this page.")
         
         return super().dispatch(request, *args, **kwargs)
@@ -146,11 +168,11 @@ class CenterContextMixin:
             return Center.objects.filter(id=center_id).first()
         
         # Otherwise, get from user's profile
-        user = self.request.user
-        if hasattr(user, 'center_head_profile'):
-            return user.center_head_profile.center
-        elif hasattr(user, 'faculty_profile'):
-            return user.faculty_profile.center
+        principal = get_principal(self.request)
+        if principal.center_head_profile:
+            return principal.center_head_profile.center
+        elif principal.faculty_profile:
+            return principal.faculty_profile.center
         
         return None
     
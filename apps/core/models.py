@@ -3,7 +3,8 @@ Core models for Disha LMS.
 Provides base models for event sourcing and audit trail.
 """
 
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, router, transaction
 from django.conf import settings
 from django.utils import timezone
 
@@ -40,6 +41,42 @@ class TimeStampedModel(models.Model):
         super().save(*args, **kwargs)
 
 
+class OutboxEventMixin:
+    """
+    Mixin for models whose changes are published to the transactional outbox.
+    
+    Every save, delete and topic change writes an OutboxEvent (see
+    apps/core/outbox.py); saves run in a transaction so the row and its
+    event commit together. outbox_fields lists the attributes copied into
+    the event payload.
+    """
+    outbox_fields = ()
+    
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+class CounterFieldsMixin:
+    """
+    Mixin for models with denormalized counter columns (counter_fields).
+    
+    The counters are only written with UPDATE ... SET n = n + 1 (see
+    apps/centers/counters.py), so a full save of an existing row leaves
+    them out instead of writing back the values it loaded.
+    """
+    counter_fields = ()
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
 class SoftDeleteManager(models.Manager):
     """Custom manager that excludes soft-deleted records by default."""
     
@@ -198,6 +235,31 @@ class AuditLog(models.Model):
         return ip
 
 
+class AuditLogArchive(models.Model):
+    """
+    Manifest entry for one monthly audit log archive file.
+    Archive files are append-only gzip JSONL; this table lets queries
+    skip files that cannot contain matching entries.
+    """
+
+    month = models.DateField(unique=True, help_text="First day of the archived month")
+    path = models.CharField(max_length=500, help_text="Archive file path relative to AUDIT_LOG_ARCHIVE_DIR")
+    entry_count = models.PositiveIntegerField(default=0)
+    first_timestamp = models.DateTimeField(null=True, blank=True)
+    last_timestamp = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'audit_log_archives'
+        verbose_name = 'Audit Log Archive'
+        verbose_name_plural = 'Audit Log Archives'
+        ordering = ['-month']
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} ({self.entry_count} entries)"
+
+
 class Notification(models.Model):
     """
     Notification model for user notifications.
@@ -468,3 +530,45 @@ class SystemConfiguration(models.Model):
         config.save()
         
         return config
+
+
+class OutboxEvent(models.Model):
+    """
+    Change event written in the same transaction as the change itself.
+    Delivered in batches to the registered projectors by the dispatcher
+    (apps/core/outbox.py) and kept for OUTBOX_RETENTION_DAYS once processed.
+    """
+    
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+        ('topics_changed', 'Topics Changed'),
+    ]
+    
+    topic = models.CharField(max_length=100, help_text="Model label of the changed row, e.g. attendance.attendancerecord")
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    object_id = models.BigIntegerField()
+    center_id = models.BigIntegerField(null=True, blank=True)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    
+    class Meta:
+        db_table = 'outbox_events'
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['attempts', 'id'],
+                condition=models.Q(processed_at__isnull=True),
+                name='outbox_event_pending_idx'
+            ),
+            models.Index(fields=['processed_at'], name='outbox_event_processed_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.topic} {self.object_id} {self.action}"
@@ -0,0 +1,276 @@
+"""
+Transactional outbox for change events.
+
+Models with OutboxEventMixin (attendance records, students, assignments,
+topics, survey responses and faculty feedback) write an OutboxEvent in the same
+transaction as every change: post_save and post_delete through
+signals.py, and record_events() from bulk writes, which send no signals.
+A rolled back change therefore never publishes an event, and a committed
+one always does.
+
+Projectors subscribe to topics (model labels) with register_projector()
+and receive the pending events in batches from dispatch_events(), run by
+the dispatch_outbox Celery task after each commit and every minute by
+Celery beat. A batch is delivered in id order; a projector that raises
+leaves its events pending for a retry (up to OUTBOX_MAX_ATTEMPTS), so
+projectors must be idempotent: recompute the derived row from the source
+rows instead of applying deltas.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# Set while a dispatch task is queued, so a burst of commits queues one task
+DISPATCH_PENDING_KEY = 'outbox_dispatch_pending'
+
+_projectors = {}
+
+
+def register_projector(name, topics, handler):
+    """
+    Subscribe a projector to change events.
+
+    Args:
+        name: Unique projector name (registering it again replaces it)
+        topics: Model labels to receive, e.g. 'feedback.facultyfeedback'
+        handler: Callable taking a list of OutboxEvents in id order
+    """
+    _projectors[name] = (frozenset(topics), handler)
+
+
+def get_projectors():
+    """Registered projectors: name -> (topics, handler)."""
+    return dict(_projectors)
+
+
+def _topic(model):
+    return model._meta.label_lower
+
+
+def _student_center_id(instance):
+    # Signals usually see the student already loaded by the caller
+    from django.core.exceptions import ObjectDoesNotExist
+
+    if not hasattr(instance, 'student_id'):
+        return None
+    try:
+        return instance.student.center_id
+    except ObjectDoesNotExist:
+        return None
+
+
+def _center_ids(instances):
+    """Center of each instance: its own center, else its student's (None for topics)."""
+    center_ids = {}
+    student_ids = set()
+    for instance in instances:
+        if hasattr(instance, 'center_id'):
+            center_ids[id(instance)] = instance.center_id
+        elif hasattr(instance, 'student_id'):
+            student_ids.add(instance.student_id)
+        else:
+            center_ids[id(instance)] = None
+    if student_ids:
+        from apps.students.models import Student
+
+        student_centers = dict(Student.all_objects.filter(
+            pk__in=student_ids
+        ).values_list('pk', 'center_id'))
+        for instance in instances:
+            if id(instance) not in center_ids:
+                center_ids[id(instance)] = student_centers.get(instance.student_id)
+    return center_ids
+
+
+def _event(instance, action, center_id, payload=None):
+    data = {field: getattr(instance, field) for field in instance.outbox_fields}
+    data.update(payload or {})
+    return OutboxEvent(
+        topic=_topic(type(instance)),
+        action=action,
+        object_id=instance.pk,
+        center_id=center_id,
+        payload=data,
+    )
+
+
+def record_event(instance, action, payload=None):
+    """
+    Write the outbox event of a change in the current transaction.
+
+    Args:
+        instance: Changed model instance (with OutboxEventMixin)
+        action: 'created', 'updated', 'deleted' or 'topics_changed'
+        payload: Extra payload merged over the instance's outbox_fields
+
+    Returns:
+        OutboxEvent: The saved event
+    """
+    center_id = instance.center_id if hasattr(instance, 'center_id') else _student_center_id(instance)
+    event = _event(instance, action, center_id, payload)
+    event.save()
+    request_dispatch()
+    return event
+
+
+def record_events(instances, action, payload=None):
+    """
+    Write the outbox events of a bulk change (bulk_create, bulk_update).
+
+    Args:
+        instances: Saved model instances of one or more outbox models
+        action: 'created', 'updated', 'deleted' or 'topics_changed'
+        payload: Extra payload merged into every event
+
+    Returns:
+        int: Number of events written
+    """
+    instances = list(instances)
+    if not instances:
+        return 0
+    center_ids = _center_ids(instances)
+    OutboxEvent.objects.bulk_create(
+        [_event(instance, action, center_ids[id(instance)], payload) for instance in instances],
+        batch_size=1000
+    )
+    request_dispatch()
+    return len(instances)
+
+
+def request_dispatch():
+    """Queue a dispatch_outbox task once the current transaction commits."""
+    transaction.on_commit(_queue_dispatch)
+
+
+def _queue_dispatch():
+    from .tasks import dispatch_outbox
+
+    if not cache.add(DISPATCH_PENDING_KEY, True, 60):
+        return
+    try:
+        # Fail fast instead of holding up the request that committed
+        dispatch_outbox.apply_async(retry=False)
+    except Exception:
+        # The broker is down: the key stays set so commits in the next minute
+        # do not wait on it again, and the beat schedule picks the events up
+        logger.warning("Could not queue the outbox dispatcher", exc_info=True)
+
+
+def _deliver(events):
+    """
+    Hand a batch to every subscribed projector.
+
+    Returns:
+        dict: event id -> error text of events a projector failed on
+    """
+    failed = {}
+    for name, (topics, handler) in _projectors.items():
+        subscribed = [event for event in events if event.topic in topics]
+        if not subscribed:
+            continue
+        try:
+            # A savepoint per projector keeps a failed one's writes out
+            with transaction.atomic():
+                handler(subscribed)
+        except Exception as exc:
+            logger.exception("Outbox projector %s failed on %s events", name, len(subscribed))
+            for event in subscribed:
+                failed[event.pk] = f"{name}: {exc}"
+    return failed
+
+
+def dispatch_events(batch_size=None):
+    """
+    Deliver one batch of pending events to the projectors.
+
+    Concurrent dispatchers skip each other's locked rows on databases that
+    support it (PostgreSQL).
+
+    Args:
+        batch_size: Events per batch (defaults to OUTBOX_BATCH_SIZE)
+
+    Returns:
+        dict: Number of events 'delivered' and 'failed'
+    """
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 500)
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+
+    with transaction.atomic():
+        pending = OutboxEvent.objects.filter(
+            processed_at__isnull=True,
+            attempts__lt=max_attempts
+        ).order_by('attempts', 'pk')
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        events = sorted(pending[:batch_size], key=lambda event: event.pk)
+        if not events:
+            return {'delivered': 0, 'failed': 0}
+
+        failed = _deliver(events)
+        now = timezone.now()
+        OutboxEvent.objects.filter(
+            pk__in=[event.pk for event in events if event.pk not in failed]
+        ).update(processed_at=now)
+        for event in events:
+            if event.pk in failed:
+                event.attempts += 1
+                event.last_error = failed[event.pk][:2000]
+        OutboxEvent.objects.bulk_update(
+            [event for event in events if event.pk in failed], ['attempts', 'last_error']
+        )
+
+    return {'delivered': len(events) - len(failed), 'failed': len(failed)}
+
+
+def dispatch_pending(batch_size=None, max_batches=None):
+    """
+    Deliver pending events batch by batch until none are left.
+
+    Args:
+        batch_size: Events per batch (defaults to OUTBOX_BATCH_SIZE)
+        max_batches: Stop after this many batches (default no limit)
+
+    Returns:
+        dict: Totals of 'delivered' and 'failed' events and 'batches' run
+    """
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 500)
+    totals = {'delivered': 0, 'failed': 0, 'batches': 0}
+    while max_batches is None or totals['batches'] < max_batches:
+        try:
+            result = dispatch_events(batch_size)
+        except DatabaseError:
+            logger.exception("Outbox dispatch failed")
+            break
+        totals['batches'] += 1
+        totals['delivered'] += result['delivered']
+        totals['failed'] += result['failed']
+        # Failed events wait for the next run instead of retrying at once
+        if result['failed'] or result['delivered'] < batch_size:
+            break
+    return totals
+
+
+def purge_processed_events(days=None):
+    """
+    Delete processed events older than the retention period.
+
+    Args:
+        days: Retention in days (defaults to OUTBOX_RETENTION_DAYS)
+
+    Returns:
+        int: Number of events deleted
+    """
+    days = days if days is not None else getattr(settings, 'OUTBOX_RETENTION_DAYS', 7)
+    deleted, _ = OutboxEvent.objects.filter(
+        processed_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
@@ -0,0 +1,166 @@
+"""
+Request-scoped principal.
+
+A Principal describes who is making a request: the role, the center head
+or faculty profile, and the center the user is limited to. It is built
+once per request (and once more if DRF authenticates a different user)
+from a user loaded together with both profiles and their centers, so
+permission checks and queryset scoping never trigger lazy profile
+queries.
+"""
+
+from django.contrib.auth import get_user_model
+
+PROFILE_RELATIONS = ('faculty_profile__center', 'center_head_profile__center')
+
+
+def load_user_with_profiles(user_id):
+    """
+    Load a user with both profiles and their centers in one query.
+
+    Args:
+        user_id: User primary key
+
+    Returns:
+        User: The user, or None if it does not exist
+    """
+    return get_user_model()._default_manager.select_related(
+        *PROFILE_RELATIONS
+    ).filter(pk=user_id).first()
+
+
+def _profiles_loaded(user):
+    User = get_user_model()
+    return User.faculty_profile.is_cached(user) and User.center_head_profile.is_cached(user)
+
+
+def _copy_profiles(source, user):
+    """Cache the profiles of a freshly loaded user on the request's user object."""
+    User = get_user_model()
+    for descriptor in (User.faculty_profile, User.center_head_profile):
+        descriptor.related.set_cached_value(user, descriptor.related.get_cached_value(source, None))
+
+
+class Principal:
+    """
+    The authenticated user's role and scope for one request.
+
+    Master accounts are unscoped; center heads and faculty members are
+    limited to the center of their profile.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.is_authenticated = bool(user and user.is_authenticated)
+        self.role = user.role if self.is_authenticated else None
+        self.center_head_profile = None
+        self.faculty_profile = None
+
+        if not self.is_authenticated:
+            return
+        if not _profiles_loaded(user):
+            loaded = load_user_with_profiles(user.pk)
+            if loaded is not None:
+                _copy_profiles(loaded, user)
+        self.center_head_profile = getattr(user, 'center_head_profile', None)
+        self.faculty_profile = getattr(user, 'faculty_profile', None)
+
+    def __repr__(self):
+        return f'<Principal {self.user} role={self.role} center={self.center_id}>'
+
+    @property
+    def is_master(self):
+        return self.is_authenticated and self.user.is_master_account
+
+    @property
+    def is_center_head(self):
+        return self.is_authenticated and self.user.is_center_head
+
+    @property
+    def is_faculty(self):
+        return self.is_authenticated and self.user.is_faculty_member
+
+    @property
+    def profile(self):
+        """The profile that goes with the role (None for master accounts)."""
+        if self.is_center_head:
+            return self.center_head_profile
+        if self.is_faculty:
+            return self.faculty_profile
+        return None
+
+    @property
+    def has_profile(self):
+        """Whether the role's profile is set up (always True for master accounts)."""
+        return self.is_master or self.profile is not None
+
+    @property
+    def center(self):
+        """Center the user is limited to, or None (master accounts, missing profile)."""
+        profile = self.profile
+        return profile.center if profile else None
+
+    @property
+    def center_id(self):
+        profile = self.profile
+        return profile.center_id if profile else None
+
+    @property
+    def is_unscoped(self):
+        """Master accounts see every center."""
+        return self.is_master
+
+    def can_access_center(self, center_id):
+        """
+        Check whether the user may see a center's data.
+
+        Args:
+            center_id: Center primary key
+
+        Returns:
+            bool: True for master accounts and for the user's own center
+        """
+        if self.is_master:
+            return True
+        return self.center_id is not None and self.center_id == center_id
+
+    def scope(self, queryset, center_field='center'):
+        """
+        Limit a queryset to the centers the user may see.
+
+        Args:
+            queryset: Queryset to filter
+            center_field: Lookup from the model to its center
+
+        Returns:
+            QuerySet: Unchanged for master accounts, filtered to the user's
+            center otherwise, empty when there is no center
+        """
+        if self.is_master:
+            return queryset
+        if self.center_id is None:
+            return queryset.none()
+        return queryset.filter(**{f'{center_field}_id': self.center_id})
+
+
+def get_principal(request):
+    """
+    Return the principal of a request, building it on first use.
+
+    Works with Django requests and DRF requests; when DRF authenticates
+    a user after the middleware ran, the principal is rebuilt for that
+    user.
+
+    Args:
+        request: HttpRequest or DRF Request
+
+    Returns:
+        Principal
+    """
+    http_request = getattr(request, '_request', request)
+    user = request.user
+    principal = getattr(http_request, '_principal', None)
+    if principal is None or principal.user is not user:
+        principal = Principal(user)
+        http_request._principal = principal
+    return principal
@@ -1,11 +1,27 @@
 """
 Service functions for notifications and tasks.
+
+Fan-out goes through notify_many() and create_tasks_bulk(): one query
+finds the recipients that already have the row, one bulk INSERT writes
+the rest and one cache call drops their unread counts.
 """
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from .models import Notification, Task
 
+UNREAD_COUNT_KEY = 'unread_notifications:{user_id}'
+
+TASK_PRIORITY_ICONS = {
+    'low': '📋',
+    'medium': '📌',
+    'high': '⚠️',
+    'critical': '🚨'
+}
+
 
 def create_notification(user, title, message, notification_type='info', action_url=None):
     """
@@ -53,6 +69,142 @@ def get_unread_notifications(user, limit=None):
     return notifications
 
 
+def get_unread_notification_count(user_id):
+    """
+    Number of unread notifications of a user, cached until they change.
+    
+    Args:
+        user_id: User primary key
+    
+    Returns:
+        int: Unread notification count
+    """
+    key = UNREAD_COUNT_KEY.format(user_id=user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.set(key, count, settings.LAYOUT_CACHE_TTL)
+    return count
+
+
+def invalidate_unread_notification_counts(user_ids):
+    """
+    Drop the cached unread counts of users (after bulk notification writes).
+    
+    Args:
+        user_ids: Iterable of user primary keys
+    """
+    keys = [UNREAD_COUNT_KEY.format(user_id=user_id) for user_id in set(user_ids)]
+    if keys:
+        cache.delete_many(keys)
+
+
+def create_notifications(notifications):
+    """
+    Insert notifications with one bulk INSERT.
+    
+    Args:
+        notifications: Unsaved Notification instances
+    
+    Returns:
+        list: The created notifications
+    """
+    notifications = Notification.objects.bulk_create(list(notifications), batch_size=1000)
+    # bulk_create sends no post_save, so drop the cached unread counts here
+    user_ids = {notification.user_id for notification in notifications if not notification.is_read}
+    if user_ids:
+        transaction.on_commit(lambda: invalidate_unread_notification_counts(user_ids))
+    return notifications
+
+
+def notify_many(users, title, message, notification_type='info', action_url=None,
+                skip_unread_duplicates=True):
+    """
+    Send the same notification to several users.
+    
+    Args:
+        users: Users or user ids (duplicates are notified once)
+        title: Notification title
+        message: Notification message
+        notification_type: Type of notification (info/warning/error/success)
+        action_url: Optional URL for action
+        skip_unread_duplicates: Skip users who still have an unread
+            notification with the same title and action URL
+    
+    Returns:
+        list: The created notifications
+    """
+    user_ids = list(dict.fromkeys(getattr(user, 'pk', user) for user in users))
+    if not user_ids:
+        return []
+    
+    if skip_unread_duplicates:
+        notified = set(Notification.objects.filter(
+            user_id__in=user_ids,
+            title=title,
+            action_url=action_url,
+            is_read=False
+        ).values_list('user_id', flat=True))
+        user_ids = [user_id for user_id in user_ids if user_id not in notified]
+    
+    return create_notifications(
+        Notification(
+            user_id=user_id,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            action_url=action_url
+        )
+        for user_id in user_ids
+    )
+
+
+def _task_notification(task):
+    """The "New Task" notification of a saved task."""
+    return Notification(
+        user_id=task.assigned_to_id,
+        title=f"{TASK_PRIORITY_ICONS.get(task.priority, '📋')} New Task: {task.title}",
+        message=f"You have been assigned a new {task.priority} priority task.",
+        notification_type='info' if task.priority in ['low', 'medium'] else 'warning',
+        action_url=f'/core/tasks/{task.id}/'
+    )
+
+
+def create_tasks_bulk(tasks, skip_existing_since=None, notify=True):
+    """
+    Create tasks with one bulk INSERT and notify the assigned users.
+    
+    Args:
+        tasks: Unsaved Task instances
+        skip_existing_since: Optional datetime; a task is skipped when its
+            user already has a task of the same type and center created
+            since then (checked for all tasks with one query)
+        notify: Send each assigned user a "New Task" notification
+    
+    Returns:
+        list: The created tasks
+    """
+    tasks = list(tasks)
+    if tasks and skip_existing_since is not None:
+        existing = set(Task.objects.filter(
+            assigned_to_id__in={task.assigned_to_id for task in tasks},
+            task_type__in={task.task_type for task in tasks},
+            created_at__gte=skip_existing_since
+        ).values_list('assigned_to_id', 'related_center_id', 'task_type'))
+        tasks = [
+            task for task in tasks
+            if (task.assigned_to_id, task.related_center_id, task.task_type) not in existing
+        ]
+    if not tasks:
+        return []
+    
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create(tasks, batch_size=1000)
+        if notify:
+            create_notifications(_task_notification(task) for task in tasks)
+    return tasks
+
+
 def create_task(assigned_to, title, description, task_type='action', 
                 priority='medium', related_center=None, due_date=None, created_by=None):
     """
@@ -71,7 +223,7 @@ def create_task(assigned_to, title, description, task_type='action',
     Returns:
         Task instance
     """
-    task = Task.objects.create(
+    return create_tasks_bulk([Task(
         assigned_to=assigned_to,
         title=title,
         description=description,
@@ -80,25 +232,7 @@ def create_task(assigned_to, title, description, task_type='action',
         related_center=related_center,
         due_date=due_date,
         created_by=created_by
-    )
-    
-    # Create notification for assigned user
-    priority_emoji = {
-        'low': '📋',
-        'medium': '📌',
-        'high': '⚠️',
-        'critical': '🚨'
-    }
-    
-    create_notification(
-        user=assigned_to,
-        title=f"{priority_emoji.get(priority, '📋')} New Task: {title}",
-        message=f"You have been assigned a new {priority} priority task.",
-        notification_type='info' if priority in ['low', 'medium'] else 'warning',
-        action_url=f'/core/tasks/{task.id}/'
-    )
-    
-    return task
+    )])[0]
 
 
 def get_pending_tasks(user, limit=None):
@@ -127,88 +261,80 @@ def auto_create_tasks_for_at_risk_centers():
     """
     Automatically create tasks for centers with low performance.
     Should be run periodically (e.g., daily cron job).
+    
+    Every master account gets one review task per low-performing center,
+    unless they already got one for that center in the last 7 days.
+    
+    Returns:
+        int: Number of tasks created
     """
     from apps.reports.services import get_low_performing_centers
     from apps.accounts.models import User
     
-    # Get master account users
-    master_users = User.objects.filter(is_master_account=True, is_active=True)
-    
-    if not master_users.exists():
-        return
+    master_user_ids = list(User.objects.filter(
+        role=User.MASTER_ACCOUNT,
+        is_active=True
+    ).values_list('pk', flat=True))
+    if not master_user_ids:
+        return 0
     
-    # Get low performing centers
-    low_performing = get_low_performing_centers()
-    
-    for center_data in low_performing:
-        center = center_data['center']
-        
-        # Check if task already exists for this center in last 7 days
-        week_ago = timezone.now().date() - timedelta(days=7)
-        existing_task = Task.objects.filter(
-            related_center=center,
+    due_date = timezone.now().date() + timedelta(days=3)
+    tasks = [
+        Task(
+            assigned_to_id=user_id,
+            title=f"Review Low-Performing Center: {center_data['center'].name}",
+            description=f"Center {center_data['center'].name} requires attention:\n"
+                        f"- Attendance Rate: {center_data['attendance_rate']}%\n"
+                        f"- Satisfaction Score: {center_data['satisfaction_score']}\n"
+                        f"- At-Risk Students: {center_data['at_risk_count']} ({center_data['at_risk_percentage']}%)",
             task_type='review',
-            created_at__gte=week_ago
-        ).exists()
-        
-        if not existing_task:
-            # Create task for each master user
-            for master_user in master_users:
-                create_task(
-                    assigned_to=master_user,
-                    title=f"Review Low-Performing Center: {center.name}",
-                    description=f"Center {center.name} requires attention:\n"
-                                f"- Attendance Rate: {center_data['attendance_rate']}%\n"
-                                f"- Satisfaction Score: {center_data['satisfaction_score']}\n"
-                                f"- At-Risk Students: {center_data['at_risk_count']} ({center_data['at_risk_percentage']}%)",
-                    task_type='review',
-                    priority='high' if center_data['performance_score'] < 40 else 'medium',
-                    related_center=center,
-                    due_date=timezone.now().date() + timedelta(days=3)
-                )
+            priority='high' if center_data['performance_score'] < 40 else 'medium',
+            related_center=center_data['center'],
+            due_date=due_date
+        )
+        for center_data in get_low_performing_centers()
+        for user_id in master_user_ids
+    ]
+    return len(create_tasks_bulk(tasks, skip_existing_since=timezone.now() - timedelta(days=7)))
 
 
 def auto_create_tasks_for_at_risk_students():
     """
     Automatically create tasks for at-risk students.
     Should be run periodically (e.g., daily cron job).
+    
+    Each active center head of a center with active students absent for
+    the last 7 days gets a follow-up task, unless they already got one in
+    the last 3 days. The absent students are counted for all centers
+    together by the center statistics provider.
+    
+    Returns:
+        int: Number of tasks created
     """
-    from apps.reports.services import get_at_risk_students
-    from apps.centers.models import Center
-    from apps.accounts.models import User
+    from apps.centers.models import CenterHead
+    from apps.centers.statistics import get_center_statistics
+    
+    center_heads = list(CenterHead.objects.filter(
+        is_active=True,
+        user__is_active=True,
+        center__is_active=True,
+        center__deleted_at__isnull=True
+    ).values_list('center_id', 'user_id'))
+    statistics = get_center_statistics({center_id for center_id, user_id in center_heads})
     
-    centers = Center.objects.filter(deleted_at__isnull=True, is_active=True)
-    
-    for center in centers:
-        # Get center head
-        try:
-            center_head = center.center_heads.first()
-            if not center_head or not center_head.user.is_active:
-                continue
-        except:
-            continue
-        
-        # Get at-risk students for this center
-        at_risk = get_at_risk_students(center, days_threshold=7)
-        
-        if at_risk.count() > 0:
-            # Check if task already exists in last 3 days
-            three_days_ago = timezone.now().date() - timedelta(days=3)
-            existing_task = Task.objects.filter(
-                assigned_to=center_head.user,
-                related_center=center,
+    due_date = timezone.now().date() + timedelta(days=2)
+    tasks = []
+    for center_id, user_id in center_heads:
+        at_risk_count = statistics[center_id]['students']['needing_attention']
+        if at_risk_count:
+            tasks.append(Task(
+                assigned_to_id=user_id,
+                title="Follow Up with At-Risk Students",
+                description=f"There are {at_risk_count} students who haven't attended in the last 7 days. "
+                            f"Please reach out to them and their guardians.",
                 task_type='follow_up',
-                created_at__gte=three_days_ago
-            ).exists()
-            
-            if not existing_task:
-                create_task(
-                    assigned_to=center_head.user,
-                    title=f"Follow Up with At-Risk Students",
-                    description=f"There are {at_risk.count()} students who haven't attended in the last 7 days. "
-                                f"Please reach out to them and their guardians.",
-                    task_type='follow_up',
-                    priority='high',
-                    related_center=center,
-                    due_date=timezone.now().date() + timedelta(days=2)
-                )
+                priority='high',
+                related_center_id=center_id,
+                due_date=due_date
+            ))
+    return len(create_tasks_bulk(tasks, skip_existing_since=timezone.now() - timedelta(days=3)))
@@ -0,0 +1,70 @@
+"""
+Signal handlers that write outbox events for models with OutboxEventMixin
+(see outbox.py) and drop cached unread notification counts.
+"""
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .models import Notification, OutboxEventMixin
+from .outbox import record_event, record_events
+
+
+def outbox_model_saved(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    record_event(instance, 'created' if created else 'updated')
+
+
+def outbox_model_deleted(sender, instance, **kwargs):
+    record_event(instance, 'deleted')
+
+
+def attendance_topics_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Topics covered by a record, changed from either side of the relation."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        record_event(instance, 'topics_changed')
+    elif pk_set:
+        from apps.attendance.models import AttendanceRecord
+
+        record_events(AttendanceRecord.objects.filter(pk__in=pk_set), 'topics_changed')
+
+
+def session_topics_changed(sender, instance, action, reverse, **kwargs):
+    """Topics of a class session apply to every record of the session."""
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse:
+        record_events(instance.records.all(), 'topics_changed')
+
+
+def notification_changed(sender, instance, **kwargs):
+    from .services import invalidate_unread_notification_counts
+
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_unread_notification_counts([user_id]))
+
+
+def connect_signals():
+    post_save.connect(notification_changed, sender=Notification, dispatch_uid='unread_count_save')
+    post_delete.connect(notification_changed, sender=Notification, dispatch_uid='unread_count_delete')
+    for model in apps.get_models():
+        if not issubclass(model, OutboxEventMixin):
+            continue
+        dispatch_uid = f'outbox_{model._meta.label_lower}'
+        post_save.connect(outbox_model_saved, sender=model, dispatch_uid=f'{dispatch_uid}_save')
+        post_delete.connect(outbox_model_deleted, sender=model, dispatch_uid=f'{dispatch_uid}_delete')
+
+    from apps.attendance.models import AttendanceRecord, Session
+
+    m2m_changed.connect(
+        attendance_topics_changed,
+        sender=AttendanceRecord.topics_covered.through,
+        dispatch_uid='outbox_attendance_topics',
+    )
+    m2m_changed.connect(
+        session_topics_changed,
+        sender=Session.topics_covered.through,
+        dispatch_uid='outbox_session_topics',
+    )
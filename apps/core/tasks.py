@@ -0,0 +1,137 @@
+"""
+Celery tasks for core maintenance jobs.
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def archive_audit_logs():
+    """
+    Move expired audit log entries to the compressed monthly archives.
+
+    Returns:
+        dict: Number of entries archived and months touched
+    """
+    from .audit_archive import archive_audit_logs as run_archive, vacuum_audit_log_table
+
+    result = run_archive()
+    if result['archived']:
+        vacuum_audit_log_table()
+
+    logger.info("Audit log archival finished: %s entries archived", result['archived'])
+    return {
+        'archived': result['archived'],
+        'months': [month.isoformat() for month in result['months']],
+    }
+
+
+@shared_task(ignore_result=True)
+def dispatch_outbox():
+    """
+    Deliver pending outbox events to the projectors (apps/core/outbox.py).
+
+    Queued after commits that write events and run every minute by beat.
+
+    Returns:
+        dict: Events delivered and failed and batches run
+    """
+    from django.core.cache import cache
+
+    from .outbox import DISPATCH_PENDING_KEY, dispatch_pending
+
+    # Commits from now on queue another run
+    cache.delete(DISPATCH_PENDING_KEY)
+    result = dispatch_pending()
+    if result['failed']:
+        logger.warning("Outbox dispatch: %s events failed", result['failed'])
+    return result
+
+
+@shared_task
+def purge_outbox_events():
+    """
+    Delete processed outbox events past OUTBOX_RETENTION_DAYS.
+
+    Returns:
+        int: Number of events deleted
+    """
+    from .outbox import purge_processed_events
+
+    deleted = purge_processed_events()
+    logger.info("Outbox purge finished: %s events deleted", deleted)
+    return deleted
+
+
+@shared_task(bind=True)
+def import_data(self, kind, file_name, user_id, center_id, dry_run=False):
+    """
+    Import an uploaded CSV or XLSX file (see apps/core/imports.py).
+
+    Progress is published as task state PROGRESS with the running counts.
+    The upload is deleted when the task ends, except after a successful
+    dry run: it is then kept for IMPORT_UPLOAD_TTL seconds, so the same
+    file can be imported once the diff was reviewed.
+
+    Args:
+        kind: 'students', 'assignments' or 'attendance'
+        file_name: Upload path in the default storage
+        user_id: User recorded as creator of the rows
+        center_id: Center the rows belong to
+        dry_run: Validate and report the diff without writing
+
+    Returns:
+        dict: Import result counts, errors and (dry run) changes
+    """
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.files.storage import default_storage
+
+    from apps.centers.models import Center
+
+    from .imports import ImportFileError, file_format_for, run_import
+
+    def progress(result):
+        self.update_state(state='PROGRESS', meta=result)
+
+    result = {}
+    try:
+        user = get_user_model().objects.get(pk=user_id)
+        center = Center.objects.get(pk=center_id)
+        with default_storage.open(file_name, 'rb') as fileobj:
+            result = run_import(
+                kind, fileobj, file_format_for(file_name), user, center,
+                dry_run=dry_run, progress=progress
+            )
+    except ImportFileError as exc:
+        result = {'kind': kind, 'dry_run': dry_run, 'failed': str(exc)}
+    finally:
+        if dry_run and result and 'failed' not in result:
+            delete_import_upload.apply_async(
+                (file_name,), countdown=settings.IMPORT_UPLOAD_TTL
+            )
+        else:
+            default_storage.delete(file_name)
+
+    logger.info(
+        "Import of %s %s finished: %s", kind, file_name,
+        {key: value for key, value in result.items() if not isinstance(value, list)}
+    )
+    return result
+
+
+@shared_task(ignore_result=True)
+def delete_import_upload(file_name):
+    """
+    Delete the upload of a dry-run import that was not applied in time.
+
+    Args:
+        file_name: Upload path in the default storage
+    """
+    from django.core.files.storage import default_storage
+
+    default_storage.delete(file_name)
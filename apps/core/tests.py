@@ -0,0 +1,484 @@
+import datetime
+import gzip
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.centers.models import Center, CenterHead
+from apps.faculty.models import Faculty
+from apps.students.models import Student
+
+from . import outbox
+from .audit_archive import archive_audit_logs, query_audit_logs
+from .imports import run_import
+from .models import AuditLog, AuditLogArchive, Notification, OutboxEvent, Task
+from .principal import Principal, get_principal
+from .outbox import DISPATCH_PENDING_KEY, dispatch_events, purge_processed_events, register_projector
+from .services import (
+    auto_create_tasks_for_at_risk_centers, create_tasks_bulk, get_unread_notification_count,
+    notify_many,
+)
+
+
+def _csv(*lines):
+    return io.BytesIO('\n'.join(lines).encode())
+
+
+class StudentImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        cls.center = Center.objects.create(
+            name='North', code='N1', address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email='north@example.com',
+            created_by=cls.user, modified_by=cls.user
+        )
+
+    def setUp(self):
+        self.student = Student.objects.create(
+            center=self.center, first_name='Asha', last_name='Rao', phone='111',
+            email='asha@example.com', date_of_birth=datetime.date(2010, 5, 1),
+            enrollment_number='E1', enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Ravi Rao', guardian_phone='222', guardian_email='ravi@example.com',
+            address='2 Lane', city='Pune', state='MH', pincode='411002', notes='Prefers mornings',
+            created_by=self.user, modified_by=self.user
+        )
+
+    def test_columns_missing_from_file_keep_their_values(self):
+        result = run_import('students', _csv(
+            'first_name,last_name,phone,enrollment_number,enrollment_date,guardian_name,guardian_phone',
+            'Asha,Rao,333,E1,2024-01-01,Ravi Rao,222',
+        ), 'csv', self.user, self.center)
+
+        self.assertEqual(result['updated'], 1)
+        self.assertEqual(result['errors'], 0)
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.phone, '333')
+        self.assertEqual(self.student.email, 'asha@example.com')
+        self.assertEqual(self.student.date_of_birth, datetime.date(2010, 5, 1))
+        self.assertEqual(self.student.guardian_email, 'ravi@example.com')
+        self.assertEqual(self.student.address, '2 Lane')
+        self.assertEqual(self.student.pincode, '411002')
+        self.assertEqual(self.student.notes, 'Prefers mornings')
+        self.assertEqual(self.student.status, 'active')
+
+    def test_dry_run_lists_only_changed_columns(self):
+        result = run_import('students', _csv(
+            'first_name,last_name,phone,enrollment_number,enrollment_date,guardian_name,guardian_phone',
+            'Asha,Rao,333,E1,2024-01-01,Ravi Rao,222',
+        ), 'csv', self.user, self.center, dry_run=True)
+
+        self.assertEqual(result['changes'][0]['fields'], {'phone': ['111', '333']})
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.phone, '111')
+
+    def test_blank_cell_in_present_column_clears_value(self):
+        result = run_import('students', _csv(
+            'first_name,last_name,phone,enrollment_number,enrollment_date,guardian_name,guardian_phone,notes',
+            'Asha,Rao,111,E1,2024-01-01,Ravi Rao,222,',
+        ), 'csv', self.user, self.center)
+
+        self.assertEqual(result['updated'], 1)
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.notes, '')
+        self.assertEqual(self.student.email, 'asha@example.com')
+
+    def test_new_student_gets_defaults_for_missing_columns(self):
+        result = run_import('students', _csv(
+            'first_name,last_name,phone,enrollment_number,enrollment_date,guardian_name,guardian_phone',
+            'Vik,Shah,444,E2,2024-02-01,Anil Shah,555',
+        ), 'csv', self.user, self.center)
+
+        self.assertEqual(result['created'], 1)
+        student = Student.objects.get(enrollment_number='E2')
+        self.assertEqual(student.status, 'active')
+        self.assertIsNone(student.date_of_birth)
+        self.assertEqual(student.email, '')
+
+
+class OutboxTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        cls.center = Center.objects.create(
+            name='North', code='N1', address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email='north@example.com',
+            created_by=cls.user, modified_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        # Only the projectors registered by a test run
+        patcher = mock.patch.dict(outbox._projectors, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_student(self, enrollment_number):
+        return Student.objects.create(
+            center=self.center, first_name='Asha', last_name='Rao', phone='111',
+            enrollment_number=enrollment_number, enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Ravi Rao', guardian_phone='222',
+            created_by=self.user, modified_by=self.user
+        )
+
+    def test_save_writes_an_event(self):
+        student = self.make_student('E1')
+
+        event = OutboxEvent.objects.get()
+        self.assertEqual(
+            (event.topic, event.action, event.object_id, event.center_id),
+            ('students.student', 'created', student.pk, self.center.pk)
+        )
+        self.assertIsNone(event.processed_at)
+
+    def test_rolled_back_save_writes_no_event(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.make_student('E1')
+                raise RuntimeError
+
+        self.assertFalse(Student.objects.exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_dispatch_delivers_events_in_order(self):
+        delivered = []
+        register_projector('test', ['students.student'], delivered.extend)
+        first = self.make_student('E1')
+        second = self.make_student('E2')
+
+        self.assertEqual(dispatch_events(), {'delivered': 2, 'failed': 0})
+        self.assertEqual([event.object_id for event in delivered], [first.pk, second.pk])
+        self.assertFalse(OutboxEvent.objects.filter(processed_at__isnull=True).exists())
+        self.assertEqual(dispatch_events(), {'delivered': 0, 'failed': 0})
+
+    def test_failed_events_stay_pending(self):
+        def fail(events):
+            raise ValueError('projection broke')
+
+        register_projector('test', ['students.student'], fail)
+        self.make_student('E1')
+
+        self.assertEqual(dispatch_events(), {'delivered': 0, 'failed': 1})
+        event = OutboxEvent.objects.get()
+        self.assertIsNone(event.processed_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertEqual(event.last_error, 'test: projection broke')
+
+        with self.settings(OUTBOX_MAX_ATTEMPTS=1):
+            self.assertEqual(dispatch_events(), {'delivered': 0, 'failed': 0})
+
+    def test_purge_keeps_recent_and_pending_events(self):
+        self.make_student('E1')
+        self.make_student('E2')
+        self.make_student('E3')
+        old, recent, pending = OutboxEvent.objects.order_by('pk')
+        OutboxEvent.objects.filter(pk=old.pk).update(processed_at=timezone.now() - datetime.timedelta(days=30))
+        OutboxEvent.objects.filter(pk=recent.pk).update(processed_at=timezone.now())
+
+        self.assertEqual(purge_processed_events(days=7), 1)
+        self.assertEqual(
+            set(OutboxEvent.objects.values_list('pk', flat=True)), {recent.pk, pending.pk}
+        )
+
+
+class UnreadNotificationCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'f1@example.com', 'pass', first_name='Mira', last_name='Iyer', role=User.FACULTY
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_count_is_cached_until_notifications_change(self):
+        self.assertEqual(get_unread_notification_count(self.user.pk), 0)
+        with self.assertNumQueries(0):
+            get_unread_notification_count(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_many([self.user], 'Hello', 'First')
+        self.assertEqual(get_unread_notification_count(self.user.pk), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = Notification.objects.get()
+            notification.is_read = True
+            notification.save()
+        self.assertEqual(get_unread_notification_count(self.user.pk), 0)
+
+
+class FanOutTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.master = User.objects.create_user(
+            'master@example.com', 'pass', first_name='Master', last_name='User', role=User.MASTER_ACCOUNT
+        )
+        cls.other_master = User.objects.create_user(
+            'master2@example.com', 'pass', first_name='Second', last_name='Master', role=User.MASTER_ACCOUNT
+        )
+        cls.head = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        cls.center = Center.objects.create(
+            name='North', code='N1', address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email='north@example.com',
+            created_by=cls.master, modified_by=cls.master
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def task(self, user, **kwargs):
+        return Task(
+            assigned_to=user, title='Review', description='Review the center',
+            task_type='review', related_center=self.center, **kwargs
+        )
+
+    def test_notify_many_skips_unread_duplicates(self):
+        notify_many([self.master, self.head], 'Hello', 'First')
+        Notification.objects.filter(user=self.master).update(is_read=True)
+
+        created = notify_many([self.master, self.head, self.master.pk], 'Hello', 'Again')
+
+        self.assertEqual([n.user_id for n in created], [self.master.pk])
+        self.assertEqual(Notification.objects.filter(user=self.head).count(), 1)
+        self.assertEqual(len(notify_many([self.head], 'Hello', 'Again', skip_unread_duplicates=False)), 1)
+
+    def test_existing_tasks_are_skipped_per_assignee(self):
+        create_tasks_bulk([self.task(self.master)])
+
+        created = create_tasks_bulk(
+            [self.task(self.master), self.task(self.other_master)],
+            skip_existing_since=timezone.now() - datetime.timedelta(days=7)
+        )
+
+        self.assertEqual([task.assigned_to_id for task in created], [self.other_master.pk])
+        self.assertEqual(Task.objects.filter(assigned_to=self.master).count(), 1)
+
+    def test_tasks_notify_their_assignees(self):
+        create_tasks_bulk([self.task(self.master, priority='high')])
+        create_tasks_bulk([self.task(self.other_master)], notify=False)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.master)
+        self.assertIn('New Task: Review', notification.title)
+        self.assertEqual(notification.notification_type, 'warning')
+
+    def test_cached_unread_counts_are_dropped_after_commit(self):
+        self.assertEqual(get_unread_notification_count(self.master.pk), 0)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            create_tasks_bulk([self.task(self.master)])
+            notify_many([self.master], 'Hello', 'First')
+        self.assertEqual(get_unread_notification_count(self.master.pk), 0)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_unread_notification_count(self.master.pk), 2)
+
+    @mock.patch('apps.reports.services.get_low_performing_centers')
+    def test_center_review_tasks_go_to_active_masters_once(self, get_low_performing_centers):
+        User.objects.filter(pk=self.other_master.pk).update(is_active=False)
+        get_low_performing_centers.return_value = [{
+            'center': self.center, 'attendance_rate': 40, 'satisfaction_score': 3.0,
+            'at_risk_count': 2, 'at_risk_percentage': 50.0, 'performance_score': 50.0,
+        }]
+
+        self.assertEqual(auto_create_tasks_for_at_risk_centers(), 1)
+        self.assertEqual(auto_create_tasks_for_at_risk_centers(), 0)
+
+        task = Task.objects.get()
+        self.assertEqual(task.assigned_to, self.master)
+        self.assertEqual(task.related_center, self.center)
+
+
+class AuditArchiveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        cls.other_user = User.objects.create_user(
+            'f1@example.com', 'pass', first_name='Mira', last_name='Iyer', role=User.FACULTY
+        )
+
+    def setUp(self):
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        self.archive_dir = archive_dir.name
+        patcher = self.settings(AUDIT_LOG_ARCHIVE_DIR=self.archive_dir, AUDIT_LOG_RETENTION_DAYS=365)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+        now = timezone.now()
+        self.january = self.log('Student', 1, self.user, datetime.datetime(2023, 1, 10, 12, tzinfo=datetime.timezone.utc))
+        self.february = self.log('Student', 2, self.other_user, datetime.datetime(2023, 2, 15, 12, tzinfo=datetime.timezone.utc))
+        self.late_january = self.log('Center', 1, self.user, datetime.datetime(2023, 1, 20, 12, tzinfo=datetime.timezone.utc))
+        self.recent = self.log('Student', 1, self.user, now - datetime.timedelta(days=1))
+
+    def log(self, model_name, object_id, user, timestamp):
+        entry = AuditLog.objects.create(
+            user=user, action='UPDATE', model_name=model_name, object_id=object_id,
+            object_repr=f'{model_name} {object_id}', changes={'name': ['a', 'b']}
+        )
+        AuditLog.objects.filter(pk=entry.pk).update(timestamp=timestamp)
+        return entry
+
+    def test_dry_run_deletes_nothing(self):
+        result = archive_audit_logs(dry_run=True)
+
+        self.assertEqual(result['archived'], 3)
+        self.assertEqual(AuditLog.objects.count(), 4)
+        self.assertFalse(AuditLogArchive.objects.exists())
+        self.assertEqual(os.listdir(self.archive_dir), [])
+
+    def test_old_entries_move_to_monthly_archives(self):
+        # Two rows per chunk: January is appended to by both chunks
+        result = archive_audit_logs(chunk_size=2)
+
+        self.assertEqual(result['archived'], 3)
+        self.assertEqual(result['months'], [datetime.date(2023, 1, 1), datetime.date(2023, 2, 1)])
+        self.assertEqual(list(AuditLog.objects.values_list('pk', flat=True)), [self.recent.pk])
+
+        january = AuditLogArchive.objects.get(month=datetime.date(2023, 1, 1))
+        self.assertEqual(january.entry_count, 2)
+        self.assertEqual(january.first_timestamp, datetime.datetime(2023, 1, 10, 12, tzinfo=datetime.timezone.utc))
+        self.assertEqual(january.last_timestamp, datetime.datetime(2023, 1, 20, 12, tzinfo=datetime.timezone.utc))
+        with gzip.open(os.path.join(self.archive_dir, january.path), 'rt') as fh:
+            self.assertEqual(len(fh.readlines()), 2)
+        self.assertEqual(AuditLogArchive.objects.get(month=datetime.date(2023, 2, 1)).entry_count, 1)
+
+        self.assertEqual(archive_audit_logs()['archived'], 0)
+
+    def test_query_returns_archived_and_hot_entries(self):
+        archive_audit_logs()
+
+        entries = query_audit_logs(model_name='Student', object_id=1)
+        self.assertEqual([entry['id'] for entry in entries], [self.recent.pk, self.january.pk])
+        self.assertEqual(entries[1]['changes'], {'name': ['a', 'b']})
+        self.assertEqual(
+            [entry['id'] for entry in query_audit_logs(user_id=self.user.pk)],
+            [self.recent.pk, self.late_january.pk, self.january.pk]
+        )
+        self.assertEqual(
+            [entry['id'] for entry in query_audit_logs(user_id=self.other_user.pk)], [self.february.pk]
+        )
+        self.assertEqual(
+            [entry['id'] for entry in query_audit_logs(
+                start=datetime.datetime(2023, 2, 1, tzinfo=datetime.timezone.utc),
+                end=datetime.datetime(2023, 3, 1, tzinfo=datetime.timezone.utc)
+            )],
+            [self.february.pk]
+        )
+
+
+class PrincipalTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.master = User.objects.create_user(
+            'master@example.com', 'pass', first_name='Master', last_name='User', role=User.MASTER_ACCOUNT
+        )
+        audit = {'created_by': cls.master, 'modified_by': cls.master}
+        cls.north = Center.objects.create(
+            name='North', code='N1', address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email='north@example.com', **audit
+        )
+        cls.south = Center.objects.create(
+            name='South', code='S1', address='2 Road', city='Pune', state='MH',
+            pincode='411001', phone='200', email='south@example.com', **audit
+        )
+        cls.head = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        CenterHead.objects.create(
+            user=cls.head, center=cls.north, employee_id='H1', joining_date=datetime.date(2024, 1, 1), **audit
+        )
+        cls.faculty = User.objects.create_user(
+            'f1@example.com', 'pass', first_name='Mira', last_name='Iyer', role=User.FACULTY
+        )
+        Faculty.objects.create(
+            user=cls.faculty, center=cls.south, employee_id='F1', joining_date=datetime.date(2024, 1, 1), **audit
+        )
+        cls.new_head = User.objects.create_user(
+            'new@example.com', 'pass', first_name='New', last_name='Head', role=User.CENTER_HEAD
+        )
+
+    def principal(self, user):
+        # A fresh user object, as loaded for a request
+        return Principal(User.objects.get(pk=user.pk))
+
+    def test_master_sees_every_center(self):
+        principal = self.principal(self.master)
+
+        self.assertTrue(principal.has_profile)
+        self.assertIsNone(principal.center_id)
+        self.assertTrue(principal.can_access_center(self.north.pk))
+        self.assertTrue(principal.can_access_center(self.south.pk))
+        self.assertEqual(principal.scope(Center.objects.all()).count(), 2)
+
+    def test_center_head_is_limited_to_their_center(self):
+        principal = self.principal(self.head)
+
+        self.assertEqual(principal.center, self.north)
+        self.assertTrue(principal.can_access_center(self.north.pk))
+        self.assertFalse(principal.can_access_center(self.south.pk))
+        self.assertEqual(list(principal.scope(Faculty.objects.all())), [])
+
+    def test_faculty_is_limited_to_their_center(self):
+        principal = self.principal(self.faculty)
+
+        self.assertEqual(principal.center_id, self.south.pk)
+        self.assertFalse(principal.can_access_center(self.north.pk))
+        self.assertEqual([faculty.user for faculty in principal.scope(Faculty.objects.all())], [self.faculty])
+
+    def test_missing_profile_sees_nothing(self):
+        principal = self.principal(self.new_head)
+
+        self.assertFalse(principal.has_profile)
+        self.assertFalse(principal.can_access_center(self.north.pk))
+        self.assertFalse(principal.scope(Center.objects.all()).exists())
+
+    def test_profiles_are_loaded_once_per_request(self):
+        request = RequestFactory().get('/')
+        request.user = User.objects.get(pk=self.head.pk)
+
+        with self.assertNumQueries(1):
+            principal = get_principal(request)
+            self.assertEqual(principal.center.name, 'North')
+        with self.assertNumQueries(0):
+            self.assertIs(get_principal(request), principal)
+
+    def test_redirect_mixin_sends_other_roles_to_their_profile(self):
+        url = reverse('centers:list')
+
+        self.client.force_login(self.faculty)
+        self.assertRedirects(self.client.get(url), reverse('accounts:profile'), fetch_redirect_response=False)
+        self.client.force_login(self.head)
+        self.assertRedirects(self.client.get(url), reverse('accounts:profile'), fetch_redirect_response=False)
+        self.client.force_login(self.master)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.client.logout()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('accounts:login'), response['Location'])
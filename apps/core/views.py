@@ -12,7 +12,7 @@ from django.core.paginator import Paginator
 from django.db.models import Q
 
 from .models import Notification, Task
-from .services import create_notification
+from .services import create_notification, get_unread_notification_count, invalidate_unread_notification_counts
 
 
 def home_view(request):
@@ -50,10 +50,7 @@ class NotificationListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['type_filter'] = self.request.GET.get('type', '')
         context['status_filter'] = self.request.GET.get('status', '')
-        context['unread_count'] = Notification.objects.filter(
-            user=self.request.user,
-            is_read=False
-        ).count()
+        context['unread_count'] = get_unread_notification_count(self.request.user.pk)
         return context
 
 
@@ -82,6 +79,7 @@ class MarkAllNotificationsReadView(LoginRequiredMixin, BaseView):
             user=request.user,
             is_read=False
         ).update(is_read=True)
+        invalidate_unread_notification_counts([request.user.pk])
         
         messages.success(request, 'All notifications marked as read')
         return redirect('core:notification_list')
@@ -218,13 +216,13 @@ class UpdateTaskStatusView(LoginRequiredMixin, BaseView):
 
 from django.views.generic import TemplateView, FormView
 from django.urls import reverse_lazy
-from apps.accounts.views import MasterAccountRequiredMixin
+from apps.core.mixins import MasterAccountRedirectMixin
 from .forms import GeminiAPIKeyForm, AISettingsForm
 from .models import SystemConfiguration
 from apps.core.utils import validate_gemini_api_key
 
 
-class SystemConfigurationView(MasterAccountRequiredMixin, TemplateView):
+class SystemConfigurationView(MasterAccountRedirectMixin, TemplateView):
     """
     System configuration dashboard.
     Shows AI status, usage statistics, and configuration options.
@@ -260,7 +258,7 @@ class SystemConfigurationView(MasterAccountRequiredMixin, TemplateView):
         return context
 
 
-class GeminiAPIKeyConfigView(MasterAccountRequiredMixin, FormView):
+class GeminiAPIKeyConfigView(MasterAccountRedirectMixin, FormView):
     """
     Configure Gemini API key.
     """
@@ -298,7 +296,7 @@ class GeminiAPIKeyConfigView(MasterAccountRequiredMixin, FormView):
         return super().form_valid(form)
 
 
-class AISettingsView(MasterAccountRequiredMixin, FormView):
+class AISettingsView(MasterAccountRedirectMixin, FormView):
     """
     Configure AI-related settings.
     """
@@ -353,7 +351,7 @@ class AISettingsView(MasterAccountRequiredMixin, FormView):
         return super().form_valid(form)
 
 
-class TestGeminiConnectionView(MasterAccountRequiredMixin, BaseView):
+class TestGeminiConnectionView(MasterAccountRedirectMixin, BaseView):
     """
     AJAX endpoint to test Gemini API connection.
     """
@@ -0,0 +1,184 @@
+"""
+Faculty activity engine.
+
+Dashboard figures for a faculty member (last-seen dates, daily and
+monthly session counts, per-assignment totals, teaching streaks) are
+computed from a handful of grouped queries over the faculty's attendance
+records, so a dashboard costs the same number of queries whatever the
+caseload. Every function takes the AttendanceRecord queryset to read
+(e.g. records of the faculty's assignments, or records marked by the
+faculty user).
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import ExtractHour
+
+
+def get_last_seen_dates(records):
+    """
+    Most recent attendance date of each student.
+
+    Args:
+        records: AttendanceRecord queryset
+
+    Returns:
+        dict: student id -> date
+    """
+    return dict(
+        records.order_by().values('student_id').annotate(
+            last_seen=Max('date')
+        ).values_list('student_id', 'last_seen')
+    )
+
+
+def get_daily_activity(records, start, end):
+    """
+    Session count and minutes per day.
+
+    Args:
+        records: AttendanceRecord queryset
+        start: First date (inclusive)
+        end: Last date (inclusive)
+
+    Returns:
+        dict: date -> {'sessions': int, 'minutes': int}; days without
+        sessions are missing
+    """
+    rows = records.filter(date__range=(start, end)).order_by().values('date').annotate(
+        sessions=Count('pk'),
+        minutes=Sum('duration_minutes')
+    )
+    return {
+        row['date']: {'sessions': row['sessions'], 'minutes': row['minutes'] or 0}
+        for row in rows
+    }
+
+
+def compute_streak(dates, today):
+    """
+    Number of consecutive days with activity, ending today.
+
+    Args:
+        dates: Dates with activity, sorted ascending
+        today: Last day of the streak
+
+    Returns:
+        int: Streak length (0 if there was no activity today)
+    """
+    streak = 0
+    expected = today
+    for day in reversed(dates):
+        if day > expected:
+            continue
+        if day != expected:
+            break
+        streak += 1
+        expected -= timedelta(days=1)
+    return streak
+
+
+def get_assignment_activity(records):
+    """
+    Session count, minutes and last session date per assignment.
+
+    Args:
+        records: AttendanceRecord queryset
+
+    Returns:
+        dict: assignment id -> {'sessions': int, 'minutes': int, 'last_date': date}
+    """
+    rows = records.order_by().values('assignment_id').annotate(
+        sessions=Count('pk'),
+        minutes=Sum('duration_minutes'),
+        last_date=Max('date')
+    )
+    return {
+        row['assignment_id']: {
+            'sessions': row['sessions'],
+            'minutes': row['minutes'] or 0,
+            'last_date': row['last_date'],
+        }
+        for row in rows
+    }
+
+
+def get_monthly_activity(records, windows):
+    """
+    Sessions, minutes and distinct students per date window.
+
+    Reads one (date, student) grouped query over the span of all windows.
+
+    Args:
+        records: AttendanceRecord queryset
+        windows: List of (start, end) date pairs, both inclusive
+
+    Returns:
+        list: One {'sessions', 'minutes', 'students'} dict per window
+    """
+    if not windows:
+        return []
+    first = min(start for start, _end in windows)
+    last = max(end for _start, end in windows)
+    rows = list(records.filter(date__range=(first, last)).order_by().values('date', 'student_id').annotate(
+        sessions=Count('pk'),
+        minutes=Sum('duration_minutes')
+    ))
+
+    activity = []
+    for start, end in windows:
+        in_window = [row for row in rows if start <= row['date'] <= end]
+        activity.append({
+            'sessions': sum(row['sessions'] for row in in_window),
+            'minutes': sum(row['minutes'] or 0 for row in in_window),
+            'students': len({row['student_id'] for row in in_window}),
+        })
+    return activity
+
+
+def get_hourly_pattern(records):
+    """
+    Number of sessions by starting hour.
+
+    Args:
+        records: AttendanceRecord queryset
+
+    Returns:
+        dict: hour (0-23) -> session count
+    """
+    return dict(
+        records.order_by().annotate(hour=ExtractHour('in_time')).values('hour').annotate(
+            sessions=Count('pk')
+        ).values_list('hour', 'sessions')
+    )
+
+
+def get_faculty_activity_totals(faculty_users, since):
+    """
+    Sessions, distinct students and recent sessions marked by each user.
+
+    Args:
+        faculty_users: Iterable of user ids
+        since: Start date of the "recent" window (inclusive)
+
+    Returns:
+        dict: user id -> {'sessions': int, 'students': int, 'recent': int}
+    """
+    from apps.attendance.models import AttendanceRecord
+
+    rows = AttendanceRecord.objects.filter(
+        marked_by_id__in=list(faculty_users)
+    ).order_by().values('marked_by_id').annotate(
+        sessions=Count('pk'),
+        students=Count('student', distinct=True),
+        recent=Count('pk', filter=Q(date__gte=since))
+    )
+    return {
+        row['marked_by_id']: {
+            'sessions': row['sessions'],
+            'students': row['students'],
+            'recent': row['recent'],
+        }
+        for row in rows
+    }
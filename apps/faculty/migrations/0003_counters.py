@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faculty', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faculty',
+            name='assignment_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Active assignments'),
+        ),
+        migrations.AddField(
+            model_name='faculty',
+            name='attendance_month',
+            field=models.DateField(blank=True, help_text='Month counted by attendance_this_month', null=True),
+        ),
+        migrations.AddField(
+            model_name='faculty',
+            name='attendance_this_month',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Attendance records dated in attendance_month'),
+        ),
+    ]
@@ -3,10 +3,10 @@ Faculty models for Disha LMS.
 """
 
 from django.db import models
-from apps.core.models import TimeStampedModel, SoftDeleteModel
+from apps.core.models import CounterFieldsMixin, TimeStampedModel, SoftDeleteModel
 
 
-class Faculty(TimeStampedModel, SoftDeleteModel):
+class Faculty(CounterFieldsMixin, TimeStampedModel, SoftDeleteModel):
     """
     Faculty profile model.
     Links a User with faculty role to a center and subjects.
@@ -41,6 +41,16 @@ class Faculty(TimeStampedModel, SoftDeleteModel):
     specialization = models.CharField(max_length=200, blank=True)
     experience_years = models.IntegerField(default=0, help_text="Years of teaching experience")
     
+    # Counters kept current by signals (see apps/centers/counters.py)
+    assignment_count = models.PositiveIntegerField(default=0, db_index=True, help_text="Active assignments")
+    attendance_this_month = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        help_text="Attendance records dated in attendance_month"
+    )
+    attendance_month = models.DateField(null=True, blank=True, help_text="Month counted by attendance_this_month")
+    counter_fields = ('assignment_count', 'attendance_this_month', 'attendance_month')
+    
     class Meta:
         db_table = 'faculty'
         verbose_name = 'Faculty'
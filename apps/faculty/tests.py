@@ -0,0 +1,49 @@
+import datetime
+
+from django.test import SimpleTestCase
+
+from .activity import compute_streak
+
+TODAY = datetime.date(2024, 3, 4)
+
+
+def _days(*offsets):
+    return sorted(TODAY - datetime.timedelta(days=offset) for offset in offsets)
+
+
+def _daily_streak(dates, today):
+    """The streak as the dashboard used to count it, one lookup per day."""
+    active = set(dates)
+    streak = 0
+    for i in range(30):
+        if today - datetime.timedelta(days=i) in active:
+            streak += 1
+        else:
+            break
+    return streak
+
+
+class StreakTests(SimpleTestCase):
+
+    def assert_streak(self, dates, expected):
+        self.assertEqual(compute_streak(dates, TODAY), expected)
+        self.assertEqual(_daily_streak(dates, TODAY), expected)
+
+    def test_no_activity(self):
+        self.assert_streak([], 0)
+
+    def test_only_today(self):
+        self.assert_streak(_days(0), 1)
+
+    def test_no_activity_today_breaks_the_streak(self):
+        self.assert_streak(_days(1, 2, 3), 0)
+
+    def test_gap_ends_the_streak(self):
+        self.assert_streak(_days(0, 1, 2, 4, 5), 3)
+
+    def test_later_dates_are_ignored(self):
+        self.assert_streak(sorted(_days(0, 1) + [TODAY + datetime.timedelta(days=1)]), 2)
+
+    def test_dashboard_window_of_thirty_days(self):
+        # The dashboard passes the active days of the last 30 days
+        self.assert_streak(_days(*range(30)), 30)
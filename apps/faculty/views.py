@@ -13,6 +13,7 @@ from datetime import timedelta, datetime, time
 import json
 
 from apps.core.mixins import CenterHeadRequiredMixin, SetCreatedByMixin, AuditLogMixin, AdminOrMasterRequiredMixin, FacultyRequiredMixin
+from apps.core.principal import get_principal
 from .models import Faculty
 from .forms import FacultyForm
 
@@ -26,6 +27,12 @@ class FacultyListView(LoginRequiredMixin, ListView):
     model = Faculty
     template_name = 'faculty/faculty_list.html'
     context_object_name = 'faculty_members'
+    # ?sort= value -> (label, ordering); the counts are maintained columns
+    SORT_OPTIONS = {
+        'joined': ('Recently joined', ['-joining_date']),
+        'assignments': ('Most assignments', ['-assignment_count', '-joining_date']),
+        'attendance': ('Most attendance this month', ['-attendance_this_month', '-joining_date']),
+    }
     paginate_by = 20
     
     def dispatch(self, request, *args, **kwargs):
@@ -41,13 +48,12 @@ class FacultyListView(LoginRequiredMixin, ListView):
         return super().dispatch(request, *args, **kwargs)
     
     def get_queryset(self):
-        queryset = Faculty.objects.filter(deleted_at__isnull=True).select_related('user', 'center').annotate(
-            student_count=Count('assignments', distinct=True)
-        )
+        queryset = Faculty.objects.filter(deleted_at__isnull=True).select_related('user', 'center')
         
         # Filter by center for center heads
-        if self.request.user.is_center_head and hasattr(self.request.user, 'center_head_profile'):
-            queryset = queryset.filter(center=self.request.user.center_head_profile.center)
+        principal = get_principal(self.request)
+        if principal.is_center_head:
+            queryset = principal.scope(queryset)
         
         # Filter by center for master account (optional)
         center_filter = self.request.GET.get('center')
@@ -72,13 +78,17 @@ class FacultyListView(LoginRequiredMixin, ListView):
         elif status == 'inactive':
             queryset = queryset.filter(is_active=False)
         
-        return queryset.order_by('-joining_date')
+        ordering = self.SORT_OPTIONS.get(self.request.GET.get('sort'), self.SORT_OPTIONS['joined'])[1]
+        return queryset.order_by(*ordering)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['search'] = self.request.GET.get('search', '')
         context['status_filter'] = self.request.GET.get('status', '')
         context['center_filter'] = self.request.GET.get('center', '')
+        sort = self.request.GET.get('sort')
+        context['sort'] = sort if sort in self.SORT_OPTIONS else 'joined'
+        context['sort_options'] = [(value, option[0]) for value, option in self.SORT_OPTIONS.items()]
         
         # Add centers list for master account
         if self.request.user.is_master_account:
@@ -105,8 +115,9 @@ class FacultyCreateView(LoginRequiredMixin, SetCreatedByMixin, AuditLogMixin, Cr
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
         # For center heads, limit to their center
-        if self.request.user.is_center_head and hasattr(self.request.user, 'center_head_profile'):
-            form.fields['center'].initial = self.request.user.center_head_profile.center
+        principal = get_principal(self.request)
+        if principal.is_center_head and principal.center:
+            form.fields['center'].initial = principal.center
             form.fields['center'].widget.attrs['readonly'] = True
         return form
     
@@ -131,8 +142,9 @@ class FacultyDetailView(LoginRequiredMixin, DetailView):
         queryset = Faculty.objects.filter(deleted_at__isnull=True).select_related('user', 'center')
         
         # Filter by center for center heads
-        if self.request.user.is_center_head and hasattr(self.request.user, 'center_head_profile'):
-            queryset = queryset.filter(center=self.request.user.center_head_profile.center)
+        principal = get_principal(self.request)
+        if principal.is_center_head:
+            queryset = principal.scope(queryset)
         
         return queryset
     
@@ -175,8 +187,9 @@ class FacultyUpdateView(LoginRequiredMixin, AuditLogMixin, UpdateView):
         queryset = Faculty.objects.filter(deleted_at__isnull=True)
         
         # Filter by center for center heads
-        if self.request.user.is_center_head and hasattr(self.request.user, 'center_head_profile'):
-            queryset = queryset.filter(center=self.request.user.center_head_profile.center)
+        principal = get_principal(self.request)
+        if principal.is_center_head:
+            queryset = principal.scope(queryset)
         
         return queryset
     
@@ -214,7 +227,7 @@ class FacultyDashboardView(LoginRequiredMixin, AdminOrMasterRequiredMixin, Templ
             from apps.faculty.models import Faculty
             if self.request.user.is_center_head:
                 faculty = Faculty.objects.filter(
-                    center=self.request.user.center_head_profile.center,
+                    center=get_principal(self.request).center,
                     deleted_at__isnull=True
                 ).first()
             else:
@@ -237,6 +250,11 @@ class FacultyDashboardView(LoginRequiredMixin, AdminOrMasterRequiredMixin, Templ
         from apps.subjects.models import Assignment
         from apps.students.models import Student
         
+        from .activity import (
+            compute_streak, get_assignment_activity, get_daily_activity,
+            get_hourly_pattern, get_last_seen_dates, get_monthly_activity,
+        )
+        
         all_records = AttendanceRecord.objects.filter(
             assignment__faculty=faculty
         ).select_related('student', 'assignment__subject', 'assignment__student')
@@ -248,66 +266,64 @@ class FacultyDashboardView(LoginRequiredMixin, AdminOrMasterRequiredMixin, Templ
             deleted_at__isnull=True
         ).values('student').distinct().count()
         
-        context['total_sessions_all_time'] = all_records.count()
-        context['sessions_last_7_days'] = all_records.filter(date__gte=last_7_days).count()
-        context['sessions_last_30_days'] = all_records.filter(date__gte=last_30_days).count()
-        
-        total_hours = all_records.aggregate(total=Sum('duration_minutes'))['total'] or 0
-        context['total_teaching_hours'] = round(total_hours / 60, 1)
+        totals = all_records.order_by().aggregate(
+            total=Count('pk'),
+            last_7_days=Count('pk', filter=Q(date__gte=last_7_days)),
+            last_30_days=Count('pk', filter=Q(date__gte=last_30_days)),
+            minutes=Sum('duration_minutes')
+        )
+        context['total_sessions_all_time'] = totals['total']
+        context['sessions_last_7_days'] = totals['last_7_days']
+        context['sessions_last_30_days'] = totals['last_30_days']
+        context['total_teaching_hours'] = round((totals['minutes'] or 0) / 60, 1)
         
         # 2. ABSENT STUDENTS (Last 5 days)
-        active_assignments = Assignment.objects.filter(
+        active_assignments = list(Assignment.objects.filter(
             faculty=faculty,
             is_active=True,
             deleted_at__isnull=True
-        ).select_related('student', 'subject')
+        ).select_related('student', 'subject'))
+        
+        recently_seen = get_last_seen_dates(all_records.filter(date__gte=last_5_days))
         
         absent_students = []
         for assignment in active_assignments:
-            last_attendance = all_records.filter(
-                student=assignment.student,
-                date__gte=last_5_days
-            ).order_by('-date').first()
-            
-            if not last_attendance:
-                days_absent = 5
-            else:
-                days_absent = (today - last_attendance.date).days
+            last_seen = recently_seen.get(assignment.student_id)
+            days_absent = (today - last_seen).days if last_seen else 5
             
             if days_absent >= 3:  # Absent for 3+ days
                 absent_students.append({
                     'student': assignment.student,
                     'subject': assignment.subject,
                     'days_absent': days_absent,
-                    'last_seen': last_attendance.date if last_attendance else None
+                    'last_seen': last_seen
                 })
         
         context['absent_students'] = sorted(absent_students, key=lambda x: x['days_absent'], reverse=True)[:10]
         context['total_absent_students'] = len(absent_students)
         
         # 3. TEACHING REGULARITY
-        # Check if faculty is teaching regularly (sessions in last 7 days)
+        # Daily sessions of the last 30 days (also feeds the weekly chart)
+        daily = get_daily_activity(all_records, today - timedelta(days=29), today)
+        no_sessions = {'sessions': 0, 'minutes': 0}
+        
         sessions_by_day = {}
         for i in range(7):
             date = today - timedelta(days=i)
-            count = all_records.filter(date=date).count()
-            sessions_by_day[date.strftime('%a')] = count
+            sessions_by_day[date.strftime('%a')] = daily.get(date, no_sessions)['sessions']
         
         context['sessions_by_day'] = sessions_by_day
         context['avg_sessions_per_day'] = round(context['sessions_last_7_days'] / 7, 1)
         
         # Teaching streak (consecutive days with sessions)
-        streak = 0
-        for i in range(30):
-            date = today - timedelta(days=i)
-            if all_records.filter(date=date).exists():
-                streak += 1
-            else:
-                break
-        context['teaching_streak'] = streak
+        context['teaching_streak'] = compute_streak(sorted(daily), today)
         
         # 4. TIME SLOT ANALYSIS (Today's schedule)
-        today_sessions = all_records.filter(date=today).order_by('in_time')
+        # Sessions of the last 7 days, today's first, each day by start time
+        week_sessions = list(
+            all_records.filter(date__gt=today - timedelta(days=7)).order_by('-date', 'in_time', 'pk')
+        )
+        today_sessions = [session for session in week_sessions if session.date == today]
         
         # Build time slots (6 AM to 10 PM in 1-hour slots)
         time_slots = []
@@ -344,22 +360,18 @@ class FacultyDashboardView(LoginRequiredMixin, AdminOrMasterRequiredMixin, Templ
         # 5. GANTT CHART DATA (Last 7 days schedule)
         gantt_data = [['Task', 'Student', 'Start', 'End']]
         
-        for i in range(7):
-            date = today - timedelta(days=i)
-            day_sessions = all_records.filter(date=date).order_by('in_time')
-            
-            for session in day_sessions:
-                if session.in_time and session.out_time:
-                    # Create datetime objects for Gantt chart
-                    start_datetime = datetime.combine(date, session.in_time)
-                    end_datetime = datetime.combine(date, session.out_time)
-                    
-                    gantt_data.append([
-                        session.assignment.subject.name,
-                        session.student.get_full_name(),
-                        start_datetime.isoformat(),
-                        end_datetime.isoformat()
-                    ])
+        for session in week_sessions:
+            if session.in_time and session.out_time:
+                # Create datetime objects for Gantt chart
+                start_datetime = datetime.combine(session.date, session.in_time)
+                end_datetime = datetime.combine(session.date, session.out_time)
+                
+                gantt_data.append([
+                    session.assignment.subject.name,
+                    session.student.get_full_name(),
+                    start_datetime.isoformat(),
+                    end_datetime.isoformat()
+                ])
         
         context['gantt_chart_data'] = json.dumps(gantt_data)
         
@@ -367,6 +379,9 @@ class FacultyDashboardView(LoginRequiredMixin, AdminOrMasterRequiredMixin, Templ
         context['recent_sessions'] = all_records.order_by('-date', '-in_time')[:10]
         
         # 7. SUBJECT-WISE BREAKDOWN
+        assignment_activity = get_assignment_activity(all_records)
+        no_activity = {'sessions': 0, 'minutes': 0, 'last_date': None}
+        
         subject_stats = {}
         for assignment in active_assignments:
             subject_name = assignment.subject.name
@@ -377,11 +392,10 @@ class FacultyDashboardView(LoginRequiredMixin, AdminOrMasterRequiredMixin, Templ
                     'hours': 0
                 }
             
+            activity = assignment_activity.get(assignment.pk, no_activity)
             subject_stats[subject_name]['students'] += 1
-            sessions = all_records.filter(assignment=assignment)
-            subject_stats[subject_name]['sessions'] += sessions.count()
-            duration = sessions.aggregate(total=Sum('duration_minutes'))['total'] or 0
-            subject_stats[subject_name]['hours'] += round(duration / 60, 1)
+            subject_stats[subject_name]['sessions'] += activity['sessions']
+            subject_stats[subject_name]['hours'] += round(activity['minutes'] / 60, 1)
         
         context['subject_stats'] = subject_stats
         
@@ -389,25 +403,23 @@ class FacultyDashboardView(LoginRequiredMixin, AdminOrMasterRequiredMixin, Templ
         weekly_data = [['Day', 'Sessions', 'Hours']]
         for i in range(6, -1, -1):
             date = today - timedelta(days=i)
-            day_sessions = all_records.filter(date=date)
-            session_count = day_sessions.count()
-            hours = round((day_sessions.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60, 1)
+            day = daily.get(date, no_sessions)
             
             weekly_data.append([
                 date.strftime('%a %d'),
-                session_count,
-                hours
+                day['sessions'],
+                round(day['minutes'] / 60, 1)
             ])
         
         context['weekly_activity_data'] = json.dumps(weekly_data)
         
         # 9. STUDENT PROGRESS DISTRIBUTION (for pie chart)
+        last_seen_dates = get_last_seen_dates(all_records)
         progress_distribution = {'on_track': 0, 'needs_attention': 0, 'at_risk': 0}
         for assignment in active_assignments:
-            student_records = all_records.filter(student=assignment.student)
-            if student_records.exists():
-                last_session = student_records.order_by('-date').first()
-                days_since = (today - last_session.date).days
+            last_seen = last_seen_dates.get(assignment.student_id)
+            if last_seen:
+                days_since = (today - last_seen).days
                 
                 if days_since >= 7:
                     progress_distribution['at_risk'] += 1
@@ -438,28 +450,26 @@ class FacultyDashboardView(LoginRequiredMixin, AdminOrMasterRequiredMixin, Templ
         context['subject_performance_chart'] = json.dumps(subject_performance_chart)
         
         # 11. MONTHLY TREND DATA (last 6 months)
+        month_starts = [today.replace(day=1) - timedelta(days=i*30) for i in range(5, -1, -1)]
+        monthly_activity = get_monthly_activity(
+            all_records,
+            [(month_start, month_start + timedelta(days=30)) for month_start in month_starts]
+        )
         monthly_trend = [['Month', 'Sessions', 'Hours', 'Students']]
-        for i in range(5, -1, -1):
-            month_start = today.replace(day=1) - timedelta(days=i*30)
-            month_end = month_start + timedelta(days=30)
-            month_sessions = all_records.filter(date__range=[month_start, month_end])
-            
+        for month_start, activity in zip(month_starts, monthly_activity):
             monthly_trend.append([
                 month_start.strftime('%b'),
-                month_sessions.count(),
-                round((month_sessions.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60, 1),
-                month_sessions.values('student').distinct().count()
+                activity['sessions'],
+                round(activity['minutes'] / 60, 1),
+                activity['students']
             ])
         context['monthly_trend_data'] = json.dumps(monthly_trend)
         
         # 12. DAILY PATTERN (hours of day)
+        sessions_by_hour = get_hourly_pattern(all_records)
         hourly_pattern = [['Hour', 'Sessions']]
         for hour in range(6, 22):
-            hour_sessions = 0
-            for session in all_records:
-                if session.in_time and session.in_time.hour == hour:
-                    hour_sessions += 1
-            hourly_pattern.append([f"{hour}:00", hour_sessions])
+            hourly_pattern.append([f"{hour}:00", sessions_by_hour.get(hour, 0)])
         context['hourly_pattern_data'] = json.dumps(hourly_pattern)
         
         context['faculty'] = faculty
@@ -477,12 +487,11 @@ class MyFacultyDashboardView(LoginRequiredMixin, FacultyRequiredMixin, TemplateV
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        faculty = self.request.user.faculty_profile
+        faculty = get_principal(self.request).faculty_profile
         today = timezone.now().date()
         
         from apps.attendance.models import AttendanceRecord
         from apps.subjects.models import Assignment
-        from django.db.models import Count, Sum, Max
         
         # Get all active assignments
         active_assignments = Assignment.objects.filter(
@@ -498,23 +507,28 @@ class MyFacultyDashboardView(LoginRequiredMixin, FacultyRequiredMixin, TemplateV
         all_records = AttendanceRecord.objects.filter(
             marked_by=self.request.user
         )
-        context['total_sessions'] = all_records.count()
-        context['today_sessions'] = all_records.filter(date=today).count()
+        session_counts = all_records.aggregate(
+            total=Count('pk'),
+            today=Count('pk', filter=Q(date=today))
+        )
+        context['total_sessions'] = session_counts['total']
+        context['today_sessions'] = session_counts['today']
         
         # My students with details
+        from .activity import get_assignment_activity, get_faculty_activity_totals
+        assignment_activity = get_assignment_activity(all_records)
+        no_activity = {'sessions': 0, 'minutes': 0, 'last_date': None}
+        
         my_students = []
         for assignment in active_assignments:
-            student_records = all_records.filter(student=assignment.student, assignment=assignment)
-            session_count = student_records.count()
-            total_minutes = student_records.aggregate(total=Sum('duration_minutes'))['total'] or 0
-            last_session = student_records.aggregate(last=Max('date'))['last']
+            activity = assignment_activity.get(assignment.pk, no_activity)
             
             my_students.append({
                 'student': assignment.student,
                 'subject_name': assignment.subject.name,
-                'session_count': session_count,
-                'total_hours': round(total_minutes / 60, 1),
-                'last_session': last_session
+                'session_count': activity['sessions'],
+                'total_hours': round(activity['minutes'] / 60, 1),
+                'last_session': activity['last_date']
             })
         
         # Sort by session count
@@ -529,11 +543,18 @@ class MyFacultyDashboardView(LoginRequiredMixin, FacultyRequiredMixin, TemplateV
             deleted_at__isnull=True
         ).select_related('user', 'center')
         
+        # Sessions, students and last 7 days' sessions of every faculty in one query
+        last_7_days = today - timedelta(days=7)
+        activity_totals = get_faculty_activity_totals(
+            [fac.user_id for fac in all_faculty], last_7_days
+        )
+        no_totals = {'sessions': 0, 'students': 0, 'recent': 0}
+        
         faculty_rankings = []
         for fac in all_faculty:
-            fac_records = AttendanceRecord.objects.filter(marked_by=fac.user)
-            session_count = fac_records.count()
-            student_count = fac_records.values('student').distinct().count()
+            totals = activity_totals.get(fac.user_id, no_totals)
+            session_count = totals['sessions']
+            student_count = totals['students']
             
             # Calculate simple performance score
             # Based on: sessions (40%), students (30%), consistency (30%)
@@ -541,8 +562,7 @@ class MyFacultyDashboardView(LoginRequiredMixin, FacultyRequiredMixin, TemplateV
             students_score = min(student_count / 5, 30)  # Max 30 points
             
             # Consistency: sessions in last 7 days
-            last_7_days = today - timedelta(days=7)
-            recent_sessions = fac_records.filter(date__gte=last_7_days).count()
+            recent_sessions = totals['recent']
             consistency_score = min(recent_sessions / 7 * 30, 30)  # Max 30 points
             
             total_score = sessions_score + students_score + consistency_score
@@ -575,11 +595,10 @@ class MyStudentsListView(LoginRequiredMixin, FacultyRequiredMixin, ListView):
     paginate_by = 12
     
     def get_queryset(self):
-        faculty = self.request.user.faculty_profile
+        faculty = get_principal(self.request).faculty_profile
         
         from apps.subjects.models import Assignment
         from apps.attendance.models import AttendanceRecord
-        from django.db.models import Count, Sum, Max
         
         # Get all active assignments
         assignments = Assignment.objects.filter(
@@ -603,31 +622,29 @@ class MyStudentsListView(LoginRequiredMixin, FacultyRequiredMixin, ListView):
             assignments = assignments.filter(subject_id=subject_id)
         
         # Build student data
+        from .activity import get_assignment_activity
+        assignment_activity = get_assignment_activity(AttendanceRecord.objects.filter(
+            marked_by=self.request.user
+        ))
+        no_activity = {'sessions': 0, 'minutes': 0, 'last_date': None}
+        
         students_data = []
         for assignment in assignments:
-            student_records = AttendanceRecord.objects.filter(
-                marked_by=self.request.user,
-                student=assignment.student,
-                assignment=assignment
-            )
-            
-            session_count = student_records.count()
-            total_minutes = student_records.aggregate(total=Sum('duration_minutes'))['total'] or 0
-            last_session = student_records.aggregate(last=Max('date'))['last']
+            activity = assignment_activity.get(assignment.pk, no_activity)
             
             students_data.append({
                 'student': assignment.student,
                 'subject_name': assignment.subject.name,
-                'session_count': session_count,
-                'total_hours': round(total_minutes / 60, 1),
-                'last_session': last_session
+                'session_count': activity['sessions'],
+                'total_hours': round(activity['minutes'] / 60, 1),
+                'last_session': activity['last_date']
             })
         
         return students_data
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        faculty = self.request.user.faculty_profile
+        faculty = get_principal(self.request).faculty_profile
         
         # Get subjects for filter
         from apps.subjects.models import Assignment
@@ -3,7 +3,7 @@ Admin interface for feedback app.
 """
 
 from django.contrib import admin
-from .models import FeedbackSurvey, FeedbackResponse, FacultyFeedback
+from .models import FeedbackSurvey, FeedbackResponse, FacultyFeedback, FacultyFeedbackRollup
 
 
 @admin.register(FeedbackSurvey)
@@ -85,3 +85,11 @@ class FacultyFeedbackAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(FacultyFeedbackRollup)
+class FacultyFeedbackRollupAdmin(admin.ModelAdmin):
+    list_display = ['faculty', 'center', 'month', 'feedback_count', 'avg_overall_score', 'updated_at']
+    list_filter = ['center', 'month']
+    search_fields = ['faculty__user__first_name', 'faculty__user__last_name', 'faculty__employee_id']
+    readonly_fields = [field.name for field in FacultyFeedbackRollup._meta.fields]
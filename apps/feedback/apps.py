@@ -5,3 +5,7 @@ class FeedbackConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.feedback'
     verbose_name = 'Feedback & Satisfaction'
+
+    def ready(self):
+        from .projections import connect_projectors
+        connect_projectors()
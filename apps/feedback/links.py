@@ -0,0 +1,344 @@
+"""
+Signed feedback links.
+
+Survey and faculty feedback tokens are signed, self-describing values:
+
+    <kind>.<nonce>.<parent id>.<expiry>:<signature>
+
+(a random nonce, the survey or faculty id and the expiry date ordinal in
+base 62). The token does not depend on the row id, so it is generated
+before the row is inserted. Faculty feedback links carry their expiry;
+survey links leave it empty, as they are valid while their survey is,
+which is checked against the survey when the link is opened. A link can
+be checked for tampering and faculty link expiry without touching the
+database, so link previewers and bots hitting a bulk WhatsApp send are
+turned away for free.
+
+Valid links are mapped to their row through a cached token lookup and
+render from a cached survey definition and a cached per-link state; the
+database is only read and written on the first open of a link. The stored token stays authoritative: the link state carries it,
+so a link stops working as soon as its row gets a new token.
+
+Tokens without a signature were issued before signing was introduced and
+are still looked up by value.
+"""
+
+import secrets
+from collections import namedtuple
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+
+SURVEY_LINK = 's'
+FACULTY_FEEDBACK_LINK = 'f'
+
+LINK_SALTS = {
+    SURVEY_LINK: 'feedback.survey_response',
+    FACULTY_FEEDBACK_LINK: 'feedback.faculty_feedback',
+}
+
+SURVEY_DEFINITION_KEY = 'feedback_survey_definition:{survey_id}'
+LINK_STATE_KEY = 'feedback_link_state:{kind}:{object_id}'
+LINK_TOKEN_KEY = 'feedback_link_token:{kind}:{token}'
+
+LinkToken = namedtuple('LinkToken', ['kind', 'object_id', 'parent_id', 'expires'])
+
+
+class InvalidLink(Exception):
+    """The token was tampered with or is malformed."""
+
+
+def _link_cache_ttl():
+    return getattr(settings, 'FEEDBACK_LINK_CACHE_TTL', 3600)
+
+
+def make_link_token(kind, parent_id, expires):
+    """
+    Sign a new link token.
+
+    Args:
+        kind: SURVEY_LINK or FACULTY_FEEDBACK_LINK
+        parent_id: Survey id (survey links) or faculty id (faculty links)
+        expires: Last date the link can be opened (None for no expiry)
+
+    Returns:
+        str: Signed token
+    """
+    value = '.'.join((
+        kind,
+        secrets.token_urlsafe(12),
+        signing.b62_encode(parent_id),
+        signing.b62_encode(expires.toordinal()) if expires else '',
+    ))
+    return signing.Signer(salt=LINK_SALTS[kind]).sign(value)
+
+
+def parse_link_token(token, kind):
+    """
+    Verify and decode a link token without touching the database.
+
+    Args:
+        token: Token from the URL
+        kind: Expected link kind
+
+    Returns:
+        LinkToken: Decoded token without its object_id, or None for an
+        unsigned (legacy) token
+
+    Raises:
+        InvalidLink: If the signature or the payload is invalid
+    """
+    if ':' not in token:
+        return None
+    try:
+        value = signing.Signer(salt=LINK_SALTS[kind]).unsign(token)
+        token_kind, nonce, parent_id, expires = value.split('.')
+        if token_kind != kind:
+            raise ValueError(token_kind)
+        return LinkToken(
+            kind,
+            None,
+            signing.b62_decode(parent_id),
+            date.fromordinal(signing.b62_decode(expires)) if expires else None,
+        )
+    except (signing.BadSignature, ValueError):
+        raise InvalidLink(token)
+
+
+def resolve_link(token, kind):
+    """
+    Decode a link token and find the row it belongs to.
+
+    The row id of a token is cached (unknown tokens too), so repeated opens
+    of a link do not reach the database. Expired links are returned
+    without a lookup.
+
+    Args:
+        token: Token from the URL
+        kind: Expected link kind
+
+    Returns:
+        LinkToken: Decoded token (parent_id and expires are None for
+        unsigned tokens; object_id is None for expired ones), or None if
+        no row has the token
+
+    Raises:
+        InvalidLink: If the token is signed but invalid
+    """
+    link = parse_link_token(token, kind)
+    if link is None:
+        link = LinkToken(kind, None, None, None)
+    elif is_link_expired(link):
+        return link
+
+    key = LINK_TOKEN_KEY.format(kind=kind, token=token)
+    object_id = cache.get(key)
+    if object_id is None:
+        from .models import FacultyFeedback, FeedbackResponse
+
+        model = FeedbackResponse if kind == SURVEY_LINK else FacultyFeedback
+        object_id = model.objects.filter(token=token).values_list('pk', flat=True).first() or 0
+        cache.set(key, object_id, _link_cache_ttl())
+    if not object_id:
+        return None
+    return link._replace(object_id=object_id)
+
+
+def is_link_expired(link, today=None):
+    """
+    Whether a decoded link is past its expiry date.
+
+    Survey links do not expire on their own, so extending a survey revives
+    the links already sent; survey tokens issued with the survey's end date
+    have it ignored.
+    """
+    if link.kind == SURVEY_LINK or link.expires is None:
+        return False
+    return link.expires < (today or timezone.localdate())
+
+
+def survey_link_token(response):
+    """New signed token for a FeedbackResponse; valid while its survey is."""
+    return make_link_token(SURVEY_LINK, response.survey_id, None)
+
+
+def faculty_feedback_link_token(feedback):
+    """New signed token for a FacultyFeedback; valid for FEEDBACK_LINK_MAX_AGE_DAYS."""
+    max_age = getattr(settings, 'FEEDBACK_LINK_MAX_AGE_DAYS', 30)
+    created = timezone.localdate(feedback.created_at) if feedback.created_at else timezone.localdate()
+    return make_link_token(FACULTY_FEEDBACK_LINK, feedback.faculty_id, created + timedelta(days=max_age))
+
+
+def get_survey_definition(survey_id):
+    """
+    Cached public part of a survey (what the survey form renders).
+
+    Args:
+        survey_id: FeedbackSurvey id
+
+    Returns:
+        dict: id, title, description, questions, valid_from, valid_until,
+        is_active and is_published, or None if the survey does not exist
+    """
+    key = SURVEY_DEFINITION_KEY.format(survey_id=survey_id)
+    definition = cache.get(key)
+    if definition is None:
+        from .models import FeedbackSurvey
+
+        definition = FeedbackSurvey.objects.filter(pk=survey_id).values(
+            'id', 'title', 'description', 'questions',
+            'valid_from', 'valid_until', 'is_active', 'is_published'
+        ).first()
+        if definition is None:
+            return None
+        cache.set(key, definition, _link_cache_ttl())
+    return definition
+
+
+def is_survey_definition_valid(definition, today=None):
+    """Same rule as FeedbackSurvey.is_valid(), on a cached definition."""
+    today = today or timezone.localdate()
+    return definition['valid_from'] <= today <= definition['valid_until']
+
+
+def invalidate_survey_definition(survey_id):
+    cache.delete(SURVEY_DEFINITION_KEY.format(survey_id=survey_id))
+
+
+def _load_survey_link_state(response_id):
+    from .models import FeedbackResponse
+
+    response = FeedbackResponse.objects.filter(
+        pk=response_id, deleted_at__isnull=True
+    ).select_related('student').first()
+    if response is None:
+        return {'exists': False}
+    return {
+        'exists': True,
+        'id': response.pk,
+        'token': response.token,
+        'survey_id': response.survey_id,
+        'is_completed': response.is_completed,
+        'submitted_at': response.submitted_at,
+        'satisfaction_score': response.satisfaction_score,
+        'opened': response.email_opened_at is not None,
+        'email_sent_at': response.email_sent_at,
+        'student_name': response.student.get_full_name(),
+        'student_email': response.student.email,
+    }
+
+
+def _load_faculty_link_state(feedback_id):
+    from .models import FacultyFeedback
+
+    feedback = FacultyFeedback.objects.filter(
+        pk=feedback_id, deleted_at__isnull=True
+    ).select_related('faculty__user', 'faculty__center').first()
+    if feedback is None:
+        return {'exists': False}
+    user = feedback.faculty.user
+    return {
+        'exists': True,
+        'id': feedback.pk,
+        'token': feedback.token,
+        'faculty_id': feedback.faculty_id,
+        'is_completed': feedback.is_completed,
+        'overall_score': feedback.overall_score,
+        'opened': feedback.link_opened_at is not None,
+        'faculty': {
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'full_name': user.get_full_name(),
+            'specialization': feedback.faculty.specialization,
+            'center_name': feedback.faculty.center.name if feedback.faculty.center_id else '',
+        },
+    }
+
+
+_STATE_LOADERS = {
+    SURVEY_LINK: _load_survey_link_state,
+    FACULTY_FEEDBACK_LINK: _load_faculty_link_state,
+}
+
+
+def get_link_state(kind, object_id, token=None):
+    """
+    Cached state of a link's response or feedback request.
+
+    Missing or deleted rows are cached too, so repeated opens of a
+    dead link do not reach the database either.
+
+    Args:
+        kind: SURVEY_LINK or FACULTY_FEEDBACK_LINK
+        object_id: FeedbackResponse or FacultyFeedback id
+        token: Token from the URL; the row must still have it
+
+    Returns:
+        dict: Link state ('exists' is False for missing rows and for
+        tokens the row no longer has)
+    """
+    key = LINK_STATE_KEY.format(kind=kind, object_id=object_id)
+    state = cache.get(key)
+    if state is None:
+        state = _STATE_LOADERS[kind](object_id)
+        cache.set(key, state, _link_cache_ttl())
+    if token is not None and state['exists'] and state['token'] != token:
+        return {'exists': False}
+    return state
+
+
+def invalidate_link_state(kind, object_id):
+    cache.delete(LINK_STATE_KEY.format(kind=kind, object_id=object_id))
+
+
+def record_link_opened(kind, state):
+    """
+    Store the first-open time of a link once, then remember it in the cache.
+
+    Args:
+        kind: SURVEY_LINK or FACULTY_FEEDBACK_LINK
+        state: Link state from get_link_state()
+    """
+    if state['opened']:
+        return
+    from .models import FacultyFeedback, FeedbackResponse
+
+    if kind == SURVEY_LINK:
+        FeedbackResponse.objects.filter(
+            pk=state['id'], email_opened_at__isnull=True
+        ).update(email_opened_at=timezone.now())
+    else:
+        FacultyFeedback.objects.filter(
+            pk=state['id'], link_opened_at__isnull=True
+        ).update(link_opened_at=timezone.now())
+    state['opened'] = True
+    cache.set(
+        LINK_STATE_KEY.format(kind=kind, object_id=state['id']), state, _link_cache_ttl()
+    )
+
+
+def lookup_kwargs(token, kind):
+    """
+    Model lookup for a token on write paths.
+
+    Tokens are looked up by value. Signed ones are verified first, and
+    expired faculty feedback tokens are rejected like invalid ones; survey
+    validity is left to the caller.
+
+    Args:
+        token: Token from the URL
+        kind: Expected link kind
+
+    Returns:
+        dict: Keyword arguments for get_object_or_404
+
+    Raises:
+        InvalidLink: If the token is signed but invalid or expired
+    """
+    link = parse_link_token(token, kind)
+    if link is not None and is_link_expired(link):
+        raise InvalidLink(token)
+    return {'token': token, 'deleted_at__isnull': True}
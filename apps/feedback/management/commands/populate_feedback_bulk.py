@@ -183,6 +183,10 @@ class Command(BaseCommand):
                 created_count += 1
                 self.stdout.write(f'  {status_icon} Feedback {i+1}/{per_student}: → {faculty.user.get_full_name()} ({feedback.overall_score if is_completed else "Pending"})')
         
+        # Seeded feedback bypasses mark_completed, so rebuild the monthly rollups
+        from apps.feedback.services import rebuild_faculty_feedback_rollups
+        rebuild_faculty_feedback_rollups()
+        
         # Summary
         self.stdout.write(self.style.SUCCESS('\n' + '='*60))
         self.stdout.write(self.style.SUCCESS('  SUMMARY'))
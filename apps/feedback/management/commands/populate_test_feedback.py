@@ -169,6 +169,10 @@ class Command(BaseCommand):
             
             self.stdout.write(f'Created feedback {created_count}/{count}: {student.get_full_name()} → {faculty.user.get_full_name()} ({"Completed" if is_completed else "Pending"})')
         
+        # Seeded feedback bypasses mark_completed, so rebuild the monthly rollups
+        from apps.feedback.services import rebuild_faculty_feedback_rollups
+        rebuild_faculty_feedback_rollups()
+        
         self.stdout.write(self.style.SUCCESS(f'\nSuccessfully created {created_count} feedback entries:'))
         self.stdout.write(self.style.SUCCESS(f'  - Completed: {completed_count}'))
         self.stdout.write(self.style.SUCCESS(f'  - Pending: {created_count - completed_count}'))
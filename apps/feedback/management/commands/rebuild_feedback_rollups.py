@@ -0,0 +1,29 @@
+"""
+Management command to rebuild the monthly faculty feedback rollups.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.centers.models import Center
+from apps.feedback.services import rebuild_faculty_feedback_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild monthly faculty feedback rollups from the feedback rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--center',
+            type=int,
+            help='Only rebuild rollups of this center (ID)',
+        )
+
+    def handle(self, *args, **options):
+        center = None
+        if options['center']:
+            center = Center.objects.filter(pk=options['center']).first()
+            if center is None:
+                raise CommandError(f"Center {options['center']} does not exist")
+
+        written = rebuild_faculty_feedback_rollups(center)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} faculty feedback rollups'))
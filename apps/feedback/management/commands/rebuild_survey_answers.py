@@ -0,0 +1,35 @@
+"""
+Management command to rebuild the flattened survey answers.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.feedback.models import FeedbackSurvey
+from apps.feedback.question_analytics import rebuild_survey_answers
+
+
+class Command(BaseCommand):
+    help = 'Rebuild SurveyAnswer rows from completed survey responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--survey',
+            type=int,
+            help='Only rebuild answers of this survey (ID)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of answer rows inserted per batch',
+        )
+
+    def handle(self, *args, **options):
+        survey = None
+        if options['survey']:
+            survey = FeedbackSurvey.all_objects.filter(pk=options['survey']).first()
+            if survey is None:
+                raise CommandError(f"Survey {options['survey']} does not exist")
+
+        written = rebuild_survey_answers(survey, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} survey answers'))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('centers', '0002_centerhead'),
+        ('faculty', '0002_initial'),
+        ('feedback', '0002_facultyfeedback'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultyFeedbackRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('feedback_count', models.PositiveIntegerField(default=0)),
+                ('teaching_quality_total', models.PositiveIntegerField(default=0)),
+                ('subject_knowledge_total', models.PositiveIntegerField(default=0)),
+                ('explanation_clarity_total', models.PositiveIntegerField(default=0)),
+                ('student_engagement_total', models.PositiveIntegerField(default=0)),
+                ('doubt_resolution_total', models.PositiveIntegerField(default=0)),
+                ('overall_total', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('avg_overall_score', models.DecimalField(blank=True, decimal_places=2, help_text='Average overall score for the month', max_digits=3, null=True)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('center', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='faculty_feedback_rollups', to='centers.center')),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feedback_rollups', to='faculty.faculty')),
+            ],
+            options={
+                'verbose_name': 'Faculty Feedback Rollup',
+                'verbose_name_plural': 'Faculty Feedback Rollups',
+                'db_table': 'faculty_feedback_rollups',
+                'ordering': ['-month'],
+                'indexes': [models.Index(fields=['center', 'month', '-avg_overall_score'], name='feedback_rollup_board_idx')],
+                'constraints': [models.UniqueConstraint(fields=('faculty', 'month'), name='unique_faculty_feedback_month')],
+            },
+        ),
+    ]
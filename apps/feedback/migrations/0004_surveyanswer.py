@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('centers', '0002_centerhead'),
+        ('feedback', '0003_facultyfeedbackrollup'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SurveyAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_key', models.CharField(help_text='Question id from FeedbackSurvey.questions', max_length=50)),
+                ('question_type', models.CharField(blank=True, max_length=20)),
+                ('numeric_value', models.FloatField(blank=True, help_text='Set when the answer is a number (e.g. ratings)', null=True)),
+                ('text_value', models.TextField(blank=True)),
+                ('submitted_at', models.DateTimeField()),
+                ('center', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='survey_answers', to='centers.center')),
+                ('response', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_rows', to='feedback.feedbackresponse')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='survey_answers', to='students.student')),
+                ('survey', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_rows', to='feedback.feedbacksurvey')),
+            ],
+            options={
+                'verbose_name': 'Survey Answer',
+                'verbose_name_plural': 'Survey Answers',
+                'db_table': 'survey_answers',
+                'indexes': [models.Index(fields=['survey', 'question_key', 'numeric_value'], name='survey_answer_numeric_idx'), models.Index(fields=['survey', 'question_key', 'center'], name='survey_answer_center_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0004_surveyanswer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='facultyfeedback',
+            name='token',
+            field=models.CharField(db_index=True, help_text='Unique token for accessing the feedback form', max_length=128, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='feedbackresponse',
+            name='token',
+            field=models.CharField(db_index=True, help_text='Unique token for accessing the survey', max_length=128, unique=True),
+        ),
+    ]
@@ -4,8 +4,7 @@ Feedback and satisfaction survey models for Disha LMS.
 
 from django.db import models
 from django.utils import timezone
-from apps.core.models import TimeStampedModel, SoftDeleteModel
-import secrets
+from apps.core.models import OutboxEventMixin, TimeStampedModel, SoftDeleteModel
 
 
 class FeedbackSurvey(TimeStampedModel, SoftDeleteModel):
@@ -57,13 +56,19 @@ class FeedbackSurvey(TimeStampedModel, SoftDeleteModel):
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        """Save and drop the cached public definition used by survey links."""
+        super().save(*args, **kwargs)
+        from .links import invalidate_survey_definition
+        invalidate_survey_definition(self.pk)
+    
     def is_valid(self):
         """Check if survey is currently valid."""
         today = timezone.now().date()
         return self.valid_from <= today <= self.valid_until
 
 
-class FeedbackResponse(TimeStampedModel, SoftDeleteModel):
+class FeedbackResponse(OutboxEventMixin, TimeStampedModel, SoftDeleteModel):
     """
     Feedback response model.
     Stores student responses to surveys.
@@ -81,9 +86,9 @@ class FeedbackResponse(TimeStampedModel, SoftDeleteModel):
         related_name='feedback_responses'
     )
     
-    # Unique token for survey access
+    # Unique token for survey access (signed, see links.py)
     token = models.CharField(
-        max_length=64,
+        max_length=128,
         unique=True,
         db_index=True,
         help_text="Unique token for accessing the survey"
@@ -110,6 +115,8 @@ class FeedbackResponse(TimeStampedModel, SoftDeleteModel):
     email_sent_at = models.DateTimeField(null=True, blank=True)
     email_opened_at = models.DateTimeField(null=True, blank=True)
     
+    outbox_fields = ('survey_id', 'student_id', 'is_completed', 'submitted_at', 'is_deleted')
+    
     class Meta:
         db_table = 'feedback_responses'
         verbose_name = 'Feedback Response'
@@ -126,20 +133,83 @@ class FeedbackResponse(TimeStampedModel, SoftDeleteModel):
         return f"{self.student.get_full_name()} - {self.survey.title}"
     
     def save(self, *args, **kwargs):
-        """Generate unique token on creation."""
+        """Generate a signed access token on creation."""
+        from .links import SURVEY_LINK, invalidate_link_state, survey_link_token
+        
+        is_new = self._state.adding
         if not self.token:
-            self.token = secrets.token_urlsafe(32)
+            self.token = survey_link_token(self)
         super().save(*args, **kwargs)
+        if not is_new:
+            invalidate_link_state(SURVEY_LINK, self.pk)
     
     def mark_completed(self):
-        """Mark response as completed."""
+        """Mark response as completed and invalidate cached satisfaction trends."""
         if not self.is_completed:
             self.is_completed = True
             self.submitted_at = timezone.now()
             self.save()
+            
+            from .services import bump_satisfaction_trends_version
+            bump_satisfaction_trends_version()
+            # The SurveyAnswer rows are written from the outbox (projections.py)
 
 
-class FacultyFeedback(TimeStampedModel, SoftDeleteModel):
+
+class SurveyAnswer(models.Model):
+    """
+    One answer to one survey question, flattened from FeedbackResponse.answers.
+    Written when a response is completed so per-question analytics can run
+    as grouped queries instead of reading every response's JSON.
+    Multiple-choice answers produce one row per selected option.
+    """
+    
+    response = models.ForeignKey(
+        FeedbackResponse,
+        on_delete=models.CASCADE,
+        related_name='answer_rows'
+    )
+    
+    survey = models.ForeignKey(
+        FeedbackSurvey,
+        on_delete=models.CASCADE,
+        related_name='answer_rows'
+    )
+    
+    # Denormalized from the response for cross-tabs
+    student = models.ForeignKey(
+        'students.Student',
+        on_delete=models.CASCADE,
+        related_name='survey_answers'
+    )
+    
+    center = models.ForeignKey(
+        'centers.Center',
+        on_delete=models.CASCADE,
+        related_name='survey_answers'
+    )
+    
+    question_key = models.CharField(max_length=50, help_text="Question id from FeedbackSurvey.questions")
+    question_type = models.CharField(max_length=20, blank=True)
+    
+    numeric_value = models.FloatField(null=True, blank=True, help_text="Set when the answer is a number (e.g. ratings)")
+    text_value = models.TextField(blank=True)
+    
+    submitted_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'survey_answers'
+        verbose_name = 'Survey Answer'
+        verbose_name_plural = 'Survey Answers'
+        indexes = [
+            models.Index(fields=['survey', 'question_key', 'numeric_value'], name='survey_answer_numeric_idx'),
+            models.Index(fields=['survey', 'question_key', 'center'], name='survey_answer_center_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.survey_id}:{self.question_key} = {self.text_value}"
+
+class FacultyFeedback(OutboxEventMixin, TimeStampedModel, SoftDeleteModel):
     """
     Faculty-specific feedback model.
     Stores student feedback about faculty teaching quality with 5 learning-based questions.
@@ -164,9 +234,9 @@ class FacultyFeedback(TimeStampedModel, SoftDeleteModel):
         related_name='faculty_feedbacks'
     )
     
-    # Unique token for feedback access (WhatsApp link)
+    # Unique token for feedback access (WhatsApp link, signed, see links.py)
     token = models.CharField(
-        max_length=64,
+        max_length=128,
         unique=True,
         db_index=True,
         help_text="Unique token for accessing the feedback form"
@@ -231,6 +301,8 @@ class FacultyFeedback(TimeStampedModel, SoftDeleteModel):
     whatsapp_sent_at = models.DateTimeField(null=True, blank=True)
     link_opened_at = models.DateTimeField(null=True, blank=True)
     
+    outbox_fields = ('faculty_id', 'student_id', 'is_completed', 'submitted_at', 'is_deleted')
+    
     class Meta:
         db_table = 'faculty_feedbacks'
         verbose_name = 'Faculty Feedback'
@@ -247,9 +319,12 @@ class FacultyFeedback(TimeStampedModel, SoftDeleteModel):
         return f"{self.student.get_full_name()} → {self.faculty.user.get_full_name()}"
     
     def save(self, *args, **kwargs):
-        """Generate unique token and calculate overall score on save."""
+        """Generate a signed token and calculate overall score on save."""
+        from .links import FACULTY_FEEDBACK_LINK, faculty_feedback_link_token, invalidate_link_state
+        
+        is_new = self._state.adding
         if not self.token:
-            self.token = secrets.token_urlsafe(32)
+            self.token = faculty_feedback_link_token(self)
         
         # Calculate overall score if all questions are answered
         if all([
@@ -269,23 +344,31 @@ class FacultyFeedback(TimeStampedModel, SoftDeleteModel):
             self.overall_score = round(total / 5, 2)
         
         super().save(*args, **kwargs)
+        
+        if not is_new:
+            invalidate_link_state(FACULTY_FEEDBACK_LINK, self.pk)
     
     def mark_completed(self):
-        """Mark feedback as completed."""
+        """Mark feedback as completed (the monthly rollup follows from the outbox)."""
         if not self.is_completed:
             self.is_completed = True
             self.submitted_at = timezone.now()
             self.save()
     
-    def get_whatsapp_link(self, request=None):
+    def get_feedback_url(self, base_url):
+        """Public URL of the feedback form."""
+        return f"{base_url}/feedback/faculty/{self.token}/"
+    
+    def get_whatsapp_link(self, request=None, base_url=None):
         """Generate WhatsApp link for sending feedback request."""
-        if request:
-            base_url = request.build_absolute_uri('/')[:-1]
-        else:
-            from django.conf import settings
-            base_url = settings.SITE_URL if hasattr(settings, 'SITE_URL') else 'http://localhost:8000'
+        if base_url is None:
+            if request:
+                base_url = request.build_absolute_uri('/')[:-1]
+            else:
+                from django.conf import settings
+                base_url = settings.SITE_URL if hasattr(settings, 'SITE_URL') else 'http://localhost:8000'
         
-        feedback_url = f"{base_url}/feedback/faculty/{self.token}/"
+        feedback_url = self.get_feedback_url(base_url)
         
         message = (
             f"Hello {self.student.first_name}! 👋\n\n"
@@ -303,3 +386,67 @@ class FacultyFeedback(TimeStampedModel, SoftDeleteModel):
         whatsapp_link = f"https://wa.me/{self.student.phone}?text={encoded_message}"
         
         return whatsapp_link
+
+
+class FacultyFeedbackRollup(models.Model):
+    """
+    Monthly aggregate of one faculty member's completed feedback.
+    Rebuilt from the feedback rows whenever a feedback in the month is
+    completed, so leaderboards and trends read one row per faculty/month.
+    """
+    
+    faculty = models.ForeignKey(
+        'faculty.Faculty',
+        on_delete=models.CASCADE,
+        related_name='feedback_rollups'
+    )
+    
+    center = models.ForeignKey(
+        'centers.Center',
+        on_delete=models.CASCADE,
+        related_name='faculty_feedback_rollups'
+    )
+    
+    month = models.DateField(help_text="First day of the month")
+    
+    feedback_count = models.PositiveIntegerField(default=0)
+    
+    # Score totals, so averages over several months stay exact
+    teaching_quality_total = models.PositiveIntegerField(default=0)
+    subject_knowledge_total = models.PositiveIntegerField(default=0)
+    explanation_clarity_total = models.PositiveIntegerField(default=0)
+    student_engagement_total = models.PositiveIntegerField(default=0)
+    doubt_resolution_total = models.PositiveIntegerField(default=0)
+    overall_total = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    
+    avg_overall_score = models.DecimalField(
+        max_digits=3,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Average overall score for the month"
+    )
+    
+    # Histogram of overall scores (rating N covers N.00 - N.99)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'faculty_feedback_rollups'
+        verbose_name = 'Faculty Feedback Rollup'
+        verbose_name_plural = 'Faculty Feedback Rollups'
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(fields=['faculty', 'month'], name='unique_faculty_feedback_month'),
+        ]
+        indexes = [
+            models.Index(fields=['center', 'month', '-avg_overall_score'], name='feedback_rollup_board_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.faculty} - {self.month:%Y-%m} ({self.feedback_count})"
@@ -0,0 +1,67 @@
+"""
+Outbox projectors of the feedback app (see apps/core/outbox.py).
+
+Both recompute their rows from the source tables, so a batch delivered
+twice gives the same result:
+
+- survey answers: the SurveyAnswer rows of every changed response are
+  replaced (deleted when the response is not completed or is deleted)
+- faculty feedback rollups: the monthly rollup of every changed
+  submission is recomputed once per faculty member and month
+"""
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+RESPONSE_TOPIC = 'feedback.feedbackresponse'
+FACULTY_FEEDBACK_TOPIC = 'feedback.facultyfeedback'
+
+
+def project_survey_answers(events):
+    """Replace the SurveyAnswer rows of the responses in a batch."""
+    from .models import FeedbackResponse, SurveyAnswer
+    from .question_analytics import flatten_answers
+
+    response_ids = {event.object_id for event in events}
+    responses = FeedbackResponse.objects.filter(
+        pk__in=response_ids,
+        is_completed=True,
+        submitted_at__isnull=False
+    ).select_related('survey', 'student')
+
+    question_types = {}
+    rows = []
+    for response in responses:
+        if response.survey_id not in question_types:
+            question_types[response.survey_id] = {
+                str(question.get('id')): question.get('type', '')
+                for question in response.survey.questions or []
+                if isinstance(question, dict)
+            }
+        rows.extend(flatten_answers(response, question_types[response.survey_id]))
+
+    SurveyAnswer.objects.filter(response_id__in=response_ids).delete()
+    SurveyAnswer.objects.bulk_create(rows, batch_size=1000)
+
+
+def project_faculty_feedback_rollups(events):
+    """Recompute the monthly rollups touched by the submissions in a batch."""
+    from .services import refresh_faculty_feedback_rollup
+
+    months = {}
+    for event in events:
+        submitted_at = parse_datetime(event.payload.get('submitted_at') or '')
+        if submitted_at is None:
+            continue
+        month = timezone.localtime(submitted_at).date().replace(day=1)
+        months[event.payload['faculty_id'], month] = submitted_at
+
+    for (faculty_id, _month), submitted_at in months.items():
+        refresh_faculty_feedback_rollup(faculty_id, submitted_at)
+
+
+def connect_projectors():
+    from apps.core.outbox import register_projector
+
+    register_projector('survey_answers', [RESPONSE_TOPIC], project_survey_answers)
+    register_projector('faculty_feedback_rollups', [FACULTY_FEEDBACK_TOPIC], project_faculty_feedback_rollups)
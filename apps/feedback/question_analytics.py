@@ -0,0 +1,277 @@
+"""
+Question-level survey analytics.
+
+FeedbackResponse.answers is free-form JSON keyed by question id. When a
+response is completed its answers are flattened into SurveyAnswer rows
+(one per question, or per selected option for multiple choice), so
+distributions, averages and cross-tabs are grouped queries on an indexed
+table instead of a scan over every response's JSON.
+"""
+
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min
+
+from .models import FeedbackResponse, SurveyAnswer
+
+ANSWER_KEY_PREFIX = 'question_'
+
+CROSSTAB_DIMENSIONS = {
+    # dimension -> (group id lookup, display name lookups)
+    'center': ('center_id', ['center__name']),
+    'faculty': (
+        'student__assignments__faculty_id',
+        ['student__assignments__faculty__user__first_name', 'student__assignments__faculty__user__last_name'],
+    ),
+    'subject': ('student__assignments__subject_id', ['student__assignments__subject__name']),
+}
+
+
+def normalize_question_key(key):
+    """Answer keys come as '3' from the web form and 'question_3' from the API."""
+    key = str(key)
+    if key.startswith(ANSWER_KEY_PREFIX):
+        key = key[len(ANSWER_KEY_PREFIX):]
+    return key
+
+
+def _to_number(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_answers(response, question_types=None):
+    """
+    Build (unsaved) SurveyAnswer rows for a completed response.
+
+    Args:
+        response: FeedbackResponse with answers, student and submitted_at set
+        question_types: dict of question key -> type (read from the survey if omitted)
+
+    Returns:
+        list: SurveyAnswer instances
+    """
+    if question_types is None:
+        question_types = {
+            str(question.get('id')): question.get('type', '')
+            for question in response.survey.questions or []
+            if isinstance(question, dict)
+        }
+
+    rows = []
+    for key, value in (response.answers or {}).items():
+        question_key = normalize_question_key(key)
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            if item is None or item == '':
+                continue
+            rows.append(SurveyAnswer(
+                response_id=response.pk,
+                survey_id=response.survey_id,
+                student_id=response.student_id,
+                center_id=response.student.center_id,
+                question_key=question_key[:50],
+                question_type=question_types.get(question_key, '')[:20],
+                numeric_value=_to_number(item),
+                text_value=str(item),
+                submitted_at=response.submitted_at,
+            ))
+    return rows
+
+
+def record_survey_answers(response):
+    """
+    Replace the SurveyAnswer rows of a completed response.
+
+    Args:
+        response: Completed FeedbackResponse
+    """
+    rows = flatten_answers(response)
+    with transaction.atomic():
+        SurveyAnswer.objects.filter(response=response).delete()
+        SurveyAnswer.objects.bulk_create(rows)
+
+
+def rebuild_survey_answers(survey=None, batch_size=1000):
+    """
+    Rebuild SurveyAnswer rows from the completed responses.
+
+    Args:
+        survey: FeedbackSurvey (optional, defaults to all surveys)
+        batch_size: Rows inserted per bulk_create call
+
+    Returns:
+        int: Number of answer rows written
+    """
+    responses = FeedbackResponse.objects.filter(
+        is_completed=True,
+        submitted_at__isnull=False,
+        deleted_at__isnull=True
+    ).select_related('survey', 'student')
+    answers = SurveyAnswer.objects.all()
+    if survey:
+        responses = responses.filter(survey=survey)
+        answers = answers.filter(survey=survey)
+
+    question_types = {}
+    written = 0
+    batch = []
+    with transaction.atomic():
+        answers.delete()
+        for response in responses.iterator(chunk_size=batch_size):
+            if response.survey_id not in question_types:
+                question_types[response.survey_id] = {
+                    str(question.get('id')): question.get('type', '')
+                    for question in response.survey.questions or []
+                    if isinstance(question, dict)
+                }
+            batch.extend(flatten_answers(response, question_types[response.survey_id]))
+            if len(batch) >= batch_size:
+                SurveyAnswer.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        SurveyAnswer.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+def _survey_answers(survey, center=None, question_key=None):
+    answers = SurveyAnswer.objects.filter(survey=survey)
+    if center:
+        answers = answers.filter(center=center)
+    if question_key is not None:
+        answers = answers.filter(question_key=normalize_question_key(question_key))
+    return answers
+
+
+def get_question_summary(survey, center=None):
+    """
+    Answer count and numeric statistics for every question of a survey.
+
+    Args:
+        survey: FeedbackSurvey
+        center: Only count answers of this center's students (optional)
+
+    Returns:
+        list: One dict per question (in survey order, then any unknown keys)
+    """
+    stats = {
+        row['question_key']: row
+        for row in _survey_answers(survey, center).values('question_key').annotate(
+            response_count=Count('response', distinct=True),
+            answer_count=Count('pk'),
+            numeric_count=Count('numeric_value'),
+            average=Avg('numeric_value'),
+            minimum=Min('numeric_value'),
+            maximum=Max('numeric_value'),
+        ).order_by()
+    }
+
+    summary = []
+    for question in survey.questions or []:
+        if not isinstance(question, dict):
+            continue
+        key = str(question.get('id'))
+        row = stats.pop(key, {})
+        summary.append(_summary_row(key, question.get('text', key), question.get('type', ''), row))
+    for key, row in sorted(stats.items()):
+        summary.append(_summary_row(key, key, '', row))
+    return summary
+
+
+def _summary_row(key, text, question_type, row):
+    average = row.get('average')
+    return {
+        'question_key': key,
+        'text': text,
+        'type': question_type,
+        'response_count': row.get('response_count', 0),
+        'answer_count': row.get('answer_count', 0),
+        'average': round(average, 2) if average is not None else None,
+        'minimum': row.get('minimum'),
+        'maximum': row.get('maximum'),
+    }
+
+
+def get_question_distribution(survey, question_key, center=None, limit=20):
+    """
+    How often each answer value was given to a question.
+
+    Args:
+        survey: FeedbackSurvey
+        question_key: Question id
+        center: Only count answers of this center's students (optional)
+        limit: Maximum number of distinct values returned
+
+    Returns:
+        list: Dicts with value, count and percentage, most frequent first
+    """
+    answers = _survey_answers(survey, center, question_key)
+    rows = list(answers.values('text_value').annotate(
+        count=Count('pk')
+    ).order_by('-count', 'text_value')[:limit])
+
+    total = sum(row['count'] for row in rows)
+    if len(rows) == limit:
+        total = answers.count()
+    return [
+        {
+            'value': row['text_value'],
+            'count': row['count'],
+            'percentage': round(row['count'] / total * 100, 1) if total else 0,
+        }
+        for row in rows
+    ]
+
+
+def get_question_crosstab(survey, question_key, by='center', center=None):
+    """
+    Answer count and average of a question per center, faculty or subject.
+
+    Faculty and subject come from the student's assignments. The join is
+    limited to one assignment per (student, faculty) or (student, subject)
+    pair, so an answer counts once for every faculty/subject the student
+    is assigned to and never twice for the same one (the same rule as the
+    satisfaction breakdowns).
+
+    Args:
+        survey: FeedbackSurvey
+        question_key: Question id
+        by: 'center', 'faculty' or 'subject'
+        center: Only count answers of this center's students (optional)
+
+    Returns:
+        list: Dicts with id, name, answer count and average, best average first
+    """
+    if by not in CROSSTAB_DIMENSIONS:
+        raise ValueError(f"Unknown cross-tab dimension: {by}")
+    group_field, name_fields = CROSSTAB_DIMENSIONS[by]
+
+    answers = _survey_answers(survey, center, question_key)
+    if by != 'center':
+        from apps.subjects.models import Assignment
+
+        one_per_pair = Assignment.objects.filter(
+            is_deleted=False
+        ).values('student_id', f'{by}_id').annotate(first_id=Min('pk')).values('first_id')
+        answers = answers.filter(student__assignments__pk__in=one_per_pair)
+
+    rows = answers.values(group_field, *name_fields).annotate(
+        answer_count=Count('pk'),
+        average=Avg('numeric_value'),
+    ).order_by()
+
+    crosstab = [
+        {
+            'id': row[group_field],
+            'name': ' '.join(filter(None, (row[field] for field in name_fields))),
+            'answer_count': row['answer_count'],
+            'average': round(row['average'], 2) if row['average'] is not None else None,
+        }
+        for row in rows
+    ]
+    crosstab.sort(key=lambda item: (item['average'] is None, -(item['average'] or 0), item['name']))
+    return crosstab
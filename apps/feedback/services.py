@@ -3,117 +3,255 @@ Service functions for feedback and satisfaction analytics.
 T183: Create satisfaction trends service
 """
 
-from django.db.models import Avg, Count, Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q, Sum
 from django.utils import timezone
-from datetime import timedelta
-from apps.feedback.models import FeedbackResponse, FeedbackSurvey
+from datetime import datetime, time, timedelta
+from apps.feedback.models import FacultyFeedback, FacultyFeedbackRollup, FeedbackResponse, FeedbackSurvey
 
 
-def calculate_satisfaction_trends(center=None, months=6):
+# Rubric questions of FacultyFeedback, in display order
+FACULTY_FEEDBACK_QUESTIONS = [
+    ('teaching_quality', 'Teaching Quality'),
+    ('subject_knowledge', 'Subject Knowledge'),
+    ('explanation_clarity', 'Explanation Clarity'),
+    ('student_engagement', 'Student Engagement'),
+    ('doubt_resolution', 'Doubt Resolution'),
+]
+
+
+SATISFACTION_TRENDS_VERSION_KEY = 'satisfaction_trends_version'
+SATISFACTION_TRENDS_KEY = 'satisfaction_trends:v{version}:{center}:{start:%Y-%m}:{end:%Y-%m}:{by_center}'
+
+
+def get_satisfaction_trends_version():
+    """Current version of the cached satisfaction trends."""
+    version = cache.get(SATISFACTION_TRENDS_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted key never reuses an old version
+        version = int(timezone.now().timestamp() * 1000)
+        if not cache.add(SATISFACTION_TRENDS_VERSION_KEY, version, timeout=None):
+            version = cache.get(SATISFACTION_TRENDS_VERSION_KEY, version)
+    return version
+
+
+def bump_satisfaction_trends_version():
+    """Invalidate all cached satisfaction trends (called when a response is completed)."""
+    try:
+        return cache.incr(SATISFACTION_TRENDS_VERSION_KEY)
+    except ValueError:
+        version = int(timezone.now().timestamp() * 1000)
+        cache.set(SATISFACTION_TRENDS_VERSION_KEY, version, timeout=None)
+        return version
+
+
+def add_months(month, count):
+    """Shift the first day of a month by a number of calendar months."""
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def calculate_satisfaction_trends(center=None, months=6, start_month=None, end_month=None, by_center=False):
     """
-    Calculate satisfaction trends over time.
+    Calculate satisfaction trends per calendar month.
     T183: Satisfaction trends service
     
+    Completed responses are grouped by TruncMonth (and by center when
+    by_center is set) in a single query. Results are cached until the next
+    response is completed.
+    
     Args:
         center: Center object (optional)
-        months: Number of months to analyze (default: 6)
+        months: Number of months up to and including the current month,
+            used when start_month is not given (default: 6)
+        start_month: First month of the range (any date in the month)
+        end_month: Last month of the range (defaults to the current month)
+        by_center: Also return a series per center
     
     Returns:
-        dict: Trend data with monthly averages
+        dict: Trend data with monthly averages; with by_center, a 'centers'
+        list holding the same data for each center
     """
-    from apps.students.models import Student
+    end_month = (end_month or timezone.localdate()).replace(day=1)
+    start_month = start_month.replace(day=1) if start_month else add_months(end_month, -(months - 1))
     
-    # Calculate date range
-    end_date = timezone.now()
-    start_date = end_date - timedelta(days=months * 30)
+    key = SATISFACTION_TRENDS_KEY.format(
+        version=get_satisfaction_trends_version(),
+        center=center.pk if center else 'all',
+        start=start_month,
+        end=end_month,
+        by_center=int(by_center)
+    )
+    trends = cache.get(key)
+    if trends is None:
+        trends = _build_satisfaction_trends(center, start_month, end_month, by_center)
+        cache.set(key, trends, settings.DASHBOARD_CACHE_TTL)
+    return trends
+
+
+def _build_satisfaction_trends(center, start_month, end_month, by_center):
+    from django.db.models.functions import TruncMonth
+    
+    month_list = [start_month]
+    while month_list[-1] < end_month:
+        month_list.append(add_months(month_list[-1], 1))
     
-    # Get completed responses in date range
     responses = FeedbackResponse.objects.filter(
         is_completed=True,
         satisfaction_score__isnull=False,
-        submitted_at__gte=start_date,
-        submitted_at__lte=end_date,
+        submitted_at__gte=timezone.make_aware(datetime.combine(start_month, time.min)),
+        submitted_at__lt=timezone.make_aware(datetime.combine(add_months(end_month, 1), time.min)),
         deleted_at__isnull=True
-    ).select_related('student', 'survey')
+    )
     
     # Filter by center if provided
     if center:
         responses = responses.filter(student__center=center)
     
-    # Group by month and calculate averages
-    monthly_data = []
-    for i in range(months):
-        month_start = end_date - timedelta(days=(months - i) * 30)
-        month_end = end_date - timedelta(days=(months - i - 1) * 30)
-        
-        month_responses = responses.filter(
-            submitted_at__gte=month_start,
-            submitted_at__lt=month_end
-        )
-        
-        avg_score = month_responses.aggregate(
-            avg=Avg('satisfaction_score')
-        )['avg']
-        
-        monthly_data.append({
-            'month': month_start.strftime('%b %Y'),
-            'avg_satisfaction': round(avg_score, 2) if avg_score else None,
-            'response_count': month_responses.count()
-        })
+    group_by = ['month']
+    if by_center:
+        group_by += ['student__center_id', 'student__center__name']
     
-    return {
-        'monthly_trends': monthly_data,
-        'overall_avg': responses.aggregate(avg=Avg('satisfaction_score'))['avg'],
-        'total_responses': responses.count()
+    rows = responses.annotate(
+        month=TruncMonth('submitted_at')
+    ).values(*group_by).annotate(
+        response_count=Count('pk'),
+        score_total=Sum('satisfaction_score')
+    ).order_by()
+    
+    # (center_id or None, month) -> [count, total]
+    buckets = {}
+    center_names = {}
+    for row in rows:
+        month = row['month']
+        if isinstance(month, datetime):
+            month = timezone.localtime(month).date()
+        bucket_keys = [(None, month)]
+        if by_center:
+            center_names[row['student__center_id']] = row['student__center__name']
+            bucket_keys.append((row['student__center_id'], month))
+        for bucket_key in bucket_keys:
+            bucket = buckets.setdefault(bucket_key, [0, 0])
+            bucket[0] += row['response_count']
+            bucket[1] += row['score_total']
+    
+    def series(center_id):
+        monthly_data = []
+        count_total = score_total = 0
+        for month in month_list:
+            count, total = buckets.get((center_id, month), (0, 0))
+            count_total += count
+            score_total += total
+            monthly_data.append({
+                'month': month.strftime('%b %Y'),
+                'avg_satisfaction': round(total / count, 2) if count else None,
+                'response_count': count
+            })
+        return {
+            'monthly_trends': monthly_data,
+            'overall_avg': score_total / count_total if count_total else None,
+            'total_responses': count_total
+        }
+    
+    trends = series(None)
+    if by_center:
+        trends['centers'] = [
+            {'center_id': center_id, 'center_name': name, **series(center_id)}
+            for center_id, name in sorted(center_names.items(), key=lambda item: item[1])
+        ]
+    return trends
+
+
+def _satisfaction_breakdown(responses, group_field, name_fields, **assignment_filters):
+    """
+    Average satisfaction per faculty or subject in one query.
+    
+    Completed responses are joined to the student's assignments and
+    reduced to DISTINCT (group, response) rows: a response counts once for
+    every faculty (or subject) the student is assigned to, and only once
+    even if the student holds several assignments with the same one.
+    
+    Args:
+        responses: FeedbackResponse queryset to break down
+        group_field: Assignment field to group by ('faculty' or 'subject')
+        name_fields: Fields of the grouped model used for its display name
+        **assignment_filters: Extra Assignment lookups; they are applied in
+            the same filter() as the join so they restrict the same rows
+    
+    Returns:
+        list: Dicts with the group id, name parts, response count and
+        average satisfaction, best average first
+    """
+    prefix = f'student__assignments__{group_field}'
+    lookups = {
+        f'student__assignments__{lookup}': value
+        for lookup, value in assignment_filters.items()
     }
+    rows = responses.filter(
+        is_completed=True,
+        satisfaction_score__isnull=False,
+        deleted_at__isnull=True,
+        student__assignments__is_deleted=False,
+        **lookups
+    ).values_list(
+        f'{prefix}_id', *[f'{prefix}__{field}' for field in name_fields], 'pk', 'satisfaction_score'
+    ).distinct().order_by()
+    
+    groups = {}
+    for group_id, *names, _response_id, score in rows:
+        group = groups.setdefault(group_id, {'names': names, 'count': 0, 'total': 0})
+        group['count'] += 1
+        group['total'] += score
+    
+    breakdown = [
+        {
+            'id': group_id,
+            'names': group['names'],
+            'response_count': group['count'],
+            'avg_satisfaction': round(group['total'] / group['count'], 2),
+        }
+        for group_id, group in groups.items()
+    ]
+    
+    # Sort by average satisfaction (descending)
+    breakdown.sort(key=lambda x: x['avg_satisfaction'], reverse=True)
+    return breakdown
 
 
-def get_faculty_satisfaction_breakdown(center):
+def get_faculty_satisfaction_breakdown(center, survey=None):
     """
     Get satisfaction breakdown by faculty.
     
     Args:
         center: Center object
+        survey: Only count responses to this survey (optional)
     
     Returns:
         list: Faculty satisfaction data
     """
-    from apps.faculty.models import Faculty
+    from apps.centers.cache import get_cached_section
     
-    faculty_list = Faculty.objects.filter(
-        center=center,
-        deleted_at__isnull=True
-    ).select_related('user')
-    
-    breakdown = []
-    for faculty in faculty_list:
-        # Get students taught by this faculty
-        student_ids = faculty.assignments.values_list('student_id', flat=True)
-        
-        # Get completed responses for these students
-        responses = FeedbackResponse.objects.filter(
-            student_id__in=student_ids,
-            is_completed=True,
-            satisfaction_score__isnull=False,
-            deleted_at__isnull=True
-        )
-        
-        if responses.exists():
-            avg_satisfaction = responses.aggregate(
-                avg=Avg('satisfaction_score')
-            )['avg']
-            
-            breakdown.append({
-                'faculty_id': faculty.id,
-                'faculty_name': faculty.user.get_full_name(),
-                'response_count': responses.count(),
-                'avg_satisfaction': round(avg_satisfaction, 2)
-            })
+    def build():
+        responses = FeedbackResponse.objects.all()
+        if survey:
+            responses = responses.filter(survey=survey)
+        return [
+            {
+                'faculty_id': item['id'],
+                'faculty_name': ' '.join(filter(None, item['names'])),
+                'response_count': item['response_count'],
+                'avg_satisfaction': item['avg_satisfaction'],
+            }
+            for item in _satisfaction_breakdown(
+                responses, 'faculty', ['user__first_name', 'user__last_name'],
+                faculty__center=center,
+                faculty__is_deleted=False
+            )
+        ]
     
-    # Sort by average satisfaction (descending)
-    breakdown.sort(key=lambda x: x['avg_satisfaction'], reverse=True)
-    
-    return breakdown
+    section = f'satisfaction_breakdown:faculty:{survey.pk if survey else "all"}'
+    return get_cached_section(center.pk, section, build)
 
 
 def get_subject_satisfaction_breakdown(center):
@@ -126,46 +264,21 @@ def get_subject_satisfaction_breakdown(center):
     Returns:
         list: Subject satisfaction data
     """
-    from apps.subjects.models import Subject
-    from apps.students.models import Assignment
-    
-    subjects = Subject.objects.filter(
-        center=center,
-        deleted_at__isnull=True
-    )
-    
-    breakdown = []
-    for subject in subjects:
-        # Get students assigned to this subject
-        student_ids = Assignment.objects.filter(
-            subject=subject,
-            deleted_at__isnull=True
-        ).values_list('student_id', flat=True)
-        
-        # Get completed responses for these students
-        responses = FeedbackResponse.objects.filter(
-            student_id__in=student_ids,
-            is_completed=True,
-            satisfaction_score__isnull=False,
-            deleted_at__isnull=True
-        )
-        
-        if responses.exists():
-            avg_satisfaction = responses.aggregate(
-                avg=Avg('satisfaction_score')
-            )['avg']
-            
-            breakdown.append({
-                'subject_id': subject.id,
-                'subject_name': subject.name,
-                'response_count': responses.count(),
-                'avg_satisfaction': round(avg_satisfaction, 2)
-            })
+    from apps.centers.cache import get_cached_section
     
-    # Sort by average satisfaction (descending)
-    breakdown.sort(key=lambda x: x['avg_satisfaction'], reverse=True)
+    def build():
+        responses = FeedbackResponse.objects.filter(student__center=center)
+        return [
+            {
+                'subject_id': item['id'],
+                'subject_name': item['names'][0],
+                'response_count': item['response_count'],
+                'avg_satisfaction': item['avg_satisfaction'],
+            }
+            for item in _satisfaction_breakdown(responses, 'subject', ['name'])
+        ]
     
-    return breakdown
+    return get_cached_section(center.pk, 'satisfaction_breakdown:subject', build)
 
 
 def get_survey_completion_stats(survey):
@@ -226,3 +339,396 @@ def prepare_satisfaction_chart_data(center, months=6):
         ])
     
     return chart_data
+
+
+def _rating_counts(filter_q=None):
+    """Conditional counts of overall scores per rating bucket (N.00 - N.99)."""
+    counts = {}
+    for rating in range(1, 6):
+        bucket = Q(overall_score__gte=rating, overall_score__lt=rating + 1)
+        if filter_q is not None:
+            bucket &= filter_q
+        counts[f'rating_{rating}'] = Count('pk', filter=bucket)
+    return counts
+
+
+def analyze_faculty_feedback(faculty, today=None):
+    """
+    Compute a faculty member's feedback analytics in one query.
+    
+    Rubric averages, 30/60-day windows, the trend against the previous
+    30 days and the rating histogram are all conditional aggregates over
+    the faculty's feedback rows.
+    
+    Args:
+        faculty: Faculty instance
+        today: Reference date (defaults to today)
+    
+    Returns:
+        dict: Counts, averages, trend and rating distribution
+    """
+    today = today or timezone.localdate()
+    thirty_days_ago = timezone.make_aware(datetime.combine(today - timedelta(days=30), time.min))
+    sixty_days_ago = timezone.make_aware(datetime.combine(today - timedelta(days=60), time.min))
+    
+    done = Q(is_completed=True)
+    last_30 = done & Q(submitted_at__gte=thirty_days_ago)
+    last_60 = done & Q(submitted_at__gte=sixty_days_ago)
+    previous_30 = done & Q(submitted_at__gte=sixty_days_ago, submitted_at__lt=thirty_days_ago)
+    
+    aggregates = {
+        'total': Count('pk'),
+        'completed': Count('pk', filter=done),
+        'unique_students': Count('student', filter=done, distinct=True),
+        'avg_overall': Avg('overall_score', filter=done),
+        'count_30_days': Count('pk', filter=last_30),
+        'count_60_days': Count('pk', filter=last_60),
+        'count_previous_30_days': Count('pk', filter=previous_30),
+        'avg_30_days': Avg('overall_score', filter=last_30),
+        'avg_60_days': Avg('overall_score', filter=last_60),
+        'avg_previous_30_days': Avg('overall_score', filter=previous_30),
+        **_rating_counts(done),
+    }
+    for field, _label in FACULTY_FEEDBACK_QUESTIONS:
+        aggregates[f'avg_{field}'] = Avg(field, filter=done)
+    
+    stats = FacultyFeedback.objects.filter(
+        faculty=faculty,
+        deleted_at__isnull=True
+    ).aggregate(**aggregates)
+    
+    scores = {
+        field: round(stats[f'avg_{field}'] or 0, 2)
+        for field, _label in FACULTY_FEEDBACK_QUESTIONS
+    }
+    scores['overall'] = round(stats['avg_overall'] or 0, 2)
+    
+    # Trend: last 30 days against the previous 30 days
+    recent_avg = stats['avg_30_days']
+    previous_avg = stats['avg_previous_30_days']
+    if stats['count_30_days'] and stats['count_previous_30_days']:
+        if previous_avg > 0:
+            trend_change = round(float((recent_avg - previous_avg) / previous_avg * 100), 1)
+            if trend_change > 5:
+                trend = 'improving'
+            elif trend_change < -5:
+                trend = 'declining'
+            else:
+                trend = 'stable'
+        else:
+            trend, trend_change = 'stable', 0
+    else:
+        trend, trend_change = 'insufficient_data', 0
+    
+    completed = stats['completed']
+    rating_distribution = {rating: stats[f'rating_{rating}'] for rating in range(1, 6)}
+    
+    return {
+        'total': stats['total'],
+        'completed': completed,
+        'pending': stats['total'] - completed,
+        'unique_students': stats['unique_students'],
+        'scores': scores,
+        'count_30_days': stats['count_30_days'],
+        'count_60_days': stats['count_60_days'],
+        'avg_30_days': round(stats['avg_30_days'], 2) if stats['avg_30_days'] is not None else None,
+        'avg_60_days': round(stats['avg_60_days'], 2) if stats['avg_60_days'] is not None else None,
+        'trend': trend,
+        'trend_change': trend_change,
+        'rating_distribution': rating_distribution,
+        'rating_percentages': {
+            rating: round((count / completed * 100) if completed > 0 else 0, 1)
+            for rating, count in rating_distribution.items()
+        },
+    }
+
+
+def _month_bounds(month):
+    """Aware datetimes for the start of a month and of the following month."""
+    next_month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return (
+        timezone.make_aware(datetime.combine(month, time.min)),
+        timezone.make_aware(datetime.combine(next_month, time.min)),
+    )
+
+
+def _rollup_aggregates():
+    aggregates = {
+        'feedback_count': Count('pk'),
+        'overall_total': Sum('overall_score'),
+        'avg_overall_score': Avg('overall_score'),
+        **_rating_counts(),
+    }
+    for field, _label in FACULTY_FEEDBACK_QUESTIONS:
+        aggregates[f'{field}_total'] = Sum(field)
+    return aggregates
+
+
+def _save_rollup(faculty_id, center_id, month, stats):
+    defaults = {key: value or 0 for key, value in stats.items()}
+    defaults['center_id'] = center_id
+    defaults['avg_overall_score'] = (
+        round(stats['avg_overall_score'], 2) if stats['avg_overall_score'] is not None else None
+    )
+    FacultyFeedbackRollup.objects.update_or_create(
+        faculty_id=faculty_id,
+        month=month,
+        defaults=defaults
+    )
+
+
+def refresh_faculty_feedback_rollup(faculty_id, submitted_at):
+    """
+    Rebuild the monthly rollup containing a feedback submission.
+    
+    The month is recomputed from the feedback rows (one indexed aggregate),
+    so repeated or concurrent refreshes always converge on the same row.
+    
+    Args:
+        faculty_id: Faculty primary key
+        submitted_at: Submission time of the completed feedback
+    """
+    from apps.faculty.models import Faculty
+    
+    month = timezone.localtime(submitted_at).date().replace(day=1)
+    start, end = _month_bounds(month)
+    
+    stats = FacultyFeedback.objects.filter(
+        faculty_id=faculty_id,
+        is_completed=True,
+        overall_score__isnull=False,
+        submitted_at__gte=start,
+        submitted_at__lt=end,
+        deleted_at__isnull=True
+    ).aggregate(**_rollup_aggregates())
+    
+    center_id = Faculty.objects.filter(pk=faculty_id).values_list('center_id', flat=True).first()
+    _save_rollup(faculty_id, center_id, month, stats)
+
+
+def rebuild_faculty_feedback_rollups(center=None):
+    """
+    Rebuild all monthly rollups from the feedback rows.
+    
+    Args:
+        center: Center object (optional, defaults to all centers)
+    
+    Returns:
+        int: Number of rollup rows written
+    """
+    from django.db import transaction
+    from django.db.models.functions import TruncMonth
+    
+    feedbacks = FacultyFeedback.objects.filter(
+        is_completed=True,
+        overall_score__isnull=False,
+        submitted_at__isnull=False,
+        deleted_at__isnull=True
+    )
+    rollups = FacultyFeedbackRollup.objects.all()
+    if center:
+        feedbacks = feedbacks.filter(faculty__center=center)
+        rollups = rollups.filter(faculty__center=center)
+    
+    groups = feedbacks.annotate(
+        month=TruncMonth('submitted_at')
+    ).values('faculty_id', 'faculty__center_id', 'month').annotate(**_rollup_aggregates()).order_by()
+    
+    written = 0
+    with transaction.atomic():
+        rollups.delete()
+        for group in groups:
+            faculty_id = group.pop('faculty_id')
+            center_id = group.pop('faculty__center_id')
+            month = group.pop('month')
+            if isinstance(month, datetime):
+                month = timezone.localtime(month).date()
+            _save_rollup(faculty_id, center_id, month, group)
+            written += 1
+    return written
+
+
+def get_faculty_monthly_feedback(faculty, months=6, today=None):
+    """
+    Monthly feedback count and average for a faculty member from the rollups.
+    
+    Args:
+        faculty: Faculty instance
+        months: Number of calendar months including the current one
+        today: Reference date (defaults to today)
+    
+    Returns:
+        list: Dicts with month label, count and average score, oldest first
+    """
+    today = today or timezone.localdate()
+    first_month = today.replace(day=1)
+    for _ in range(months - 1):
+        first_month = (first_month - timedelta(days=1)).replace(day=1)
+    
+    rollups = FacultyFeedbackRollup.objects.filter(
+        faculty=faculty,
+        month__gte=first_month,
+        feedback_count__gt=0
+    ).order_by('month')
+    
+    return [
+        {
+            'month': rollup.month.strftime('%b %Y'),
+            'count': rollup.feedback_count,
+            'avg_score': rollup.avg_overall_score,
+        }
+        for rollup in rollups
+    ]
+
+
+def get_faculty_feedback_leaderboard(center=None, month=None, limit=10):
+    """
+    Rank faculty by their average feedback score for a month.
+    
+    Reads the monthly rollups through the (center, month, score) index.
+    
+    Args:
+        center: Center object (optional, defaults to all centers)
+        month: Any date in the month (defaults to the current month)
+        limit: Maximum number of faculty to return
+    
+    Returns:
+        list: FacultyFeedbackRollup rows, best average first
+    """
+    month = (month or timezone.localdate()).replace(day=1)
+    
+    rollups = FacultyFeedbackRollup.objects.filter(
+        month=month,
+        feedback_count__gt=0
+    ).select_related('faculty__user', 'center')
+    if center:
+        rollups = rollups.filter(center=center)
+    
+    return list(rollups.order_by('-avg_overall_score', '-feedback_count')[:limit])
+
+
+def create_faculty_feedback_requests(faculty, center, student_ids, user):
+    """
+    Create feedback requests for many students at once.
+    
+    The students are validated with one IN query and the requests are
+    inserted, signed tokens included (see links.py), with one bulk_create.
+    A student who still has a pending request for the faculty whose link
+    has not expired keeps that request instead of getting a second one.
+    
+    Args:
+        faculty: Faculty the feedback is about
+        center: Center of the faculty and students
+        student_ids: Iterable of student ids (ints or numeric strings)
+        user: User creating the requests
+    
+    Returns:
+        tuple: (requests of all the students in the given order, the
+        newly created ones), FacultyFeedback rows with faculty and
+        student attached
+    
+    Raises:
+        Student.DoesNotExist: If any id is not a student of the center
+    """
+    from django.db import transaction
+    from apps.centers.cache import bump_center_data_version
+    from apps.core.outbox import record_events
+    from apps.students.models import Student
+    from .links import faculty_feedback_link_token
+    
+    try:
+        ids = list(dict.fromkeys(int(student_id) for student_id in student_ids))
+    except (TypeError, ValueError):
+        raise Student.DoesNotExist('Invalid student id.')
+    
+    students = Student.objects.filter(
+        pk__in=ids,
+        center=center,
+        deleted_at__isnull=True
+    ).in_bulk()
+    if len(students) != len(ids):
+        raise Student.DoesNotExist('One or more students do not belong to this center.')
+    
+    max_age = getattr(settings, 'FEEDBACK_LINK_MAX_AGE_DAYS', 30)
+    pending = {
+        feedback.student_id: feedback
+        for feedback in FacultyFeedback.objects.filter(
+            faculty=faculty,
+            student_id__in=ids,
+            is_completed=False,
+            deleted_at__isnull=True,
+            created_at__gte=timezone.now() - timedelta(days=max_age)
+        ).order_by('created_at')
+    }
+    
+    created = [
+        FacultyFeedback(
+            faculty=faculty,
+            student=students[student_id],
+            center=center,
+            created_by=user,
+            modified_by=user
+        )
+        for student_id in ids
+        if student_id not in pending
+    ]
+    for feedback in created:
+        feedback.token = faculty_feedback_link_token(feedback)
+    
+    if created:
+        with transaction.atomic():
+            FacultyFeedback.objects.bulk_create(created)
+            # bulk_create skips the post_save signals that normally do this
+            record_events(created, 'created')
+            transaction.on_commit(lambda: bump_center_data_version(center.pk))
+    
+    new = {feedback.student_id: feedback for feedback in created}
+    feedbacks = []
+    for student_id in ids:
+        feedback = pending.get(student_id) or new[student_id]
+        feedback.faculty = faculty
+        feedback.student = students[student_id]
+        feedbacks.append(feedback)
+    return feedbacks, created
+
+
+def get_feedback_link_rows(feedbacks, base_url):
+    """
+    Feedback URL and WhatsApp deep link of each feedback request.
+    
+    Args:
+        feedbacks: FacultyFeedback rows with student and faculty__user loaded
+        base_url: Site URL without a trailing slash
+    
+    Returns:
+        list: Dicts with the feedback, student and faculty details and links
+    """
+    return [
+        {
+            'feedback': feedback,
+            'student_name': feedback.student.get_full_name(),
+            'enrollment_number': feedback.student.enrollment_number,
+            'phone': feedback.student.phone,
+            'faculty_name': feedback.faculty.user.get_full_name(),
+            'feedback_url': feedback.get_feedback_url(base_url),
+            'whatsapp_link': feedback.get_whatsapp_link(base_url=base_url),
+        }
+        for feedback in feedbacks
+    ]
+
+
+def mark_whatsapp_sent(feedbacks):
+    """
+    Record the WhatsApp send time of feedback requests (one UPDATE).
+    
+    Args:
+        feedbacks: FacultyFeedback rows
+    """
+    now = timezone.now()
+    pending = [feedback for feedback in feedbacks if not feedback.whatsapp_sent_at]
+    FacultyFeedback.objects.filter(
+        pk__in=[feedback.pk for feedback in pending],
+        whatsapp_sent_at__isnull=True
+    ).update(whatsapp_sent_at=now)
+    for feedback in pending:
+        feedback.whatsapp_sent_at = now
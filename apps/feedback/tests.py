@@ -1,3 +1,534 @@
+import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.centers.models import Center, CenterHead
+from apps.core.outbox import DISPATCH_PENDING_KEY, dispatch_events
+from apps.faculty.models import Faculty
+from apps.students.models import Student
+from apps.subjects.models import Assignment, Subject
+
+from .links import (
+    FACULTY_FEEDBACK_LINK, SURVEY_LINK, InvalidLink, get_link_state, is_link_expired, lookup_kwargs,
+    parse_link_token, resolve_link,
+)
+from .models import FacultyFeedback, FacultyFeedbackRollup, FeedbackResponse, FeedbackSurvey, SurveyAnswer
+from .question_analytics import get_question_distribution, get_question_summary, rebuild_survey_answers
+from .services import (
+    FACULTY_FEEDBACK_QUESTIONS, analyze_faculty_feedback, calculate_satisfaction_trends,
+    create_faculty_feedback_requests, get_faculty_satisfaction_breakdown,
+    get_subject_satisfaction_breakdown, rebuild_faculty_feedback_rollups,
+)
+
+
+class SurveyLinkExpiryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        audit = {'created_by': cls.user, 'modified_by': cls.user}
+        cls.center = Center.objects.create(
+            name='North', code='N1', address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email='north@example.com', **audit
+        )
+        cls.student = Student.objects.create(
+            center=cls.center, first_name='Asha', last_name='Rao', phone='111',
+            enrollment_number='E1', enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Ravi Rao', guardian_phone='222', **audit
+        )
+
+    def setUp(self):
+        cache.clear()
+        today = timezone.localdate()
+        self.survey = FeedbackSurvey.objects.create(
+            title='Term survey', questions=[], center=self.center, is_published=True,
+            valid_from=today - datetime.timedelta(days=30), valid_until=today - datetime.timedelta(days=1),
+            created_by=self.user, modified_by=self.user
+        )
+        self.response = FeedbackResponse.objects.create(
+            survey=self.survey, student=self.student, created_by=self.user, modified_by=self.user
+        )
+        self.url = reverse('feedback:submit', kwargs={'token': self.response.token})
+
+    def test_token_does_not_freeze_the_survey_end_date(self):
+        link = parse_link_token(self.response.token, SURVEY_LINK)
+        self.assertIsNone(link.expires)
+        self.assertFalse(is_link_expired(link))
+
+    def test_closed_survey_link_shows_expired(self):
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, 'feedback/survey_expired.html')
+
+    def test_extending_the_survey_revives_sent_links(self):
+        self.survey.valid_until = timezone.localdate() + datetime.timedelta(days=7)
+        self.survey.save()
+
+        response = self.client.get(self.url)
+        self.assertTemplateNotUsed(response, 'feedback/survey_expired.html')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(FeedbackResponse.objects.get(**lookup_kwargs(self.response.token, SURVEY_LINK)), self.response)
+
+    def test_tampered_token_is_rejected(self):
+        with self.assertRaises(InvalidLink):
+            parse_link_token(self.response.token[:-1] + 'x', SURVEY_LINK)
+
+
+class FacultyFeedbackTestData(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'head@example.com', 'pass', first_name='Head', last_name='User', role=User.CENTER_HEAD
+        )
+        cls.audit = {'created_by': cls.user, 'modified_by': cls.user}
+        cls.center = Center.objects.create(
+            name='North', code='N1', address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email='north@example.com', **cls.audit
+        )
+        cls.student = Student.objects.create(
+            center=cls.center, first_name='Asha', last_name='Rao', phone='111',
+            enrollment_number='E1', enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Ravi Rao', guardian_phone='222', **cls.audit
+        )
+        faculty_user = User.objects.create_user(
+            'f1@example.com', 'pass', first_name='Mira', last_name='Iyer', role=User.FACULTY
+        )
+        cls.faculty = Faculty.objects.create(
+            user=faculty_user, center=cls.center, employee_id='EMP1',
+            joining_date=datetime.date(2024, 1, 1), **cls.audit
+        )
+        CenterHead.objects.create(
+            user=cls.user, center=cls.center, employee_id='H1',
+            joining_date=datetime.date(2024, 1, 1), **cls.audit
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def create_feedback(self, student=None):
+        return FacultyFeedback.objects.create(
+            faculty=self.faculty, student=student or self.student, center=self.center, **self.audit
+        )
+
+    def open_link(self, token):
+        link = resolve_link(token, FACULTY_FEEDBACK_LINK)
+        return link and get_link_state(FACULTY_FEEDBACK_LINK, link.object_id, token)['exists']
+
+
+class FacultyFeedbackLinkTests(FacultyFeedbackTestData):
+
+    def test_token_is_written_with_the_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            feedback = self.create_feedback()
+
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "faculty_feedbacks"')])
+        self.assertEqual(FacultyFeedback.objects.get(pk=feedback.pk).token, feedback.token)
+        self.assertEqual(parse_link_token(feedback.token, FACULTY_FEEDBACK_LINK).parent_id, self.faculty.pk)
+
+    def test_open_link_reaches_the_database_once(self):
+        feedback = self.create_feedback()
+
+        self.assertTrue(self.open_link(feedback.token))
+        with self.assertNumQueries(0):
+            self.assertTrue(self.open_link(feedback.token))
+
+    def test_new_token_revokes_the_old_link(self):
+        feedback = self.create_feedback()
+        old_token = feedback.token
+        self.assertTrue(self.open_link(old_token))
+
+        feedback.token = ''
+        feedback.save()
+
+        self.assertFalse(self.open_link(old_token))
+        self.assertTrue(self.open_link(feedback.token))
+        url = reverse('feedback:submit_faculty_feedback', kwargs={'token': feedback.token})
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_unsigned_tokens_are_looked_up_by_value(self):
+        feedback = self.create_feedback()
+        FacultyFeedback.objects.filter(pk=feedback.pk).update(token='legacy-token')
+
+        self.assertTrue(self.open_link('legacy-token'))
+
+
+class FacultyFeedbackRequestTests(FacultyFeedbackTestData):
+
+    def setUp(self):
+        super().setUp()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        self.vik = Student.objects.create(
+            center=self.center, first_name='Vik', last_name='Rao', phone='333',
+            enrollment_number='E2', enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Ravi Rao', guardian_phone='222', **self.audit
+        )
+
+    def test_requests_are_inserted_at_once_with_signed_tokens(self):
+        with CaptureQueriesContext(connection) as queries:
+            feedbacks, created = create_faculty_feedback_requests(
+                self.faculty, self.center, [str(self.student.pk), str(self.vik.pk)], self.user
+            )
+
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "faculty_feedbacks"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "faculty_feedbacks"')])
+        self.assertEqual(feedbacks, created)
+        self.assertEqual([feedback.student for feedback in feedbacks], [self.student, self.vik])
+        for feedback in FacultyFeedback.objects.all():
+            self.assertEqual(parse_link_token(feedback.token, FACULTY_FEEDBACK_LINK).parent_id, self.faculty.pk)
+            self.assertTrue(self.open_link(feedback.token))
+
+    def test_pending_requests_are_reused(self):
+        pending = self.create_feedback()
+        completed = self.create_feedback(self.vik)
+        completed.mark_completed()
+
+        feedbacks, created = create_faculty_feedback_requests(
+            self.faculty, self.center, [self.student.pk, self.vik.pk], self.user
+        )
+
+        self.assertEqual(feedbacks[0], pending)
+        self.assertEqual([feedback.student for feedback in created], [self.vik])
+        self.assertEqual(FacultyFeedback.objects.count(), 3)
+
+    def test_students_of_other_centers_are_rejected(self):
+        with self.assertRaises(Student.DoesNotExist):
+            create_faculty_feedback_requests(self.faculty, self.center, [self.student.pk, 0], self.user)
+        self.assertFalse(FacultyFeedback.objects.exists())
+
+    def test_links_are_marked_sent_only_on_post(self):
+        feedbacks, created = create_faculty_feedback_requests(
+            self.faculty, self.center, [self.student.pk, self.vik.pk], self.user
+        )
+        ids = ','.join(str(feedback.pk) for feedback in feedbacks)
+        self.client.force_login(self.user)
+
+        batch = self.client.get(reverse('feedback:request_batch'), {'ids': ids})
+        self.assertEqual(batch.status_code, 200)
+        self.assertEqual(batch.context['unsent_count'], 2)
+        self.assertEqual(self.client.get(reverse('feedback:export_links'), {'ids': ids}).status_code, 200)
+        self.assertFalse(FacultyFeedback.objects.filter(whatsapp_sent_at__isnull=False).exists())
+
+        response = self.client.post(reverse('feedback:mark_links_sent'), {'ids': ids})
+        self.assertRedirects(response, f"{reverse('feedback:request_batch')}?ids={ids}")
+        self.assertFalse(FacultyFeedback.objects.filter(whatsapp_sent_at__isnull=True).exists())
+
+
+class FacultyFeedbackAnalyticsTests(FacultyFeedbackTestData):
+
+    TODAY = datetime.date(2024, 5, 20)
+
+    def setUp(self):
+        super().setUp()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        self.feedbacks = [
+            self.submit(datetime.datetime(*when), scores)
+            for when, scores in (
+                ((2024, 3, 25, 10), (2, 3, 2, 3, 2)),
+                ((2024, 4, 10, 10), (4, 4, 3, 4, 5)),
+                ((2024, 4, 30, 23, 30), (5, 5, 5, 4, 5)),
+                ((2024, 5, 1, 0, 15), (1, 2, 1, 1, 2)),
+                ((2024, 5, 15, 10), (3, 4, 4, 3, 3)),
+            )
+        ]
+        # A pending request counts for nothing but the totals
+        self.create_feedback()
+        dispatch_events()
+
+    def submit(self, submitted_at, scores):
+        feedback = self.create_feedback()
+        for (field, _label), score in zip(FACULTY_FEEDBACK_QUESTIONS, scores):
+            setattr(feedback, field, score)
+        feedback.is_completed = True
+        feedback.submitted_at = timezone.make_aware(submitted_at)
+        feedback.save()
+        return FacultyFeedback.objects.get(pk=feedback.pk)
+
+    def rollups(self):
+        return list(FacultyFeedbackRollup.objects.order_by('month').values())
+
+    def test_rollups_match_the_feedback_rows(self):
+        months = {}
+        for feedback in self.feedbacks:
+            month = timezone.localtime(feedback.submitted_at).date().replace(day=1)
+            months.setdefault(month, []).append(feedback)
+
+        rollups = {rollup['month']: rollup for rollup in self.rollups()}
+        self.assertEqual(sorted(rollups), sorted(months))
+        for month, feedbacks in months.items():
+            scores = [feedback.overall_score for feedback in feedbacks]
+            rollup = rollups[month]
+            self.assertEqual(rollup['feedback_count'], len(feedbacks))
+            self.assertEqual(rollup['overall_total'], sum(scores))
+            self.assertEqual(rollup['avg_overall_score'], round(sum(scores) / len(scores), 2))
+            for field, _label in FACULTY_FEEDBACK_QUESTIONS:
+                self.assertEqual(rollup[f'{field}_total'], sum(getattr(feedback, field) for feedback in feedbacks))
+            for rating in range(1, 6):
+                self.assertEqual(rollup[f'rating_{rating}'], sum(int(score) == rating for score in scores))
+
+        refreshed = self.rollups()
+        rebuild_faculty_feedback_rollups()
+        ignore = {'id', 'updated_at'}
+        self.assertEqual(
+            [{key: value for key, value in row.items() if key not in ignore} for row in self.rollups()],
+            [{key: value for key, value in row.items() if key not in ignore} for row in refreshed]
+        )
+
+    def test_analysis_matches_direct_averages(self):
+        analysis = analyze_faculty_feedback(self.faculty, today=self.TODAY)
+
+        def average(feedbacks, field='overall_score'):
+            return float(round(sum(Decimal(getattr(feedback, field)) for feedback in feedbacks) / len(feedbacks), 2))
+
+        self.assertEqual((analysis['total'], analysis['completed'], analysis['pending']), (6, 5, 1))
+        self.assertEqual(float(analysis['scores']['overall']), average(self.feedbacks))
+        for field, _label in FACULTY_FEEDBACK_QUESTIONS:
+            self.assertEqual(analysis['scores'][field], average(self.feedbacks, field))
+
+        # Windows start at local midnight: the last 30 days begin on 20 April
+        last_30 = self.feedbacks[2:]
+        self.assertEqual(analysis['count_30_days'], 3)
+        self.assertEqual(float(analysis['avg_30_days']), average(last_30))
+        self.assertEqual(analysis['count_60_days'], 5)
+        previous = average(self.feedbacks[:2])
+        self.assertEqual(analysis['trend_change'], round((average(last_30) - previous) / previous * 100, 1))
+        self.assertEqual(analysis['rating_distribution'], {1: 1, 2: 1, 3: 1, 4: 2, 5: 0})
+
+
+class SatisfactionTrendTests(FacultyFeedbackTestData):
+
+    def setUp(self):
+        super().setUp()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        self.south = Center.objects.create(
+            name='South', code='S1', address='2 Road', city='Pune', state='MH',
+            pincode='411002', phone='200', email='south@example.com', **self.audit
+        )
+        self.survey = FeedbackSurvey.objects.create(
+            title='Term survey', questions=[], is_published=True,
+            valid_from=datetime.date(2024, 1, 1), valid_until=datetime.date(2024, 12, 31), **self.audit
+        )
+        # Local times around midnight; the first two are both 31 January in UTC
+        self.responses = [
+            self.respond(self.center, 'E2', (2024, 1, 31, 23, 45), 2),
+            self.respond(self.center, 'E3', (2024, 2, 1, 0, 15), 4),
+            self.respond(self.south, 'E4', (2024, 2, 29, 23, 59), 5),
+            self.respond(self.south, 'E5', (2024, 3, 1, 0, 0), 3),
+            self.respond(self.center, 'E6', (2024, 3, 31, 23, 0), 1),
+        ]
+
+    def respond(self, center, enrollment_number, submitted_at, score):
+        student = Student.objects.create(
+            center=center, first_name=enrollment_number, last_name='Rao', phone='111',
+            enrollment_number=enrollment_number, enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Ravi Rao', guardian_phone='222', **self.audit
+        )
+        return FeedbackResponse.objects.create(
+            survey=self.survey, student=student, satisfaction_score=score, is_completed=True,
+            submitted_at=timezone.make_aware(datetime.datetime(*submitted_at)), **self.audit
+        )
+
+    def expected_series(self, center=None):
+        """Monthly averages bucketed by local calendar month, response by response."""
+        buckets = {}
+        for response in self.responses:
+            if center and response.student.center_id != center.pk:
+                continue
+            month = timezone.localtime(response.submitted_at).strftime('%b %Y')
+            buckets.setdefault(month, []).append(response.satisfaction_score)
+        return [
+            {
+                'month': month,
+                'avg_satisfaction': round(sum(buckets[month]) / len(buckets[month]), 2) if month in buckets else None,
+                'response_count': len(buckets.get(month, [])),
+            }
+            for month in ('Jan 2024', 'Feb 2024', 'Mar 2024', 'Apr 2024')
+        ]
+
+    def test_months_follow_local_midnight(self):
+        trends = calculate_satisfaction_trends(
+            start_month=datetime.date(2024, 1, 1), end_month=datetime.date(2024, 4, 1), by_center=True
+        )
+
+        self.assertEqual(trends['monthly_trends'], self.expected_series())
+        self.assertEqual(trends['total_responses'], 5)
+        self.assertEqual(trends['overall_avg'], 3)
+        self.assertEqual(
+            [(series['center_name'], series['monthly_trends']) for series in trends['centers']],
+            [('North', self.expected_series(self.center)), ('South', self.expected_series(self.south))]
+        )
+
+    def test_center_trends_match_the_center_series(self):
+        trends = calculate_satisfaction_trends(
+            self.south, start_month=datetime.date(2024, 1, 1), end_month=datetime.date(2024, 4, 1)
+        )
+        self.assertEqual(trends['monthly_trends'], self.expected_series(self.south))
+        self.assertEqual(trends['overall_avg'], 4)
+
+
+class SatisfactionBreakdownTests(FacultyFeedbackTestData):
+
+    def setUp(self):
+        super().setUp()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        ravi = User.objects.create_user(
+            'f2@example.com', 'pass', first_name='Ravi', last_name='Nair', role=User.FACULTY
+        )
+        self.other_faculty = Faculty.objects.create(
+            user=ravi, center=self.center, employee_id='EMP2',
+            joining_date=datetime.date(2024, 1, 1), **self.audit
+        )
+        self.maths = Subject.objects.create(name='Maths', code='MATH', **self.audit)
+        self.physics = Subject.objects.create(name='Physics', code='PHY', **self.audit)
+        self.survey = FeedbackSurvey.objects.create(
+            title='Term survey', questions=[], center=self.center, is_published=True,
+            valid_from=datetime.date(2024, 1, 1), valid_until=datetime.date(2024, 12, 31), **self.audit
+        )
+        # Both subjects with the same faculty: counted once for the faculty
+        self.respond('E2', 5, (self.faculty, self.maths), (self.faculty, self.physics))
+        self.respond('E3', 2, (self.other_faculty, self.maths))
+        self.respond('E4', 3, (self.faculty, self.maths))
+        # Only a deleted assignment
+        removed = self.respond('E5', 1, (self.other_faculty, self.physics))
+        Assignment.objects.filter(student=removed).update(is_deleted=True, deleted_at=timezone.now())
+        # Not completed
+        self.respond('E6', 1, (self.faculty, self.physics), completed=False)
+
+    def respond(self, enrollment_number, score, *assignments, completed=True):
+        student = Student.objects.create(
+            center=self.center, first_name=enrollment_number, last_name='Rao', phone='111',
+            enrollment_number=enrollment_number, enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Ravi Rao', guardian_phone='222', **self.audit
+        )
+        for faculty, subject in assignments:
+            Assignment.objects.create(
+                student=student, subject=subject, faculty=faculty,
+                start_date=datetime.date(2024, 1, 1), **self.audit
+            )
+        FeedbackResponse.objects.create(
+            survey=self.survey, student=student, satisfaction_score=score, is_completed=completed,
+            submitted_at=timezone.now() if completed else None, **self.audit
+        )
+        return student
+
+    def per_item(self, items, field):
+        """The breakdown as it was computed before, one query set per faculty or subject."""
+        breakdown = []
+        for item in items:
+            student_ids = Assignment.objects.filter(**{field: item}).values_list('student_id', flat=True)
+            scores = list(FeedbackResponse.objects.filter(
+                student_id__in=student_ids, is_completed=True, satisfaction_score__isnull=False
+            ).values_list('satisfaction_score', flat=True))
+            if scores:
+                breakdown.append((item.pk, len(scores), round(sum(scores) / len(scores), 2)))
+        return sorted(breakdown, key=lambda row: row[2], reverse=True)
+
+    def test_faculty_breakdown_matches_per_faculty_results(self):
+        breakdown = get_faculty_satisfaction_breakdown(self.center)
+
+        self.assertEqual(
+            [(row['faculty_id'], row['response_count'], row['avg_satisfaction']) for row in breakdown],
+            self.per_item([self.faculty, self.other_faculty], 'faculty')
+        )
+        self.assertEqual([row['faculty_name'] for row in breakdown], ['Mira Iyer', 'Ravi Nair'])
+
+    def test_subject_breakdown_matches_per_subject_results(self):
+        breakdown = get_subject_satisfaction_breakdown(self.center)
+
+        self.assertEqual(
+            [(row['subject_id'], row['response_count'], row['avg_satisfaction']) for row in breakdown],
+            self.per_item([self.maths, self.physics], 'subject')
+        )
+        self.assertEqual([row['subject_name'] for row in breakdown], ['Physics', 'Maths'])
+
+
+class SurveyAnswerTests(FacultyFeedbackTestData):
+
+    QUESTIONS = [
+        {'id': 1, 'type': 'rating', 'text': 'How was the class?'},
+        {'id': 2, 'type': 'multiple_choice', 'text': 'What did you like?'},
+        {'id': 3, 'type': 'text', 'text': 'Anything else?'},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        today = timezone.localdate()
+        self.survey = FeedbackSurvey.objects.create(
+            title='Term survey', questions=self.QUESTIONS, center=self.center, is_published=True,
+            valid_from=today, valid_until=today, **self.audit
+        )
+        # Web form keys ('1') and API keys ('question_1') mixed
+        self.answers = [
+            {'1': 4, 'question_2': ['Pace', 'Examples'], '3': 'More practice'},
+            {'question_1': '5', '2': 'Examples', '3': ''},
+            {'1': 2},
+        ]
+        for number, answers in enumerate(self.answers):
+            student = Student.objects.create(
+                center=self.center, first_name=f'S{number}', last_name='Rao', phone='111',
+                enrollment_number=f'E{number + 2}', enrollment_date=datetime.date(2024, 1, 1),
+                guardian_name='Ravi Rao', guardian_phone='222', **self.audit
+            )
+            response = FeedbackResponse.objects.create(
+                survey=self.survey, student=student, answers=answers, **self.audit
+            )
+            response.mark_completed()
+        # Never completed: not flattened
+        FeedbackResponse.objects.create(
+            survey=self.survey, student=self.student, answers={'1': 1}, **self.audit
+        )
+        dispatch_events()
+
+    def scanned(self, question):
+        """Answers of a question read from every completed response's JSON."""
+        values = []
+        for answers in self.answers:
+            for key in (str(question), f'question_{question}'):
+                value = answers.get(key)
+                if value not in (None, ''):
+                    values.extend(value if isinstance(value, list) else [value])
+        return values
+
+    def test_summary_matches_the_response_json(self):
+        summary = {row['question_key']: row for row in get_question_summary(self.survey)}
+
+        ratings = [float(value) for value in self.scanned(1)]
+        self.assertEqual(summary['1']['answer_count'], len(ratings))
+        self.assertEqual(summary['1']['average'], round(sum(ratings) / len(ratings), 2))
+        self.assertEqual((summary['1']['minimum'], summary['1']['maximum']), (min(ratings), max(ratings)))
+        self.assertEqual(summary['2']['response_count'], 2)
+        self.assertEqual(summary['2']['answer_count'], len(self.scanned(2)))
+        self.assertEqual(summary['3']['answer_count'], len(self.scanned(3)))
+        self.assertIsNone(summary['3']['average'])
+
+    def test_distribution_matches_the_response_json(self):
+        distribution = get_question_distribution(self.survey, 'question_2')
+
+        choices = self.scanned(2)
+        self.assertEqual(
+            {row['value']: row['count'] for row in distribution},
+            {choice: choices.count(choice) for choice in choices}
+        )
+        self.assertEqual(distribution[0], {'value': 'Examples', 'count': 2, 'percentage': 66.7})
+
+    def test_rebuild_writes_the_same_rows(self):
+        fields = ('response_id', 'question_key', 'question_type', 'numeric_value', 'text_value', 'center_id')
+        projected = sorted(SurveyAnswer.objects.values_list(*fields))
 
-# Create your tests here.
+        self.assertEqual(rebuild_survey_answers(), len(projected))
+        self.assertEqual(sorted(SurveyAnswer.objects.values_list(*fields)), projected)
@@ -27,6 +27,9 @@ urlpatterns = [
     # Faculty Feedback Management
     path('faculty-feedback/', views.FacultyFeedbackListView.as_view(), name='faculty_list'),
     path('faculty-feedback/create/', views.CreateFeedbackRequestView.as_view(), name='create_request'),
+    path('faculty-feedback/batch/', views.FeedbackRequestBatchView.as_view(), name='request_batch'),
+    path('faculty-feedback/links.csv', views.ExportFeedbackLinksView.as_view(), name='export_links'),
+    path('faculty-feedback/mark-sent/', views.MarkFeedbackLinksSentView.as_view(), name='mark_links_sent'),
     path('faculty-feedback/<int:pk>/whatsapp/', views.SendFeedbackWhatsAppView.as_view(), name='send_whatsapp'),
     path('faculty-feedback/<int:pk>/delete/', views.DeleteFeedbackRequestView.as_view(), name='delete_request'),
     
@@ -5,20 +5,25 @@ Views for feedback and survey management.
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, FormView, TemplateView
 from django.views import View
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.contrib import messages
 from django.db.models import Q, Count, Avg
 from django.shortcuts import get_object_or_404, redirect, render
-from django.http import JsonResponse, HttpResponseForbidden
+from django.http import Http404, JsonResponse, HttpResponseForbidden
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
 from apps.core.mixins import CenterHeadRequiredMixin, SetCreatedByMixin, AuditLogMixin, MasterAccountRequiredMixin
+from apps.core.principal import get_principal
 from apps.students.models import Student
 from apps.faculty.models import Faculty
 from .models import FeedbackSurvey, FeedbackResponse, FacultyFeedback
 from .forms import SurveyForm, FacultyFeedbackForm
+from .links import (
+    FACULTY_FEEDBACK_LINK, SURVEY_LINK, InvalidLink, get_link_state, get_survey_definition,
+    is_link_expired, is_survey_definition_valid, lookup_kwargs, record_link_opened, resolve_link,
+)
 from .tasks import send_survey_email, send_bulk_survey_emails
 
 
@@ -30,7 +35,7 @@ class SurveyListView(LoginRequiredMixin, CenterHeadRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        center = self.request.user.center_head_profile.center
+        center = get_principal(self.request).center
         
         # Show global surveys and center-specific surveys
         queryset = FeedbackSurvey.objects.filter(
@@ -78,7 +83,7 @@ class SurveyCreateView(LoginRequiredMixin, CenterHeadRequiredMixin, SetCreatedBy
         form = super().get_form(form_class)
         # Set default center to user's center
         if not self.request.user.is_master_account:
-            form.fields['center'].initial = self.request.user.center_head_profile.center
+            form.fields['center'].initial = get_principal(self.request).center
         return form
     
     def form_valid(self, form):
@@ -93,7 +98,7 @@ class SurveyDetailView(LoginRequiredMixin, CenterHeadRequiredMixin, DetailView):
     context_object_name = 'survey'
     
     def get_queryset(self):
-        center = self.request.user.center_head_profile.center
+        center = get_principal(self.request).center
         return FeedbackSurvey.objects.filter(
             Q(center__isnull=True) | Q(center=center),
             deleted_at__isnull=True
@@ -131,7 +136,7 @@ class SurveyUpdateView(LoginRequiredMixin, CenterHeadRequiredMixin, AuditLogMixi
     audit_action = 'UPDATE'
     
     def get_queryset(self):
-        center = self.request.user.center_head_profile.center
+        center = get_principal(self.request).center
         return FeedbackSurvey.objects.filter(
             Q(center__isnull=True) | Q(center=center),
             deleted_at__isnull=True
@@ -156,7 +161,7 @@ class SendSurveyView(LoginRequiredMixin, CenterHeadRequiredMixin, View):
         survey = get_object_or_404(FeedbackSurvey, pk=pk, deleted_at__isnull=True)
         
         # Get center
-        center = request.user.center_head_profile.center
+        center = get_principal(request).center
         
         # Get students from the center
         students = Student.objects.filter(
@@ -223,38 +228,58 @@ class SubmitSurveyView(TemplateView):
         return super().dispatch(*args, **kwargs)
     
     def get(self, request, token):
-        """Display survey form to student."""
-        # Get response by token (T176)
-        response = get_object_or_404(
-            FeedbackResponse,
-            token=token,
-            deleted_at__isnull=True
-        )
+        """
+        Display survey form to student.
+        
+        Signed tokens are verified without a query and the form renders
+        from the cached survey definition and link state (see links.py).
+        """
+        # Validate token (T176)
+        try:
+            link = resolve_link(token, SURVEY_LINK)
+        except InvalidLink:
+            raise Http404('Invalid survey link.')
+        if link is None:
+            raise Http404('Invalid survey link.')
+        
+        if is_link_expired(link):
+            return render(request, 'feedback/survey_expired.html', {
+                'message': 'This survey link has expired.'
+            })
+        
+        state = get_link_state(SURVEY_LINK, link.object_id, token)
+        if not state['exists'] or link.parent_id not in (None, state['survey_id']):
+            raise Http404('Invalid survey link.')
+        
+        survey = get_survey_definition(state['survey_id'])
+        response = {
+            'survey': survey,
+            'submitted_at': state['submitted_at'],
+            'satisfaction_score': state['satisfaction_score'],
+        }
         
         # Check if already completed
-        if response.is_completed:
+        if state['is_completed']:
             return render(request, 'feedback/survey_completed.html', {
                 'response': response,
                 'message': 'You have already completed this survey. Thank you!'
             })
         
         # Check if survey is valid (T176)
-        if not response.survey.is_valid():
+        if not is_survey_definition_valid(survey):
             return render(request, 'feedback/survey_expired.html', {
                 'response': response,
                 'message': 'This survey has expired.'
             })
         
         # Track email opened
-        if not response.email_opened_at:
-            response.email_opened_at = timezone.now()
-            response.save(update_fields=['email_opened_at'])
+        record_link_opened(SURVEY_LINK, state)
         
         context = {
             'response': response,
-            'survey': response.survey,
-            'student': response.student,
-            'questions': response.survey.questions,
+            'survey': survey,
+            'student_name': state['student_name'],
+            'questions': survey['questions'],
         }
         
         return render(request, self.template_name, context)
@@ -262,11 +287,11 @@ class SubmitSurveyView(TemplateView):
     def post(self, request, token):
         """Save survey responses (T177)."""
         # Get response by token
-        response = get_object_or_404(
-            FeedbackResponse,
-            token=token,
-            deleted_at__isnull=True
-        )
+        try:
+            lookup = lookup_kwargs(token, SURVEY_LINK)
+        except InvalidLink:
+            raise Http404('Invalid survey link.')
+        response = get_object_or_404(FeedbackResponse, **lookup)
         
         # Validate survey is still valid
         if not response.survey.is_valid():
@@ -322,7 +347,7 @@ class SurveyResponsesView(LoginRequiredMixin, CenterHeadRequiredMixin, DetailVie
     context_object_name = 'survey'
     
     def get_queryset(self):
-        center = self.request.user.center_head_profile.center
+        center = get_principal(self.request).center
         return FeedbackSurvey.objects.filter(
             Q(center__isnull=True) | Q(center=center),
             deleted_at__isnull=True
@@ -337,51 +362,57 @@ class SurveyResponsesView(LoginRequiredMixin, CenterHeadRequiredMixin, DetailVie
             deleted_at__isnull=True
         ).select_related('student', 'student__center')
         
-        # Basic statistics
-        context['total_responses'] = responses.count()
-        context['completed_responses'] = responses.filter(is_completed=True).count()
-        context['pending_responses'] = responses.filter(is_completed=False).count()
+        # Basic statistics and rating distribution (T181) in one pass
+        scored = Q(is_completed=True, satisfaction_score__isnull=False)
+        stats = responses.aggregate(
+            total=Count('pk'),
+            completed=Count('pk', filter=Q(is_completed=True)),
+            avg_satisfaction=Avg('satisfaction_score', filter=scored),
+            **{
+                f'rating_{i}': Count('pk', filter=scored & Q(satisfaction_score=i))
+                for i in range(1, 6)
+            }
+        )
+        context['total_responses'] = stats['total']
+        context['completed_responses'] = stats['completed']
+        context['pending_responses'] = stats['total'] - stats['completed']
         context['completion_rate'] = (
             (context['completed_responses'] / context['total_responses'] * 100)
             if context['total_responses'] > 0 else 0
         )
         
         # Average satisfaction score
-        completed = responses.filter(is_completed=True, satisfaction_score__isnull=False)
-        context['avg_satisfaction'] = completed.aggregate(avg=Avg('satisfaction_score'))['avg']
-        
-        # Rating distribution (T181)
-        rating_distribution = {}
-        for i in range(1, 6):
-            count = completed.filter(satisfaction_score=i).count()
-            rating_distribution[i] = count
+        context['avg_satisfaction'] = stats['avg_satisfaction']
+        
+        rating_distribution = {i: stats[f'rating_{i}'] for i in range(1, 6)}
         context['rating_distribution'] = rating_distribution
         
         # Faculty-wise breakdown (T182)
         from apps.faculty.models import Faculty
-        faculty_breakdown = []
+        from .services import get_faculty_satisfaction_breakdown
         
-        for faculty in Faculty.objects.filter(
-            center=self.request.user.center_head_profile.center,
-            deleted_at__isnull=True
-        ):
-            # Get students taught by this faculty
-            student_ids = faculty.assignments.values_list('student_id', flat=True)
-            faculty_responses = completed.filter(student_id__in=student_ids)
-            
-            if faculty_responses.exists():
-                faculty_breakdown.append({
-                    'faculty': faculty,
-                    'response_count': faculty_responses.count(),
-                    'avg_satisfaction': faculty_responses.aggregate(
-                        avg=Avg('satisfaction_score')
-                    )['avg']
-                })
-        
-        context['faculty_breakdown'] = sorted(
-            faculty_breakdown,
-            key=lambda x: x['avg_satisfaction'] or 0,
-            reverse=True
+        breakdown = get_faculty_satisfaction_breakdown(
+            get_principal(self.request).center,
+            survey=self.object
+        )
+        faculty_by_id = Faculty.objects.select_related('user').in_bulk(
+            [item['faculty_id'] for item in breakdown]
+        )
+        context['faculty_breakdown'] = [
+            {
+                'faculty': faculty_by_id[item['faculty_id']],
+                'response_count': item['response_count'],
+                'avg_satisfaction': item['avg_satisfaction'],
+            }
+            for item in breakdown
+            if item['faculty_id'] in faculty_by_id
+        ]
+        
+        # Per-question summary (flattened SurveyAnswer rows)
+        from .question_analytics import get_question_summary
+        context['question_summary'] = get_question_summary(
+            self.object,
+            center=get_principal(self.request).center
         )
         
         # Recent responses
@@ -417,17 +448,18 @@ class FacultyFeedbackListView(LoginRequiredMixin, ListView):
         # Allow master accounts and center heads
         if not request.user.is_authenticated:
             return super().dispatch(request, *args, **kwargs)
-        if not (request.user.is_master_account or request.user.is_center_head):
+        principal = get_principal(request)
+        if not (principal.is_master or principal.is_center_head):
             messages.error(request, 'You do not have permission to access faculty feedback.')
             return redirect('accounts:profile')
         return super().dispatch(request, *args, **kwargs)
     
     def get_queryset(self):
         # Get center based on user role
-        if self.request.user.is_center_head:
-            if hasattr(self.request.user, 'center_head_profile'):
-                center = self.request.user.center_head_profile.center
-            else:
+        principal = get_principal(self.request)
+        if principal.is_center_head:
+            center = principal.center
+            if not center:
                 return FacultyFeedback.objects.none()
         else:
             # Master account - show all or filter by center if needed
@@ -470,14 +502,8 @@ class FacultyFeedbackListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Get center based on user role
-        if self.request.user.is_center_head:
-            if hasattr(self.request.user, 'center_head_profile'):
-                center = self.request.user.center_head_profile.center
-            else:
-                center = None
-        else:
-            center = None
+        # Get center based on user role (None for master accounts)
+        center = get_principal(self.request).center
         
         # Get faculty list for filter
         if center:
@@ -522,6 +548,10 @@ class FacultyFeedbackListView(LoginRequiredMixin, ListView):
         else:
             context['avg_score'] = None
         
+        # This month's top rated faculty (monthly rollups)
+        from .services import get_faculty_feedback_leaderboard
+        context['feedback_leaderboard'] = get_faculty_feedback_leaderboard(center)
+        
         return context
 
 
@@ -530,7 +560,7 @@ class CreateFeedbackRequestView(LoginRequiredMixin, CenterHeadRequiredMixin, Vie
     
     def get(self, request):
         """Display form to select faculty and students."""
-        center = request.user.center_head_profile.center
+        center = get_principal(request).center
         
         # Get faculty list
         faculty_list = Faculty.objects.filter(
@@ -554,8 +584,16 @@ class CreateFeedbackRequestView(LoginRequiredMixin, CenterHeadRequiredMixin, Vie
         return render(request, 'feedback/create_feedback_request.html', context)
     
     def post(self, request):
-        """Create feedback requests for selected students and faculty."""
-        center = request.user.center_head_profile.center
+        """
+        Create feedback requests for selected students and faculty.
+        
+        All requests are created in one bulk insert, then the browser is
+        redirected to the batch of WhatsApp links (FeedbackRequestBatchView),
+        so reloading the page does not create the batch again.
+        """
+        from .services import create_faculty_feedback_requests
+        
+        center = get_principal(request).center
         
         faculty_id = request.POST.get('faculty')
         student_ids = request.POST.getlist('students')
@@ -565,31 +603,150 @@ class CreateFeedbackRequestView(LoginRequiredMixin, CenterHeadRequiredMixin, Vie
             return redirect('feedback:create_request')
         
         # Get faculty
-        faculty = get_object_or_404(Faculty, id=faculty_id, center=center, deleted_at__isnull=True)
+        faculty = get_object_or_404(
+            Faculty.objects.select_related('user'),
+            id=faculty_id,
+            center=center,
+            deleted_at__isnull=True
+        )
         
-        # Create feedback requests
-        created_count = 0
+        # Create feedback requests (students with a pending request keep it;
+        # completed feedback does not stop a new request)
+        try:
+            feedbacks, created = create_faculty_feedback_requests(faculty, center, student_ids, request.user)
+        except Student.DoesNotExist:
+            messages.error(request, 'One or more selected students were not found in your center.')
+            return redirect('feedback:create_request')
         
-        for student_id in student_ids:
-            student = get_object_or_404(Student, id=student_id, center=center, deleted_at__isnull=True)
-            
-            # Allow multiple feedbacks - no duplicate check
-            FacultyFeedback.objects.create(
-                faculty=faculty,
-                student=student,
-                center=center,
-                created_by=request.user,
-                modified_by=request.user
-            )
-            created_count += 1
+        pending = len(feedbacks) - len(created)
+        messages.success(
+            request,
+            f'Created {len(created)} feedback request(s) for {faculty.user.get_full_name()}'
+            + (f' ({pending} student(s) already had a pending request)' if pending else '')
+            + '. Students can submit multiple feedbacks.'
+        )
         
-        if created_count > 0:
-            messages.success(
-                request,
-                f'Created {created_count} feedback request(s) for {faculty.user.get_full_name()}. Students can submit multiple feedbacks.'
-            )
+        ids = ','.join(str(feedback.pk) for feedback in feedbacks)
+        return redirect(f"{reverse('feedback:request_batch')}?ids={ids}")
+
+
+class FeedbackRequestBatchView(LoginRequiredMixin, CenterHeadRequiredMixin, View):
+    """
+    WhatsApp links of a batch of feedback requests, downloadable as CSV
+    from export_links and marked as sent with mark_links_sent.
+    
+    Query parameters:
+    - ids: Comma-separated feedback request ids
+    """
+    
+    def get(self, request):
+        from .services import get_feedback_link_rows
         
-        return redirect('feedback:faculty_list')
+        center = get_principal(request).center
+        
+        ids = [value for value in request.GET.get('ids', '').split(',') if value.strip().isdigit()]
+        feedbacks = list(FacultyFeedback.objects.filter(
+            pk__in=ids,
+            center=center,
+            deleted_at__isnull=True
+        ).select_related('student', 'faculty__user').order_by('student__first_name', 'student__last_name'))
+        if not feedbacks:
+            messages.error(request, 'These feedback requests were not found.')
+            return redirect('feedback:faculty_list')
+        
+        rows = get_feedback_link_rows(feedbacks, request.build_absolute_uri('/')[:-1])
+        
+        return render(request, 'feedback/feedback_request_batch.html', {
+            'faculty': feedbacks[0].faculty,
+            'rows': rows,
+            'feedback_ids': ','.join(str(feedback.pk) for feedback in feedbacks),
+            'unsent_count': sum(1 for feedback in feedbacks if not feedback.whatsapp_sent_at),
+        })
+
+
+class MarkFeedbackLinksSentView(LoginRequiredMixin, CenterHeadRequiredMixin, View):
+    """
+    Record that the WhatsApp links of a batch were sent.
+    
+    Kept out of the GET views that show or export the links, so reloads,
+    link previews and crawlers do not mark links as sent.
+    
+    POST parameters:
+    - ids: Comma-separated feedback request ids
+    """
+    
+    def post(self, request):
+        from .services import mark_whatsapp_sent
+        
+        center = get_principal(request).center
+        
+        ids = [value for value in request.POST.get('ids', '').split(',') if value.strip().isdigit()]
+        feedbacks = list(FacultyFeedback.objects.filter(
+            pk__in=ids,
+            center=center,
+            whatsapp_sent_at__isnull=True,
+            deleted_at__isnull=True
+        ).only('pk', 'whatsapp_sent_at'))
+        mark_whatsapp_sent(feedbacks)
+        
+        messages.success(request, f'Marked {len(feedbacks)} feedback link(s) as sent.')
+        return redirect(f"{reverse('feedback:request_batch')}?ids={','.join(ids)}")
+
+
+def feedback_links_csv_response(rows, filename):
+    """CSV attachment of feedback link rows (see services.get_feedback_link_rows)."""
+    import csv
+    from django.http import HttpResponse
+    
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    writer = csv.writer(response)
+    writer.writerow(['Student', 'Enrollment Number', 'Phone', 'Faculty', 'Feedback Link', 'WhatsApp Link'])
+    for row in rows:
+        writer.writerow([
+            row['student_name'],
+            row['enrollment_number'],
+            row['phone'],
+            row['faculty_name'],
+            row['feedback_url'],
+            row['whatsapp_link'],
+        ])
+    return response
+
+
+class ExportFeedbackLinksView(LoginRequiredMixin, CenterHeadRequiredMixin, View):
+    """
+    Download the WhatsApp links of pending feedback requests as CSV
+    (downloading does not mark them as sent, see MarkFeedbackLinksSentView).
+    
+    Query parameters:
+    - ids: Comma-separated feedback request ids (e.g. one created batch)
+    - faculty: Only requests for this faculty
+    """
+    
+    def get(self, request):
+        from .services import get_feedback_link_rows
+        
+        center = get_principal(request).center
+        
+        feedbacks = FacultyFeedback.objects.filter(
+            center=center,
+            is_completed=False,
+            deleted_at__isnull=True
+        ).select_related('student', 'faculty__user').order_by('student__first_name', 'student__last_name')
+        
+        ids = [value for value in request.GET.get('ids', '').split(',') if value.strip().isdigit()]
+        if ids:
+            feedbacks = feedbacks.filter(pk__in=ids)
+        faculty_id = request.GET.get('faculty')
+        if faculty_id and faculty_id.isdigit():
+            feedbacks = feedbacks.filter(faculty_id=faculty_id)
+        
+        feedbacks = list(feedbacks)
+        rows = get_feedback_link_rows(feedbacks, request.build_absolute_uri('/')[:-1])
+        
+        return feedback_links_csv_response(rows, f'feedback_links_{timezone.localdate():%Y%m%d}.csv')
 
 
 class SendFeedbackWhatsAppView(LoginRequiredMixin, CenterHeadRequiredMixin, View):
@@ -597,7 +754,7 @@ class SendFeedbackWhatsAppView(LoginRequiredMixin, CenterHeadRequiredMixin, View
     
     def get(self, request, pk):
         """Display WhatsApp link for a feedback request."""
-        center = request.user.center_head_profile.center
+        center = get_principal(request).center
         
         feedback = get_object_or_404(
             FacultyFeedback,
@@ -631,43 +788,52 @@ class SubmitFacultyFeedbackView(TemplateView):
         return super().dispatch(*args, **kwargs)
     
     def get(self, request, token):
-        """Display feedback form to student."""
-        feedback = get_object_or_404(
-            FacultyFeedback,
-            token=token,
-            deleted_at__isnull=True
-        )
+        """
+        Display feedback form to student.
+        
+        Signed tokens are verified without a query and the form renders
+        from the cached link state (see links.py).
+        """
+        try:
+            link = resolve_link(token, FACULTY_FEEDBACK_LINK)
+        except InvalidLink:
+            raise Http404('Invalid feedback link.')
+        if link is None:
+            raise Http404('Invalid feedback link.')
+        
+        if is_link_expired(link):
+            return render(request, 'feedback/survey_expired.html', {
+                'message': 'This feedback link has expired.'
+            })
+        
+        state = get_link_state(FACULTY_FEEDBACK_LINK, link.object_id, token)
+        if not state['exists'] or link.parent_id not in (None, state['faculty_id']):
+            raise Http404('Invalid feedback link.')
         
         # Check if already completed
-        if feedback.is_completed:
+        if state['is_completed']:
             return render(request, 'feedback/feedback_completed.html', {
-                'feedback': feedback,
+                'feedback': state,
                 'message': 'You have already submitted feedback for this faculty. Thank you!'
             })
         
         # Track link opened
-        if not feedback.link_opened_at:
-            feedback.link_opened_at = timezone.now()
-            feedback.save(update_fields=['link_opened_at'])
-        
-        form = FacultyFeedbackForm(instance=feedback)
+        record_link_opened(FACULTY_FEEDBACK_LINK, state)
         
         context = {
-            'feedback': feedback,
-            'form': form,
-            'faculty': feedback.faculty,
-            'student': feedback.student,
+            'form': FacultyFeedbackForm(),
+            'faculty': state['faculty'],
         }
         
         return render(request, self.template_name, context)
     
     def post(self, request, token):
         """Save feedback responses."""
-        feedback = get_object_or_404(
-            FacultyFeedback,
-            token=token,
-            deleted_at__isnull=True
-        )
+        try:
+            lookup = lookup_kwargs(token, FACULTY_FEEDBACK_LINK)
+        except InvalidLink:
+            raise Http404('Invalid feedback link.')
+        feedback = get_object_or_404(FacultyFeedback, **lookup)
         
         # Check if already completed
         if feedback.is_completed:
@@ -693,8 +859,7 @@ class SubmitFacultyFeedbackView(TemplateView):
         context = {
             'feedback': feedback,
             'form': form,
-            'faculty': feedback.faculty,
-            'student': feedback.student,
+            'faculty': get_link_state(FACULTY_FEEDBACK_LINK, feedback.pk)['faculty'],
         }
         
         return render(request, self.template_name, context)
@@ -705,7 +870,7 @@ class DeleteFeedbackRequestView(LoginRequiredMixin, CenterHeadRequiredMixin, Vie
     
     def post(self, request, pk):
         """Delete the feedback request."""
-        center = request.user.center_head_profile.center
+        center = get_principal(request).center
         
         # Get feedback and verify it belongs to this center and is pending
         feedback = get_object_or_404(
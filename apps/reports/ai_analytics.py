@@ -361,7 +361,7 @@ def generate_center_insights(center):
     try:
         from apps.students.models import Student
         from apps.faculty.models import Faculty
-        from apps.attendance.models import Attendance
+        from apps.attendance.models import AttendanceRecord
         
         # Gather comprehensive center data
         last_30_days = timezone.now().date() - timedelta(days=30)
@@ -378,11 +378,11 @@ def generate_center_insights(center):
             'total_faculty': Faculty.objects.filter(
                 center=center, deleted_at__isnull=True, is_active=True
             ).count(),
-            'attendance_last_7d': Attendance.objects.filter(
-                center=center, date__gte=last_7_days, deleted_at__isnull=True
+            'attendance_last_7d': AttendanceRecord.objects.filter(
+                student__center=center, date__gte=last_7_days
             ).count(),
-            'attendance_last_30d': Attendance.objects.filter(
-                center=center, date__gte=last_30_days, deleted_at__isnull=True
+            'attendance_last_30d': AttendanceRecord.objects.filter(
+                student__center=center, date__gte=last_30_days
             ).count(),
         }
         
@@ -436,19 +436,17 @@ def generate_student_insights(student):
         return cached
     
     try:
-        from apps.attendance.models import Attendance
+        from apps.attendance.models import AttendanceRecord
         
         # Gather student data
-        total_sessions = Attendance.objects.filter(
-            student=student,
-            deleted_at__isnull=True
+        total_sessions = AttendanceRecord.objects.filter(
+            student=student
         ).count()
         
         last_30_days = timezone.now().date() - timedelta(days=30)
-        recent_sessions = Attendance.objects.filter(
+        recent_sessions = AttendanceRecord.objects.filter(
             student=student,
-            date__gte=last_30_days,
-            deleted_at__isnull=True
+            date__gte=last_30_days
         ).count()
         
         student_data = {
@@ -508,26 +506,23 @@ def generate_faculty_insights(faculty):
         return cached
     
     try:
-        from apps.attendance.models import Attendance
+        from apps.attendance.models import AttendanceRecord
         from apps.students.models import Student
         
         # Gather faculty data
-        total_sessions = Attendance.objects.filter(
-            faculty=faculty,
-            deleted_at__isnull=True
+        total_sessions = AttendanceRecord.objects.filter(
+            marked_by=faculty.user
         ).count()
         
         last_30_days = timezone.now().date() - timedelta(days=30)
-        recent_sessions = Attendance.objects.filter(
-            faculty=faculty,
-            date__gte=last_30_days,
-            deleted_at__isnull=True
+        recent_sessions = AttendanceRecord.objects.filter(
+            marked_by=faculty.user,
+            date__gte=last_30_days
         ).count()
         
         # Get unique students taught
-        unique_students = Attendance.objects.filter(
-            faculty=faculty,
-            deleted_at__isnull=True
+        unique_students = AttendanceRecord.objects.filter(
+            marked_by=faculty.user
         ).values('student').distinct().count()
         
         faculty_data = {
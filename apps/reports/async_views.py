@@ -0,0 +1,71 @@
+"""
+Async variants of the heavy report views.
+
+The report's independent query sections run concurrently (see
+sections.gather_sections) and the shared build_report_context turns the
+results into the same template context as the sync views. Under ASGI the
+event loop is never blocked; under WSGI Django runs the view in its own
+event loop and the sections still overlap.
+
+Use the benchmark_reports management command to compare both paths.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.utils import timezone
+from django.views.generic.base import ContextMixin
+
+from .mixins import deny_report_access
+from .sections import gather_sections
+from .views import FacultyReportView, StudentReportView
+
+
+class AsyncReportViewMixin:
+    """
+    Async GET for report views that define get_report_sections() and
+    build_report_context(). Authentication is checked with request.auser(),
+    so no synchronous ORM access happens on the event loop.
+    """
+    denied_message = 'You do not have permission to access reports.'
+
+    def get_report_object(self):
+        raise NotImplementedError
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        if not self.has_report_role(user):
+            return deny_report_access(request, self.denied_message)
+
+        if request.method.lower() in self.http_method_names:
+            handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+        else:
+            handler = self.http_method_not_allowed
+        return await handler(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        # Access checks may follow relations (center head / faculty profiles)
+        obj = await sync_to_async(self.get_report_object)()
+        today = timezone.now().date()
+        sections = await gather_sections(self.get_report_sections(obj, today))
+
+        context = ContextMixin.get_context_data(self, **kwargs)
+        context.update(self.build_report_context(obj, today, sections))
+        # TemplateResponse is rendered by the handler in a sync thread
+        return self.render_to_response(context)
+
+
+class AsyncStudentReportView(AsyncReportViewMixin, StudentReportView):
+    """T133: Student report with its query sections run concurrently."""
+    denied_message = 'You do not have permission to access student reports.'
+
+    def get_report_object(self):
+        return self.get_report_student()
+
+
+class AsyncFacultyReportView(AsyncReportViewMixin, FacultyReportView):
+    """T134: Faculty report with its query sections run concurrently."""
+
+    def get_report_object(self):
+        return self.get_report_faculty()
@@ -0,0 +1,90 @@
+"""
+Management command comparing sync and async (concurrent) report building.
+"""
+
+import asyncio
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.faculty.models import Faculty
+from apps.reports.sections import gather_sections, run_sections, time_sections
+from apps.reports.views import FacultyReportView, StudentReportView
+from apps.students.models import Student
+
+
+class Command(BaseCommand):
+    help = 'Time the student/faculty report query sections sequentially and concurrently'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--student', type=int, help='Student ID to build the report for')
+        parser.add_argument('--faculty', type=int, help='Faculty ID to build the report for')
+        parser.add_argument('--runs', type=int, default=5, help='Number of timed runs per path')
+
+    def handle(self, *args, **options):
+        if not options['student'] and not options['faculty']:
+            raise CommandError('Pass --student and/or --faculty')
+
+        today = timezone.now().date()
+        if options['student']:
+            student = Student.objects.select_related('center').filter(pk=options['student']).first()
+            if student is None:
+                raise CommandError(f"Student {options['student']} not found")
+            self.benchmark(
+                f'Student report: {student.get_full_name()}',
+                lambda: StudentReportView().get_report_sections(student, today),
+                options['runs']
+            )
+
+        if options['faculty']:
+            faculty = Faculty.objects.select_related('user', 'center').filter(pk=options['faculty']).first()
+            if faculty is None:
+                raise CommandError(f"Faculty {options['faculty']} not found")
+            self.benchmark(
+                f'Faculty report: {faculty.user.get_full_name()}',
+                lambda: FacultyReportView().get_report_sections(faculty, today),
+                options['runs']
+            )
+
+    def benchmark(self, title, make_sections, runs):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+
+        # Warm up connections and caches once so both paths start equal
+        run_sections(make_sections())
+
+        timings = time_sections(make_sections())
+        for name, elapsed in sorted(timings.items(), key=lambda item: -item[1]):
+            self.stdout.write(f'  {name:<24} {elapsed * 1000:8.1f} ms')
+        self.stdout.write(
+            f'  sum of sections {sum(timings.values()) * 1000:.1f} ms, '
+            f'slowest section {max(timings.values()) * 1000:.1f} ms'
+        )
+
+        sync_times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            run_sections(make_sections())
+            sync_times.append(time.perf_counter() - start)
+
+        # One event loop for all runs, as in an ASGI server, so worker
+        # threads (and their connections, with CONN_MAX_AGE) are reused
+        async_times = asyncio.run(self.time_async(make_sections, runs))
+
+        sync_median = statistics.median(sync_times)
+        async_median = statistics.median(async_times)
+        self.stdout.write(f'  sync  (sequential) median {sync_median * 1000:8.1f} ms over {runs} runs')
+        self.stdout.write(f'  async (concurrent) median {async_median * 1000:8.1f} ms over {runs} runs')
+        if async_median > 0:
+            self.stdout.write(self.style.SUCCESS(f'  speed-up x{sync_median / async_median:.2f}'))
+
+    async def time_async(self, make_sections, runs):
+        await gather_sections(make_sections())
+
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await gather_sections(make_sections())
+            times.append(time.perf_counter() - start)
+        return times
@@ -0,0 +1,123 @@
+"""
+Access checks shared by report pages and their lazily loaded panels.
+"""
+
+from django.contrib import messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404, redirect
+
+from apps.core.principal import get_principal
+from apps.faculty.models import Faculty
+from apps.students.models import Student
+
+
+class StudentReportAccessMixin:
+    """
+    Resolve the student of a report and check the user may see it.
+    Master accounts see everyone, center heads their center, faculty
+    only students they teach.
+    """
+
+    def has_report_role(self, user):
+        return user.is_master_account or user.is_center_head or user.is_faculty_member
+
+    def get_report_student(self):
+        """
+        Return the requested student.
+
+        Raises:
+            Http404: If the student does not exist
+            PermissionDenied: If the user may not view this student
+        """
+        student = get_object_or_404(
+            Student.objects.select_related('center'),
+            pk=self.kwargs.get('student_id'),
+            deleted_at__isnull=True
+        )
+        principal = get_principal(self.request)
+
+        if principal.is_center_head:
+            if not principal.has_profile:
+                raise PermissionDenied("Your center head profile is not set up.")
+            if principal.center_id != student.center_id:
+                raise PermissionDenied("You can only view students from your center.")
+
+        elif principal.is_faculty:
+            if not principal.has_profile:
+                raise PermissionDenied("Your faculty profile is not set up.")
+            # Faculty can only view students they teach
+            from apps.subjects.models import Assignment
+            has_assignment = Assignment.objects.filter(
+                student=student,
+                faculty=principal.faculty_profile,
+                is_active=True
+            ).exists()
+            if not has_assignment:
+                raise PermissionDenied("You can only view students you teach.")
+
+        return student
+
+
+class FacultyReportAccessMixin:
+    """
+    Resolve the faculty member of a report and check the user may see it.
+    Master accounts see everyone, center heads their own center's faculty.
+    """
+
+    def has_report_role(self, user):
+        return user.is_master_account or user.is_center_head
+
+    def get_report_faculty(self):
+        """
+        Return the requested faculty member.
+
+        Raises:
+            Http404: If the faculty member does not exist
+            PermissionDenied: If the user may not view this faculty member
+        """
+        faculty = get_object_or_404(
+            Faculty.objects.select_related('user', 'center'),
+            pk=self.kwargs.get('faculty_id'),
+            deleted_at__isnull=True
+        )
+        principal = get_principal(self.request)
+
+        if principal.is_center_head:
+            if not principal.can_access_center(faculty.center_id):
+                raise PermissionDenied("You do not have permission to view this faculty.")
+
+        return faculty
+
+
+class CenterDashboardAccessMixin:
+    """
+    Resolve the center shown on the center dashboard.
+    Center heads see their own center, master accounts the center
+    selected in the session.
+    """
+
+    def has_report_role(self, user):
+        return user.is_center_head or user.is_master_account
+
+    def get_dashboard_center(self):
+        """
+        Return the dashboard center, or None if no center applies.
+        """
+        from apps.centers.models import Center
+
+        principal = get_principal(self.request)
+        if principal.is_master:
+            center_id = self.request.session.get('active_center_id')
+            if center_id:
+                return get_object_or_404(Center, pk=center_id, deleted_at__isnull=True)
+            return None
+
+        if principal.center_head_profile:
+            return principal.center_head_profile.center
+        return None
+
+
+def deny_report_access(request, message='You do not have permission to access reports.'):
+    """Redirect a user without a report role back to their profile."""
+    messages.error(request, message)
+    return redirect('accounts:profile')
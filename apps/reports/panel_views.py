@@ -0,0 +1,101 @@
+"""
+JSON endpoints for lazily loaded report panels.
+
+Report pages render a shell first; the browser then fetches each panel
+concurrently (static/js/report-panels.js). Panels are cached under the
+owning center's data version, and the version also drives the ETag, so a
+revalidation with an unchanged version is answered with 304 before any
+panel data is computed or even read from the cache.
+"""
+
+import hashlib
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views import View
+
+from apps.centers.cache import get_cached_section, get_center_data_version
+
+from .mixins import CenterDashboardAccessMixin, FacultyReportAccessMixin, StudentReportAccessMixin
+from .panels import CENTER_PANELS, FACULTY_PANELS, STUDENT_PANELS
+
+
+class ReportPanelView(LoginRequiredMixin, View):
+    """
+    Base view serving one named panel of a report as JSON.
+    Subclasses provide the panel registry and resolve the report object
+    with the same access checks as the full report page.
+    """
+    panels = {}
+    report_kind = ''
+
+    def get_report_object(self):
+        raise NotImplementedError
+
+    def get_center_id(self, obj):
+        return obj.center_id
+
+    def get(self, request, panel, **kwargs):
+        if not self.has_report_role(request.user):
+            return JsonResponse({'error': 'You do not have permission to access reports.'}, status=403)
+
+        builder = self.panels.get(panel)
+        if builder is None:
+            raise Http404(f"Unknown panel: {panel}")
+
+        obj = self.get_report_object()
+        if obj is None:
+            raise Http404("No report available.")
+
+        center_id = self.get_center_id(obj)
+        today = timezone.now().date().isoformat()
+        version = get_center_data_version(center_id)
+        etag = '"%s"' % hashlib.md5(
+            f'{self.report_kind}:{obj.pk}:{panel}:{version}:{today}'.encode()
+        ).hexdigest()
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            data = get_cached_section(
+                center_id,
+                f'panel:{self.report_kind}:{obj.pk}:{panel}:{today}',
+                lambda: builder(obj),
+                version=version
+            )
+            response = JsonResponse(data)
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        return response
+
+
+class StudentReportPanelView(StudentReportAccessMixin, ReportPanelView):
+    """Panels of the student report (trend, heatmap, subjects, peers, AI insights)."""
+    panels = STUDENT_PANELS
+    report_kind = 'student'
+
+    def get_report_object(self):
+        return self.get_report_student()
+
+
+class FacultyReportPanelView(FacultyReportAccessMixin, ReportPanelView):
+    """Panels of the faculty report (trend, heatmap, peers, AI insights)."""
+    panels = FACULTY_PANELS
+    report_kind = 'faculty'
+
+    def get_report_object(self):
+        return self.get_report_faculty()
+
+
+class CenterDashboardPanelView(CenterDashboardAccessMixin, ReportPanelView):
+    """Panels of the center dashboard (trend, insights, AI insights)."""
+    panels = CENTER_PANELS
+    report_kind = 'center'
+
+    def get_report_object(self):
+        return self.get_dashboard_center()
+
+    def get_center_id(self, obj):
+        return obj.pk
@@ -0,0 +1,478 @@
+"""
+Lazily loaded report panels.
+
+Report pages render a fast shell and the browser fetches each chart panel
+from its own JSON endpoint (see panel_views.py). Every builder here takes
+the report object and returns JSON-serialisable data for one panel.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Max, Sum
+from django.utils import timezone
+
+from apps.attendance.models import AttendanceRecord
+from apps.attendance.services import get_topic_links, topic_count_expression
+from apps.subjects.models import Assignment
+
+from .services import (
+    get_at_risk_students, get_delayed_students, get_faculty_free_slots,
+    get_irregular_students, get_skipped_topics, prepare_attendance_trend_data,
+    prepare_gantt_chart_data,
+)
+
+DAYS_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _student_sessions(student):
+    """All sessions of a student with their topic count, oldest first (one query)."""
+    return list(AttendanceRecord.objects.filter(student=student).annotate(
+        topic_count=topic_count_expression()
+    ).values(
+        'id', 'date', 'in_time', 'duration_minutes', 'topic_count', 'assignment__subject__name'
+    ).order_by('date', 'in_time'))
+
+
+# ============================================================================
+# STUDENT REPORT PANELS
+# ============================================================================
+
+def build_student_trend_panel(student):
+    """
+    Attendance trend, 6-month learning trend, velocity and cumulative progress.
+
+    Args:
+        student: Student instance
+
+    Returns:
+        dict: Google Charts data tables
+    """
+    today = timezone.now().date()
+    sessions = _student_sessions(student)
+
+    # 6-month learning trend (30-day windows, as on the report page)
+    monthly_learning = [['Month', 'Sessions', 'Hours', 'Topics']]
+    for i in range(5, -1, -1):
+        month_start = today.replace(day=1) - timedelta(days=i * 30)
+        month_end = month_start + timedelta(days=30)
+        month_sessions = [s for s in sessions if month_start <= s['date'] <= month_end]
+        monthly_learning.append([
+            month_start.strftime('%b'),
+            len(month_sessions),
+            round(sum(s['duration_minutes'] for s in month_sessions) / 60, 1),
+            sum(s['topic_count'] for s in month_sessions),
+        ])
+
+    # Learning velocity over the last 10 sessions
+    velocity_trend = [['Session', 'Topics/Hour']]
+    recent = sessions[-10:]
+    for index, session in enumerate(recent):
+        duration_hours = session['duration_minutes'] / 60 if session['duration_minutes'] > 0 else 1
+        velocity_trend.append([f"S{len(recent) - index}", round(session['topic_count'] / duration_hours, 2)])
+
+    # Cumulative topics over the first 30 sessions
+    progress_over_time = [['Date', 'Cumulative Topics']]
+    cumulative_topics = 0
+    for session in sessions[:30]:
+        cumulative_topics += session['topic_count']
+        progress_over_time.append([session['date'].strftime('%m/%d'), cumulative_topics])
+
+    return {
+        'attendance_trend': prepare_attendance_trend_data(student=student, days=30),
+        'monthly_learning': monthly_learning,
+        'velocity_trend': velocity_trend,
+        'progress_over_time': progress_over_time,
+    }
+
+
+def build_student_heatmap_panel(student):
+    """
+    Attendance calendar heatmap plus weekly and hourly learning patterns.
+
+    Args:
+        student: Student instance
+
+    Returns:
+        dict: Calendar rows ([ISO date, hours, HTML tooltip]) and chart tables
+    """
+    today = timezone.now().date()
+    sessions = _student_sessions(student)
+
+    topics_by_record = defaultdict(list)
+    for links in get_topic_links(AttendanceRecord.objects.filter(student=student)):
+        for record_id, topic_name in links.order_by().values_list('pk', 'topic_name'):
+            topics_by_record[record_id].append(topic_name)
+
+    # Start from the enrollment date (can be backdated by admin)
+    if student.enrollment_date:
+        start_date = student.enrollment_date
+    elif sessions:
+        start_date = sessions[0]['date']
+    else:
+        start_date = today - timedelta(days=365)
+
+    by_date = {}
+    weekday_sessions = defaultdict(int)
+    weekday_minutes = defaultdict(int)
+    hour_sessions = defaultdict(int)
+    for session in sessions:
+        day = by_date.setdefault(session['date'], {'sessions': 0, 'hours': 0, 'topics': [], 'subjects': set()})
+        day['sessions'] += 1
+        day['hours'] += session['duration_minutes'] / 60
+        day['topics'].extend(topics_by_record.get(session['id'], []))
+        day['subjects'].add(session['assignment__subject__name'])
+
+        weekday = DAYS_ORDER[session['date'].weekday()]
+        weekday_sessions[weekday] += 1
+        weekday_minutes[weekday] += session['duration_minutes']
+        if session['in_time']:
+            hour_sessions[session['in_time'].hour] += 1
+
+    calendar = []
+    current_date = start_date
+    while current_date <= today:
+        label = current_date.strftime('%b %d, %Y')
+        data = by_date.get(current_date)
+        if data:
+            hours = round(data['hours'], 1)
+            topics = ', '.join(data['topics']) if data['topics'] else 'No topics'
+            tooltip = f"<div style='padding:10px;'><b>{label}</b><br/>" \
+                      f"<b>Subjects:</b> {', '.join(sorted(data['subjects']))}<br/>" \
+                      f"<b>Topics:</b> {topics}<br/>" \
+                      f"<b>Sessions:</b> {data['sessions']}<br/>" \
+                      f"<b>Hours:</b> {hours}</div>"
+        else:
+            hours = 0
+            tooltip = f"<div style='padding:10px;'><b>{label}</b><br/><b>Status:</b> Absent</div>"
+        calendar.append([current_date.isoformat(), hours, tooltip])
+        current_date += timedelta(days=1)
+
+    weekly_pattern = [['Day', 'Sessions', 'Hours']]
+    for day in DAYS_ORDER:
+        weekly_pattern.append([day[:3], weekday_sessions[day], round(weekday_minutes[day] / 60, 1)])
+
+    hourly_preference = [['Hour', 'Sessions']]
+    for hour in range(6, 22):
+        hourly_preference.append([f"{hour}:00", hour_sessions[hour]])
+
+    return {
+        'calendar': calendar,
+        'start_year': start_date.year,
+        'end_year': today.year,
+        'weekly_pattern': weekly_pattern,
+        'most_active_day': max(weekday_sessions, key=weekday_sessions.get) if weekday_sessions else 'N/A',
+        'hourly_preference': hourly_preference,
+    }
+
+
+def build_student_subjects_panel(student):
+    """
+    Subject-wise performance table, completion and mastery charts.
+
+    Args:
+        student: Student instance
+
+    Returns:
+        dict: Table rows and Google Charts data tables
+    """
+    assignments = Assignment.objects.filter(
+        student=student,
+        deleted_at__isnull=True
+    ).select_related('subject')
+
+    records = AttendanceRecord.objects.filter(student=student)
+    totals = {
+        row['assignment_id']: row
+        for row in records.values('assignment_id').annotate(
+            sessions=Count('id'),
+            minutes=Sum('duration_minutes'),
+            avg_duration=Avg('duration_minutes'),
+            last_session=Max('date'),
+        )
+    }
+    topic_counts = defaultdict(int)
+    for links in get_topic_links(records):
+        for assignment_id, count in links.order_by().values('assignment_id').annotate(
+            count=Count('pk')
+        ).values_list('assignment_id', 'count'):
+            topic_counts[assignment_id] += count
+
+    subject_performance = []
+    subject_completion = [['Subject', 'Sessions Completed', 'Progress %']]
+    subject_mastery = [['Subject', 'Topics Covered']]
+    for assignment in assignments:
+        row = totals.get(assignment.pk, {})
+        sessions = row.get('sessions', 0)
+        topics = topic_counts.get(assignment.pk, 0)
+        last_session = row.get('last_session')
+
+        subject_performance.append({
+            'subject': assignment.subject.name,
+            'sessions': sessions,
+            'hours': round((row.get('minutes') or 0) / 60, 1),
+            'topics': topics,
+            'avg_duration': round(row.get('avg_duration') or 0, 1),
+            'last_session': last_session.isoformat() if last_session else None,
+        })
+        # Assume 20 sessions = 100% completion
+        subject_completion.append([assignment.subject.name, sessions, round(min(sessions / 20 * 100, 100), 1)])
+        if topics > 0:
+            subject_mastery.append([assignment.subject.name[:15], topics])
+
+    return {
+        'subject_performance': subject_performance,
+        'subject_completion': subject_completion,
+        'subject_mastery': subject_mastery,
+    }
+
+
+def build_student_peers_panel(student):
+    """
+    Compare a student's session count with the center average.
+
+    Args:
+        student: Student instance
+
+    Returns:
+        dict: Session totals and comparison label
+    """
+    total_sessions = AttendanceRecord.objects.filter(student=student).count()
+    center_avg_sessions = AttendanceRecord.objects.filter(
+        student__center_id=student.center_id,
+        student__deleted_at__isnull=True
+    ).values('student').annotate(count=Count('id')).aggregate(avg=Avg('count'))['avg'] or 0
+
+    return {
+        'total_sessions': total_sessions,
+        'center_avg_sessions': round(center_avg_sessions, 1),
+        'performance_vs_peers': 'Above Average' if total_sessions > center_avg_sessions else 'Below Average',
+    }
+
+
+def build_student_ai_insights_panel(student):
+    """AI insights for a student (cached by the AI layer itself)."""
+    from .ai_analytics import generate_student_insights
+    return _ai_panel(generate_student_insights(student))
+
+
+# ============================================================================
+# FACULTY REPORT PANELS
+# ============================================================================
+
+def build_faculty_trend_panel(faculty):
+    """Center attendance trend shown on the faculty report."""
+    return {
+        'attendance_trend': prepare_attendance_trend_data(center=faculty.center, days=30),
+    }
+
+
+def build_faculty_heatmap_panel(faculty):
+    """
+    Weekly schedule and today's utilisation for a faculty member.
+
+    Args:
+        faculty: Faculty instance
+
+    Returns:
+        dict: Gantt rows and today's busy/free hours
+    """
+    free_slots = get_faculty_free_slots(faculty=faculty)
+    today_slots = free_slots[0] if free_slots else None
+
+    return {
+        'gantt': prepare_gantt_chart_data(faculty=faculty, days=7),
+        'today': {
+            'total_sessions': today_slots['total_sessions'],
+            'busy_hours': today_slots['busy_hours'],
+            'free_hours': today_slots['free_hours'],
+            'utilization_percentage': today_slots['utilization_percentage'],
+        } if today_slots else None,
+    }
+
+
+def build_faculty_peers_panel(faculty):
+    """
+    Compare a faculty member's last-30-day sessions and hours with the
+    other active faculty of the same center.
+
+    Args:
+        faculty: Faculty instance
+
+    Returns:
+        dict: This faculty's figures, center averages and rank
+    """
+    from apps.faculty.models import Faculty
+
+    since = timezone.now().date() - timedelta(days=30)
+    peers = list(Faculty.objects.filter(
+        center_id=faculty.center_id,
+        deleted_at__isnull=True,
+        is_active=True
+    ).values_list('user_id', flat=True))
+    if faculty.user_id not in peers:
+        peers.append(faculty.user_id)
+
+    per_user = {
+        row['marked_by_id']: row
+        for row in AttendanceRecord.objects.filter(
+            marked_by_id__in=peers,
+            date__gte=since
+        ).values('marked_by_id').annotate(
+            sessions=Count('id'),
+            minutes=Sum('duration_minutes')
+        )
+    }
+    sessions = {user_id: per_user.get(user_id, {}).get('sessions', 0) for user_id in peers}
+    minutes = {user_id: per_user.get(user_id, {}).get('minutes') or 0 for user_id in peers}
+
+    ranking = sorted(peers, key=lambda user_id: sessions[user_id], reverse=True)
+
+    return {
+        'sessions_30d': sessions[faculty.user_id],
+        'hours_30d': round(minutes[faculty.user_id] / 60, 1),
+        'center_avg_sessions_30d': round(sum(sessions.values()) / len(peers), 1),
+        'center_avg_hours_30d': round(sum(minutes.values()) / len(peers) / 60, 1),
+        'rank': ranking.index(faculty.user_id) + 1,
+        'faculty_count': len(peers),
+    }
+
+
+def build_faculty_ai_insights_panel(faculty):
+    """AI insights for a faculty member (cached by the AI layer itself)."""
+    from .ai_analytics import generate_faculty_insights
+    return _ai_panel(generate_faculty_insights(faculty))
+
+
+# ============================================================================
+# CENTER DASHBOARD PANELS
+# ============================================================================
+
+def build_center_trend_panel(center):
+    """
+    Attendance count per day for the last 7 days (one grouped query).
+
+    Args:
+        center: Center instance
+
+    Returns:
+        dict: Chart.js labels and data
+    """
+    today = timezone.now().date()
+    counts = dict(AttendanceRecord.objects.filter(
+        student__center=center,
+        date__gte=today - timedelta(days=6),
+        date__lte=today
+    ).values('date').annotate(count=Count('id')).values_list('date', 'count'))
+
+    labels = []
+    data = []
+    for i in range(6, -1, -1):
+        day = today - timedelta(days=i)
+        labels.append(day.strftime('%a'))
+        data.append(counts.get(day, 0))
+
+    return {'labels': labels, 'data': data}
+
+
+def build_center_insights_panel(center):
+    """
+    Students needing follow-up, faculty utilisation and skipped topics.
+
+    Args:
+        center: Center instance
+
+    Returns:
+        dict: Counts and top entries of each insight list
+    """
+    today = timezone.now().date()
+
+    at_risk = get_at_risk_students(center, days_threshold=4)
+    delayed = get_delayed_students(center, months_threshold=6, progress_threshold=50)
+    irregular = get_irregular_students(center, days_window=30, gap_threshold=3)
+    free_slots = get_faculty_free_slots(center=center, date=today)
+    skipped = get_skipped_topics(center=center, days=30)
+
+    return {
+        'absent_4days_count': at_risk.count(),
+        'absent_4days': [
+            {
+                'id': student.pk,
+                'name': student.get_full_name(),
+                'last_attendance': student.last_attendance_date.isoformat() if student.last_attendance_date else None,
+            }
+            for student in at_risk[:10]
+        ],
+        'delayed_count': len(delayed),
+        'delayed': [
+            {
+                'id': item['student'].pk,
+                'name': item['student'].get_full_name(),
+                'progress_percentage': item['progress_percentage'],
+                'months_enrolled': item['months_enrolled'],
+            }
+            for item in delayed[:10]
+        ],
+        'irregular_count': len(irregular),
+        'irregular': [
+            {
+                'id': item['student'].pk,
+                'name': item['student'].get_full_name(),
+                'max_gap_days': item['max_gap_days'],
+                'total_sessions': item['total_sessions'],
+            }
+            for item in irregular[:10]
+        ],
+        'faculty_utilization': [
+            {
+                'name': item['faculty'].user.get_full_name(),
+                'total_sessions': item['total_sessions'],
+                'busy_hours': item['busy_hours'],
+                'free_hours': item['free_hours'],
+                'utilization_percentage': item['utilization_percentage'],
+            }
+            for item in free_slots[:5]
+        ],
+        'skipped_topics_count': len(skipped),
+        'skipped_topics': [
+            {'topic': item['topic'].name, 'subject': item['subject'].name, 'ever_covered': item['ever_covered']}
+            for item in skipped[:15]
+        ],
+    }
+
+
+def build_center_ai_insights_panel(center):
+    """AI insights for a center (cached by the AI layer itself)."""
+    from .ai_analytics import generate_center_insights
+    return _ai_panel(generate_center_insights(center))
+
+
+def _ai_panel(result):
+    result = result or {}
+    return {
+        'available': bool(result.get('success')),
+        'insights': result.get('insights', ''),
+        'error': '' if result.get('success') else result.get('error', 'AI insights are not available.'),
+    }
+
+
+STUDENT_PANELS = {
+    'trend': build_student_trend_panel,
+    'heatmap': build_student_heatmap_panel,
+    'subjects': build_student_subjects_panel,
+    'peers': build_student_peers_panel,
+    'ai-insights': build_student_ai_insights_panel,
+}
+
+FACULTY_PANELS = {
+    'trend': build_faculty_trend_panel,
+    'heatmap': build_faculty_heatmap_panel,
+    'peers': build_faculty_peers_panel,
+    'ai-insights': build_faculty_ai_insights_panel,
+}
+
+CENTER_PANELS = {
+    'trend': build_center_trend_panel,
+    'insights': build_center_insights_panel,
+    'ai-insights': build_center_ai_insights_panel,
+}
@@ -6,96 +6,41 @@ T137: Insights services (at-risk, extended, nearing completion)
 T138: Chart data preparation services
 """
 
-from django.db.models import Count, Q, Avg, Sum, F, ExpressionWrapper, fields
+from django.db.models import Count, Q, Avg, Sum, F, ExpressionWrapper, fields, OuterRef, Subquery
 from django.utils import timezone
 from datetime import timedelta, date
 from apps.centers.models import Center
 from apps.students.models import Student
 from apps.faculty.models import Faculty
 from apps.subjects.models import Subject, Assignment
-from apps.attendance.models import AttendanceRecord
+from apps.attendance.models import AssignmentProgress, AttendanceRecord
 
 
 def calculate_center_metrics(center=None):
     """
     Calculate comprehensive metrics for a center or all centers.
     
+    Counts come from the shared center statistics provider (see
+    apps/centers/statistics.py), so all centers are computed together.
+    
     Args:
         center: Center instance or None for all centers
     
     Returns:
         dict: Metrics including students, faculty, subjects, attendance
     """
-    today = timezone.now().date()
-    week_ago = today - timedelta(days=7)
-    month_ago = today - timedelta(days=30)
+    from apps.centers.statistics import get_center_statistics
     
     if center:
         centers = [center]
     else:
-        centers = Center.objects.filter(deleted_at__isnull=True, is_active=True)
+        centers = list(Center.objects.filter(deleted_at__isnull=True, is_active=True))
     
-    metrics = []
+    statistics = get_center_statistics(c.pk for c in centers)
     
+    metrics = []
     for c in centers:
-        # Student metrics
-        students = Student.objects.filter(center=c, deleted_at__isnull=True)
-        total_students = students.count()
-        active_students = students.filter(status='active').count()
-        inactive_students = students.filter(status='inactive').count()
-        completed_students = students.filter(status='completed').count()
-        
-        # Faculty metrics
-        faculty = Faculty.objects.filter(center=c, deleted_at__isnull=True)
-        total_faculty = faculty.count()
-        active_faculty = faculty.filter(is_active=True).count()
-        
-        # Subject metrics (subjects being taught at this center through assignments)
-        subjects_in_center = Assignment.objects.filter(
-            student__center=c,
-            deleted_at__isnull=True
-        ).values('subject').distinct()
-        total_subjects = subjects_in_center.count()
-        
-        active_subjects = Assignment.objects.filter(
-            student__center=c,
-            deleted_at__isnull=True,
-            is_active=True
-        ).values('subject').distinct().count()
-        
-        # Attendance metrics
-        attendance_records = AttendanceRecord.objects.filter(
-            student__center=c
-        )
-        total_attendance = attendance_records.count()
-        attendance_this_week = attendance_records.filter(date__gte=week_ago).count()
-        attendance_this_month = attendance_records.filter(date__gte=month_ago).count()
-        
-        # Calculate average session duration (in minutes)
-        avg_duration = attendance_records.aggregate(
-            avg_duration=Avg('duration_minutes')
-        )['avg_duration'] or 0
-        
-        # Attendance rate (this month)
-        if active_students > 0:
-            # Expected attendance: active students * days in month
-            days_in_month = (today - month_ago).days
-            expected_attendance = active_students * days_in_month
-            attendance_rate = (attendance_this_month / expected_attendance * 100) if expected_attendance > 0 else 0
-        else:
-            attendance_rate = 0
-        
-        # Students needing attention (no attendance in last 7 days)
-        students_with_recent_attendance = attendance_records.filter(
-            date__gte=week_ago
-        ).values_list('student_id', flat=True).distinct()
-        
-        students_needing_attention = students.filter(
-            status='active'
-        ).exclude(
-            id__in=students_with_recent_attendance
-        ).count()
-        
+        stats = statistics[c.pk]
         metrics.append({
             'center': c,
             'center_id': c.id,
@@ -103,28 +48,10 @@ def calculate_center_metrics(center=None):
             'center_code': c.code,
             'center_city': c.city,
             'center_state': c.state,
-            'students': {
-                'total': total_students,
-                'active': active_students,
-                'inactive': inactive_students,
-                'completed': completed_students,
-                'needing_attention': students_needing_attention,
-            },
-            'faculty': {
-                'total': total_faculty,
-                'active': active_faculty,
-            },
-            'subjects': {
-                'total': total_subjects,
-                'active': active_subjects,
-            },
-            'attendance': {
-                'total': total_attendance,
-                'this_week': attendance_this_week,
-                'this_month': attendance_this_month,
-                'avg_duration_minutes': round(avg_duration, 1),
-                'attendance_rate': round(attendance_rate, 1),
-            },
+            'students': dict(stats['students']),
+            'faculty': dict(stats['faculty']),
+            'subjects': dict(stats['subjects']),
+            'attendance': dict(stats['attendance']),
         })
     
     return metrics
@@ -273,15 +200,16 @@ def calculate_learning_velocity(student):
     """
     attendance_records = AttendanceRecord.objects.filter(student=student)
     
-    # Count unique topics covered
-    total_topics = 0
-    for record in attendance_records:
-        total_topics += record.topics_covered.count()
+    # Count topics covered across all sessions (record and class-session topics)
+    from apps.attendance.services import count_topic_links
+    total_topics = count_topic_links(attendance_records)
     
-    total_sessions = attendance_records.count()
-    total_minutes = attendance_records.aggregate(
+    totals = attendance_records.aggregate(
+        sessions=Count('id'),
         total=Sum('duration_minutes')
-    )['total'] or 0
+    )
+    total_sessions = totals['sessions']
+    total_minutes = totals['total'] or 0
     
     # Topics per session
     topics_per_session = total_topics / total_sessions if total_sessions > 0 else 0
@@ -332,9 +260,9 @@ def get_at_risk_students(center=None, days_threshold=7):
     
     # Annotate with last attendance date
     at_risk = at_risk.annotate(
-        last_attendance_date=AttendanceRecord.objects.filter(
-            student=F('id')
-        ).order_by('-date').values('date')[:1]
+        last_attendance_date=Subquery(AttendanceRecord.objects.filter(
+            student=OuterRef('pk')
+        ).order_by('-date').values('date')[:1])
     )
     
     return at_risk
@@ -375,59 +303,64 @@ def get_extended_students(center=None, months_threshold=6):
     return extended.order_by('enrollment_date')
 
 
+def _student_progress_totals(student_ids):
+    """Active assignments and attended sessions of students, from the progress rows."""
+    return {
+        row['student_id']: row
+        for row in AssignmentProgress.objects.filter(
+            student_id__in=student_ids,
+            assignment__deleted_at__isnull=True
+        ).order_by().values('student_id').annotate(
+            assignments=Count('pk'),
+            sessions=Sum('session_count')
+        )
+    }
+
+
 def get_nearing_completion_students(center=None, completion_threshold=80):
     """
-    Identify students nearing completion based on attendance and progress.
+    Identify students with a subject nearly or fully covered.
+    
+    Reads the per-assignment syllabus progress (see
+    apps/attendance/progress.py): a student is listed once, with their
+    most advanced assignment at or above the threshold.
     
     Args:
         center: Center instance or None for all centers
-        completion_threshold: Percentage threshold for completion
+        completion_threshold: Percentage of the subject's topics covered
     
     Returns:
         list: Students nearing completion with metrics
     """
-    students = Student.objects.filter(
-        status='active',
-        deleted_at__isnull=True
-    )
+    progress = AssignmentProgress.objects.filter(
+        percent_complete__gte=completion_threshold,
+        assignment__deleted_at__isnull=True,
+        student__status='active',
+        student__deleted_at__isnull=True
+    ).select_related('student__center', 'assignment__subject').order_by('-percent_complete', 'student_id')
     
     if center:
-        students = students.filter(center=center)
+        progress = progress.filter(student__center=center)
     
-    nearing_completion = []
-    
-    for student in students:
-        # Get total assignments and attendance
-        total_assignments = Assignment.objects.filter(
-            student=student,
-            deleted_at__isnull=True
-        ).count()
-        
-        if total_assignments == 0:
-            continue
-        
-        # Count attendance records
-        attendance_count = AttendanceRecord.objects.filter(
-            student=student
-        ).count()
-        
-        # Simple completion metric: attendance per assignment
-        # (In real scenario, you'd have more sophisticated completion tracking)
-        if attendance_count > 0:
-            # Assume average 20 sessions per subject for completion
-            expected_sessions = total_assignments * 20
-            completion_percentage = (attendance_count / expected_sessions * 100) if expected_sessions > 0 else 0
-            
-            if completion_percentage >= completion_threshold:
-                nearing_completion.append({
-                    'student': student,
-                    'completion_percentage': round(completion_percentage, 1),
-                    'attendance_count': attendance_count,
-                    'total_assignments': total_assignments,
-                    'days_enrolled': (timezone.now().date() - student.enrollment_date).days,
-                })
+    best = {}
+    for row in progress:
+        best.setdefault(row.student_id, row)
+    totals = _student_progress_totals(best.keys())
+    today = timezone.now().date()
     
-    return sorted(nearing_completion, key=lambda x: x['completion_percentage'], reverse=True)
+    return [
+        {
+            'student': row.student,
+            'subject': row.assignment.subject,
+            'completion_percentage': float(row.percent_complete),
+            'covered_topics': row.covered_topics,
+            'total_topics': row.total_topics,
+            'attendance_count': totals[student_id]['sessions'],
+            'total_assignments': totals[student_id]['assignments'],
+            'days_enrolled': (today - row.student.enrollment_date).days,
+        }
+        for student_id, row in best.items()
+    ]
 
 
 def get_insights_summary(center=None):
@@ -482,15 +415,20 @@ def prepare_attendance_trend_data(student=None, center=None, days=30):
     elif center:
         records = records.filter(student__center=center)
     
-    # Group by date
+    # Group by date in a single query
+    daily = {
+        row['date']: row
+        for row in records.values('date').annotate(
+            sessions=Count('id'),
+            duration=Sum('duration_minutes')
+        )
+    }
     date_range = [start_date + timedelta(days=x) for x in range(days + 1)]
     
     for current_date in date_range:
-        day_records = records.filter(date=current_date)
-        session_count = day_records.count()
-        total_duration = day_records.aggregate(
-            total=Sum('duration_minutes')
-        )['total'] or 0
+        day = daily.get(current_date, {})
+        session_count = day.get('sessions', 0)
+        total_duration = day.get('duration') or 0
         
         chart_data.append([
             current_date.strftime('%Y-%m-%d'),
@@ -516,21 +454,15 @@ def prepare_subject_completion_data(student):
     assignments = Assignment.objects.filter(
         student=student,
         deleted_at__isnull=True
-    ).select_related('subject')
+    ).select_related('subject', 'progress')
     
     for assignment in assignments:
-        session_count = AttendanceRecord.objects.filter(
-            student=student,
-            assignment=assignment
-        ).count()
-        
-        # Assume 20 sessions = 100% completion
-        progress = min((session_count / 20 * 100), 100)
-        
+        # Progress rows are created from the outbox shortly after the assignment
+        progress = getattr(assignment, 'progress', None)
         chart_data.append([
             assignment.subject.name,
-            session_count,
-            round(progress, 1)
+            progress.session_count if progress else 0,
+            float(progress.percent_complete) if progress else 0
         ])
     
     return chart_data
@@ -619,9 +551,19 @@ def get_low_performing_centers(attendance_threshold=60, satisfaction_threshold=3
     Returns:
         list: Low performing centers with metrics
     """
+    from apps.feedback.models import FeedbackResponse
+    
     center_metrics = calculate_center_metrics()
     low_performing = []
     
+    # Average satisfaction of every center's surveys in one grouped query
+    satisfaction = dict(FeedbackResponse.objects.filter(
+        survey__center_id__in=[metric['center_id'] for metric in center_metrics],
+        satisfaction_score__isnull=False
+    ).order_by().values('survey__center_id').annotate(
+        avg=Avg('satisfaction_score')
+    ).values_list('survey__center_id', 'avg'))
+    
     for metric in center_metrics:
         center = metric['center']
         attendance_rate = metric['attendance']['attendance_rate']
@@ -631,11 +573,7 @@ def get_low_performing_centers(attendance_threshold=60, satisfaction_threshold=3
         # Calculate at-risk percentage
         at_risk_percentage = (at_risk_count / total_students * 100) if total_students > 0 else 0
         
-        # Get average satisfaction from feedback
-        from apps.feedback.models import FeedbackResponse
-        avg_satisfaction = FeedbackResponse.objects.filter(
-            survey__center=center
-        ).aggregate(avg=Avg('rating'))['avg'] or 0
+        avg_satisfaction = satisfaction.get(center.pk) or 0
         
         # Determine if low performing
         is_low_performing = (
@@ -718,12 +656,17 @@ def get_irregular_students(center=None, days_window=30, gap_threshold=3):
 
 def get_delayed_students(center=None, months_threshold=6, progress_threshold=50):
     """
-    Identify students enrolled for extended periods with low progress.
+    Identify students with a subject still mostly uncovered after months.
+    
+    Reads the per-assignment syllabus progress (see
+    apps/attendance/progress.py): assignments started before the threshold
+    with less than progress_threshold percent of their topics covered. A
+    student is listed once, with their least advanced such assignment.
     
     Args:
         center: Center instance or None for all centers
-        months_threshold: Months enrolled to check
-        progress_threshold: Expected progress percentage
+        months_threshold: Months since enrollment and assignment start
+        progress_threshold: Expected percentage of topics covered
     
     Returns:
         list: Delayed students with metrics
@@ -731,51 +674,41 @@ def get_delayed_students(center=None, months_threshold=6, progress_threshold=50)
     today = timezone.now().date()
     threshold_date = today - timedelta(days=months_threshold * 30)
     
-    students = Student.objects.filter(
-        enrollment_date__lte=threshold_date,
-        status='active',
-        deleted_at__isnull=True
-    )
+    progress = AssignmentProgress.objects.filter(
+        percent_complete__lt=progress_threshold,
+        total_topics__gt=0,
+        assignment__start_date__lte=threshold_date,
+        assignment__is_active=True,
+        assignment__deleted_at__isnull=True,
+        student__enrollment_date__lte=threshold_date,
+        student__status='active',
+        student__deleted_at__isnull=True
+    ).select_related('student', 'assignment__subject').order_by('percent_complete', 'student_id')
     
     if center:
-        students = students.filter(center=center)
+        progress = progress.filter(student__center=center)
     
-    delayed_students = []
+    worst = {}
+    for row in progress:
+        worst.setdefault(row.student_id, row)
+    totals = _student_progress_totals(worst.keys())
     
-    for student in students:
-        enrollment_days = (today - student.enrollment_date).days
-        
-        # Get total assignments and attendance
-        from apps.subjects.models import Assignment
-        total_assignments = Assignment.objects.filter(
-            student=student,
-            deleted_at__isnull=True
-        ).count()
-        
-        if total_assignments == 0:
-            continue
-        
-        attendance_count = AttendanceRecord.objects.filter(
-            student=student
-        ).count()
-        
-        # Calculate expected sessions (assume 20 sessions per month per subject)
-        months_enrolled = enrollment_days / 30
-        expected_sessions = total_assignments * months_enrolled * 20 / 6  # Normalize
-        actual_progress = (attendance_count / expected_sessions * 100) if expected_sessions > 0 else 0
-        
-        if actual_progress < progress_threshold:
-            delayed_students.append({
-                'student': student,
-                'enrollment_days': enrollment_days,
-                'months_enrolled': round(months_enrolled, 1),
-                'expected_sessions': round(expected_sessions, 0),
-                'actual_sessions': attendance_count,
-                'progress_percentage': round(actual_progress, 1),
-                'assignments_count': total_assignments,
-            })
+    delayed_students = []
+    for student_id, row in worst.items():
+        enrollment_days = (today - row.student.enrollment_date).days
+        delayed_students.append({
+            'student': row.student,
+            'subject': row.assignment.subject,
+            'enrollment_days': enrollment_days,
+            'months_enrolled': round(enrollment_days / 30, 1),
+            'covered_topics': row.covered_topics,
+            'total_topics': row.total_topics,
+            'actual_sessions': totals[student_id]['sessions'],
+            'progress_percentage': float(row.percent_complete),
+            'assignments_count': totals[student_id]['assignments'],
+        })
     
-    return sorted(delayed_students, key=lambda x: x['progress_percentage'])
+    return delayed_students
 
 
 def calculate_profitability_metrics(center=None):
@@ -880,12 +813,18 @@ def get_faculty_free_slots(faculty=None, center=None, date=None):
                     'student': record.student,
                 })
         
-        # Calculate free slots (simplified - just show if busy or free)
-        total_busy_minutes = sum([
-            (slot['end'].hour * 60 + slot['end'].minute) - 
-            (slot['start'].hour * 60 + slot['start'].minute)
-            for slot in busy_slots
-        ])
+        # Busy time is the union of the windows: students of one class
+        # share a window, and overlapping windows count once
+        total_busy_minutes = 0
+        busy_until = None
+        for slot in busy_slots:
+            start = slot['start'].hour * 60 + slot['start'].minute
+            end = slot['end'].hour * 60 + slot['end'].minute
+            if busy_until is not None and start < busy_until:
+                start = busy_until
+            if end > start:
+                total_busy_minutes += end - start
+                busy_until = end
         
         # Working hours: 6 AM to 10 PM = 16 hours = 960 minutes
         total_available_minutes = 960
@@ -919,6 +858,7 @@ def get_skipped_topics(student=None, center=None, days=30):
     today = timezone.now().date()
     start_date = today - timedelta(days=days)
     
+    from apps.attendance.services import get_topic_links
     from apps.subjects.models import Assignment, Topic
     
     if student:
@@ -951,20 +891,22 @@ def get_skipped_topics(student=None, center=None, days=30):
         )
         
         # Get covered topics in the time period
-        covered_topic_ids = AttendanceRecord.objects.filter(
+        covered_topic_ids = set()
+        for links in get_topic_links(AttendanceRecord.objects.filter(
             student=assignment.student,
             assignment=assignment,
             date__gte=start_date
-        ).values_list('topics_covered', flat=True)
+        )):
+            covered_topic_ids.update(links.values_list('topic_ref', flat=True))
         
         # Find skipped topics
         for topic in all_topics:
             if topic.id not in covered_topic_ids:
                 # Check if ever covered
                 ever_covered = AttendanceRecord.objects.filter(
+                    Q(topics_covered=topic) | Q(session__topics_covered=topic),
                     student=assignment.student,
-                    assignment=assignment,
-                    topics_covered=topic
+                    assignment=assignment
                 ).exists()
                 
                 skipped_topics.append({
@@ -1,3 +1,153 @@
+import datetime
+import json
+
+from django.core.cache import cache
+from django.db.models import Sum
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.attendance.models import AttendanceRecord
+from apps.centers.models import Center
+from apps.core.outbox import DISPATCH_PENDING_KEY
+from apps.faculty.models import Faculty
+from apps.feedback.models import FeedbackResponse, FeedbackSurvey
+from apps.students.models import Student
+from apps.subjects.models import Assignment, Subject, Topic
+
+from .services import get_low_performing_centers
+
+
+class ReportTestData(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'master@example.com', 'pass', first_name='Master', last_name='User', role=User.MASTER_ACCOUNT
+        )
+        cls.audit = {'created_by': cls.user, 'modified_by': cls.user}
+        cls.center = cls.make_center('North', 'N1')
+        cls.other_center = cls.make_center('South', 'S1')
+
+    @classmethod
+    def make_center(cls, name, code):
+        return Center.objects.create(
+            name=name, code=code, address='1 Road', city='Pune', state='MH',
+            pincode='411001', phone='100', email=f'{code}@example.com', **cls.audit
+        )
+
+    @classmethod
+    def make_student(cls, center, enrollment_number, **kwargs):
+        return Student.objects.create(
+            center=center, first_name=enrollment_number, last_name='Rao', phone='111',
+            enrollment_number=enrollment_number, enrollment_date=datetime.date(2024, 1, 1),
+            guardian_name='Guardian', guardian_phone='222', **kwargs, **cls.audit
+        )
+
+    def setUp(self):
+        cache.clear()
+
+
+class LowPerformingCentersTests(ReportTestData):
+
+    def test_satisfaction_is_averaged_per_center(self):
+        today = timezone.localdate()
+        survey = FeedbackSurvey.objects.create(
+            title='Term survey', questions=[], center=self.center, is_published=True,
+            valid_from=today, valid_until=today, **self.audit
+        )
+        for number, score in (('E1', 2), ('E2', 5), ('E3', None)):
+            FeedbackResponse.objects.create(
+                survey=survey, student=self.make_student(self.center, number),
+                satisfaction_score=score, **self.audit
+            )
+
+        centers = {item['center']: item for item in get_low_performing_centers()}
+
+        self.assertEqual(centers[self.center]['satisfaction_score'], 3.5)
+        self.assertEqual(centers[self.other_center]['satisfaction_score'], 0)
+
+
+class ReportPanelTests(ReportTestData):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.student = cls.make_student(cls.center, 'E1')
+        faculty_user = User.objects.create_user(
+            'f1@example.com', 'pass', first_name='Mira', last_name='Iyer', role=User.FACULTY
+        )
+        faculty = Faculty.objects.create(
+            user=faculty_user, center=cls.center, employee_id='EMP1',
+            joining_date=datetime.date(2024, 1, 1), **cls.audit
+        )
+        subject = Subject.objects.create(name='Maths', code='MATH', **cls.audit)
+        cls.topics = [
+            Topic.objects.create(subject=subject, name=f'Topic {number}', sequence_number=number, **cls.audit)
+            for number in (1, 2)
+        ]
+        cls.assignment = Assignment.objects.create(
+            student=cls.student, subject=subject, faculty=faculty,
+            start_date=datetime.date(2024, 1, 1), **cls.audit
+        )
+
+    def setUp(self):
+        super().setUp()
+        # Commit hooks would queue the outbox dispatcher; there is no broker
+        cache.set(DISPATCH_PENDING_KEY, True)
+        self.client.force_login(self.user)
+        self.url = reverse('reports:student_report_panel', args=[self.student.pk, 'trend'])
+        today = timezone.now().date()
+        for days_ago, topics in ((70, []), (40, self.topics), (3, self.topics[:1])):
+            self.mark(today - datetime.timedelta(days=days_ago), topics)
+
+    def mark(self, date, topics=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            record = AttendanceRecord.objects.create(
+                student=self.student, assignment=self.assignment, date=date,
+                in_time=datetime.time(10), out_time=datetime.time(11), duration_minutes=60,
+                marked_by=self.user, **self.audit
+            )
+            record.topics_covered.set(topics)
+        return record
+
+    def page_charts(self):
+        """The trend charts as the full report page used to compute them, record by record."""
+        today = timezone.now().date()
+        records = AttendanceRecord.objects.filter(student=self.student)
+        monthly_learning = [['Month', 'Sessions', 'Hours', 'Topics']]
+        for i in range(5, -1, -1):
+            month_start = today.replace(day=1) - datetime.timedelta(days=i * 30)
+            month_records = records.filter(date__range=[month_start, month_start + datetime.timedelta(days=30)])
+            monthly_learning.append([
+                month_start.strftime('%b'),
+                month_records.count(),
+                round((month_records.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60, 1),
+                sum(record.topics_covered.count() for record in month_records),
+            ])
+        progress_over_time = [['Date', 'Cumulative Topics']]
+        cumulative_topics = 0
+        for record in records.order_by('date')[:30]:
+            cumulative_topics += record.topics_covered.count()
+            progress_over_time.append([record.date.strftime('%m/%d'), cumulative_topics])
+        return monthly_learning, progress_over_time
+
+    def test_trend_panel_matches_the_report_page(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual((data['monthly_learning'], data['progress_over_time']), self.page_charts())
+
+    def test_unchanged_panel_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
 
-# Create your tests here.
+        self.mark(timezone.now().date(), self.topics[1:])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(json.loads(response.content)['progress_over_time'], self.page_charts()[1])
@@ -2,11 +2,20 @@
 URL configuration for reports app.
 """
 
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, panel_views, async_views
 
 app_name = 'reports'
 
+# Heavy reports run their query sections concurrently unless disabled
+if settings.REPORTS_ASYNC_VIEWS:
+    StudentReportView = async_views.AsyncStudentReportView
+    FacultyReportView = async_views.AsyncFacultyReportView
+else:
+    StudentReportView = views.StudentReportView
+    FacultyReportView = views.FacultyReportView
+
 urlpatterns = [
     # Master Account Dashboard
     path('master/', views.MasterAccountDashboardView.as_view(), name='master_dashboard'),
@@ -20,10 +29,15 @@ urlpatterns = [
     path('center/<int:center_id>/', views.CenterReportView.as_view(), name='center_report'),
     
     # T133: Student report
-    path('student/<int:student_id>/', views.StudentReportView.as_view(), name='student_report'),
+    path('student/<int:student_id>/', StudentReportView.as_view(), name='student_report'),
+    path('student/<int:student_id>/panels/<slug:panel>/', panel_views.StudentReportPanelView.as_view(), name='student_report_panel'),
     
     # T134: Faculty report
-    path('faculty/<int:faculty_id>/', views.FacultyReportView.as_view(), name='faculty_report'),
+    path('faculty/<int:faculty_id>/', FacultyReportView.as_view(), name='faculty_report'),
+    path('faculty/<int:faculty_id>/panels/<slug:panel>/', panel_views.FacultyReportPanelView.as_view(), name='faculty_report_panel'),
+    
+    # Center dashboard panels (loaded lazily by centers:dashboard)
+    path('center-dashboard/panels/<slug:panel>/', panel_views.CenterDashboardPanelView.as_view(), name='center_dashboard_panel'),
     
     # T135: Insights
     path('insights/', views.InsightsView.as_view(), name='insights'),
@@ -11,18 +11,24 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import TemplateView, DetailView, ListView
 from django.contrib import messages
 from django.shortcuts import redirect, get_object_or_404
+from django.urls import reverse
 from django.db.models import Count, Q, Max, Sum, Avg
 import json
 
-from apps.core.mixins import AdminOrFacultyRequiredMixin
+from apps.core.mixins import AdminOrFacultyRequiredMixin, MasterAccountRedirectMixin
+from apps.core.principal import get_principal
+from apps.attendance.scheduling import get_expected_attendance
+from apps.attendance.services import count_topic_links, topic_count_expression
 from apps.centers.models import Center
 from apps.students.models import Student
 from apps.faculty.models import Faculty
+from .mixins import StudentReportAccessMixin, FacultyReportAccessMixin, deny_report_access
+from .sections import run_sections
 from .services import (
     calculate_center_metrics, calculate_all_centers_summary, get_top_performing_centers,
     calculate_attendance_velocity, calculate_learning_velocity,
     get_insights_summary, get_at_risk_students, get_extended_students, get_nearing_completion_students,
-    prepare_attendance_trend_data, prepare_subject_completion_data,
+    prepare_attendance_trend_data,
     prepare_attendance_distribution_data, prepare_faculty_performance_data,
     get_low_performing_centers, get_irregular_students, get_delayed_students,
     calculate_profitability_metrics, get_faculty_free_slots, get_skipped_topics,
@@ -30,23 +36,23 @@ from .services import (
 )
 
 
-class MasterAccountRequiredMixin(LoginRequiredMixin):
-    """Mixin to ensure only master accounts can access reports."""
-    
-    def dispatch(self, request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            return super().dispatch(request, *args, **kwargs)
-        if not request.user.is_master_account:
-            messages.error(request, 'You do not have permission to access reports.')
-            return redirect('accounts:profile')
-        return super().dispatch(request, *args, **kwargs)
+# FacultyFeedback rubric fields averaged on the faculty report
+FEEDBACK_SCORE_FIELDS = {
+    'teaching_quality': 'teaching_quality',
+    'subject_knowledge': 'subject_knowledge',
+    'explanation_clarity': 'explanation_clarity',
+    'student_engagement': 'student_engagement',
+    'doubt_resolution': 'doubt_resolution',
+    'overall': 'overall_score',
+}
 
 
-class AllCentersReportView(MasterAccountRequiredMixin, TemplateView):
+class AllCentersReportView(MasterAccountRedirectMixin, TemplateView):
     """
     T123: View for comparing all centers side-by-side.
     Shows metrics, charts, and performance comparison.
     """
+    permission_denied_message = 'You do not have permission to access reports.'
     template_name = 'reports/all_centers.html'
     
     def get_context_data(self, **kwargs):
@@ -182,9 +188,9 @@ class CenterReportView(LoginRequiredMixin, TemplateView):
         center = get_object_or_404(Center, pk=center_id, deleted_at__isnull=True)
         
         # Check permissions for center heads
-        if self.request.user.is_center_head:
-            if not hasattr(self.request.user, 'center_head_profile') or \
-               self.request.user.center_head_profile.center != center:
+        principal = get_principal(self.request)
+        if principal.is_center_head:
+            if not principal.can_access_center(center.pk):
                 messages.error(self.request, 'You do not have permission to view this center.')
                 return redirect('accounts:profile')
         
@@ -273,11 +279,13 @@ class CenterReportView(LoginRequiredMixin, TemplateView):
 
 # T133: Student Report View
 
-class StudentReportView(LoginRequiredMixin, TemplateView):
+class StudentReportView(LoginRequiredMixin, StudentReportAccessMixin, TemplateView):
     """
     T133: Detailed report for a specific student.
     ACCESS: Master Account, Center Head, and Faculty.
     Shows attendance history, learning velocity, subject progress, and Gantt chart.
+    Charts, subject table and peer comparison are loaded lazily from the
+    panel endpoints (StudentReportPanelView).
     """
     template_name = 'reports/student_report.html'
     
@@ -288,294 +296,136 @@ class StudentReportView(LoginRequiredMixin, TemplateView):
             return redirect_to_login(request.get_full_path())
         
         # Allow master accounts, center heads, and faculty
-        if not (request.user.is_master_account or request.user.is_center_head or request.user.is_faculty_member):
-            messages.error(request, 'You do not have permission to access student reports.')
-            return redirect('accounts:profile')
+        if not self.has_report_role(request.user):
+            return deny_report_access(request, 'You do not have permission to access student reports.')
         
         return super().dispatch(request, *args, **kwargs)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        student_id = self.kwargs.get('student_id')
-        student = get_object_or_404(Student, pk=student_id, deleted_at__isnull=True)
+        from django.utils import timezone
         
-        # Check permissions based on role
-        if self.request.user.is_center_head:
-            if not hasattr(self.request.user, 'center_head_profile'):
-                messages.error(self.request, 'Your center head profile is not set up.')
-                return redirect('accounts:profile')
-            if self.request.user.center_head_profile.center != student.center:
-                from django.core.exceptions import PermissionDenied
-                raise PermissionDenied("You can only view students from your center.")
+        student = self.get_report_student()
+        today = timezone.now().date()
+        sections = run_sections(self.get_report_sections(student, today))
+        context.update(self.build_report_context(student, today, sections))
+        return context
+    
+    def get_report_sections(self, student, today):
+        """
+        Independent queries behind the report, keyed by section name.
+        They run one after another here and concurrently in
+        AsyncStudentReportView, so none may depend on another's result.
+        """
+        from apps.attendance.models import AttendanceRecord
+        from datetime import timedelta
         
-        elif self.request.user.is_faculty_member:
-            if not hasattr(self.request.user, 'faculty_profile'):
-                messages.error(self.request, 'Your faculty profile is not set up.')
-                return redirect('accounts:profile')
-            # Faculty can only view students they teach
-            from apps.subjects.models import Assignment
-            has_assignment = Assignment.objects.filter(
-                student=student,
-                faculty=self.request.user.faculty_profile,
-                is_active=True
-            ).exists()
-            if not has_assignment:
-                from django.core.exceptions import PermissionDenied
-                raise PermissionDenied("You can only view students you teach.")
+        all_records = AttendanceRecord.objects.filter(student=student)
         
+        return {
+            'expected_attendance': lambda: get_expected_attendance(
+                student, student.enrollment_date or today - timedelta(days=365), today
+            ),
+            'attendance_velocity': lambda: calculate_attendance_velocity(student, days=30),
+            'learning_velocity': lambda: calculate_learning_velocity(student),
+            'totals': lambda: all_records.aggregate(
+                sessions=Count('id'),
+                minutes=Sum('duration_minutes'),
+                avg_duration=Avg('duration_minutes'),
+                last_date=Max('date'),
+                recent_30=Count('id', filter=Q(date__gte=today - timedelta(days=30))),
+                morning=Count('id', filter=Q(in_time__hour__lt=12)),
+                afternoon=Count('id', filter=Q(in_time__hour__gte=12, in_time__hour__lt=17)),
+                evening=Count('id', filter=Q(in_time__hour__gte=17)),
+            ),
+            'total_topics': lambda: count_topic_links(all_records),
+            'session_topic_counts': lambda: list(all_records.order_by('date', 'in_time').annotate(
+                topic_count=topic_count_expression()
+            ).values_list('topic_count', flat=True)),
+            'recent_dates': lambda: list(
+                all_records.filter(date__gte=today - timedelta(days=60)).order_by('date').values_list('date', flat=True)
+            ),
+            'subject_sessions': lambda: dict(
+                all_records.values('assignment__subject__name').annotate(
+                    count=Count('id')
+                ).values_list('assignment__subject__name', 'count')
+            ),
+            'recent_attendance': lambda: list(all_records.select_related(
+                'assignment__subject', 'marked_by'
+            ).prefetch_related(
+                'topics_covered', 'session__topics_covered'
+            ).order_by('-date')[:10]),
+        }
+    
+    def build_report_context(self, student, today, sections):
+        """
+        Derive the report metrics, insights and recommendations from the
+        section results. Pure computation, no queries.
+        """
+        from datetime import timedelta
+        
+        context = {}
         context['student'] = student
+        context['panel_url'] = reverse('reports:student_report', args=[student.pk]) + 'panels/'
         
         # Calculate velocities
-        attendance_velocity = calculate_attendance_velocity(student, days=30)
-        learning_velocity = calculate_learning_velocity(student)
-        context['attendance_velocity'] = attendance_velocity
-        context['learning_velocity'] = learning_velocity
+        context['attendance_velocity'] = sections['attendance_velocity']
+        context['learning_velocity'] = sections['learning_velocity']
         
         # ENHANCED ACADEMIC INSIGHTS
-        from apps.attendance.models import AttendanceRecord
-        from apps.subjects.models import Assignment
-        from django.db.models import Avg, Sum, Count
-        from django.utils import timezone
-        from datetime import timedelta
+        totals = sections['totals']
+        total_topics = sections['total_topics']
         
-        today = timezone.now().date()
-        all_records = AttendanceRecord.objects.filter(student=student)
+        # Expected sessions from the student's schedules, as (date, attended)
+        # pairs; without a schedule the usual rates are assumed below.
+        expected_attendance = sections['expected_attendance']
+        recent_expected = [attended for day, attended in expected_attendance if day > today - timedelta(days=30)]
+        context['has_schedule'] = bool(expected_attendance)
         
         # 1. Attendance Consistency Score (0-100)
-        last_30_days = today - timedelta(days=30)
-        expected_sessions = 20  # Assume 20 sessions per month is ideal
-        actual_sessions = all_records.filter(date__gte=last_30_days).count()
-        consistency_score = min(100, (actual_sessions / expected_sessions) * 100)
+        if recent_expected:
+            consistency_score = sum(recent_expected) / len(recent_expected) * 100
+        else:
+            expected_sessions = 20  # Assume 20 sessions per month is ideal
+            actual_sessions = totals['recent_30']
+            consistency_score = min(100, (actual_sessions / expected_sessions) * 100)
         context['consistency_score'] = round(consistency_score, 1)
         
         # 2. Learning Efficiency (topics per hour)
-        total_topics = 0
-        for record in all_records:
-            total_topics += record.topics_covered.count()
-        total_hours = (all_records.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60
+        total_hours = (totals['minutes'] or 0) / 60
         learning_efficiency = round(total_topics / total_hours, 2) if total_hours > 0 else 0
         context['learning_efficiency'] = learning_efficiency
         
         # 3. At-Risk Status
-        days_since_last = (today - all_records.order_by('-date').first().date).days if all_records.exists() else 999
+        days_since_last = (today - totals['last_date']).days if totals['last_date'] else 999
         context['at_risk'] = days_since_last >= 7
         context['days_since_last_session'] = days_since_last
         
         # 4. Enrollment Duration vs Progress
         enrollment_days = (today - student.enrollment_date).days if student.enrollment_date else 0
-        total_sessions = all_records.count()
-        expected_sessions_total = (enrollment_days / 30) * 20  # 20 sessions per month
-        progress_vs_expected = (total_sessions / expected_sessions_total * 100) if expected_sessions_total > 0 else 0
+        total_sessions = totals['sessions']
+        if expected_attendance:
+            attended_slots = sum(attended for day, attended in expected_attendance)
+            progress_vs_expected = attended_slots / len(expected_attendance) * 100
+        else:
+            expected_sessions_total = (enrollment_days / 30) * 20  # 20 sessions per month
+            progress_vs_expected = (total_sessions / expected_sessions_total * 100) if expected_sessions_total > 0 else 0
         context['enrollment_days'] = enrollment_days
         context['progress_vs_expected'] = round(progress_vs_expected, 1)
         
-        # 5. Subject-wise Performance
-        assignments = Assignment.objects.filter(student=student, deleted_at__isnull=True)
-        subject_performance = []
-        for assignment in assignments:
-            subject_records = all_records.filter(assignment=assignment)
-            # Count topics manually for ManyToMany field
-            topics_count = 0
-            for record in subject_records:
-                topics_count += record.topics_covered.count()
-            
-            subject_performance.append({
-                'subject': assignment.subject.name,
-                'sessions': subject_records.count(),
-                'hours': round((subject_records.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60, 1),
-                'topics': topics_count,
-                'avg_duration': round(subject_records.aggregate(avg=Avg('duration_minutes'))['avg'] or 0, 1),
-                'last_session': subject_records.order_by('-date').first().date if subject_records.exists() else None
-            })
-        context['subject_performance'] = subject_performance
-        
-        # 6. Weekly Pattern Analysis
-        weekly_pattern = {}
-        for i in range(7):
-            day_name = (today - timedelta(days=i)).strftime('%A')
-            day_sessions = all_records.filter(date__week_day=(today - timedelta(days=i)).isoweekday())
-            weekly_pattern[day_name] = day_sessions.count()
-        context['weekly_pattern'] = weekly_pattern
-        context['most_active_day'] = max(weekly_pattern, key=weekly_pattern.get) if weekly_pattern else 'N/A'
-        
-        # 7. Comparative Metrics (vs center average)
-        center_students = Student.objects.filter(center=student.center, deleted_at__isnull=True)
-        center_avg_sessions = AttendanceRecord.objects.filter(
-            student__in=center_students
-        ).values('student').annotate(count=Count('id')).aggregate(avg=Avg('count'))['avg'] or 0
-        context['center_avg_sessions'] = round(center_avg_sessions, 1)
-        context['performance_vs_peers'] = 'Above Average' if total_sessions > center_avg_sessions else 'Below Average'
-        
-        # Prepare charts
-        # Chart 1: Attendance trend
-        attendance_trend = prepare_attendance_trend_data(student=student, days=30)
-        context['attendance_trend_data'] = json.dumps(attendance_trend)
-        
-        # Debug: Log chart data
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"Student {student.id} - Attendance trend rows: {len(attendance_trend)}")
-        logger.info(f"Student {student.id} - Total attendance records: {all_records.count()}")
-        
-        # Chart 2: Subject completion
-        subject_completion = prepare_subject_completion_data(student)
-        context['subject_completion_data'] = json.dumps(subject_completion)
-        logger.info(f"Student {student.id} - Subject completion rows: {len(subject_completion)}")
-        
-        # NEW CHARTS FOR DETAILED ANALYTICS
-        
-        # Chart 3: Subject Mastery Pie Chart
-        subject_mastery_data = [['Subject', 'Topics Covered']]
-        for perf in subject_performance:
-            if perf['topics'] > 0:
-                subject_mastery_data.append([perf['subject'][:15], perf['topics']])
-        context['subject_mastery_data'] = json.dumps(subject_mastery_data)
-        
-        # Chart 4: Monthly Learning Trend (6 months)
-        monthly_learning = [['Month', 'Sessions', 'Hours', 'Topics']]
-        for i in range(5, -1, -1):
-            month_start = today.replace(day=1) - timedelta(days=i*30)
-            month_end = month_start + timedelta(days=30)
-            month_records = all_records.filter(date__range=[month_start, month_end])
-            
-            month_topics = 0
-            for record in month_records:
-                month_topics += record.topics_covered.count()
-            
-            monthly_learning.append([
-                month_start.strftime('%b'),
-                month_records.count(),
-                round((month_records.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60, 1),
-                month_topics
-            ])
-        context['monthly_learning_data'] = json.dumps(monthly_learning)
-        
-        # Chart 5: Weekly Learning Pattern (Bar Chart)
-        weekly_pattern_chart = [['Day', 'Sessions', 'Hours']]
-        days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        for day in days_order:
-            day_count = weekly_pattern.get(day, 0)
-            day_records = all_records.filter(date__week_day=days_order.index(day) + 1)
-            day_hours = round((day_records.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60, 1)
-            weekly_pattern_chart.append([day[:3], day_count, day_hours])
-        context['weekly_pattern_chart'] = json.dumps(weekly_pattern_chart)
-        
-        # Chart 6: Hourly Learning Preference (Area Chart)
-        hourly_preference = [['Hour', 'Sessions']]
-        for hour in range(6, 22):
-            hour_count = 0
-            for record in all_records:
-                if record.in_time and record.in_time.hour == hour:
-                    hour_count += 1
-            hourly_preference.append([f"{hour}:00", hour_count])
-        context['hourly_preference_data'] = json.dumps(hourly_preference)
-        
-        # Chart 7: Learning Velocity Trend (Line Chart - Last 10 sessions)
-        velocity_trend = [['Session', 'Topics/Hour']]
-        recent_10 = all_records.order_by('-date')[:10]
-        session_num = 10
-        for record in reversed(list(recent_10)):
-            duration_hours = record.duration_minutes / 60 if record.duration_minutes > 0 else 1
-            topics_count = record.topics_covered.count()
-            velocity = round(topics_count / duration_hours, 2)
-            velocity_trend.append([f"S{session_num}", velocity])
-            session_num -= 1
-        context['velocity_trend_data'] = json.dumps(velocity_trend)
-        
-        # Chart 8: Progress Over Time (Area Chart)
-        progress_over_time = [['Date', 'Cumulative Topics']]
-        cumulative_topics = 0
-        for record in all_records.order_by('date')[:30]:  # Last 30 sessions
-            cumulative_topics += record.topics_covered.count()
-            progress_over_time.append([record.date.strftime('%m/%d'), cumulative_topics])
-        context['progress_over_time_data'] = json.dumps(progress_over_time)
-        
-        # Chart 9: Google Calendar Chart (From enrollment date to today)
-        # Use enrollment date as start date (can be backdated by admin)
-        if student.enrollment_date:
-            start_date = student.enrollment_date
-        else:
-            # Fallback to first attendance or 1 year ago
-            first_record = all_records.order_by('date').first()
-            if first_record:
-                start_date = first_record.date
-            else:
-                start_date = today - timedelta(days=365)
-        
-        # Create a dictionary for quick lookup
-        attendance_by_date = {}
-        for record in all_records:
-            date_str = record.date.strftime('%Y-%m-%d')
-            topics_list = [topic.name for topic in record.topics_covered.all()]
-            
-            if date_str not in attendance_by_date:
-                attendance_by_date[date_str] = {
-                    'sessions': 0,
-                    'hours': 0,
-                    'topics': [],
-                    'subjects': set()
-                }
-            
-            attendance_by_date[date_str]['sessions'] += 1
-            attendance_by_date[date_str]['hours'] += record.duration_minutes / 60
-            attendance_by_date[date_str]['topics'].extend(topics_list)
-            attendance_by_date[date_str]['subjects'].add(record.assignment.subject.name)
-        
-        # Generate Google Calendar Chart data format: [Date, Hours]
-        # Google Calendar expects: new Date(year, month, day), value
-        calendar_chart_data = [['Date', 'Hours', {'type': 'string', 'role': 'tooltip', 'p': {'html': True}}]]
-        
-        current_date = start_date
-        while current_date <= today:
-            date_str = current_date.strftime('%Y-%m-%d')
-            
-            if date_str in attendance_by_date:
-                data = attendance_by_date[date_str]
-                hours = round(data['hours'], 1)
-                topics = ', '.join(data['topics']) if data['topics'] else 'No topics'
-                subjects = ', '.join(data['subjects'])
-                
-                # Create HTML tooltip
-                tooltip = f"<div style='padding:10px;'><b>{current_date.strftime('%b %d, %Y')}</b><br/>" \
-                         f"<b>Subjects:</b> {subjects}<br/>" \
-                         f"<b>Topics:</b> {topics}<br/>" \
-                         f"<b>Sessions:</b> {data['sessions']}<br/>" \
-                         f"<b>Hours:</b> {hours}</div>"
-                
-                calendar_chart_data.append([
-                    f"new Date({current_date.year}, {current_date.month - 1}, {current_date.day})",
-                    hours,
-                    tooltip
-                ])
-            else:
-                # No attendance - value 0
-                tooltip = f"<div style='padding:10px;'><b>{current_date.strftime('%b %d, %Y')}</b><br/>" \
-                         f"<b>Status:</b> Absent</div>"
-                calendar_chart_data.append([
-                    f"new Date({current_date.year}, {current_date.month - 1}, {current_date.day})",
-                    0,
-                    tooltip
-                ])
-            
-            current_date += timedelta(days=1)
-        
-        context['calendar_chart_data'] = calendar_chart_data
-        context['calendar_start_year'] = start_date.year
-        context['calendar_end_year'] = today.year
-        
         # Get recent attendance records
-        recent_attendance = all_records.select_related(
-            'assignment__subject', 'marked_by'
-        ).order_by('-date')[:10]
-        context['recent_attendance'] = recent_attendance
+        context['recent_attendance'] = sections['recent_attendance']
         
         # ENHANCED STUDENT INSIGHTS & RECOMMENDATIONS
         
         # 1. Calculate Total Sessions (Attended / Expected)
         days_enrolled = (today - student.enrollment_date).days if student.enrollment_date else 0
         weeks_enrolled = days_enrolled / 7
-        expected_total_sessions = int(weeks_enrolled * 3)  # Assuming 3 sessions per week is ideal
-        actual_total_sessions = all_records.count()
+        if expected_attendance:
+            expected_total_sessions = len(expected_attendance)
+        else:
+            expected_total_sessions = int(weeks_enrolled * 3)  # Assuming 3 sessions per week is ideal
+        actual_total_sessions = total_sessions
         attendance_completion_rate = round((actual_total_sessions / expected_total_sessions * 100), 1) if expected_total_sessions > 0 else 0
         
         context['expected_total_sessions'] = expected_total_sessions
@@ -585,11 +435,9 @@ class StudentReportView(LoginRequiredMixin, TemplateView):
         
         # 2. Consistency Score (0-100) - Based on regularity of attendance
         # Check attendance pattern over last 60 days
-        sixty_days_ago = today - timedelta(days=60)
-        recent_60_days = all_records.filter(date__gte=sixty_days_ago).order_by('date')
+        dates_list = sections['recent_dates']
         
-        if recent_60_days.count() >= 3:
-            dates_list = list(recent_60_days.values_list('date', flat=True))
+        if len(dates_list) >= 3:
             gaps = []
             for i in range(1, len(dates_list)):
                 gap = (dates_list[i] - dates_list[i-1]).days
@@ -628,9 +476,9 @@ class StudentReportView(LoginRequiredMixin, TemplateView):
         learning_patterns = []
         
         # Pattern 1: Preferred learning time
-        morning_sessions = all_records.filter(in_time__hour__lt=12).count()
-        afternoon_sessions = all_records.filter(in_time__hour__gte=12, in_time__hour__lt=17).count()
-        evening_sessions = all_records.filter(in_time__hour__gte=17).count()
+        morning_sessions = totals['morning']
+        afternoon_sessions = totals['afternoon']
+        evening_sessions = totals['evening']
         
         if morning_sessions > afternoon_sessions and morning_sessions > evening_sessions:
             preferred_time = "Morning (before 12 PM)"
@@ -646,7 +494,7 @@ class StudentReportView(LoginRequiredMixin, TemplateView):
         })
         
         # Pattern 2: Average session duration
-        avg_duration = all_records.aggregate(avg=Avg('duration_minutes'))['avg'] or 0
+        avg_duration = totals['avg_duration'] or 0
         if avg_duration >= 90:
             duration_assessment = "Excellent - Long focused sessions"
         elif avg_duration >= 60:
@@ -664,11 +512,9 @@ class StudentReportView(LoginRequiredMixin, TemplateView):
         
         # Pattern 3: Learning velocity trend
         if actual_total_sessions >= 10:
-            first_half = all_records.order_by('date')[:actual_total_sessions//2]
-            second_half = all_records.order_by('date')[actual_total_sessions//2:]
-            
-            first_half_topics = sum(r.topics_covered.count() for r in first_half)
-            second_half_topics = sum(r.topics_covered.count() for r in second_half)
+            topic_counts = sections['session_topic_counts']
+            first_half_topics = sum(topic_counts[:actual_total_sessions//2])
+            second_half_topics = sum(topic_counts[actual_total_sessions//2:])
             
             if second_half_topics > first_half_topics * 1.2:
                 velocity_trend = "Improving - Learning pace is accelerating"
@@ -684,10 +530,7 @@ class StudentReportView(LoginRequiredMixin, TemplateView):
             })
         
         # Pattern 4: Subject focus
-        subject_sessions = {}
-        for record in all_records:
-            subject_name = record.assignment.subject.name
-            subject_sessions[subject_name] = subject_sessions.get(subject_name, 0) + 1
+        subject_sessions = sections['subject_sessions']
         
         if subject_sessions:
             most_focused_subject = max(subject_sessions, key=subject_sessions.get)
@@ -926,10 +769,12 @@ class StudentReportView(LoginRequiredMixin, TemplateView):
 
 # T134: Faculty Report View
 
-class FacultyReportView(LoginRequiredMixin, TemplateView):
+class FacultyReportView(LoginRequiredMixin, FacultyReportAccessMixin, TemplateView):
     """
     T134: Detailed report for a specific faculty member.
     Shows teaching statistics, student performance, and session metrics.
+    Activity trend, schedule utilisation, peer comparison and AI insights are
+    loaded lazily from the panel endpoints (FacultyReportPanelView).
     """
     template_name = 'reports/faculty_report.html'
     
@@ -937,85 +782,186 @@ class FacultyReportView(LoginRequiredMixin, TemplateView):
         # Allow master accounts and center heads
         if not request.user.is_authenticated:
             return super().dispatch(request, *args, **kwargs)
-        if not (request.user.is_master_account or request.user.is_center_head):
-            messages.error(request, 'You do not have permission to access reports.')
-            return redirect('accounts:profile')
+        if not self.has_report_role(request.user):
+            return deny_report_access(request)
         return super().dispatch(request, *args, **kwargs)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        faculty_id = self.kwargs.get('faculty_id')
-        faculty = get_object_or_404(Faculty, pk=faculty_id, deleted_at__isnull=True)
-        
-        # Check permissions for center heads
-        if self.request.user.is_center_head:
-            if not hasattr(self.request.user, 'center_head_profile') or \
-               self.request.user.center_head_profile.center != faculty.center:
-                messages.error(self.request, 'You do not have permission to view this faculty.')
-                return redirect('accounts:profile')
-        
-        context['faculty'] = faculty
+        from django.utils import timezone
         
-        # Get teaching statistics
+        faculty = self.get_report_faculty()
+        today = timezone.now().date()
+        sections = run_sections(self.get_report_sections(faculty, today))
+        context.update(self.build_report_context(faculty, today, sections))
+        return context
+    
+    def get_report_sections(self, faculty, today):
+        """
+        Independent queries behind the report, keyed by section name.
+        They run one after another here and concurrently in
+        AsyncFacultyReportView, so none may depend on another's result.
+        """
         from apps.attendance.models import AttendanceRecord
         from apps.subjects.models import Assignment
-        from django.db.models import Avg, Sum
+        from apps.feedback.models import FeedbackResponse
+        from django.db.models import Min
+        from datetime import timedelta
         
         records = AttendanceRecord.objects.filter(marked_by=faculty.user)
+        active_assignments = Assignment.objects.filter(
+            faculty=faculty,
+            is_active=True,
+            deleted_at__isnull=True
+        )
+        seven_days_ago = today - timedelta(days=7)
         
-        total_sessions = records.count()
-        total_students = records.values('student').distinct().count()
+        def totals():
+            return records.aggregate(
+                total_sessions=Count('id'),
+                total_students=Count('student', distinct=True),
+                avg_duration=Avg('duration_minutes'),
+                total_minutes=Sum('duration_minutes'),
+                # Weeks with sessions over the last 8 weeks
+                weeks_with_sessions=Count('date__week', distinct=True, filter=Q(date__gte=today - timedelta(days=56))),
+                students_present=Count('student', distinct=True, filter=Q(date__gte=seven_days_ago)),
+            )
         
-        stats = {
-            'total_sessions': total_sessions,
-            'total_students': total_students,
-            'total_subjects': Assignment.objects.filter(
+        def at_risk_students():
+            # Active students with no session from this faculty in the last 7 days
+            students = Student.objects.filter(
+                id__in=active_assignments.values('student_id')
+            ).exclude(
+                id__in=records.filter(date__gte=seven_days_ago).values('student_id')
+            ).select_related('center').annotate(
+                last_session_date=Max('attendance_records__date', filter=Q(attendance_records__marked_by=faculty.user)),
+                total_sessions=Count('attendance_records', filter=Q(attendance_records__marked_by=faculty.user)),
+                total_hours=Sum('attendance_records__duration_minutes', filter=Q(attendance_records__marked_by=faculty.user))
+            ).order_by('last_session_date')
+            return list(students)
+        
+        def recent_student_dates():
+            # Session dates per active student over the last 30 days, in one query
+            dates = {}
+            for student_id, date in records.filter(
+                student_id__in=active_assignments.values('student_id'),
+                date__gte=today - timedelta(days=30)
+            ).order_by('student_id', 'date').values_list('student_id', 'date'):
+                dates.setdefault(student_id, []).append(date)
+            return dates
+        
+        return {
+            'totals': totals,
+            'total_subjects': lambda: Assignment.objects.filter(
                 faculty=faculty,
                 deleted_at__isnull=True
             ).values('subject').distinct().count(),
-            'avg_session_duration': records.aggregate(avg=Avg('duration_minutes'))['avg'] or 0,
-            'total_teaching_hours': (records.aggregate(total=Sum('duration_minutes'))['total'] or 0) / 60,
+            'total_topics': lambda: count_topic_links(
+                AttendanceRecord.objects.filter(marked_by=faculty.user)
+            ),
+            'top_students': lambda: list(Student.objects.filter(
+                id__in=records.values('student_id')
+            ).annotate(
+                session_count=Count('attendance_records', filter=Q(attendance_records__marked_by=faculty.user))
+            ).order_by('-session_count')[:10]),
+            'recent_sessions': lambda: list(
+                records.select_related('student', 'assignment__subject').prefetch_related(
+                    'topics_covered', 'session__topics_covered'
+                ).order_by('-date')[:10]
+            ),
+            'batch_schedule': lambda: list(active_assignments.select_related(
+                'student', 'subject'
+            ).annotate(
+                total_sessions=Count('attendance_records'),
+                last_session_date=Max('attendance_records__date'),
+                first_session_date=Min('attendance_records__date'),
+                total_hours=Sum('attendance_records__duration_minutes')
+            ).order_by('subject__name', 'student__first_name')),
+            'active_students': lambda: set(active_assignments.values_list('student_id', flat=True)),
+            'at_risk_students': at_risk_students,
+            'recent_student_dates': recent_student_dates,
+            'avg_satisfaction': lambda: FeedbackResponse.objects.filter(
+                survey__center_id=faculty.center_id
+            ).aggregate(avg=Avg('satisfaction_score'))['avg'] or 0,
+            'feedback': lambda: self.get_feedback_summary(faculty, today),
+        }
+    
+    def get_feedback_summary(self, faculty, today):
+        """Counts, rubric averages, rating histogram and 30-day windows in one aggregate."""
+        from apps.feedback.models import FacultyFeedback
+        from django.utils import timezone
+        from datetime import timedelta
+        
+        now = timezone.now()
+        thirty_days_ago = now - timedelta(days=30)
+        sixty_days_ago = now - timedelta(days=60)
+        all_feedback = FacultyFeedback.objects.filter(
+            faculty=faculty,
+            deleted_at__isnull=True
+        )
+        completed = Q(is_completed=True)
+        
+        aggregates = {
+            'total': Count('id'),
+            'completed': Count('id', filter=completed),
+            'recent_avg': Avg('overall_score', filter=completed & Q(submitted_at__gte=thirty_days_ago)),
+            'previous_avg': Avg('overall_score', filter=completed & Q(
+                submitted_at__gte=sixty_days_ago,
+                submitted_at__lt=thirty_days_ago
+            )),
+        }
+        for field in FEEDBACK_SCORE_FIELDS:
+            aggregates[field] = Avg(FEEDBACK_SCORE_FIELDS[field], filter=completed)
+        for rating in range(1, 6):
+            aggregates[f'rating_{rating}'] = Count('id', filter=completed & Q(
+                overall_score__gte=rating,
+                overall_score__lt=rating + 1
+            ))
+        summary = all_feedback.aggregate(**aggregates)
+        
+        summary['recent_comments'] = list(all_feedback.filter(is_completed=True).exclude(
+            comments=''
+        ).order_by('-submitted_at')[:5]) if summary['completed'] else []
+        return summary
+    
+    def build_report_context(self, faculty, today, sections):
+        """
+        Derive the report metrics, insights and feedback analytics from the
+        section results. Pure computation, no queries.
+        """
+        context = {}
+        context['faculty'] = faculty
+        context['panel_url'] = reverse('reports:faculty_report', args=[faculty.pk]) + 'panels/'
+        
+        # Get teaching statistics
+        totals = sections['totals']
+        total_sessions = totals['total_sessions']
+        total_students = totals['total_students']
+        
+        stats = {
+            'total_sessions': total_sessions,
+            'total_students': total_students,
+            'total_subjects': sections['total_subjects'],
+            'avg_session_duration': totals['avg_duration'] or 0,
+            'total_teaching_hours': (totals['total_minutes'] or 0) / 60,
             'sessions_per_student': round(total_sessions / total_students, 1) if total_students > 0 else 0,
         }
         context['stats'] = stats
         
         # Get student list
-        students = Student.objects.filter(
-            id__in=records.values_list('student_id', flat=True).distinct()
-        ).annotate(
-            session_count=Count('attendance_records', filter=Q(attendance_records__marked_by=faculty.user))
-        ).order_by('-session_count')[:10]
-        context['top_students'] = students
-        
-        # Prepare charts
-        # Chart 1: Attendance trend
-        attendance_trend = prepare_attendance_trend_data(center=faculty.center, days=30)
-        context['attendance_trend_data'] = json.dumps(attendance_trend)
+        context['top_students'] = sections['top_students']
         
         # Get recent sessions
-        recent_sessions = records.select_related('student', 'assignment__subject').order_by('-date')[:10]
-        context['recent_sessions'] = recent_sessions
+        context['recent_sessions'] = sections['recent_sessions']
         
         # Get batch schedule (active assignments with student details)
-        from django.db.models import Max, Min
-        batch_schedule = Assignment.objects.filter(
-            faculty=faculty,
-            is_active=True,
-            deleted_at__isnull=True
-        ).select_related(
-            'student', 'subject'
-        ).annotate(
-            total_sessions=Count('attendance_records'),
-            last_session_date=Max('attendance_records__date'),
-            first_session_date=Min('attendance_records__date'),
-            total_hours=Sum('attendance_records__duration_minutes')
-        ).order_by('subject__name', 'student__first_name')
-        
+        batch_schedule = sections['batch_schedule']
         context['batch_schedule'] = batch_schedule
         
         # Group batch schedule by subject for better display
         from collections import defaultdict
         schedule_by_subject = defaultdict(list)
+        subjects_by_student = defaultdict(list)
         for assignment in batch_schedule:
             schedule_by_subject[assignment.subject.name].append({
                 'assignment': assignment,
@@ -1026,64 +972,25 @@ class FacultyReportView(LoginRequiredMixin, TemplateView):
                 'total_hours': round((assignment.total_hours or 0) / 60, 1),
                 'start_date': assignment.start_date,
             })
+            subjects_by_student[assignment.student_id].append(assignment.subject)
         
         context['schedule_by_subject'] = dict(schedule_by_subject)
         
         # Identify at-risk students (no session in last 7 days)
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        today = timezone.now().date()
-        seven_days_ago = today - timedelta(days=7)
-        
-        # Get all active students taught by this faculty
-        active_students = Assignment.objects.filter(
-            faculty=faculty,
-            is_active=True,
-            deleted_at__isnull=True
-        ).values_list('student_id', flat=True)
-        
-        # Find students with no recent attendance
-        students_with_recent_attendance = AttendanceRecord.objects.filter(
-            student_id__in=active_students,
-            marked_by=faculty.user,
-            date__gte=seven_days_ago
-        ).values_list('student_id', flat=True).distinct()
-        
-        # At-risk students are those without recent attendance
-        at_risk_students = Student.objects.filter(
-            id__in=active_students
-        ).exclude(
-            id__in=students_with_recent_attendance
-        ).select_related('center').annotate(
-            last_session_date=Max('attendance_records__date', filter=Q(attendance_records__marked_by=faculty.user)),
-            total_sessions=Count('attendance_records', filter=Q(attendance_records__marked_by=faculty.user)),
-            total_hours=Sum('attendance_records__duration_minutes', filter=Q(attendance_records__marked_by=faculty.user))
-        ).order_by('last_session_date')
-        
-        # Calculate days since last session for each at-risk student
         at_risk_list = []
-        for student in at_risk_students:
+        for student in sections['at_risk_students']:
             if student.last_session_date:
                 days_since = (today - student.last_session_date).days
             else:
                 days_since = None  # Never attended
             
-            # Get their subject assignments
-            student_subjects = Assignment.objects.filter(
-                student=student,
-                faculty=faculty,
-                is_active=True,
-                deleted_at__isnull=True
-            ).select_related('subject')
-            
             at_risk_list.append({
                 'student': student,
                 'last_session': student.last_session_date,
                 'days_since': days_since,
                 'total_sessions': student.total_sessions or 0,
                 'total_hours': round((student.total_hours or 0) / 60, 1),
-                'subjects': [a.subject for a in student_subjects],
+                'subjects': subjects_by_student.get(student.pk, []),
                 'risk_level': 'critical' if days_since and days_since >= 14 else 'high' if days_since and days_since >= 7 else 'never_attended' if not days_since else 'moderate'
             })
         
@@ -1092,60 +999,38 @@ class FacultyReportView(LoginRequiredMixin, TemplateView):
         
         # Enhanced performance metrics
         # Session quality score (topics per hour)
-        total_topics = 0
-        for record in records:
-            total_topics += record.topics_covered.count()
-        
+        total_topics = sections['total_topics']
         total_hours = stats['total_teaching_hours']
         session_quality_score = round(total_topics / total_hours, 2) if total_hours > 0 else 0
         context['session_quality_score'] = session_quality_score
         
         # Student satisfaction from feedback
-        from apps.feedback.models import FeedbackResponse
         # Note: FeedbackResponse doesn't have a direct faculty field
         # Getting center-wide satisfaction as a proxy
-        if hasattr(faculty, 'center'):
-            avg_satisfaction = FeedbackResponse.objects.filter(
-                survey__center=faculty.center
-            ).aggregate(avg=Avg('satisfaction_score'))['avg'] or 0
-        else:
-            avg_satisfaction = 0
-        context['avg_satisfaction'] = round(avg_satisfaction, 1)
+        context['avg_satisfaction'] = round(sections['avg_satisfaction'], 1)
         
         # Consistency score (regular teaching pattern)
         # Calculate sessions per week over last 8 weeks
-        eight_weeks_ago = today - timedelta(days=56)
-        recent_records = records.filter(date__gte=eight_weeks_ago)
-        weeks_with_sessions = recent_records.values('date__week').distinct().count()
-        consistency_score = round((weeks_with_sessions / 8) * 100, 1)
+        consistency_score = round((totals['weeks_with_sessions'] / 8) * 100, 1)
         context['consistency_score'] = consistency_score
         
         # Student Attendance Rate (present vs total students)
-        total_active_students = len(active_students)
-        students_with_attendance = records.filter(
-            date__gte=seven_days_ago
-        ).values('student').distinct().count()
+        total_active_students = len(sections['active_students'])
+        students_with_attendance = totals['students_present']
         attendance_rate = round((students_with_attendance / total_active_students * 100), 1) if total_active_students > 0 else 0
         context['student_attendance_rate'] = attendance_rate
         context['students_present'] = students_with_attendance
         context['total_active_students'] = total_active_students
         
         # Irregular Students Count (gaps > 5 days in last 30 days)
-        thirty_days_ago = today - timedelta(days=30)
+        students_by_id = {student.pk: student for student in (a.student for a in batch_schedule)}
         irregular_students_list = []
         
-        for student_id in active_students:
-            student = Student.objects.get(id=student_id)
-            student_records = records.filter(
-                student_id=student_id,
-                date__gte=thirty_days_ago
-            ).order_by('date')
-            
-            if student_records.count() < 3:  # Less than 3 sessions in 30 days
+        for student_id, dates in sections['recent_student_dates'].items():
+            if len(dates) < 3:  # Less than 3 sessions in 30 days
                 continue
             
             # Check for gaps
-            dates = list(student_records.values_list('date', flat=True))
             has_large_gap = False
             max_gap = 0
             
@@ -1158,9 +1043,9 @@ class FacultyReportView(LoginRequiredMixin, TemplateView):
             
             if has_large_gap:
                 irregular_students_list.append({
-                    'student': student,
+                    'student': students_by_id.get(student_id),
                     'max_gap': max_gap,
-                    'sessions': student_records.count()
+                    'sessions': len(dates)
                 })
         
         context['irregular_students_count'] = len(irregular_students_list)
@@ -1297,59 +1182,34 @@ class FacultyReportView(LoginRequiredMixin, TemplateView):
         
         context['performance_summary'] = ' '.join(summary_parts)
         
-        # Free time slots visualization
-        free_slots = get_faculty_free_slots(faculty=faculty)
-        context['free_slots'] = free_slots[0] if free_slots else None
-        
-        # Gantt chart for weekly schedule
-        gantt_data = prepare_gantt_chart_data(faculty=faculty, days=7)
-        context['faculty_gantt_data'] = json.dumps(gantt_data)
-        
         # ============================================================================
         # COMPREHENSIVE FACULTY FEEDBACK ANALYTICS
         # ============================================================================
-        from apps.feedback.models import FacultyFeedback
-        
-        # Get all feedback for this faculty
-        all_feedback = FacultyFeedback.objects.filter(
-            faculty=faculty,
-            deleted_at__isnull=True
-        )
-        
-        completed_feedback = all_feedback.filter(is_completed=True)
-        pending_feedback = all_feedback.filter(is_completed=False)
+        feedback = sections['feedback']
         
         # Basic feedback statistics
-        context['feedback_total'] = all_feedback.count()
-        context['feedback_completed'] = completed_feedback.count()
-        context['feedback_pending'] = pending_feedback.count()
+        context['feedback_total'] = feedback['total']
+        context['feedback_completed'] = feedback['completed']
+        context['feedback_pending'] = feedback['total'] - feedback['completed']
         context['feedback_completion_rate'] = round(
             (context['feedback_completed'] / context['feedback_total'] * 100) 
             if context['feedback_total'] > 0 else 0, 1
         )
         
         # Calculate average scores for each question
-        if completed_feedback.exists():
+        if feedback['completed']:
             feedback_scores = {
-                'teaching_quality': completed_feedback.aggregate(avg=Avg('teaching_quality'))['avg'] or 0,
-                'subject_knowledge': completed_feedback.aggregate(avg=Avg('subject_knowledge'))['avg'] or 0,
-                'explanation_clarity': completed_feedback.aggregate(avg=Avg('explanation_clarity'))['avg'] or 0,
-                'student_engagement': completed_feedback.aggregate(avg=Avg('student_engagement'))['avg'] or 0,
-                'doubt_resolution': completed_feedback.aggregate(avg=Avg('doubt_resolution'))['avg'] or 0,
-                'overall': completed_feedback.aggregate(avg=Avg('overall_score'))['avg'] or 0,
+                key: round(feedback[key] or 0, 2)
+                for key in FEEDBACK_SCORE_FIELDS
             }
             
-            # Round all scores to 2 decimal places
-            for key in feedback_scores:
-                feedback_scores[key] = round(feedback_scores[key], 2)
-            
             context['feedback_scores'] = feedback_scores
             
             # Rating distribution for overall score
-            rating_distribution = {}
-            for rating in range(1, 6):
-                count = completed_feedback.filter(overall_score__gte=rating, overall_score__lt=rating+1).count()
-                rating_distribution[rating] = count
+            rating_distribution = {
+                rating: feedback[f'rating_{rating}']
+                for rating in range(1, 6)
+            }
             
             context['feedback_rating_distribution'] = rating_distribution
             
@@ -1361,16 +1221,8 @@ class FacultyReportView(LoginRequiredMixin, TemplateView):
             context['feedback_rating_percentages'] = rating_percentages
             
             # Feedback trends (last 30 days vs previous 30 days)
-            sixty_days_ago = today - timedelta(days=60)
-            
-            recent_feedback = completed_feedback.filter(submitted_at__gte=thirty_days_ago)
-            previous_feedback = completed_feedback.filter(
-                submitted_at__gte=sixty_days_ago,
-                submitted_at__lt=thirty_days_ago
-            )
-            
-            recent_avg = recent_feedback.aggregate(avg=Avg('overall_score'))['avg'] or 0
-            previous_avg = previous_feedback.aggregate(avg=Avg('overall_score'))['avg'] or 0
+            recent_avg = feedback['recent_avg'] or 0
+            previous_avg = feedback['previous_avg'] or 0
             
             feedback_trend = 'stable'
             feedback_trend_change = 0
@@ -1446,10 +1298,7 @@ class FacultyReportView(LoginRequiredMixin, TemplateView):
             context['satisfaction_message'] = satisfaction_message
             
             # Recent feedback with comments
-            recent_feedback_with_comments = completed_feedback.exclude(
-                comments=''
-            ).order_by('-submitted_at')[:5]
-            context['recent_feedback_comments'] = recent_feedback_with_comments
+            context['recent_feedback_comments'] = feedback['recent_comments']
             
             # Feedback insights
             feedback_insights = []
@@ -1607,10 +1456,10 @@ class InsightsView(LoginRequiredMixin, TemplateView):
         
         # Determine center
         center = None
-        if self.request.user.is_center_head:
-            if hasattr(self.request.user, 'center_head_profile'):
-                center = self.request.user.center_head_profile.center
-        elif self.request.user.is_master_account:
+        principal = get_principal(self.request)
+        if principal.is_center_head:
+            center = principal.center
+        elif principal.is_master:
             # Check if center_id is provided in URL
             center_id = self.kwargs.get('center_id')
             if center_id:
@@ -1781,10 +1630,11 @@ class ExportReportCSVView(LoginRequiredMixin, TemplateView):
 
 # Master Account Dashboard
 
-class MasterAccountDashboardView(MasterAccountRequiredMixin, TemplateView):
+class MasterAccountDashboardView(MasterAccountRedirectMixin, TemplateView):
     """
     Master Account Dashboard - Redirects to insights page as default.
     """
+    permission_denied_message = 'You do not have permission to access reports.'
     
     def get(self, request, *args, **kwargs):
         from django.shortcuts import redirect
@@ -1973,10 +1823,11 @@ class MasterAccountDashboardView(MasterAccountRequiredMixin, TemplateView):
         return context
 
 
-class MasterFacultyListView(MasterAccountRequiredMixin, ListView):
+class MasterFacultyListView(MasterAccountRedirectMixin, ListView):
     """
     Faculty list view for master account with center filter and search.
     """
+    permission_denied_message = 'You do not have permission to access reports.'
     model = Faculty
     template_name = 'reports/master_faculty_list.html'
     context_object_name = 'faculty_members'
@@ -2034,11 +1885,12 @@ class MasterFacultyListView(MasterAccountRequiredMixin, ListView):
         return context
 
 
-class MasterStudentSearchView(MasterAccountRequiredMixin, TemplateView):
+class MasterStudentSearchView(MasterAccountRedirectMixin, TemplateView):
     """
     Student search view for master account.
     Allows searching students across a selected center.
     """
+    permission_denied_message = 'You do not have permission to access reports.'
     template_name = 'reports/master_student_search.html'
     
     def get_context_data(self, **kwargs):
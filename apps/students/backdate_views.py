@@ -2,6 +2,9 @@
 Admin-only views for backdating attendance and admission dates.
 Only Center Heads (Admins) can access these views.
 """
+import logging
+
+from django.db import DatabaseError, transaction
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.urls import reverse_lazy
@@ -10,11 +13,14 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from datetime import datetime
 
 from apps.core.mixins import CenterHeadRequiredMixin, AuditLogMixin
+from apps.core.principal import get_principal
 from apps.students.models import Student
 from apps.attendance.models import AttendanceRecord
 from apps.subjects.models import Assignment
 from django import forms
 
+logger = logging.getLogger(__name__)
+
 
 class BackdateAdmissionForm(forms.ModelForm):
     """Form to backdate student enrollment date."""
@@ -116,7 +122,7 @@ class BackdateAdmissionView(LoginRequiredMixin, CenterHeadRequiredMixin, AuditLo
     def get_queryset(self):
         # Center heads can only backdate for their center
         return Student.objects.filter(
-            center=self.request.user.center_head_profile.center,
+            center=get_principal(self.request).center,
             deleted_at__isnull=True
         )
     
@@ -159,7 +165,7 @@ class BackdateAttendanceView(LoginRequiredMixin, CenterHeadRequiredMixin, AuditL
         kwargs = super().get_form_kwargs()
         # Pass a special flag to indicate this is backdate mode
         kwargs['is_backdate'] = True
-        kwargs['center'] = self.request.user.center_head_profile.center
+        kwargs['center'] = get_principal(self.request).center
         return kwargs
     
     def form_valid(self, form):
@@ -191,19 +197,20 @@ class BackdateAttendanceView(LoginRequiredMixin, CenterHeadRequiredMixin, AuditL
         
         # Handle Ready to Transfer status
         elif status == 'ready_to_transfer':
-            from apps.core.services import create_notification
+            from apps.core.services import notify_many
             try:
                 center_head = student.center.center_heads.first()
-                if center_head and center_head.user != self.request.user:
-                    create_notification(
-                        user=center_head.user,
-                        title=f"Student Ready for Transfer: {student.get_full_name()}",
-                        message=f"Student {student.get_full_name()} has been marked as ready to transfer (backdated).",
-                        notification_type='info',
-                        action_url=f'/students/{student.id}/'
-                    )
-            except:
-                pass
+                if center_head and center_head != self.request.user:
+                    with transaction.atomic():
+                        notify_many(
+                            [center_head],
+                            title=f"Student Ready for Transfer: {student.get_full_name()}",
+                            message=f"Student {student.get_full_name()} has been marked as ready to transfer (backdated).",
+                            notification_type='info',
+                            action_url=f'/students/{student.id}/'
+                        )
+            except DatabaseError:
+                logger.exception("Ready-to-transfer notification failed for student %s", student.pk)
             
             messages.info(
                 self.request,
@@ -227,7 +234,7 @@ class BackdateAttendanceView(LoginRequiredMixin, CenterHeadRequiredMixin, AuditL
         context['page_description'] = 'Create backdated attendance records for any student in your center'
         
         # Get recent backdated records
-        center = self.request.user.center_head_profile.center
+        center = get_principal(self.request).center
         context['recent_backdated'] = AttendanceRecord.objects.filter(
             student__center=center,
             notes__icontains='BACKDATED'
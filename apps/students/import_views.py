@@ -0,0 +1,165 @@
+"""
+Views for importing students, assignments and attendance from CSV or XLSX.
+Center Heads import into their center; master accounts pick the center.
+
+The upload is stored and imported by a Celery task (apps/core/tasks.py);
+the status page polls the task's progress. A dry run keeps the upload so
+its diff can be reviewed and then applied.
+"""
+import uuid
+
+from django import forms
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.files.storage import default_storage
+from django.http import Http404, JsonResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.views import View
+from django.views.generic import FormView, TemplateView
+
+from apps.centers.models import Center
+from apps.core.imports import IMPORT_KINDS, ImportFileError, file_format_for
+from apps.core.mixins import CenterHeadRequiredMixin
+from apps.core.principal import get_principal
+
+# Imports started in this browser session: task id -> import details
+SESSION_KEY = 'data_imports'
+
+
+class ImportForm(forms.Form):
+    """Upload form for a data import."""
+
+    kind = forms.ChoiceField(
+        choices=[(kind, kind.title()) for kind in IMPORT_KINDS],
+        widget=forms.Select(attrs={'class': 'select select-bordered w-full'}),
+        label='Data'
+    )
+    file = forms.FileField(
+        widget=forms.ClearableFileInput(attrs={'class': 'file-input file-input-bordered w-full', 'accept': '.csv,.xlsx'}),
+        help_text='CSV or XLSX file with a header row'
+    )
+    center = forms.ModelChoiceField(
+        queryset=Center.objects.none(),
+        required=False,
+        widget=forms.Select(attrs={'class': 'select select-bordered w-full'})
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        initial=True,
+        label='Dry run',
+        help_text='Only validate and show what would change'
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.principal = kwargs.pop('principal')
+        super().__init__(*args, **kwargs)
+        if self.principal.is_master:
+            self.fields['center'].queryset = Center.objects.order_by('name')
+            self.fields['center'].required = True
+        else:
+            del self.fields['center']
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        try:
+            file_format_for(upload.name)
+        except ImportFileError as exc:
+            raise forms.ValidationError(str(exc))
+        return upload
+
+
+def _start_import(request, details, dry_run):
+    """Queue the import task and remember it in the session."""
+    from apps.core.tasks import import_data
+
+    task = import_data.delay(
+        details['kind'], details['file_name'], request.user.pk, details['center_id'], dry_run=dry_run
+    )
+    imports = request.session.get(SESSION_KEY, {})
+    imports[task.id] = {**details, 'dry_run': dry_run}
+    request.session[SESSION_KEY] = imports
+    return task.id
+
+
+def _get_import(request, task_id):
+    details = request.session.get(SESSION_KEY, {}).get(task_id)
+    if details is None:
+        raise Http404('Import not found')
+    return details
+
+
+class ImportDataView(LoginRequiredMixin, CenterHeadRequiredMixin, FormView):
+    """Upload a file and start an import."""
+    form_class = ImportForm
+    template_name = 'students/import_data.html'
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['principal'] = get_principal(self.request)
+        return kwargs
+
+    def form_valid(self, form):
+        principal = get_principal(self.request)
+        center = form.cleaned_data.get('center') or principal.center
+        upload = form.cleaned_data['file']
+        file_name = default_storage.save(f'imports/{uuid.uuid4().hex}_{upload.name}', upload)
+
+        task_id = _start_import(self.request, {
+            'kind': form.cleaned_data['kind'],
+            'file_name': file_name,
+            'upload_name': upload.name,
+            'center_id': center.pk,
+        }, dry_run=form.cleaned_data['dry_run'])
+        return redirect('students:import-status', task_id=task_id)
+
+
+class ImportStatusView(LoginRequiredMixin, CenterHeadRequiredMixin, TemplateView):
+    """Progress and result of an import (JSON with ?format=json for polling)."""
+    template_name = 'students/import_status.html'
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('format') == 'json':
+            return JsonResponse(self.get_status())
+        return super().get(request, *args, **kwargs)
+
+    def get_status(self):
+        from celery.result import AsyncResult
+
+        task_id = self.kwargs['task_id']
+        details = _get_import(self.request, task_id)
+        task = AsyncResult(task_id)
+        result = task.info if isinstance(task.info, dict) else {}
+        if task.failed():
+            result = {'failed': str(task.info)}
+        return {
+            'state': task.state,
+            'ready': task.ready(),
+            'import': details,
+            'result': result,
+        }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['page_title'] = 'Import Status'
+        context['task_id'] = self.kwargs['task_id']
+        context['status'] = self.get_status()
+        return context
+
+
+class ImportApplyView(LoginRequiredMixin, CenterHeadRequiredMixin, View):
+    """Import the file of a finished dry run."""
+
+    def post(self, request, task_id):
+        details = _get_import(request, task_id)
+        if (not details['dry_run'] or details.get('applied')
+                or not default_storage.exists(details['file_name'])):
+            messages.error(request, 'This import cannot be applied; upload the file again.')
+            return redirect('students:import-data')
+
+        imports = request.session[SESSION_KEY]
+        imports[task_id]['applied'] = True
+        request.session[SESSION_KEY] = imports
+        new_task_id = _start_import(request, details, dry_run=False)
+        messages.info(request, f"Importing {details['upload_name']}.")
+        return redirect(reverse('students:import-status', kwargs={'task_id': new_task_id}))
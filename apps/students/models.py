@@ -3,10 +3,10 @@ Student models for Disha LMS.
 """
 
 from django.db import models
-from apps.core.models import TimeStampedModel, SoftDeleteModel
+from apps.core.models import OutboxEventMixin, TimeStampedModel, SoftDeleteModel
 
 
-class Student(TimeStampedModel, SoftDeleteModel):
+class Student(OutboxEventMixin, TimeStampedModel, SoftDeleteModel):
     """
     Student model.
     Represents a student enrolled in a center.
@@ -49,6 +49,8 @@ class Student(TimeStampedModel, SoftDeleteModel):
     # Notes
     notes = models.TextField(blank=True, help_text="Internal notes about the student")
     
+    outbox_fields = ('status', 'is_deleted')
+    
     class Meta:
         db_table = 'students'
         verbose_name = 'Student'
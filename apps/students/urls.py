@@ -5,6 +5,7 @@ URL configuration for students app.
 from django.urls import path
 from . import views
 from . import backdate_views
+from . import import_views
 
 app_name = 'students'
 
@@ -21,4 +22,9 @@ urlpatterns = [
     # Admin-only backdating URLs
     path('<int:pk>/backdate-admission/', backdate_views.BackdateAdmissionView.as_view(), name='backdate-admission'),
     path('backdate-attendance/', backdate_views.BackdateAttendanceView.as_view(), name='backdate-attendance'),
+    
+    # Bulk CSV/XLSX import
+    path('import/', import_views.ImportDataView.as_view(), name='import-data'),
+    path('import/<str:task_id>/', import_views.ImportStatusView.as_view(), name='import-status'),
+    path('import/<str:task_id>/apply/', import_views.ImportApplyView.as_view(), name='import-apply'),
 ]
@@ -10,6 +10,7 @@ from django.urls import reverse_lazy
 from django.db.models import Q
 
 from apps.core.mixins import CenterHeadRequiredMixin, SetCreatedByMixin, AuditLogMixin
+from apps.core.principal import get_principal
 from .models import Student
 from .forms import StudentForm, AssignmentForm
 from apps.subjects.models import Assignment
@@ -23,18 +24,10 @@ class StudentListView(LoginRequiredMixin, CenterHeadRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        # Master account can see all students
-        if self.request.user.is_master_account:
-            queryset = Student.objects.filter(deleted_at__isnull=True).select_related('center')
-        else:
-            # Get center from user's profile
-            if not hasattr(self.request.user, 'center_head_profile'):
-                return Student.objects.none()
-            
-            queryset = Student.objects.filter(
-                center=self.request.user.center_head_profile.center,
-                deleted_at__isnull=True
-            ).select_related('center')
+        # Master account can see all students, others their center's
+        queryset = get_principal(self.request).scope(
+            Student.objects.filter(deleted_at__isnull=True).select_related('center')
+        )
         
         # Search functionality
         search = self.request.GET.get('search')
@@ -71,7 +64,7 @@ class StudentCreateView(LoginRequiredMixin, CenterHeadRequiredMixin, SetCreatedB
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
         # Limit center selection to user's center
-        form.fields['center'].initial = self.request.user.center_head_profile.center
+        form.fields['center'].initial = get_principal(self.request).center
         form.fields['center'].widget.attrs['readonly'] = True
         return form
     
@@ -92,18 +85,20 @@ class StudentDetailView(LoginRequiredMixin, DetailView):
             from django.contrib.auth.views import redirect_to_login
             return redirect_to_login(request.get_full_path())
         
+        principal = get_principal(request)
+        
         # Master account can view all students
-        if request.user.is_master_account:
+        if principal.is_master:
             return super().dispatch(request, *args, **kwargs)
         
         # Center head and faculty must have profiles
-        if request.user.is_center_head:
-            if not hasattr(request.user, 'center_head_profile'):
+        if principal.is_center_head:
+            if not principal.has_profile:
                 from django.contrib import messages
                 messages.error(request, "Your center head profile is not set up.")
                 return redirect('accounts:profile')
-        elif request.user.is_faculty_member:
-            if not hasattr(request.user, 'faculty_profile'):
+        elif principal.is_faculty:
+            if not principal.has_profile:
                 from django.contrib import messages
                 messages.error(request, "Your faculty profile is not set up.")
                 return redirect('accounts:profile')
@@ -116,19 +111,16 @@ class StudentDetailView(LoginRequiredMixin, DetailView):
     def get_queryset(self):
         """Filter students based on user role."""
         queryset = Student.objects.filter(deleted_at__isnull=True)
+        principal = get_principal(self.request)
         
-        # Master account can see all students
-        if self.request.user.is_master_account:
-            return queryset
-        
-        # Center head can see students in their center
-        if self.request.user.is_center_head:
-            return queryset.filter(center=self.request.user.center_head_profile.center)
+        # Master account can see all students, center heads their center's
+        if principal.is_master or principal.is_center_head:
+            return principal.scope(queryset)
         
         # Faculty can see students they teach (have assignments with)
-        if self.request.user.is_faculty_member:
+        if principal.is_faculty:
             return queryset.filter(
-                assignments__faculty=self.request.user.faculty_profile,
+                assignments__faculty=principal.faculty_profile,
                 assignments__is_active=True
             ).distinct()
         
@@ -158,7 +150,7 @@ class StudentUpdateView(LoginRequiredMixin, CenterHeadRequiredMixin, AuditLogMix
     
     def get_queryset(self):
         return Student.objects.filter(
-            center=self.request.user.center_head_profile.center,
+            center=get_principal(self.request).center,
             deleted_at__isnull=True
         )
     
@@ -179,7 +171,7 @@ class StudentDeleteView(LoginRequiredMixin, CenterHeadRequiredMixin, AuditLogMix
     
     def get_queryset(self):
         return Student.objects.filter(
-            center=self.request.user.center_head_profile.center,
+            center=get_principal(self.request).center,
             deleted_at__isnull=True
         )
     
@@ -203,7 +195,7 @@ class AssignSubjectView(LoginRequiredMixin, CenterHeadRequiredMixin, SetCreatedB
         context['student'] = get_object_or_404(
             Student,
             pk=self.kwargs['student_pk'],
-            center=self.request.user.center_head_profile.center
+            center=get_principal(self.request).center
         )
         return context
     
@@ -212,7 +204,7 @@ class AssignSubjectView(LoginRequiredMixin, CenterHeadRequiredMixin, SetCreatedB
         student = get_object_or_404(
             Student,
             pk=self.kwargs['student_pk'],
-            center=self.request.user.center_head_profile.center
+            center=get_principal(self.request).center
         )
         form.fields['student'].initial = student
         form.fields['student'].widget.attrs['readonly'] = True
@@ -234,7 +226,7 @@ class AssignFacultyView(LoginRequiredMixin, CenterHeadRequiredMixin, UpdateView)
     
     def get_queryset(self):
         return Assignment.objects.filter(
-            student__center=self.request.user.center_head_profile.center
+            student__center=get_principal(self.request).center
         )
     
     def get_success_url(self):
@@ -253,7 +245,7 @@ class ReadyForTransferView(LoginRequiredMixin, CenterHeadRequiredMixin, ListView
     
     def get_queryset(self):
         return Student.objects.filter(
-            center=self.request.user.center_head_profile.center,
+            center=get_principal(self.request).center,
             status='completed',
             deleted_at__isnull=True
         ).order_by('-modified_at')
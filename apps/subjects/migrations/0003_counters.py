@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subjects', '0002_remove_center_from_subject'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='assignment_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Active assignments'),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='topic_count',
+            field=models.PositiveIntegerField(default=0, help_text='Active topics'),
+        ),
+    ]
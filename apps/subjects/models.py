@@ -3,10 +3,10 @@ Subject, Topic, and Assignment models for Disha LMS.
 """
 
 from django.db import models
-from apps.core.models import TimeStampedModel, SoftDeleteModel
+from apps.core.models import CounterFieldsMixin, OutboxEventMixin, TimeStampedModel, SoftDeleteModel
 
 
-class Subject(TimeStampedModel, SoftDeleteModel):
+class Subject(CounterFieldsMixin, TimeStampedModel, SoftDeleteModel):
     """
     Subject model.
     Represents a subject that is common across all centers.
@@ -18,6 +18,11 @@ class Subject(TimeStampedModel, SoftDeleteModel):
     
     is_active = models.BooleanField(default=True)
     
+    # Counters kept current by signals (see apps/centers/counters.py)
+    topic_count = models.PositiveIntegerField(default=0, help_text="Active topics")
+    assignment_count = models.PositiveIntegerField(default=0, db_index=True, help_text="Active assignments")
+    counter_fields = ('topic_count', 'assignment_count')
+    
     class Meta:
         db_table = 'subjects'
         verbose_name = 'Subject'
@@ -28,7 +33,7 @@ class Subject(TimeStampedModel, SoftDeleteModel):
         return f"{self.name} ({self.code})"
 
 
-class Topic(TimeStampedModel, SoftDeleteModel):
+class Topic(OutboxEventMixin, TimeStampedModel, SoftDeleteModel):
     """
     Topic model.
     Represents a topic within a subject.
@@ -55,6 +60,8 @@ class Topic(TimeStampedModel, SoftDeleteModel):
     
     is_active = models.BooleanField(default=True)
     
+    outbox_fields = ('subject_id', 'is_active', 'is_deleted')
+    
     class Meta:
         db_table = 'topics'
         verbose_name = 'Topic'
@@ -68,7 +75,7 @@ class Topic(TimeStampedModel, SoftDeleteModel):
         return f"{self.subject.name} - {self.name}"
 
 
-class Assignment(TimeStampedModel, SoftDeleteModel):
+class Assignment(OutboxEventMixin, TimeStampedModel, SoftDeleteModel):
     """
     Assignment model.
     Links a student to a subject with a faculty member.
@@ -97,6 +104,8 @@ class Assignment(TimeStampedModel, SoftDeleteModel):
     
     is_active = models.BooleanField(default=True)
     
+    outbox_fields = ('student_id', 'subject_id', 'faculty_id', 'start_date', 'end_date', 'is_active', 'is_deleted')
+    
     class Meta:
         db_table = 'assignments'
         verbose_name = 'Assignment'
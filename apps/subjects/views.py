@@ -6,7 +6,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import CreateView, ListView, DetailView, UpdateView
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db.models import Q
 
 from apps.core.mixins import SetCreatedByMixin, AuditLogMixin, CenterHeadRequiredMixin
 from .models import Subject, Topic
@@ -81,9 +81,6 @@ class SubjectListView(LoginRequiredMixin, CenterHeadRequiredMixin, ListView):
         # Subjects are common across all centers
         queryset = Subject.objects.filter(
             deleted_at__isnull=True
-        ).annotate(
-            topic_count=Count('topics', distinct=True),
-            assignment_count=Count('assignments', distinct=True)
         )
         
         # Search functionality
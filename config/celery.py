@@ -38,4 +38,23 @@ app.conf.beat_schedule = {
         'task': 'apps.feedback.tasks.send_survey_reminders',
         'schedule': crontab(hour=17, minute=0),
     },
+    # Move expired audit log entries to the monthly archives at 2 AM
+    'archive-audit-logs': {
+        'task': 'apps.core.tasks.archive_audit_logs',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    # Deliver outbox events that missed their post-commit dispatch
+    'dispatch-outbox': {
+        'task': 'apps.core.tasks.dispatch_outbox',
+        'schedule': crontab(),
+    },
+    'purge-outbox-events': {
+        'task': 'apps.core.tasks.purge_outbox_events',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    # Repair counter drift and roll the monthly attendance counters over
+    'reconcile-counters': {
+        'task': 'apps.centers.tasks.reconcile_counters',
+        'schedule': crontab(hour=0, minute=5),
+    },
 }
@@ -42,6 +42,13 @@ INSTALLED_APPS = [
     'apps.feedback',  # T158: Feedback & Satisfaction app
 ]
 
+# Session users are loaded with their profiles (see apps/core/principal.py).
+# ModelBackend stays listed so sessions stored with it remain valid.
+AUTHENTICATION_BACKENDS = [
+    'apps.accounts.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -70,6 +77,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.core.context_processors.layout',
             ],
         },
     },
@@ -120,7 +128,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.api.v1.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -144,6 +152,12 @@ REST_FRAMEWORK = {
     },
 }
 
+# API token cache (see apps/api/v1/authentication.py). The local TTL bounds
+# how long another process may still accept a token after logout.
+API_TOKEN_CACHE_TTL = config('API_TOKEN_CACHE_TTL', default=300, cast=int)
+API_TOKEN_LOCAL_CACHE_TTL = config('API_TOKEN_LOCAL_CACHE_TTL', default=5, cast=int)
+API_TOKEN_CACHE_STATS_FLUSH = config('API_TOKEN_CACHE_STATS_FLUSH', default=100, cast=int)
+
 # DRF Spectacular (OpenAPI documentation)
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Disha LMS API',
@@ -179,6 +193,37 @@ CACHES = {
     }
 }
 
+# Dashboard section cache (entries are also invalidated by per-center data versions)
+DASHBOARD_CACHE_TTL = config('DASHBOARD_CACHE_TTL', default=900, cast=int)
+
+# Per-faculty today roster of the attendance marking screen (apps/attendance/roster.py)
+ATTENDANCE_ROSTER_CACHE_TTL = config('ATTENDANCE_ROSTER_CACHE_TTL', default=3600, cast=int)
+
+# Page chrome data: center switcher, active center and unread notification
+# count (apps/core/context_processors.py); entries are dropped on writes
+LAYOUT_CACHE_TTL = config('LAYOUT_CACHE_TTL', default=3600, cast=int)
+
+# Serve the student/faculty reports from async views that run their
+# independent query sections concurrently (see apps/reports/async_views.py).
+# Only pays off under ASGI against a database server; each section uses its
+# own short-lived connection.
+REPORTS_ASYNC_VIEWS = config('REPORTS_ASYNC_VIEWS', default=False, cast=bool)
+
+# Rows per validated and written batch of CSV/XLSX imports (apps/core/imports.py)
+IMPORT_CHUNK_SIZE = config('IMPORT_CHUNK_SIZE', default=2000, cast=int)
+# Seconds a dry-run upload is kept so its import can be applied
+IMPORT_UPLOAD_TTL = config('IMPORT_UPLOAD_TTL', default=86400, cast=int)
+
+# Transactional outbox of change events (apps/core/outbox.py)
+OUTBOX_BATCH_SIZE = config('OUTBOX_BATCH_SIZE', default=500, cast=int)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+OUTBOX_RETENTION_DAYS = config('OUTBOX_RETENTION_DAYS', default=7, cast=int)
+
+# Audit Log Retention
+AUDIT_LOG_RETENTION_DAYS = config('AUDIT_LOG_RETENTION_DAYS', default=365, cast=int)
+AUDIT_LOG_ARCHIVE_DIR = config('AUDIT_LOG_ARCHIVE_DIR', default=str(BASE_DIR / 'archives' / 'audit_logs'))
+AUDIT_LOG_ARCHIVE_CHUNK_SIZE = config('AUDIT_LOG_ARCHIVE_CHUNK_SIZE', default=1000, cast=int)
+
 # Session Configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -199,6 +244,10 @@ SERVER_EMAIL = DEFAULT_FROM_EMAIL
 # Site URL for email links (T172)
 SITE_URL = config('SITE_URL', default='http://127.0.0.1:8000')
 
+# Signed survey/feedback links (apps/feedback/links.py)
+FEEDBACK_LINK_MAX_AGE_DAYS = config('FEEDBACK_LINK_MAX_AGE_DAYS', default=30, cast=int)
+FEEDBACK_LINK_CACHE_TTL = config('FEEDBACK_LINK_CACHE_TTL', default=3600, cast=int)
+
 # AI Integration Settings
 GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
 AI_CACHE_TTL = config('AI_CACHE_TTL', default=3600, cast=int)
@@ -0,0 +1,90 @@
+/**
+ * Report Panels Loader
+ * Fetches the lazily computed panels of a report page concurrently and
+ * renders each one as soon as its data (and the chart library) is ready.
+ *
+ * Usage:
+ *   ReportPanels.load('/reports/student/1/panels/', {
+ *       trend: function (data) { ... },
+ *       heatmap: function (data) { ... },
+ *   }, chartsReadyPromise);
+ */
+
+const ReportPanels = {
+    data: {},
+    renderers: {},
+
+    load(baseUrl, renderers, ready) {
+        const chartsReady = ready || Promise.resolve();
+        this.renderers = Object.assign(this.renderers, renderers);
+
+        return Promise.all(Object.keys(renderers).map((name) => {
+            this.setLoading(name, true);
+            return fetch(`${baseUrl}${name}/`, {
+                credentials: 'same-origin',
+                headers: { 'Accept': 'application/json' },
+            })
+                .then((response) => {
+                    if (!response.ok) {
+                        throw new Error(`Panel ${name} failed with status ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then((data) => chartsReady.then(() => {
+                    this.data[name] = data;
+                    this.render(name);
+                }))
+                .catch((error) => {
+                    console.error(error);
+                    this.showError(name);
+                })
+                .finally(() => this.setLoading(name, false));
+        }));
+    },
+
+    render(name) {
+        if (!(name in this.data)) {
+            return;
+        }
+        try {
+            this.renderers[name](this.data[name]);
+        } catch (error) {
+            console.error(`Panel ${name} render error:`, error);
+            this.showError(name);
+        }
+    },
+
+    redrawAll() {
+        Object.keys(this.data).forEach((name) => this.render(name));
+    },
+
+    panelElements(name) {
+        return document.querySelectorAll(`[data-panel="${name}"]`);
+    },
+
+    setLoading(name, loading) {
+        this.panelElements(name).forEach((element) => {
+            element.classList.toggle('opacity-50', loading);
+        });
+    },
+
+    showError(name) {
+        this.panelElements(name).forEach((element) => {
+            element.innerHTML = '<p class="text-center text-base-content/60 py-8">Unable to load this section</p>';
+        });
+    },
+
+    escape(value) {
+        const div = document.createElement('div');
+        div.textContent = value === null || value === undefined ? '' : String(value);
+        return div.innerHTML;
+    },
+};
+
+window.ReportPanels = ReportPanels;
+
+let reportPanelsResizeTimer = null;
+window.addEventListener('resize', () => {
+    clearTimeout(reportPanelsResizeTimer);
+    reportPanelsResizeTimer = setTimeout(() => ReportPanels.redrawAll(), 200);
+});